@@ -1,7 +1,6 @@
 import os
 import json
 from io import BytesIO
-from glob import glob
 from uuid import UUID
 from datetime import datetime
 from zipfile import ZipFile
@@ -12,6 +11,7 @@ import pandas as pd
 
 from helao.helpers.yml_tools import yml_load
 from helao.helpers.file_mapper import FileMapper
+from .localfs_index import LocalIndex, DEFAULT_INDEX_NAME
 
 
 def parse_seq_path(ymlp, target):
@@ -124,7 +124,8 @@ class LocalLoader:
         actions (pd.DataFrame): A DataFrame containing action metadata.
         processes (pd.DataFrame): A DataFrame containing process metadata.
     Methods:
-        __init__(data_path: str): Initializes the LocalLoader with a data path.
+        __init__(data_path: str, index_path: str = None): Initializes the LocalLoader with a data path
+            and the persistent yml path index (see LocalIndex), by default a file in the data root.
         clear_cache(): Clears all data caches.
         get_yml(path: str): Loads and returns YAML data from the specified path.
         get_act(index: int = None, path: str = None): Retrieves an action by index or path.
@@ -134,7 +135,7 @@ class LocalLoader:
         get_hlo(yml_path: str, hlo_fn: str): Retrieves hierarchical lab object (HLO) data.
     """
 
-    def __init__(self, data_path: str):
+    def __init__(self, data_path: str, index_path: Optional[str] = None):
         self.act_cache = {}  # {uuid: json_dict}
         self.exp_cache = {}
         self.seq_cache = {}
@@ -157,34 +158,46 @@ class LocalLoader:
             raise FileNotFoundError(
                 "data_path argument is not a valid file or folder path"
             )
+        if index_path is None:
+            # the directory holding the RUNS_* and PROCESSES folders
+            parts = self.target.split(os.sep)
+            run_parts = [
+                i
+                for i, x in enumerate(parts)
+                if x.startswith("RUNS_") or x == "PROCESSES"
+            ]
+            data_root = (
+                os.sep.join(parts[: run_parts[0]]) or os.sep
+                if run_parts
+                else os.path.dirname(self.target)
+            )
+            index_path = os.path.join(data_root, DEFAULT_INDEX_NAME)
+        self._index = LocalIndex(index_path)
         _yml_paths = []
         if self.target.endswith(".zip"):
             with ZipFile(self.target, "r") as zf:
                 zip_contents = zf.namelist()
             _yml_paths = [x for x in zip_contents if x.endswith(".yml")]
-            _yml_paths += glob(
-                os.path.join(process_dir, "**", "*-prc.yml"), recursive=True
-            )
+            _yml_paths += [
+                x for x in self._index.list_ymls(process_dir) if x.endswith("-prc.yml")
+            ]
+            self._index_roots = [process_dir]
         elif os.path.isdir(self.target):
-            for check_dir in check_dirs:
-                _yml_paths += glob(
-                    os.path.join(check_dir, "**", "*.yml"), recursive=True
-                )
+            self._index_roots = check_dirs
         else:
-            for check_dir in check_dirs:
-                _yml_paths += glob(
-                    os.path.join(os.path.dirname(check_dir), "**", "*.yml"),
-                    recursive=True,
-                )
+            self._index_roots = [os.path.dirname(x) for x in check_dirs]
+        if not self.target.endswith(".zip"):
+            for check_dir in self._index_roots:
+                _yml_paths += self._index.list_ymls(check_dir)
 
         for suffix in ("seq", "exp", "act", "prc"):
             self._yml_paths[suffix] = [
                 x for x in _yml_paths if x.endswith(f"-{suffix}.yml")
             ]
 
-        seq_parts = []
-        for ymlp in self._yml_paths["seq"]:
-            seq_parts.append(parse_seq_path(ymlp, self.target))
+        seq_parts = self._parse_paths(
+            self._yml_paths["seq"], lambda x: parse_seq_path(x, self.target)
+        )
         self.sequences = pd.DataFrame(
             seq_parts,
             columns=[
@@ -198,9 +211,7 @@ class LocalLoader:
             ],
         )
 
-        exp_parts = []
-        for ymlp in self._yml_paths["exp"]:
-            exp_parts.append(parse_exp_path(ymlp))
+        exp_parts = self._parse_paths(self._yml_paths["exp"], parse_exp_path)
         self.experiments = pd.DataFrame(
             exp_parts,
             columns=[
@@ -211,9 +222,7 @@ class LocalLoader:
             ],
         )
 
-        act_parts = []
-        for ymlp in self._yml_paths["act"]:
-            act_parts.append(parse_act_path(ymlp))
+        act_parts = self._parse_paths(self._yml_paths["act"], parse_act_path)
         self.actions = pd.DataFrame(
             act_parts,
             columns=[
@@ -227,23 +236,7 @@ class LocalLoader:
             ],
         )
 
-        prc_parts = []
-        for ymlp in self._yml_paths["prc"]:
-
-            prc_idx, prc_uuid, techname, yml_dir, ymlp, exp_timestamp, exp_name = (
-                parse_prc_path(ymlp)
-            )
-            prc_parts.append(
-                (
-                    prc_idx,
-                    prc_uuid,
-                    techname,
-                    yml_dir,
-                    ymlp,
-                    exp_timestamp,
-                    exp_name,
-                )
-            )
+        prc_parts = self._parse_paths(self._yml_paths["prc"], parse_prc_path)
         self.processes = pd.DataFrame(
             prc_parts,
             columns=[
@@ -257,18 +250,52 @@ class LocalLoader:
             ],
         )
 
-        self.actions["experiment_index"] = self.actions.action_localpath.apply(
-            lambda x: self._get_experiment_index(x)
-        )
+        self._index.close()
+
+        self.actions["experiment_index"] = self._get_experiment_indices()
         self.actions = self.actions.merge(
             self.experiments.reset_index(), left_on="experiment_index", right_on="index"
         )
 
+    def _parse_paths(self, paths: list, parse_func) -> list:
+        """Parse yml paths, reusing the results cached in the index."""
+        if any(not os.path.isabs(x) for x in paths):
+            # zip members, parsed directly
+            return [parse_func(x) for x in paths]
+        parts = []
+        for root in self._index_roots:
+            root = os.path.normpath(root)
+            root_paths = [
+                x for x in paths if x == root or x.startswith(root.rstrip(os.sep) + os.sep)
+            ]
+            parts += self._index.parse_paths(root_paths, parse_func, root=root)
+        return parts
+
+    def _get_experiment_indices(self) -> pd.Series:
+        """
+        Experiment index of each action. An action yml lives in a subfolder of
+        its experiment folder, so actions and experiments are joined on that
+        folder; actions without an exact match fall back to a prefix search.
+        """
+        exp_dirs = pd.Series(
+            self.experiments.index,
+            index=self.experiments.experiment_localpath.map(os.path.dirname),
+        )
+        exp_dirs = exp_dirs[~exp_dirs.index.duplicated(keep="first")]
+        act_dirs = self.actions.action_localpath.map(
+            lambda x: os.path.dirname(os.path.dirname(x))
+        )
+        indices = act_dirs.map(exp_dirs)
+        for i in indices.index[indices.isna()]:
+            indices[i] = self._get_experiment_index(self.actions.action_localpath[i])
+        return indices if indices.isna().any() else indices.astype(int)
+
     def _get_experiment_index(self, action_local_path):
         alp = os.path.dirname(os.path.dirname(action_local_path))
-        return self.experiments.query(
+        matches = self.experiments.query(
             "experiment_localpath.str.startswith(@alp)"
-        ).index[0]
+        ).index
+        return matches[0] if len(matches) else None
 
     def clear_cache(self):
         """Clears all caches.
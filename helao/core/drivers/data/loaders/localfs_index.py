@@ -0,0 +1,224 @@
+"""
+Persistent index of the *.yml files under helao run directories.
+
+LocalLoader used to glob every yml under RUNS_* and PROCESSES and parse all of
+their paths on each construction. LocalIndex keeps the directory listings and
+the parsed path tuples in a sqlite file and only rescans directories whose
+mtime changed, so the first load of an archive walks it once and later loads
+only stat the directories.
+
+A directory is listed again if its mtime is within `racy_window_s` of the time
+it was last listed, since files created in the same mtime tick would not
+change it. Listings and parsed paths of directories and ymls that disappeared
+are deleted when their parent is listed again.
+
+LocalLoader keeps the index file (DEFAULT_INDEX_NAME) in the data root next
+to the RUNS_* directories, so each archive has its own index.
+"""
+
+__all__ = ["LocalIndex", "DEFAULT_INDEX_NAME"]
+
+import os
+import json
+import time
+import sqlite3
+from uuid import UUID
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_INDEX_NAME = "helao_localfs_index.db"
+
+
+def _encode(obj):
+    if isinstance(obj, datetime):
+        return {"__dt": obj.isoformat()}
+    if isinstance(obj, UUID):
+        return {"__uuid": str(obj)}
+    raise TypeError(f"cannot index {type(obj)}")
+
+
+def _decode(d: dict):
+    if "__dt" in d:
+        return datetime.fromisoformat(d["__dt"])
+    if "__uuid" in d:
+        return UUID(d["__uuid"])
+    return d
+
+
+class LocalIndex:
+    """
+    Sqlite cache of directory listings and parsed yml paths.
+
+    Args:
+        index_path (str): sqlite file, created if missing. ":memory:" (the
+            default) disables persistence.
+        racy_window_s (float): Directories modified this close to their last
+            listing are listed again. Defaults to 2.0.
+    """
+
+    def __init__(
+        self, index_path: Optional[str] = None, racy_window_s: float = 2.0
+    ):
+        self.index_path = ":memory:" if index_path is None else index_path
+        self.racy_window_ns = int(racy_window_s * 1e9)
+        try:
+            self._con = self._connect(self.index_path)
+        except sqlite3.Error:
+            # unwritable location or corrupt file, index for this session only
+            self.index_path = ":memory:"
+            self._con = self._connect(self.index_path)
+        self.listed_dirs = 0
+        self.parsed_paths = 0
+
+    @staticmethod
+    def _connect(index_path: str) -> sqlite3.Connection:
+        con = sqlite3.connect(index_path, timeout=30)
+        if index_path != ":memory:":
+            con.execute("PRAGMA journal_mode=WAL;")
+        con.execute(
+            """CREATE TABLE IF NOT EXISTS dirs(
+              path TEXT PRIMARY KEY,
+              mtime_ns INTEGER NOT NULL,
+              listed_ns INTEGER NOT NULL,
+              subdirs TEXT NOT NULL,
+              ymls TEXT NOT NULL
+              );"""
+        )
+        con.execute(
+            """CREATE TABLE IF NOT EXISTS parsed(
+              path TEXT PRIMARY KEY,
+              row TEXT NOT NULL
+              );"""
+        )
+        con.commit()
+        return con
+
+    def close(self):
+        self._con.close()
+
+    @staticmethod
+    def _prefix_range(root: str) -> tuple:
+        """(root, lo, hi) bounds of *root* and every path below it."""
+        return (
+            root,
+            root.rstrip(os.sep) + os.sep,
+            root.rstrip(os.sep) + chr(ord(os.sep) + 1),
+        )
+
+    def _prefix_rows(self, table: str, columns: str, root: str) -> list:
+        """Rows of *table* for *root* and every path below it."""
+        return self._con.execute(
+            f"SELECT {columns} FROM {table} WHERE path = ? OR (path >= ? AND path < ?);",
+            self._prefix_range(root),
+        ).fetchall()
+
+    def list_ymls(self, root: str) -> List[str]:
+        """Return the paths of all *.yml files below *root* (recursive)."""
+        root = os.path.normpath(root)
+        cached = {
+            path: (mtime_ns, listed_ns, subdirs, ymls)
+            for path, mtime_ns, listed_ns, subdirs, ymls in self._prefix_rows(
+                "dirs", "path, mtime_ns, listed_ns, subdirs, ymls", root
+            )
+        }
+        visited = set()
+        changed = []
+        # ymls no longer listed in a directory that still exists
+        removed_ymls = []
+        yml_paths = []
+        stack = [root]
+        while stack:
+            dirpath = stack.pop()
+            try:
+                mtime_ns = os.stat(dirpath).st_mtime_ns
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            visited.add(dirpath)
+            entry = cached.get(dirpath)
+            if (
+                entry is not None
+                and entry[0] == mtime_ns
+                and entry[1] - mtime_ns > self.racy_window_ns
+            ):
+                subdirs, ymls = json.loads(entry[2]), json.loads(entry[3])
+            else:
+                listed_ns = time.time_ns()
+                subdirs, ymls = [], []
+                try:
+                    with os.scandir(dirpath) as it:
+                        for de in it:
+                            if de.is_dir():
+                                subdirs.append(de.name)
+                            elif de.name.endswith(".yml"):
+                                ymls.append(de.name)
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
+                subdirs.sort()
+                ymls.sort()
+                if entry is not None:
+                    removed_ymls += [
+                        (os.path.join(dirpath, x),)
+                        for x in set(json.loads(entry[3])) - set(ymls)
+                    ]
+                changed.append(
+                    (dirpath, mtime_ns, listed_ns, json.dumps(subdirs), json.dumps(ymls))
+                )
+                self.listed_dirs += 1
+            yml_paths += [os.path.join(dirpath, x) for x in ymls]
+            stack += [os.path.join(dirpath, x) for x in reversed(subdirs)]
+
+        removed = [path for path in cached if path not in visited]
+        if changed or removed or removed_ymls:
+            with self._con:
+                self._con.executemany(
+                    "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?);", changed
+                )
+                self._con.executemany(
+                    "DELETE FROM dirs WHERE path = ?;", [(x,) for x in removed]
+                )
+                # parsed ymls of removed directories and files
+                self._con.executemany(
+                    "DELETE FROM parsed WHERE path = ? OR (path >= ? AND path < ?);",
+                    [self._prefix_range(x) for x in removed],
+                )
+                self._con.executemany("DELETE FROM parsed WHERE path = ?;", removed_ymls)
+        return yml_paths
+
+    def parse_paths(
+        self, paths: List[str], parse_func: Callable, root: Optional[str] = None
+    ) -> list:
+        """
+        Return [parse_func(path) for path in paths], using cached results.
+
+        *parse_func* must be a pure function of the path returning a tuple of
+        json types, datetimes and UUIDs. If *root* is given, the cache of all
+        paths below it is fetched with one range query.
+        """
+        if root is not None:
+            rows = self._prefix_rows("parsed", "path, row", os.path.normpath(root))
+        else:
+            rows = []
+            for i in range(0, len(paths), 900):
+                chunk = paths[i : i + 900]
+                rows += self._con.execute(
+                    f"SELECT path, row FROM parsed WHERE path IN ({','.join('?' * len(chunk))});",
+                    chunk,
+                ).fetchall()
+        cached: Dict[str, str] = dict(rows)
+        parsed = []
+        new_rows = []
+        for path in paths:
+            row = cached.get(path)
+            if row is None:
+                tup = parse_func(path)
+                new_rows.append((path, json.dumps(tup, default=_encode)))
+                self.parsed_paths += 1
+            else:
+                tup = tuple(json.loads(row, object_hook=_decode))
+            parsed.append(tup)
+        if new_rows:
+            with self._con:
+                self._con.executemany(
+                    "INSERT OR REPLACE INTO parsed VALUES (?, ?);", new_rows
+                )
+        return parsed
@@ -0,0 +1,227 @@
+"""
+Bounded, non-blocking S3 upload pool used by HelaoSyncer.
+
+boto3 calls block, so uploads run on a dedicated thread pool whose size caps
+the number of concurrent transfers; the coroutine awaiting an upload only
+waits on a future, and retries back off with capped exponential delays on
+the event loop instead of sleeping a fixed 30 s.
+
+Files at or above `multipart_threshold_mb` are sent as multipart uploads by
+boto3's transfer manager. Every object is uploaded with an S3 additional
+checksum (`checksum_algorithm`, SHA256 by default) that S3 validates on
+receipt, and its local sha256 is stored in the object metadata. With
+`verify` enabled (in the 's3_upload' config params), the object size and
+stored digest are also compared against head_object after the upload; this
+needs s3:GetObject, so a 403 on the head request counts the upload as done
+but unverified.
+
+Any client implementing the boto3 S3 API works, so the pool can be tested
+against a local stand-in such as moto or MinIO.
+"""
+
+__all__ = ["S3Uploader"]
+
+import io
+import os
+import time
+import random
+import asyncio
+import hashlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Union
+
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+from helao.helpers import helao_logging as logging
+
+LOGGER = logging.make_logger(__file__) if logging.LOGGER is None else logging.LOGGER
+
+MB = 1024**2
+
+UploadSource = Union[Path, str, bytes, Callable[[], bytes]]
+
+
+def _sha256_file(path: str, chunksize: int = 8 * MB) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunksize), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class S3Uploader:
+    """
+    Upload files and in-memory payloads to one bucket from a thread pool.
+
+    Args:
+        s3_client: boto3 S3 client.
+        bucket (str): Target bucket.
+        max_workers (int): Concurrent uploads. Defaults to 4.
+        multipart_threshold_mb (float): Size from which multipart uploads are
+            used. Defaults to 64.
+        multipart_chunksize_mb (float): Part size. Defaults to 16.
+        multipart_concurrency (int): Parts uploaded in parallel per file.
+            Defaults to 4.
+        checksum_algorithm (str): S3 additional checksum algorithm, None to
+            disable. Defaults to "SHA256".
+        verify (bool): Compare size and sha256 with head_object after each
+            upload. Defaults to False.
+        backoff_base (float): First retry delay in seconds. Defaults to 1.
+        backoff_max (float): Retry delay cap in seconds. Defaults to 60.
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        bucket: str,
+        max_workers: int = 4,
+        multipart_threshold_mb: float = 64,
+        multipart_chunksize_mb: float = 16,
+        multipart_concurrency: int = 4,
+        checksum_algorithm: Optional[str] = "SHA256",
+        verify: bool = False,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ):
+        self.s3 = s3_client
+        self.bucket = bucket
+        self.max_workers = max_workers
+        self.checksum_algorithm = checksum_algorithm
+        self.verify = verify
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.transfer_config = TransferConfig(
+            multipart_threshold=int(multipart_threshold_mb * MB),
+            multipart_chunksize=int(multipart_chunksize_mb * MB),
+            max_concurrency=multipart_concurrency,
+            use_threads=multipart_concurrency > 1,
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="s3_upload"
+        )
+        self.in_flight = 0
+        self.uploaded = 0
+        self.failed = 0
+        self.retried = 0
+        self.unverified = 0
+        self.bytes_uploaded = 0
+        self.upload_seconds = 0.0
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number *attempt* (1-based), with jitter."""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _upload_sync(self, source: UploadSource, key: str) -> int:
+        """Blocking upload of *source* to *key*, returns the uploaded size."""
+        if callable(source):
+            source = source()
+        if isinstance(source, bytes):
+            size = len(source)
+            sha256 = hashlib.sha256(source).hexdigest()
+        else:
+            source = str(source)
+            size = os.path.getsize(source)
+            sha256 = _sha256_file(source)
+
+        extra_args = {"Metadata": {"sha256": sha256}}
+        if self.checksum_algorithm:
+            extra_args["ChecksumAlgorithm"] = self.checksum_algorithm
+        if isinstance(source, bytes):
+            self.s3.upload_fileobj(
+                io.BytesIO(source),
+                self.bucket,
+                key,
+                ExtraArgs=extra_args,
+                Config=self.transfer_config,
+            )
+        else:
+            self.s3.upload_file(
+                source, self.bucket, key, ExtraArgs=extra_args, Config=self.transfer_config
+            )
+
+        if self.verify:
+            try:
+                head = self.s3.head_object(Bucket=self.bucket, Key=key)
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code")
+                if code not in ("403", "AccessDenied"):
+                    raise
+                # upload-only credentials, the upload itself succeeded
+                LOGGER.warning(f"Uploaded {key} to S3 but no permission to verify it.")
+                self.unverified += 1
+                return size
+            if head["ContentLength"] != size:
+                raise IOError(
+                    f"size mismatch for {key}: local {size}, remote {head['ContentLength']}"
+                )
+            remote_sha256 = head.get("Metadata", {}).get("sha256")
+            if remote_sha256 != sha256:
+                raise IOError(
+                    f"sha256 mismatch for {key}: local {sha256}, remote {remote_sha256}"
+                )
+        return size
+
+    async def upload(self, source: UploadSource, key: str, retries: int = 5) -> bool:
+        """
+        Upload *source* to *key* without blocking the event loop.
+
+        Args:
+            source: File path, bytes, or a callable returning bytes (called on
+                the upload thread, e.g. to serialize and compress a payload).
+            key (str): Object key.
+            retries (int): Retries after the first attempt. Defaults to 5.
+
+        Returns:
+            bool: True if the upload succeeded (and was verified, if enabled).
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in range(retries + 1):
+            if attempt > 0:
+                delay = self.backoff(attempt)
+                self.retried += 1
+                LOGGER.info(
+                    f"S3 retry [{attempt}/{retries}] in {delay:.1f} s: {self.bucket}, {key}"
+                )
+                await asyncio.sleep(delay)
+            self.in_flight += 1
+            t0 = time.perf_counter()
+            try:
+                size = await loop.run_in_executor(
+                    self._executor, self._upload_sync, source, key
+                )
+            except Exception:
+                LOGGER.error(f"Failed to upload {key} to S3.", exc_info=True)
+                continue
+            finally:
+                self.in_flight -= 1
+            self.upload_seconds += time.perf_counter() - t0
+            self.uploaded += 1
+            self.bytes_uploaded += size
+            return True
+        self.failed += 1
+        LOGGER.info(f"Did not upload {key} after {retries} retries.")
+        return False
+
+    def stats(self) -> dict:
+        """Return upload counters and the mean per-upload throughput."""
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "uploaded": self.uploaded,
+            "failed": self.failed,
+            "retried": self.retried,
+            "unverified": self.unverified,
+            "bytes_uploaded": self.bytes_uploaded,
+            "upload_seconds": round(self.upload_seconds, 3),
+            "throughput_mb_s": (
+                round(self.bytes_uploaded / MB / self.upload_seconds, 3)
+                if self.upload_seconds
+                else None
+            ),
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
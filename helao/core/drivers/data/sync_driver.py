@@ -52,6 +52,7 @@ from helao.helpers.read_hlo import read_hlo
 from helao.helpers.parquet import hlo_to_parquet
 from helao.helpers.yml_tools import yml_dumps, yml_load
 from helao.helpers.zip_dir import zip_dir
+from helao.core.drivers.data.s3_uploader import S3Uploader
 
 from time import sleep
 from glob import glob
@@ -944,7 +945,13 @@ class HelaoSyncer:
             Pushes unfinished processes to S3 and API from experiment progress.
 
         to_s3(self, msg: Union[dict, Path], target: str, retries: int = 5, compress: bool = False):
-            Uploads data to S3, either as a JSON object or a file.
+            Uploads data to S3, either as a JSON object or a file, through the upload pool.
+
+        get_uploader(self):
+            Returns the S3Uploader pool, created on first use.
+
+        get_upload_stats(self):
+            Returns S3 upload counters and throughput.
 
         to_api(self, req_model: dict, meta_type: str, retries: int = 5):
             Sends a POST or PATCH request to the Modelyst API.
@@ -959,7 +966,7 @@ class HelaoSyncer:
             Resets a synced sequence zip or partially-synced sequence folder.
 
         shutdown(self):
-            Placeholder method for shutting down the syncer.
+            Shuts down the S3 upload pool.
 
         unsync_dir(self, sync_dir: str):
             Reverts a synced directory back to the RUNS_FINISHED state.
@@ -1407,7 +1414,9 @@ class HelaoSyncer:
                                 file_s3_key += ".gz"
                             LOGGER.debug("Parsing hlo dicts.")
                             try:
-                                file_meta, file_data = read_hlo(sp)
+                                file_meta, file_data = await asyncio.to_thread(
+                                    read_hlo, sp
+                                )
                             except Exception:
                                 LOGGER.error(
                                     f"Failed to read hlo file {fp}, skipping upload.",
@@ -1425,7 +1434,9 @@ class HelaoSyncer:
                             )
                             try:
                                 parquet_path = str(fp).replace(".hlo", ".parquet")
-                                hlo_to_parquet(fp, parquet_path)
+                                await asyncio.to_thread(
+                                    hlo_to_parquet, fp, parquet_path
+                                )
                                 msg = Path(parquet_path)
                             except Exception:
                                 LOGGER.error(
@@ -1873,39 +1884,39 @@ class HelaoSyncer:
                 LOGGER.info("S3 is not configured. Skipping to S3 upload.")
                 return True
             if isinstance(msg, dict):
-                LOGGER.debug("Converting dict to json.")
-                uploadee = dict2json(msg)
-                uploader = self.s3.upload_fileobj
-                if compress:
-                    if not target.endswith(".gz"):
-                        target = f"{target}.gz"
-                    buffer = io.BytesIO()
-                    with gzip.GzipFile(fileobj=buffer, mode="wb") as f:
-                        f.write(uploadee.read())
-                    buffer.seek(0)
-                    uploadee = buffer
+                if compress and not target.endswith(".gz"):
+                    target = f"{target}.gz"
+
+                def uploadee():
+                    # serialized on the upload thread
+                    payload = dict2json(msg).read()
+                    return gzip.compress(payload) if compress else payload
+
             else:
-                LOGGER.debug("Converting path to str")
                 uploadee = str(msg)
-                uploader = self.s3.upload_file
-            for i in range(retries + 1):
-                if i > 0:
-                    LOGGER.info(f"S3 retry [{i}/{retries}]: {self.bucket}, {target}")
-                try:
-                    uploader(uploadee, self.bucket, target)
-                    return True
-                except Exception:
-                    LOGGER.error(
-                        f"Failed to upload {target} to S3, retrying in 30 seconds",
-                        exc_info=True,
-                    )
-                    await asyncio.sleep(30)
-            LOGGER.info(f"Did not upload {target} after {retries} tries.")
-            return False
+            return await self.get_uploader().upload(uploadee, target, retries=retries)
         except Exception:
             LOGGER.error(f"Could not push {target}.", exc_info=True)
             return False
 
+    def get_uploader(self) -> S3Uploader:
+        """Return the S3 upload pool, created on first use from the 's3_upload'
+        config params (see S3Uploader for keys)."""
+        uploader = getattr(self, "s3_uploader", None)
+        if uploader is None or uploader.s3 is not self.s3:
+            if uploader is not None:
+                uploader.shutdown()
+            self.s3_uploader = S3Uploader(
+                self.s3, self.bucket, **self.config_dict.get("s3_upload", {})
+            )
+        return self.s3_uploader
+
+    def get_upload_stats(self) -> dict:
+        """Return the S3 upload pool counters."""
+        if getattr(self, "s3_uploader", None) is None:
+            return {}
+        return self.s3_uploader.stats()
+
     async def to_api(self, req_model: dict, meta_type: str, retries: int = 5):
         """
         Pushes a request model to an API endpoint asynchronously with retry logic.
@@ -2251,7 +2262,8 @@ class HelaoSyncer:
         return False
 
     def shutdown(self):
-        pass
+        if getattr(self, "s3_uploader", None) is not None:
+            self.s3_uploader.shutdown()
 
     def unsync_dir(self, sync_dir: str):
         """
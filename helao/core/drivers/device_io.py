@@ -0,0 +1,242 @@
+"""
+Dedicated I/O thread per device.
+
+Driver calls into serial, gclib or vendor libraries block until the device
+answers. Made from a coroutine they stall the event loop, and with it every
+endpoint, websocket relay and status push of the server. DeviceIOExecutor
+runs them one at a time on a thread owned by the device, so calls to one
+device stay serialized as they were on the loop, while the loop only awaits
+their result.
+
+Calls are queued by priority: a stop or estop waits for the call in progress
+but goes ahead of queued commands, and commands go ahead of polling reads.
+Run time and queue wait are recorded per call label in LatencyHistograms.
+
+usage:
+    io = DeviceIOExecutor("galil_io")
+    ret = await io.call(g.GCommand, "MG @AN[1]", priority=IOPriority.poll)
+"""
+
+__all__ = [
+    "IOPriority",
+    "LatencyHistogram",
+    "DeviceIOExecutor",
+    "AsyncDriverProxy",
+]
+
+import time
+import queue
+import asyncio
+import inspect
+import itertools
+import threading
+from enum import IntEnum
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+
+class IOPriority(IntEnum):
+    """Queue priority of a device call, lower runs first."""
+
+    stop = 0  # stop, estop
+    command = 10  # setup, move, set points
+    poll = 20  # status and data reads
+
+
+# driver methods queued ahead of commands or behind them by AsyncDriverProxy
+METHOD_PRIORITY = {
+    "stop": IOPriority.stop,
+    "estop": IOPriority.stop,
+    "get_status": IOPriority.poll,
+    "get_data": IOPriority.poll,
+}
+
+
+class LatencyHistogram:
+    """Counts of durations in log-spaced millisecond buckets."""
+
+    BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def record(self, seconds: float):
+        ms = seconds * 1e3
+        for i, edge in enumerate(self.BUCKETS_MS):
+            if ms <= edge:
+                break
+        else:
+            i = len(self.BUCKETS_MS)
+        self.counts[i] += 1
+        self.count += 1
+        self.total_s += seconds
+        self.max_s = max(self.max_s, seconds)
+
+    def as_dict(self) -> dict:
+        labels = [f"<={edge}" for edge in self.BUCKETS_MS] + [
+            f">{self.BUCKETS_MS[-1]}"
+        ]
+        return {
+            "count": self.count,
+            "mean_ms": 1e3 * self.total_s / self.count if self.count else None,
+            "max_ms": 1e3 * self.max_s,
+            "buckets_ms": {k: v for k, v in zip(labels, self.counts) if v},
+        }
+
+
+class DeviceIOExecutor:
+    """
+    Single worker thread with a priority queue of blocking device calls.
+
+    The thread is started by the first call and is a daemon, so a device
+    hanging in a call never prevents the server from exiting.
+
+    Args:
+        name (str): Device name, used for the thread name and in stats.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.busy_label: Optional[str] = None
+        self.run_time: Dict[str, LatencyHistogram] = {}
+        self.queue_wait: Dict[str, LatencyHistogram] = {}
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker, name=f"io-{self.name}", daemon=True
+                )
+                self._thread.start()
+
+    def submit(
+        self,
+        fn: Callable,
+        *args,
+        priority: IOPriority = IOPriority.command,
+        label: Optional[str] = None,
+        **kwargs,
+    ) -> Future:
+        """Queue fn(*args, **kwargs), returns a concurrent.futures.Future."""
+        if self._closed:
+            raise RuntimeError(f"I/O executor of {self.name} is shut down")
+        self._ensure_thread()
+        future = Future()
+        if label is None:
+            label = getattr(fn, "__name__", "call")
+        self._queue.put(
+            (
+                int(priority),
+                next(self._seq),
+                (fn, args, kwargs, future, label, time.perf_counter()),
+            )
+        )
+        return future
+
+    async def call(
+        self,
+        fn: Callable,
+        *args,
+        priority: IOPriority = IOPriority.command,
+        label: Optional[str] = None,
+        **kwargs,
+    ):
+        """Run fn(*args, **kwargs) on the device thread and await its result."""
+        return await asyncio.wrap_future(
+            self.submit(fn, *args, priority=priority, label=label, **kwargs)
+        )
+
+    def _record(self, hists: Dict[str, LatencyHistogram], label: str, seconds: float):
+        hist = hists.get(label)
+        if hist is None:
+            hist = hists[label] = LatencyHistogram()
+        hist.record(seconds)
+
+    def _worker(self):
+        while True:
+            _, _, item = self._queue.get()
+            if item is None:
+                break
+            fn, args, kwargs, future, label, queued_at = item
+            # skipped if the awaiting coroutine was cancelled meanwhile
+            if not future.set_running_or_notify_cancel():
+                continue
+            started = time.perf_counter()
+            self._record(self.queue_wait, label, started - queued_at)
+            self.busy_label = label
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            finally:
+                self.busy_label = None
+                self._record(self.run_time, label, time.perf_counter() - started)
+
+    def stats(self) -> dict:
+        """Queue depth, call in progress, and latency histograms per call label."""
+        return {
+            "name": self.name,
+            "queued": self._queue.qsize(),
+            "busy": self.busy_label,
+            "calls": {
+                label: {
+                    "run_time": hist.as_dict(),
+                    "queue_wait": self.queue_wait[label].as_dict(),
+                }
+                for label, hist in list(self.run_time.items())
+                if label in self.queue_wait
+            },
+        }
+
+    def shutdown(self):
+        """Cancel queued calls and stop the thread after the call in progress."""
+        self._closed = True
+        while True:
+            try:
+                _, _, item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[3].cancel()
+        if self._thread is not None:
+            self._queue.put((-1, next(self._seq), None))
+
+
+class AsyncDriverProxy:
+    """
+    Awaitable view of a driver's methods, see HelaoDriver.aio.
+
+    `await driver.aio.move(...)` runs driver.move(...) on the driver's
+    DeviceIOExecutor with the priority in METHOD_PRIORITY (command by
+    default); coroutine methods are awaited on the loop as they are.
+    """
+
+    def __init__(self, driver: object, io: DeviceIOExecutor):
+        self._driver = driver
+        self._io = io
+
+    def __getattr__(self, name: str):
+        method = getattr(self._driver, name)
+        if not callable(method):
+            raise AttributeError(f"{name} is not a method of {self._driver}")
+        if inspect.iscoroutinefunction(method):
+            return method
+        priority = METHOD_PRIORITY.get(name, IOPriority.command)
+
+        async def io_call(*args, **kwargs):
+            return await self._io.call(
+                method, *args, priority=priority, label=name, **kwargs
+            )
+
+        io_call.__name__ = name
+        return io_call
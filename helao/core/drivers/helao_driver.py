@@ -14,6 +14,7 @@ Functions:
     HelaoDriver.stop(self) -> DriverResponse: General stop method, abort all active methods e.g. motion, I/O, compute.
     HelaoDriver.reset(self) -> DriverResponse: Reinitialize driver, force-close old connection if necessary.
     HelaoDriver.disconnect(self) -> DriverResponse: Release connection to resource.
+    HelaoDriver.aio: Awaitable wrappers of the driver methods, run on the driver's I/O thread.
     DriverPoller.get_data(self) -> DriverResponse: Method to be implemented by subclasses to return a dictionary of polled values.
 """
 
@@ -23,6 +24,7 @@ from enum import StrEnum
 from datetime import datetime
 from dataclasses import dataclass, field
 
+from helao.core.drivers.device_io import AsyncDriverProxy, DeviceIOExecutor, IOPriority
 from helao.helpers import helao_logging as logging
 
 LOGGER = logging.make_logger(__file__) if logging.LOGGER is None else logging.LOGGER
@@ -103,6 +105,10 @@ class HelaoDriver(ABC):
     Attributes:
         timestamp (datetime): The timestamp when the driver instance was created.
         config (dict): Configuration dictionary for the driver.
+        offload_io (bool): True if every caller of the driver, the executors and
+            endpoints of its server included, goes through `io` or `aio`. The
+            poller and /get_status then use `io` as well; otherwise they call
+            the driver on the event loop, so calls to the device stay serialized.
 
     Methods:
         connect() -> DriverResponse:
@@ -117,6 +123,10 @@ class HelaoDriver(ABC):
             Release connection to resource.
 
     Properties:
+        io (DeviceIOExecutor):
+            Dedicated thread running the blocking calls to the device.
+        aio (AsyncDriverProxy):
+            Awaitable wrappers of the driver methods, e.g. `await driver.aio.stop()`.
         _created_at (str):
             Instantiation timestamp formatted as "YYYY-MM-DD HH:MM:SS,mmm".
         _uptime (str):
@@ -125,6 +135,7 @@ class HelaoDriver(ABC):
 
     timestamp: datetime
     config: dict
+    offload_io: bool = False
 
     def __init__(self, config: dict = {}):
         """
@@ -140,6 +151,24 @@ class HelaoDriver(ABC):
         self.timestamp = datetime.now()
         self.config = config
 
+    @property
+    def io(self) -> DeviceIOExecutor:
+        """
+        Dedicated I/O thread of the driver, created on first use.
+
+        Blocking device calls made through it keep the event loop free and
+        stay serialized, with stop/estop ahead of queued commands and polls.
+        """
+        io = self.__dict__.get("_io")
+        if io is None:
+            io = self._io = DeviceIOExecutor(type(self).__name__)
+        return io
+
+    @property
+    def aio(self) -> AsyncDriverProxy:
+        """Awaitable wrappers of the driver methods, run on `io`."""
+        return AsyncDriverProxy(self, self.io)
+
     @property
     def _created_at(self):
         """
@@ -220,6 +249,9 @@ class DriverPoller:
 
     get_data() -> DriverResponse
         A placeholder method to retrieve data from the driver. Should be implemented by subclasses.
+
+    get_data runs on the driver's I/O thread at polling priority if the
+    driver sets `offload_io`, on the event loop otherwise.
     """
 
     driver: HelaoDriver
@@ -333,7 +365,16 @@ class DriverPoller:
         LOGGER.info("polling task has started")
         while True:
             if self.polling:
-                resp = self.get_data()
+                try:
+                    if self.driver.offload_io:
+                        resp = await self.driver.io.call(
+                            self.get_data, priority=IOPriority.poll, label="poll"
+                        )
+                    else:
+                        resp = self.get_data()
+                except Exception:
+                    LOGGER.error("polling error", exc_info=True)
+                    resp = DriverResponse()
                 if resp.data:
                     self.last_update = resp.timestamp
                     self.live_dict.update(resp.data)
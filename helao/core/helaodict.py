@@ -1,16 +1,21 @@
-__all__ = ["HelaoDict"]
+__all__ = ["HelaoDict", "json_dumps"]
 
 from datetime import datetime, date
 from uuid import UUID
 import types
 import numpy as np
+import orjson
 from pydantic import BaseModel
-from typing import Any
+from typing import Any, Callable, Dict
 from enum import Enum
 from pathlib import Path
-from copy import deepcopy
 import math
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 
 # https://stackoverflow.com/a/71389334
 def nan2None(obj):
@@ -23,74 +28,244 @@ def nan2None(obj):
     return obj
 
 
+# Serialization is a single pass over the object tree: each value is handled
+# by a function looked up by its exact type in _SERIALIZERS, which is filled
+# on first sight of a type by walking the isinstance chain of _resolve_serializer
+# once. Handlers take (value, nan_none); nan_none is True where nan2None would
+# have replaced NaN floats, i.e. along dict values and list items.
+
+
+def _ser_passthrough(val, nan_none):
+    return val
+
+
+def _ser_enum_name(val, nan_none):
+    return val.name
+
+
+def _ser_enum_value(val, nan_none):
+    return val.value
+
+
+def _ser_bool(val, nan_none):
+    return bool(val)
+
+
+def _ser_int(val, nan_none):
+    return int(val)
+
+
+def _ser_float(val, nan_none):
+    val = round(float(val), 9)
+    if nan_none and val != val:
+        return None
+    return val
+
+
+def _ser_str(val, nan_none):
+    if r"\\" in val:
+        return val.replace(r"\\", "/")
+    return val
+
+
+def _ser_path(val, nan_none):
+    return str(val.as_posix())
+
+
+def _ser_datetime(val, nan_none):
+    return val.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _ser_str_conv(val, nan_none):
+    return str(val)
+
+
+def _ser_list(val, nan_none):
+    return [_serialize(item, nan_none) for item in val]
+
+
+def _ser_tuple(val, nan_none):
+    # tuples have always been returned as generators
+    items = [_serialize(item, False) for item in val]
+    return (item for item in items)
+
+
+def _ser_set(val, nan_none):
+    return {_serialize(item, False) for item in val}
+
+
+def _ser_dict(val, nan_none):
+    return _serialize_mapping(val, nan_none)
+
+
+def _ser_as_dict(val, nan_none):
+    return val.as_dict()
+
+
+def _ser_model(val, nan_none):
+    return _serialize_mapping(val.model_dump(), nan_none)
+
+
+def _resolve_serializer(cls: type) -> Callable:
+    if issubclass(cls, Enum):
+        # need to be first to catch also str enums
+        return _ser_enum_name if issubclass(cls, str) else _ser_enum_value
+    if cls is type(None):
+        return _ser_passthrough
+    if issubclass(cls, np.bool_):
+        return _ser_bool
+    if issubclass(cls, bool):
+        return _ser_passthrough
+    if issubclass(cls, np.integer):
+        return _ser_int
+    if issubclass(cls, int):
+        return _ser_passthrough
+    if issubclass(cls, (np.floating, float)):
+        return _ser_float
+    if issubclass(cls, str):
+        return _ser_str
+    if issubclass(cls, Path):
+        return _ser_path
+    if issubclass(cls, datetime):
+        return _ser_datetime
+    if issubclass(cls, (UUID, date)):
+        return _ser_str_conv
+    if issubclass(cls, list):
+        return _ser_list
+    if issubclass(cls, tuple):
+        return _ser_tuple
+    if issubclass(cls, set):
+        return _ser_set
+    if issubclass(cls, dict):
+        return _ser_dict
+    if hasattr(cls, "as_dict"):
+        return _ser_as_dict
+    if issubclass(cls, BaseModel):
+        return _ser_model
+    return None
+
+
+_SERIALIZERS: Dict[type, Callable] = {}
+
+
+def _serializer(val: Any) -> Callable:
+    cls = type(val)
+    func = _SERIALIZERS.get(cls)
+    if func is None:
+        func = _resolve_serializer(cls)
+        if func is None:
+            raise ValueError(
+                f"Helao as_dict cannot serialize {val} of type {type(val)}"
+            )
+        _SERIALIZERS[cls] = func
+    return func
+
+
+def _serialize(val: Any, nan_none: bool = False):
+    cls = type(val)
+    # plain values are by far the most common, skip the table for them
+    if cls is str:
+        return val.replace(r"\\", "/") if r"\\" in val else val
+    if cls is int or cls is bool or val is None:
+        return val
+    return (_SERIALIZERS.get(cls) or _serializer(val))(val, nan_none)
+
+
+def _serialize_mapping(dict_in: dict, nan_none: bool = False) -> dict:
+    clean = {}
+    for k, v in dict_in.items():
+        cls = type(v)
+        if cls is types.FunctionType:
+            continue
+        if type(k) is str:
+            if k[:2] == "__" and isinstance(v, str):
+                continue
+            key = k.replace(r"\\", "/") if r"\\" in k else k
+        else:
+            # keys can also be UUID, datetime etc
+            key = _serialize_key(k)
+        if cls is str:
+            clean[key] = v.replace(r"\\", "/") if r"\\" in v else v
+        elif cls is int or cls is bool or v is None:
+            clean[key] = v
+        else:
+            clean[key] = (_SERIALIZERS.get(cls) or _serializer(v))(v, nan_none)
+    return clean
+
+
+def _serialize_key(key: Any):
+    # tuple keys (e.g. MachineModel.as_key()) stay tuples so they are hashable
+    if isinstance(key, tuple):
+        return tuple(_serialize_key(x) for x in key)
+    return _serialize(key)
+
+
+def _join_tuple_keys(obj):
+    """Replace tuple dict keys by "a@b" strings, which json can represent."""
+    if isinstance(obj, dict):
+        return {
+            "@".join(str(x) for x in k) if isinstance(k, tuple) else k: _join_tuple_keys(v)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, (list, tuple, set, types.GeneratorType)):
+        return [_join_tuple_keys(v) for v in obj]
+    return obj
+
+
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _json_default(obj: Any):
+    if isinstance(obj, (set, frozenset, tuple, types.GeneratorType)):
+        return list(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"cannot serialize {type(obj)} to json")
+
+
+def _orjson_dumps(obj: Any) -> bytes:
+    try:
+        return orjson.dumps(obj, default=_json_default, option=_JSON_OPTIONS)
+    except TypeError:
+        # e.g. tuple keys such as GlobalStatusModel.server_dict, rare enough
+        # to not check for on every call
+        return orjson.dumps(
+            _join_tuple_keys(obj), default=_json_default, option=_JSON_OPTIONS
+        )
+
+
+def json_dumps(obj: Any) -> str:
+    """
+    Serialize *obj* to a json string with orjson; numpy values, non-str dict
+    keys, sets and generators (as produced by HelaoDict.as_dict) are allowed.
+    """
+    return _orjson_dumps(obj).decode()
+
+
 class HelaoDict:
     """implements dict and serialization methods for helao - this cleans up things that are
     not serializable such as np arrays etc"""
 
     def _serialize_dict(self, dict_in: dict):
-        clean = {}
-        for k, v in dict_in.items():
-            if not isinstance(v, types.FunctionType) and not (
-                isinstance(v, str) and k.startswith("__")
-            ):
-                # keys can also be UUID, datetime etc
-                clean.update({self._serialize_item(val=k): self._serialize_item(val=v)})
-        return clean
+        return _serialize_mapping(dict_in)
 
     def _serialize_item(self, val: Any):
-        if isinstance(val, Enum):
-            # need to be first to catch also str enums
-            if isinstance(val, str):
-                return val.name
-            else:
-                return val.value
-        elif isinstance(val, type(None)):
-            return val
-        elif isinstance(val, np.bool_):
-            return bool(val)
-        elif isinstance(val, bool):
-            return val
-        elif isinstance(val, np.integer):
-            return int(val)
-        elif isinstance(val, int):
-            return val
-        elif isinstance(val, np.floating):
-            return round(float(val), 9)
-        elif isinstance(val, float):
-            return round(val, 9)
-        elif isinstance(val, str):
-            if r"\\" in val:
-                return val.replace(r"\\", "/")
-            else:
-                return val
-        elif isinstance(val, (Path)):
-            return str(val.as_posix())
-        elif isinstance(val, datetime):
-            strtime = val.strftime("%Y-%m-%d %H:%M:%S.%f")
-            return strtime
-        elif isinstance(val, (UUID, date)):
-            return str(val)
-        elif isinstance(val, list):
-            return [self._serialize_item(val=item) for item in val]
-        elif isinstance(val, tuple):
-            return (self._serialize_item(val=item) for item in val)
-        elif isinstance(val, set):
-            return {self._serialize_item(val=item) for item in val}
-        elif isinstance(val, dict):
-            return self._serialize_dict(dict_in=val)
-        elif hasattr(val, "as_dict"):
-            return val.as_dict()
-        elif isinstance(val, BaseModel):
-            return self._serialize_dict(dict_in=val.model_dump())
-        else:
-            tmp_str = f"Helao as_dict cannot serialize {val} of type {type(val)}"
-            raise ValueError(tmp_str)
+        return _serialize(val)
 
     def as_dict(self):
-        d = deepcopy(vars(self))
-        attr_only = self._serialize_dict(dict_in=d)
-        clean_nans = {k: nan2None(v) for k, v in attr_only.items()}
-        return clean_nans
+        # the serialized tree shares no mutable containers with the model,
+        # so no deepcopy of the attributes is needed
+        return _serialize_mapping(vars(self), nan_none=True)
+
+    def as_json_bytes(self) -> bytes:
+        """as_dict encoded as json bytes"""
+        return _orjson_dumps(self.as_dict())
+
+    def as_msgpack(self) -> bytes:
+        """as_dict encoded as msgpack bytes, requires the msgpack package"""
+        if msgpack is None:
+            raise ImportError("as_msgpack requires the msgpack package")
+        return msgpack.packb(self.as_dict(), default=_json_default, use_bin_type=True)
 
     def clean_dict(self, strip_private: bool = False):
         return self._cleanupdict(self.as_dict(), strip_private)
@@ -24,6 +24,10 @@ class HloHeaderModel(BaseModel, HelaoDict):
     # entries
     optional: Optional[Dict] = Field(default={})
     epoch_ns: Optional[int] = None
+    # None (json lines) or "binary" (packed records, see helpers/hlo_binary.py)
+    data_format: Optional[str] = None
+    # numpy dtype string per column heading for binary data sections
+    binary_dtypes: Optional[Dict[str, str]] = None
 
 
 class FileConnParams(BaseModel, HelaoDict):
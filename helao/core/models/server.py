@@ -3,9 +3,9 @@ __all__ = [
     "GlobalStatusModel",
 ]
 
-from typing import Dict, Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List, Set
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 from .orchstatus import OrchStatus, LoopStatus, LoopIntent
@@ -132,6 +132,19 @@ class GlobalStatusModel(BaseModel, HelaoDict):
     # counter for dispatched actions, keyed by experiment uuid
     counter_dispatched_actions: Dict[UUID, int] = Field(default={})
 
+    # index of this orch's active action uuids,
+    # keyed by (server key, endpoint name) and by server key
+    _endpoint_busy: Dict[Tuple, Set[UUID]] = PrivateAttr(default_factory=dict)
+    _server_busy: Dict[Tuple, Set[UUID]] = PrivateAttr(default_factory=dict)
+    # finished statuses already sorted per action uuid,
+    # and the uuids last reported as nonactive per (server key, endpoint name)
+    _sorted_nonactive: Dict[UUID, Set[HloStatus]] = PrivateAttr(default_factory=dict)
+    _endpoint_nonactive: Dict[Tuple, Set[UUID]] = PrivateAttr(default_factory=dict)
+    # nonactive actions keyed by each of their statuses
+    _substatus: Dict[HloStatus, Dict[UUID, Action]] = PrivateAttr(
+        default_factory=dict
+    )
+
     def as_json(self):
         json_dict = {
             k: vars(self)[k]
@@ -162,104 +175,171 @@ class GlobalStatusModel(BaseModel, HelaoDict):
         action_server: MachineModel,
     ) -> bool:
         """checks if action server is idle for this orch"""
-        free = True
-        if action_server.as_key() in self.server_dict:
-            actionservermodel = self.server_dict[action_server.as_key()]
-            for _, endpointmodel in actionservermodel.endpoints.items():
-                # loop through all of its active uuids
-                for _, statusmodel in endpointmodel.active_dict.items():
-                    if statusmodel.orchestrator == self.orchestrator:
-                        # found an acive action for this orch
-                        # endpoint is not yet free for this orch
-                        free = False
-                        break
-        return free
+        return not self._server_busy.get(action_server.as_key())
 
     def endpoint_free(self, action_server: MachineModel, endpoint_name: str) -> bool:
         """checks if an action server endpoint is available
         for this orch"""
-        free = True
-        # check if the actio server is registered for this orch
-        # if action_server.server_name in self.server_dict:
-        if action_server.as_key() in self.server_dict:
-            actionservermodel = self.server_dict[action_server.as_key()]
-            # check if the action server has the requested endpoint
-            if endpoint_name in actionservermodel.endpoints.keys():
-                endpointmodel = actionservermodel.endpoints[endpoint_name]
-                # loop through all of its active uuids
-                for _, statusmodel in endpointmodel.active_dict.items():
-                    if statusmodel.orchestrator == self.orchestrator:
-                        # found an acive action for this orch
-                        # endpoint is not yet free for this orch
-                        free = False
-                        break
-
-        return free
+        return not self._endpoint_busy.get((action_server.as_key(), endpoint_name))
+
+    def _set_busy(self, server_key: Tuple, endpoint_name: str, uuid: UUID):
+        self._endpoint_busy.setdefault((server_key, endpoint_name), set()).add(uuid)
+        self._server_busy.setdefault(server_key, set()).add(uuid)
+
+    def _set_free(self, server_key: Tuple, endpoint_name: str, uuid: UUID):
+        busy = self._endpoint_busy.get((server_key, endpoint_name))
+        if busy is not None:
+            busy.discard(uuid)
+        busy = self._server_busy.get(server_key)
+        if busy is not None:
+            busy.discard(uuid)
+
+    def _add_nonactive(self, hlostatus: HloStatus, uuid: UUID, statusmodel: Action):
+        if hlostatus not in self.nonactive_dict:
+            self.nonactive_dict[hlostatus] = {}
+        self.nonactive_dict[hlostatus].update({uuid: statusmodel})
+        for substatus in statusmodel.action_status:
+            self._substatus.setdefault(substatus, {})[uuid] = statusmodel
+
+    def _prune_substatus(self):
+        """drops actions no longer in nonactive_dict from the substatus index"""
+        nonactive = set()
+        for status_dict in self.nonactive_dict.values():
+            nonactive.update(status_dict)
+        for substatus in list(self._substatus):
+            status_dict = {
+                uuid: statusmodel
+                for uuid, statusmodel in self._substatus[substatus].items()
+                if uuid in nonactive
+            }
+            if status_dict:
+                self._substatus[substatus] = status_dict
+            else:
+                del self._substatus[substatus]
+
+    def _sort_endpoint(
+        self, server_key: Tuple, endpoint_name: str, endpointmodel: EndpointModel
+    ) -> list:
+        """sorts the actions of one endpoint into the orch specific dicts
+        and the busy index, skipping finished actions already sorted"""
+        recent_nonactive = []
+        endpointmodel.sort_status()
+        active_uuids = set()
+        for uuid, statusmodel in endpointmodel.active_dict.items():
+            if statusmodel.orchestrator == self.orchestrator:
+                self.active_dict.update({uuid: statusmodel})
+                self._set_busy(server_key, endpoint_name, uuid)
+                active_uuids.add(uuid)
+
+        # action servers clear their finished actions after each update,
+        # so uuids no longer reported need no longer be skipped
+        reported = set()
+        for status_dict in endpointmodel.nonactive_dict.values():
+            reported.update(status_dict)
+        endpoint_key = (server_key, endpoint_name)
+        for uuid in self._endpoint_nonactive.get(endpoint_key, set()) - reported:
+            self._sorted_nonactive.pop(uuid, None)
+        self._endpoint_nonactive[endpoint_key] = reported
+
+        for hlostatus, status_dict in endpointmodel.nonactive_dict.items():
+            for uuid, statusmodel in status_dict.items():
+                seen = self._sorted_nonactive.setdefault(uuid, set())
+                if hlostatus in seen:
+                    continue
+                seen.add(hlostatus)
+                if statusmodel.orchestrator == self.orchestrator:
+                    # check if its in active and remove it from there first
+                    if uuid in self.active_dict:
+                        del self.active_dict[uuid]
+                        recent_nonactive.append((uuid, hlostatus.name))
+                    self._set_free(server_key, endpoint_name, uuid)
+                    self._add_nonactive(hlostatus, uuid, statusmodel)
+
+        # actions the server no longer reports as active, e.g. dropped without
+        # finishing, are neither active nor keep the endpoint busy
+        busy = self._endpoint_busy.get(endpoint_key, set())
+        for uuid in busy - active_uuids:
+            self._set_free(server_key, endpoint_name, uuid)
+            self.active_dict.pop(uuid, None)
+        return recent_nonactive
 
     def _sort_status(self):
         """sorts actions from server_dict
-        into orch specific separate dicts"""
+        into orch specific separate dicts, rebuilding the busy index"""
         recent_nonactive = []
+        self._endpoint_busy = {}
+        self._server_busy = {}
+        self._sorted_nonactive = {}
+        self._endpoint_nonactive = {}
 
         # loop through all servers
         for action_server, actionservermodel in self.server_dict.items():
             # loop through all endpoints on this server
             for action_name, endpointmodel in actionservermodel.endpoints.items():
-                endpointmodel.sort_status()
-                # loop through all active uuids on this endpoint
-                for uuid, statusmodel in endpointmodel.active_dict.items():
-                    if statusmodel.orchestrator == self.orchestrator:
-                        self.active_dict.update({uuid: statusmodel})
-                # loop through all finished uuids on this endpoint
-                for hlostatus, status_dict in endpointmodel.nonactive_dict.items():
-                    for uuid, statusmodel in status_dict.items():
-                        if statusmodel.orchestrator == self.orchestrator:
-                            # check if its in active and remove it from there first
-                            if uuid in self.active_dict:
-                                del self.active_dict[uuid]
-                                recent_nonactive.append((uuid, hlostatus.name))
-                            if hlostatus not in self.nonactive_dict:
-                                self.nonactive_dict[hlostatus] = {}
-                            self.nonactive_dict[hlostatus].update({uuid: statusmodel})
+                recent_nonactive += self._sort_endpoint(
+                    action_server, action_name, endpointmodel
+                )
         return recent_nonactive
 
     def update_global_with_acts(self, actionservermodel: ActionServerModel):
-        if actionservermodel.action_server.as_key() not in self.server_dict:
+        server_key = actionservermodel.action_server.as_key()
+        if server_key not in self.server_dict:
             # add it for the first time
-            self.server_dict.update(
-                {actionservermodel.action_server.as_key(): actionservermodel}
-            )
+            self.server_dict.update({server_key: actionservermodel})
         else:
-            self.server_dict[actionservermodel.action_server.as_key()].endpoints.update(
-                actionservermodel.endpoints
+            self.server_dict[server_key].endpoints.update(actionservermodel.endpoints)
+        # sort only the endpoints in this update into active and finished
+        recent_nonactive = []
+        for action_name, endpointmodel in actionservermodel.endpoints.items():
+            recent_nonactive += self._sort_endpoint(
+                server_key, action_name, endpointmodel
             )
-        # sort it into active and finished
-        recent_nonactive = self._sort_status()
         return recent_nonactive
 
+    def register_dispatched(self, server_key: Tuple, action: Action):
+        """adds the action returned by a dispatch to the global and
+        endpoint status ahead of the action server's status update"""
+        endpointmodel = self.server_dict[server_key].endpoints[action.action_name]
+        uuid = action.action_uuid
+        if uuid in self._sorted_nonactive or any(
+            uuid in status_dict for status_dict in self.nonactive_dict.values()
+        ):
+            # the action finished before its dispatch response arrived
+            return
+        if HloStatus.active in action.action_status:
+            self.active_dict[uuid] = action
+            endpointmodel.active_dict[uuid] = action
+            self._set_busy(server_key, action.action_name, uuid)
+            return
+        # orch got back a nonactive result
+        for actstat in action.action_status:
+            if uuid in self.nonactive_dict.get(actstat, {}):
+                break  # already in nonactive_dict
+            self._add_nonactive(actstat, uuid, action)
+            endpointmodel.nonactive_dict.setdefault(actstat, {})[uuid] = action
+
     def find_hlostatus_in_finished(self, hlostatus: HloStatus) -> Dict[UUID, Action]:
         """returns a dict of uuids for actions which contain hlostatus"""
-        uuid_dict = {}
-
         if hlostatus in self.nonactive_dict:
             # all of them have this status
-            for uuid, statusmodel in self.nonactive_dict[hlostatus].items():
-                uuid_dict.update({uuid: statusmodel})
-        elif HloStatus.finished in self.nonactive_dict:
-            # can only be in finsihed, but need to look for substatus
-            for uuid, statusmodel in self.nonactive_dict[HloStatus.finished].items():
-                if hlostatus in statusmodel.action_status:
-                    uuid_dict.update({uuid: statusmodel})
-
-        return uuid_dict
+            return dict(self.nonactive_dict[hlostatus])
+        finished = self.nonactive_dict.get(HloStatus.finished)
+        if not finished:
+            return {}
+        # can only be in finished, but need to look for substatus
+        return {
+            uuid: statusmodel
+            for uuid, statusmodel in self._substatus.get(hlostatus, {}).items()
+            if uuid in finished
+        }
 
     def clear_in_finished(self, hlostatus: HloStatus):
         if hlostatus in self.nonactive_dict:
             self.nonactive_dict[hlostatus] = {}
         elif HloStatus.finished in self.nonactive_dict:
             # can only be in finsihed, but need to look for substatus
-            for key in self.nonactive_dict[HloStatus.finished].keys():
-                del self.nonactive_dict[HloStatus.finished][key]
+            self.nonactive_dict[HloStatus.finished].clear()
+        self._prune_substatus()
 
     def new_experiment(self, exp_uuid: UUID):
         self.counter_dispatched_actions[exp_uuid] = 0
@@ -285,6 +365,7 @@ class GlobalStatusModel(BaseModel, HelaoDict):
 
         # clear finished
         self.nonactive_dict = {}
+        self._substatus = {}
         if exp_uuid in self.counter_dispatched_actions:
             del self.counter_dispatched_actions[exp_uuid]
 
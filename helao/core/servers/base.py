@@ -7,13 +7,11 @@ from importlib.util import module_from_spec
 from importlib.machinery import SourceFileLoader
 
 import asyncio
-import json
 import os
 import sys
-import pickle
 import pathlib
 from socket import gethostname
-from time import time, time_ns, sleep, perf_counter_ns
+from time import time, time_ns, perf_counter_ns
 from typing import List, Dict, Optional, Union
 from uuid import UUID, uuid1
 from glob import glob
@@ -27,23 +25,29 @@ import aiodebug.log_slow_callbacks
 import aiofiles
 import colorama
 import numpy as np
-import pyzstd
 
 from fastapi import WebSocket
 from fastapi.dependencies.utils import get_flat_params
 
 from helao.helpers.server_api import HelaoFastAPI
-from helao.helpers.dispatcher import async_private_dispatcher, async_action_dispatcher
+from helao.helpers.dispatcher import (
+    async_private_dispatcher,
+    async_action_dispatcher,
+    configure_http_pool,
+    HTTP_POOL,
+)
 from helao.helpers.executor import Executor
 from helao.helpers.helao_dirs import helao_dirs
 from helao.helpers.multisubscriber_queue import MultisubscriberQueue
 from helao.helpers.print_message import print_message
 from helao.helpers import async_copy
 from helao.helpers.yml_tools import yml_dumps
-from helao.helpers.yml_finisher import move_dir
+from helao.helpers.yml_finisher import move_dir, resume_promotions
 from helao.helpers.premodels import Action, Experiment, Sequence
 from helao.core.models.action_start_condition import ActionStartCondition as ASC
 from helao.helpers.ws_publisher import WsPublisher
+from helao.helpers.ws_codec import WsFrameEncoder, select_ws_codec, encode_ws_frame
+from helao.helpers.ws_decimate import DecimationParams, DataDecimator
 from helao.helpers.set_time import set_time
 from helao.helpers.get_ntp_time import read_saved_offset
 from helao.core.models.hlostatus import HloStatus
@@ -75,11 +79,27 @@ from helao.core.models.file import (
 from helao.core.error import ErrorCodes
 from helao.helpers import config_loader
 from helao.helpers.hlo_postprocessor import HloPostProcessor
+from helao.helpers.postprocess_queue import PostProcessQueue
+from helao.helpers.hlo_writer import HloBatchWriter
+from helao.helpers.status_fanout import StatusFanout
+from helao.helpers.hlo_binary import (
+    HLO_BINARY_FORMAT,
+    HLO_BINARY_DEFAULT_DTYPE,
+    hlo_record_dtype,
+)
 from helao.helpers.dequedict import DequeDict
 
 LOGGER = logging.make_logger(__file__) if logging.LOGGER is None else logging.LOGGER
 CONFIG = config_loader.CONFIG
 
+# default bounds of subscriber queues (e.g. websocket clients), override with
+# the server config key 'queue_limits'; internal consumers subscribe unbounded
+DEFAULT_QUEUE_LIMITS = {
+    "status_q": {"maxsize": 1000, "policy": "conflate"},
+    "data_q": {"maxsize": 1000, "policy": "drop_oldest"},
+    "live_q": {"maxsize": 1000, "policy": "conflate"},
+}
+
 # ANSI color codes converted to the Windows versions
 # strip colors if stdout is redirected
 colorama.init(strip=not sys.stdout.isatty())
@@ -122,6 +142,7 @@ class Base:
         status_publisher (WsPublisher): Status WebSocket publisher.
         data_publisher (WsPublisher): Data WebSocket publisher.
         live_publisher (WsPublisher): Live WebSocket publisher.
+        ws_encoders (dict): Shared WsFrameEncoder per websocket message stream.
         ntp_server (str): NTP server.
         ntp_response (NTPResponse, optional): NTP response.
         ntp_offset (float, optional): NTP offset.
@@ -155,6 +176,9 @@ class Base:
         setup_and_contain_action(self, json_data_keys: List[str], action_abbr: str, file_type: str, hloheader: HloHeaderModel): Setup and contain an action.
         contain_action(self, activeparams: ActiveParams): Contain an action.
         get_active_info(self, action_uuid: UUID): Get active action information.
+        get_hlo_writer_stats(self): Get data writer statistics for active actions.
+        get_http_pool_stats(self): Get request latency statistics per target server.
+        get_queue_stats(self): Get lag and drop counters of queue subscribers.
         get_ntp_time(self): Get the current time from the NTP server.
         send_statuspackage(self, client_servkey: str, client_host: str, client_port: int, action_name: Optional[str] = None): Send a status package to a client.
         send_nbstatuspackage(self, client_servkey: str, client_host: str, client_port: int, actionmodel: Action): Send a non-blocking status package to a client.
@@ -163,6 +187,7 @@ class Base:
         ws_status(self, websocket: WebSocket): Handle WebSocket status subscriptions.
         ws_data(self, websocket: WebSocket): Handle WebSocket data subscriptions.
         ws_live(self, websocket: WebSocket): Handle WebSocket live subscriptions.
+        ws_data_decimated(self, websocket: WebSocket): Handle decimated WebSocket data subscriptions.
         live_buffer_task(self): Task to update the live buffer.
         put_lbuf(self, live_dict): Put data into the live buffer.
         put_lbuf_nowait(self, live_dict): Put data into the live buffer without waiting.
@@ -243,17 +268,35 @@ class Base:
         self.actionservermodel = ActionServerModel(action_server=self.server)
         self.actionservermodel.init_endpoints()
 
-        self.status_q = MultisubscriberQueue()
-        self.data_q = MultisubscriberQueue()
-        self.live_q = MultisubscriberQueue()
+        queue_limits = self.server_cfg.get("queue_limits", {})
+        self.status_q = MultisubscriberQueue(
+            conflate_key=lambda msg: msg.action_uuid,
+            **{**DEFAULT_QUEUE_LIMITS["status_q"], **queue_limits.get("status_q", {})},
+        )
+        self.data_q = MultisubscriberQueue(
+            conflate_key=lambda msg: msg.action_uuid,
+            **{**DEFAULT_QUEUE_LIMITS["data_q"], **queue_limits.get("data_q", {})},
+        )
+        self.live_q = MultisubscriberQueue(
+            conflate_key=lambda msg: tuple(msg),
+            **{**DEFAULT_QUEUE_LIMITS["live_q"], **queue_limits.get("live_q", {})},
+        )
         self.live_buffer = {}
         self.status_clients = set()
+        # per-client sender tasks for log_status_task
+        self.status_fanout = StatusFanout(self.send_status_payload)
         # only executors register into local_action_task_queue, default executors ignore queue
         self.local_action_task_queue = []
 
         self.status_publisher = WsPublisher(self.status_q)
         self.data_publisher = WsPublisher(self.data_q)
         self.live_publisher = WsPublisher(self.live_q)
+        # frames are encoded once per message and shared by all ws subscribers
+        self.ws_encoders = {
+            "status": WsFrameEncoder(lambda msg: msg.as_dict()),
+            "data": WsFrameEncoder(lambda msg: msg.as_dict()),
+            "live_buffer": WsFrameEncoder(),
+        }
 
         self.ntp_offset: float = 0.0  # add to system time for correction
         self.ntp_last_sync = None
@@ -264,10 +307,23 @@ class Base:
 
         self.hlo_postprocessors: List[HloPostProcessor] = []
         self.hlo_postprocess_libs = self.server_cfg.get("hlo_postprocess_libs", [])
+        self.hlo_postprocess_paths: List[str] = []
 
         self.import_postprocessors(
-            self.hlo_postprocess_libs, self.hlo_postprocessors, HloPostProcessor
+            self.hlo_postprocess_libs,
+            self.hlo_postprocessors,
+            HloPostProcessor,
+            self.hlo_postprocess_paths,
         )
+        # background post-processing: workers, max_retries, retry_delay, background
+        self.hlo_postprocess_params = self.server_cfg.get("hlo_postprocess", {})
+        self.postprocess_queue: Optional[PostProcessQueue] = None
+        # journal of RUNS_ACTIVE directory moves, see helpers.dir_promotion
+        self.promotion_journal = None
+        # keyword arguments for the per-active HloBatchWriter
+        self.hlo_writer_params = self.server_cfg.get("hlo_writer", {})
+        # connection limits and retry backoff of the shared keep-alive HTTP pool
+        configure_http_pool(**self.server_cfg.get("http_pool", {}))
 
         self.ntp_last_sync, self.ntp_offset = read_saved_offset(
             os.path.join(self.helaodirs.log_root, "ntpLastSync.txt")
@@ -334,6 +390,22 @@ class Base:
         self.bufferer = self.aloop.create_task(self.live_buffer_task())
 
         self.status_logger = self.aloop.create_task(self.log_status_task())
+        # finish directory moves interrupted by a crash or shutdown
+        self.promotion_resumer = self.aloop.create_task(resume_promotions(self))
+        if self.hlo_postprocess_paths and self.hlo_postprocess_params.get(
+            "background", True
+        ):
+            self.postprocess_queue = PostProcessQueue(
+                db_path=os.path.join(
+                    self.helaodirs.states_root,
+                    f"{self.server.server_name}_postprocess.db",
+                ),
+                on_done=self.finish_postprocessed,
+                max_workers=self.hlo_postprocess_params.get("workers", 1),
+                max_retries=self.hlo_postprocess_params.get("max_retries", 2),
+                retry_delay=self.hlo_postprocess_params.get("retry_delay", 30.0),
+            )
+            self.postprocess_queue.start()
         if self.server_cfg.get("regular_update", False):
             regular_delay = self.server_cfg.get("regular_update_delay", 10)
             self.regular_updater = self.aloop.create_task(
@@ -669,6 +741,89 @@ class Base:
             LOGGER.error(f"Specified action uuid {str(action_uuid)} was not found.")
             return None
 
+    def get_hlo_writer_stats(self):
+        """
+        Collect the HloBatchWriter statistics of all active actions.
+
+        Returns:
+            dict: A dictionary mapping active action UUIDs (str) to writer statistics.
+        """
+        return {
+            str(active_uuid): active.hlo_writer.stats()
+            for active_uuid, active in self.actives.items()
+        }
+
+    def get_queue_stats(self):
+        """
+        Collect lag and drop counters of the subscribers of all message queues.
+
+        Returns:
+            dict: A dictionary mapping queue names to lists of subscriber statistics.
+        """
+        return {
+            "status_q": self.status_q.stats(),
+            "data_q": self.data_q.stats(),
+            "live_q": self.live_q.stats(),
+        }
+
+    def get_postprocess_jobs(self, status: Optional[str] = None, limit: int = 50):
+        """
+        Collect the job counts and most recent jobs of the post-processing queue.
+
+        Args:
+            status (str, optional): Only list jobs with this status.
+            limit (int): Maximum number of jobs to list. Defaults to 50.
+
+        Returns:
+            dict: Queue statistics and job list, empty if post-processing
+                does not run in the background.
+        """
+        if self.postprocess_queue is None:
+            return {}
+        return {
+            "stats": self.postprocess_queue.stats(),
+            "jobs": self.postprocess_queue.jobs(status=status, limit=limit),
+        }
+
+    async def finish_postprocessed(
+        self,
+        action: Action,
+        files: Optional[List[FileInfo]],
+        error: Optional[str] = None,
+    ):
+        """
+        Complete an action whose post-processing ran in the background.
+
+        Replaces the action file list with the processed one, rewrites the act
+        yml and moves the action directory, which Active.finish deferred.
+
+        Args:
+            action (Action): The finished action.
+            files (list, optional): Processed file list, None if the job failed.
+            error (str, optional): Error of a failed job.
+        """
+        if files is not None:
+            action.files = files
+            if action.action_uuid in self.history:
+                self.history[action.action_uuid].files = files
+        else:
+            LOGGER.warning(
+                f"post-processing of action {action.action_uuid} failed ({error}), "
+                "keeping unprocessed files"
+            )
+        await self.write_act(action)
+        if not action.manual_action:
+            await move_dir(action, base=self)
+
+    def get_http_pool_stats(self):
+        """
+        Collect request counts and latency histograms of the shared HTTP pool.
+
+        Returns:
+            dict: A dictionary mapping 'host:port' targets to request statistics.
+        """
+        return HTTP_POOL.stats()
+
     async def send_statuspackage(
         self,
         client_servkey: str,
@@ -685,22 +840,41 @@ class Base:
             client_port (int): The port number of the client.
             action_name (str, optional): The name of the action to include in the status package. Defaults to None.
 
+        Returns:
+            tuple: A tuple containing the response and error code from the private dispatcher.
+        """
+        return await self.send_status_payload(
+            (client_servkey, client_host, client_port),
+            self.actionservermodel.get_fastapi_json(action_name=action_name),
+            regular_task=action_name is None,
+        )
+
+    async def send_status_payload(
+        self,
+        client_key: tuple,
+        actionservermodel_json: dict,
+        regular_task: bool = False,
+    ):
+        """
+        Sends a serialized ActionServerModel to a status client.
+
+        Args:
+            client_key (tuple): The (servkey, host, port) of the client.
+            actionservermodel_json (dict): Output of ActionServerModel.get_fastapi_json.
+            regular_task (bool, optional): True if the payload holds all endpoints. Defaults to False.
+
         Returns:
             tuple: A tuple containing the response and error code from the private dispatcher.
         """
         # needs private dispatcher
-        json_dict = {
-            "actionservermodel": self.actionservermodel.get_fastapi_json(
-                action_name=action_name,
-            ),
-        }
+        client_servkey, client_host, client_port = client_key
         response, error_code = await async_private_dispatcher(
             server_key=client_servkey,
             host=client_host,
             port=client_port,
             private_action="update_status",
-            params_dict={"regular_task": "true" if action_name is None else "false"},
-            json_dict=json_dict,
+            params_dict={"regular_task": "true" if regular_task else "false"},
+            json_dict={"actionservermodel": actionservermodel_json},
         )
         return response, error_code
 
@@ -828,6 +1002,7 @@ class Base:
         )
         if combo_key in self.status_clients:
             self.status_clients.remove(combo_key)
+            self.status_fanout.remove(combo_key)
             LOGGER.info(f"Client {combo_key} will no longer receive status updates.")
         else:
             LOGGER.info(f"Client {combo_key} is not subscribed.")
@@ -837,22 +1012,32 @@ class Base:
         websocket: WebSocket,
         queue: MultisubscriberQueue,
         label: str,
-        use_as_dict: bool = True,
     ) -> None:
         """Accept *websocket*, subscribe to *queue*, and stream compressed messages.
 
         Shared implementation for :meth:`ws_status`, :meth:`ws_data`,
-        and :meth:`ws_live`.  When *use_as_dict* is ``True`` each message is
-        serialised via ``.as_dict()`` before pickling; otherwise the message
-        object is pickled directly.
+        and :meth:`ws_live`.  Frames are taken from ``self.ws_encoders[label]``,
+        so each message is serialized once per codec for all subscribers. The
+        client selects the codec with the ``codec`` query parameter (see
+        helpers/ws_codec.py), pickle is used if it is not given.
         """
         LOGGER.info(f"got new {label} subscriber")
         await websocket.accept()
-        sub = queue.subscribe()
+        codec = select_ws_codec(websocket.query_params.get("codec", None))
+        if codec is None:
+            LOGGER.error(
+                f"{label} websocket client requested unavailable codec "
+                f"'{websocket.query_params.get('codec')}'"
+            )
+            await websocket.close(code=1003, reason="unsupported codec")
+            return
+        encoder = self.ws_encoders[label]
+        sub = queue.subscribe(
+            label=f"ws_{label} {websocket.client[0]}:{websocket.client[1]}"
+        )
         try:
             async for msg in sub:
-                payload = msg.as_dict() if use_as_dict else msg
-                await websocket.send_bytes(pyzstd.compress(pickle.dumps(payload)))
+                await websocket.send_bytes(encoder.frame(msg, codec))
         except Exception as e:
             tb = "".join(traceback.format_exception(type(e), e, e.__traceback__))
             LOGGER.error(
@@ -873,7 +1058,68 @@ class Base:
 
     async def ws_live(self, websocket: WebSocket) -> None:
         """WebSocket endpoint for compressed live-buffer messages."""
-        await self._ws_relay(websocket, self.live_q, "live_buffer", use_as_dict=False)
+        await self._ws_relay(websocket, self.live_q, "live_buffer")
+
+    async def ws_data_decimated(self, websocket: WebSocket) -> None:
+        """WebSocket endpoint for data messages decimated per client.
+
+        Data packages are buffered per action and sent every ``interval``
+        seconds, reduced to the client's points-per-second budget and
+        columns, see helpers/ws_decimate.py for the query parameters. Frames
+        are encoded per client since no two clients share a decimation.
+        """
+        LOGGER.info("got new decimated data subscriber")
+        await websocket.accept()
+        codec = select_ws_codec(websocket.query_params.get("codec", None))
+        try:
+            params = DecimationParams.from_query(websocket.query_params)
+        except ValueError as e:
+            LOGGER.error(f"decimated data websocket client sent invalid parameters: {e}")
+            await websocket.close(code=1003, reason=str(e))
+            return
+        if codec is None:
+            await websocket.close(code=1003, reason="unsupported codec")
+            return
+        decimator = DataDecimator(params)
+        client = f"{websocket.client[0]}:{websocket.client[1]}"
+        sendq = asyncio.Queue()
+
+        async def read_data():
+            async for msg in self.data_q.subscribe(label=f"ws_data_decimated {client}"):
+                for pkg in decimator.add(msg):
+                    sendq.put_nowait(pkg)
+            sendq.put_nowait(StopAsyncIteration)
+
+        def frame(pkg):
+            # pickle keeps the DataPackageModel, like ws_data on action servers
+            return encode_ws_frame(
+                pkg if codec == "pickle" or not hasattr(pkg, "as_dict") else pkg.as_dict(),
+                codec,
+            )
+
+        reader = asyncio.create_task(read_data())
+        next_flush = time() + params.interval
+        try:
+            while True:
+                try:
+                    pkg = await asyncio.wait_for(
+                        sendq.get(), max(0.0, next_flush - time())
+                    )
+                except asyncio.TimeoutError:
+                    for pkg in decimator.flush():
+                        await websocket.send_bytes(frame(pkg))
+                    next_flush = time() + params.interval
+                    continue
+                if pkg is StopAsyncIteration:
+                    break
+                await websocket.send_bytes(frame(pkg))
+        except Exception as e:
+            LOGGER.info(
+                f"Decimated data websocket client {client} disconnected "
+                f"({repr(e)}), {decimator.stats()}"
+            )
+        finally:
+            reader.cancel()
 
     async def live_buffer_task(self):
         """
@@ -888,7 +1134,7 @@ class Base:
             None
         """
         LOGGER.info(f"{self.server.server_name} live buffer task created.")
-        async for live_msg in self.live_q.subscribe():
+        async for live_msg in self.live_q.subscribe(maxsize=0, label="live_buffer_task"):
             self.live_buffer.update(live_msg)
 
     @staticmethod
@@ -967,20 +1213,24 @@ class Base:
         Asynchronous task to log and send status updates to clients.
 
         This task subscribes to a status queue and processes incoming status messages.
-        It updates the internal action server model with the new status, sends the status
-        to subscribed clients, and handles retries in case of failures.
+        It updates the internal action server model with the new status and hands a
+        snapshot of the changed endpoint to the status fan-out, which delivers (and
+        retries) it per client in the background, see helpers/status_fanout.py.
 
         Args:
-            retry_limit (int): The number of retry attempts for sending status updates to clients. Default is 5.
+            retry_limit (int): The number of delivery attempts per status update and client. Default is 5.
 
         Raises:
             Exception: If an error occurs during the execution of the task, it logs the error and traceback.
         """
         LOGGER.info(f"{self.server.server_name} status log task created.")
+        self.status_fanout.retry_limit = retry_limit
 
         try:
             # get the new Action (status) from the queue
-            async for status_msg in self.status_q.subscribe():
+            async for status_msg in self.status_q.subscribe(
+                maxsize=0, label="log_status_task"
+            ):
                 # add it to the correct "EndpointModel"
                 # in the "ActionServerModel"
                 if status_msg.action_name not in self.actionservermodel.endpoints:
@@ -1003,37 +1253,21 @@ class Base:
                         self.orch_key, self.orch_host, self.orch_port
                     )
 
-                for combo_key in self.status_clients.copy():
-                    client_servkey, client_host, client_port = combo_key
-                    LOGGER.debug(
-                        f"log_status_task trying to send status to {client_servkey}."
-                    )
-                    success = False
-                    for _ in range(retry_limit):
-                        response, error_code = await self.send_statuspackage(
-                            action_name=status_msg.action_name,
-                            client_servkey=client_servkey,
-                            client_host=client_host,
-                            client_port=client_port,
-                        )
-
-                        if response and error_code == ErrorCodes.none:
-                            success = True
-                            break
-
-                    if success:
-                        LOGGER.info(f"Pushed status message to {client_servkey}.")
-                    else:
-                        LOGGER.error(
-                            f"Failed to push status message to {client_servkey} after {retry_limit} attempts."
-                        )
-                    sleep(0.3)
+                # snapshot the endpoint before finished statuses are cleared,
+                # delivery to each client happens in its own sender task
+                self.status_fanout.publish(
+                    self.status_clients,
+                    status_msg.action_name,
+                    self.actionservermodel.get_fastapi_json(
+                        action_name=status_msg.action_name
+                    ),
+                )
                 # now delete the errored and finsihed statuses after
-                # all are send to the subscribers
+                # the snapshot was queued for the subscribers
                 self.actionservermodel.endpoints[
                     status_msg.action_name
                 ].clear_finished()
-                LOGGER.debug("all log_status_task messages sent.")
+                LOGGER.debug("all log_status_task messages queued.")
 
                 active_nonqueued = {
                     endpoint: [
@@ -1130,12 +1364,18 @@ class Base:
         2. Detaches all subscribers by calling `detach_subscribers`.
         3. Cancels the `status_logger` task.
         4. Cancels the `ntp_syncer` task.
+        5. Stops the status sender tasks and closes the pooled HTTP sessions.
+        6. Stops the post-processing queue, pending jobs resume on restart.
 
         Returns:
             None
         """
         await self.detach_subscribers()
         self.status_logger.cancel()
+        if self.postprocess_queue is not None:
+            await self.postprocess_queue.shutdown()
+        await self.status_fanout.close()
+        await HTTP_POOL.close()
 
     async def write_act(self, action: Action):
         """
@@ -1405,7 +1645,7 @@ class Base:
         for exec_key in matching_execs:
             self.stop_executor(exec_key)
 
-    def import_postprocessors(self, name_list, class_list, proc_class):
+    def import_postprocessors(self, name_list, class_list, proc_class, path_list=None):
         proc_class_type = (
             proc_class.__name__.split("Post")[0].split("Processor")[0].lower()
         )
@@ -1417,6 +1657,8 @@ class Base:
                 ppclass = SourceFileLoader(mod_name, pplib).load_module().PostProcess
                 if issubclass(ppclass, proc_class):
                     class_list.append(ppclass)
+                    if path_list is not None:
+                        path_list.append(os.path.abspath(pplib))
             else:
                 script_path = None
                 LOGGER.info(f"Looking for {pplib} post-processor in deployments")
@@ -1445,6 +1687,8 @@ class Base:
                     ppclass = proc_mod.PostProcess
                     if issubclass(ppclass, proc_class):
                         class_list.append(ppclass)
+                        if path_list is not None:
+                            path_list.append(os.path.abspath(script_path))
                 else:
                     LOGGER.info(
                         f"Post-processor {pplib} was not found in processors module"
@@ -1629,6 +1873,8 @@ class Active:
         self.listen_uuids = []
         self.num_data_queued = 0
         self.num_data_written = 0
+        # batches data lines per file_conn_key before writing to disk
+        self.hlo_writer = HloBatchWriter(**self.base.hlo_writer_params)
 
         # this updates timestamp and uuid
         # only if they are None
@@ -2028,6 +2274,9 @@ class Active:
         """
         Asynchronously writes a string to a live data file connection.
 
+        The string is buffered by `self.hlo_writer` and written to disk together
+        with other lines for the same file connection.
+
         Args:
             output_str (str): The string to be written to the file. A newline character
                               will be appended if it is not already present.
@@ -2039,9 +2288,7 @@ class Active:
         """
         if file_conn_key in self.file_conn_dict:
             if self.file_conn_dict[file_conn_key].file:
-                if not output_str.endswith("\n"):
-                    output_str += "\n"
-                await self.file_conn_dict[file_conn_key].file.write(output_str)
+                await self.hlo_writer.write(file_conn_key, output_str)
 
     async def enqueue_data_dflt(self, datadict: dict):
         """
@@ -2181,6 +2428,18 @@ class Active:
         self.file_conn_dict[file_conn_key].params.hloheader.column_headings = (
             self.file_conn_dict[file_conn_key].params.json_data_keys
         )
+        # binary data sections list the dtype of every column in the header
+        hloheader = self.file_conn_dict[file_conn_key].params.hloheader
+        record_dtype = None
+        if hloheader.data_format == HLO_BINARY_FORMAT:
+            binary_dtypes = hloheader.binary_dtypes or {}
+            hloheader.binary_dtypes = {
+                k: binary_dtypes.get(k, HLO_BINARY_DEFAULT_DTYPE)
+                for k in hloheader.column_headings
+            }
+            record_dtype = hlo_record_dtype(
+                hloheader.column_headings, hloheader.binary_dtypes
+            )
         # epoch_ns should have been set already
         # else we need to add it now because the header is now written
         # before data can be added to the file
@@ -2215,14 +2474,19 @@ class Active:
         LOGGER.info(f"writing data to: {output_file}")
         # create output file and set connection
         self.file_conn_dict[file_conn_key].file = await aiofiles.open(
-            output_file, mode="a+"
+            output_file, mode="a+" if record_dtype is None else "ab+"
         )
 
         if header:
             LOGGER.debug("adding header to new file")
             if not header.endswith("\n"):
                 header += "\n"
-            await self.file_conn_dict[file_conn_key].file.write(header)
+            await self.file_conn_dict[file_conn_key].file.write(
+                header if record_dtype is None else header.encode("utf8")
+            )
+        self.hlo_writer.register(
+            file_conn_key, self.file_conn_dict[file_conn_key].file, record_dtype
+        )
 
     async def log_data_task(self):
         """
@@ -2257,7 +2521,10 @@ class Active:
         #     info=True,
         # )
 
-        dq_sub = self.base.data_q.subscribe()
+        # lossless subscription, the data logger must see every message
+        dq_sub = self.base.data_q.subscribe(
+            maxsize=0, label=f"log_data_task {self.action.action_uuid}"
+        )
 
         try:
             async for data_msg in dq_sub:
@@ -2331,13 +2598,10 @@ class Active:
                             )
 
                         if isinstance(sample_data, dict):
-                            try:
-                                output_str = json.dumps(sample_data)
-                            except TypeError:
-                                LOGGER.error("Data is not json serializable.")
-                                output_str = "Error: data was not serializable."
                             await self.write_live_data(
-                                output_str=output_str,
+                                output_str=self.hlo_writer.encode(
+                                    sample_data, file_conn_key
+                                ),
                                 file_conn_key=file_conn_key,
                             )
                         else:
@@ -2687,7 +2951,7 @@ class Active:
     async def substitute(self):
         for filekey in self.file_conn_dict:
             if self.file_conn_dict[filekey].file:
-                await self.file_conn_dict[filekey].file.close()
+                await self.hlo_writer.close(filekey)
 
     async def finish(
         self,
@@ -2849,9 +3113,10 @@ class Active:
 
                 # all actions are finished
                 LOGGER.debug("finishing data logging.")
+                LOGGER.info(f"hlo writer stats: {self.hlo_writer.stats()}")
                 for filekey in self.file_conn_dict:
                     if self.file_conn_dict[filekey].file:
-                        await self.file_conn_dict[filekey].file.close()
+                        await self.hlo_writer.close(filekey)
                 self.file_conn_dict = {}
 
                 # finish the data writer
@@ -2862,9 +3127,19 @@ class Active:
             save_root = str(self.base.helaodirs.save_root)
             if self.action.manual_action:
                 save_root = save_root.replace("RUNS_ACTIVE", "RUNS_DIAG")
+            postprocess_job = None
             try:
+                # queue post-processing in the background, the action directory
+                # is moved once the job completes (Base.finish_postprocessed)
+                if self.base.postprocess_queue is not None:
+                    postprocess_job = self.base.postprocess_queue.submit(
+                        self.action, self.base.hlo_postprocess_paths, save_root
+                    )
+                    LOGGER.info(
+                        f"Queued HLO post-processing job {postprocess_job} for action {self.action.action_uuid}"
+                    )
                 # call custom hlo post-processor if it exists
-                if self.base.hlo_postprocessors:
+                elif self.base.hlo_postprocessors:
                     for hpp, libname in zip(
                         self.base.hlo_postprocessors, self.base.hlo_postprocess_libs
                     ):
@@ -2908,7 +3183,11 @@ class Active:
                         f"Failed to send last status for action {action.action_uuid}",
                         exc_info=True,
                     )
-                if not self.action.manual_action:
+                if postprocess_job is not None and action is self.action:
+                    LOGGER.info(
+                        f"Action {action.action_uuid} is post-processing, deferring directory move."
+                    )
+                elif not self.action.manual_action:
                     try:
                         self.base.aloop.create_task(move_dir(action, base=self.base))
                         # pop from local action task queue
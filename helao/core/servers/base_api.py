@@ -6,9 +6,11 @@ import faulthandler
 from copy import copy
 from socket import gethostname
 from collections import namedtuple
+from typing import Optional
 from typing_extensions import Annotated
 
 from helao.core.drivers.helao_driver import HelaoDriver, DriverPoller, DriverStatus
+from helao.core.drivers.device_io import DeviceIOExecutor
 from helao.helpers.eval import eval_val
 from helao.helpers.gen_uuid import gen_uuid
 from helao.core.servers.base import Base
@@ -262,6 +264,9 @@ class BaseAPI(HelaoFastAPI):
         get_status():
             Endpoint to retrieve the server status.
 
+        get_driver_io_stats():
+            Endpoint to retrieve driver I/O thread queue depth and call latencies.
+
         attach_client(client_servkey: str, client_host: str, client_port: int):
             Endpoint to attach a client to the server.
 
@@ -274,6 +279,18 @@ class BaseAPI(HelaoFastAPI):
         get_lbuf():
             Endpoint to retrieve the live buffer.
 
+        get_hlo_writer_stats():
+            Endpoint to retrieve .hlo data writer statistics.
+
+        get_http_pool_stats():
+            Endpoint to retrieve pooled HTTP client latency statistics.
+
+        get_queue_stats():
+            Endpoint to retrieve queue subscriber lag and drop counters.
+
+        get_postprocess_jobs():
+            Endpoint to retrieve background post-processing job statuses.
+
         list_executors():
             Endpoint to list all executors.
 
@@ -432,6 +449,18 @@ class BaseAPI(HelaoFastAPI):
             except ConnectionClosedOK:
                 self.base.data_publisher.disconnect(websocket)
 
+        @self.websocket("/ws_data_decimated")
+        async def websocket_data_decimated(websocket: WebSocket):
+            """
+            Handles a websocket connection for data decimated to a points-per-second
+            budget and column selection given as query parameters, see
+            helpers/ws_decimate.py.
+
+            Args:
+                websocket (WebSocket): The websocket connection to be managed.
+            """
+            await self.base.ws_data_decimated(websocket)
+
         @self.websocket("/ws_live")
         async def websocket_live(websocket: WebSocket):
             """
@@ -467,7 +496,7 @@ class BaseAPI(HelaoFastAPI):
             return self.base.world_cfg
 
         @self.post("/get_status", tags=["private"])
-        def get_status():
+        async def get_status():
             """
             Retrieve the current status of the action server and its driver.
 
@@ -486,11 +515,29 @@ class BaseAPI(HelaoFastAPI):
                 driver_status = DriverStatus.ok
             # if no poller, but HelaoDriver, use get_status method
             elif isinstance(self.driver, HelaoDriver):
-                resp = self.driver.get_status()
+                if self.driver.offload_io:
+                    resp = await self.driver.aio.get_status()
+                else:
+                    resp = self.driver.get_status()
                 driver_status = resp.status
             status_dict["_driver_status"] = driver_status
             return status_dict
 
+        @self.post("/get_driver_io_stats", tags=["private"])
+        def get_driver_io_stats():
+            """
+            Retrieve queue depth and per-call latency histograms of the
+            dedicated I/O threads of the server's drivers.
+
+            Returns:
+                dict: DeviceIOExecutor stats by driver class name.
+            """
+            return {
+                type(driver).__name__: driver.io.stats()
+                for driver in self.drivers
+                if isinstance(getattr(driver, "io", None), DeviceIOExecutor)
+            }
+
         @self.post("/attach_client", tags=["private"])
         async def attach_client(
             client_servkey: str, client_host: str, client_port: int
@@ -556,6 +603,55 @@ class BaseAPI(HelaoFastAPI):
             """
             return self.base.live_buffer
 
+        @self.post("/get_hlo_writer_stats", tags=["private"])
+        def get_hlo_writer_stats():
+            """
+            Retrieve batching, back-pressure and flush-latency statistics of the
+            .hlo data writers of all active actions.
+
+            Returns:
+                dict: A dictionary mapping active action UUIDs to writer statistics.
+            """
+            return self.base.get_hlo_writer_stats()
+
+        @self.post("/get_http_pool_stats", tags=["private"])
+        def get_http_pool_stats():
+            """
+            Retrieve request counts, retries and latency histograms of the
+            pooled HTTP client, per target server.
+
+            Returns:
+                dict: A dictionary mapping 'host:port' targets to request statistics.
+            """
+            return self.base.get_http_pool_stats()
+
+        @self.post("/get_queue_stats", tags=["private"])
+        def get_queue_stats():
+            """
+            Retrieve per-subscriber lag (queued messages), overflow policy and
+            drop/conflation counters of the status, data and live queues.
+
+            Returns:
+                dict: A dictionary mapping queue names to lists of subscriber statistics.
+            """
+            return self.base.get_queue_stats()
+
+        @self.post("/get_postprocess_jobs", tags=["private"])
+        def get_postprocess_jobs(status: Optional[str] = None, limit: int = 50):
+            """
+            Retrieve job counts and the most recent jobs of the background
+            HLO post-processing queue.
+
+            Args:
+                status (str, optional): Only list jobs with this status
+                    (queued, running, done or failed).
+                limit (int): Maximum number of jobs to list. Defaults to 50.
+
+            Returns:
+                dict: Queue statistics and job list.
+            """
+            return self.base.get_postprocess_jobs(status=status, limit=limit)
+
         @self.post("/list_executors", tags=["private"])
         def list_executors():
             """
@@ -628,6 +724,10 @@ class BaseAPI(HelaoFastAPI):
             else:
                 LOGGER.info("driver has NO async_shutdown function")
                 retvals["async_shutdown"] = None
+            for driver in self.drivers:
+                io = getattr(driver, "io", None)
+                if isinstance(io, DeviceIOExecutor):
+                    io.shutdown()
 
             if self.root_dir is not None:
                 faulthandler.disable()
@@ -1942,15 +1942,6 @@ cb_obj.stylesheets = [`.bk-input {{ color: ${{new_color}} !important; }}`]
                 partial(self.update_pm_plot, plot_mpmap, pmdata)
             )
 
-    def xy_to_sample(self, xy, pmapxy):
-        """get point from pmap closest to xy"""
-        if len(pmapxy):
-            diff = pmapxy - xy
-            sumdiff = (diff**2).sum(axis=1)
-            return int(np.argmin(sumdiff))
-        else:
-            return None
-
     def get_samples(self, X, Y, sender):
         """get list of samples row number closest to xy"""
         # X and Y are vectors
@@ -1962,13 +1953,10 @@ cb_obj.stylesheets = [`.bk-input {{ color: ${{new_color}} !important; }}`]
         input_plate_id = self.find_input(param_input, "solid_plate_id")
 
         if input_plate_id is not None:
-            # pmdata = json.loads(self.dataAPI.get_platemap_plateid(input_plate_id.value))
-            pmdata = self.dataAPI.get_platemap_plateid(int(input_plate_id.value))
-
-            xyarr = np.array((X, Y)).T
-            pmxy = np.array([[col["x"], col["y"]] for col in pmdata])
-            samples = list(np.apply_along_axis(self.xy_to_sample, 1, xyarr, pmxy))
-            return samples
+            pm_index = self.dataAPI.get_platemap_index(int(input_plate_id.value))
+            if pm_index is None:
+                return [None for _ in X]
+            return pm_index.nearest_list(X, Y)
         else:
             return [None]
 
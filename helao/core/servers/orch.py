@@ -3,6 +3,7 @@ __all__ = ["Orch"]
 import pickle
 import os
 from datetime import datetime
+from pathlib import Path
 from helao.helpers import helao_logging as logging
 
 import asyncio
@@ -40,9 +41,17 @@ from helao.helpers.dispatcher import (
     async_private_dispatcher,
     async_action_dispatcher,
     endpoints_available,
+    HTTP_POOL,
 )
 from helao.helpers.multisubscriber_queue import MultisubscriberQueue
-from helao.helpers.yml_finisher import move_dir
+from helao.helpers.status_waiters import (
+    StatusWaiters,
+    ANY,
+    endpoint_wait_key,
+    server_wait_key,
+    action_wait_key,
+)
+from helao.helpers.yml_finisher import move_dir, resume_promotions
 from helao.helpers.premodels import Sequence, Experiment, Action
 from helao.core.servers.base import Base, Active
 from helao.helpers.gen_uuid import gen_uuid
@@ -64,6 +73,39 @@ colorama.init(strip=not sys.stdout.isatty())
 PLATE_API = HTEPlateAPI()
 
 
+class StagedExperiment:
+    """An unpacked experiment with its actions and model, ready to dispatch."""
+
+    def __init__(
+        self,
+        experiment: Experiment,
+        actions: Optional[List[Action]],
+        exp_model: Optional[ExperimentModel],
+        context: tuple,
+        restamp: bool,
+    ):
+        self.experiment = experiment
+        self.actions = actions
+        self.exp_model = exp_model
+        self.context = context
+        self._restamp = restamp
+
+    def restamp(self, timestamp: datetime):
+        """Set the experiment timestamp and output dir to the dispatch time."""
+        if not self._restamp:
+            return
+        exp = self.experiment
+        exp.experiment_timestamp = timestamp
+        exp.experiment_output_dir = exp.get_experiment_dir()
+        targets = list(self.actions or [])
+        if self.exp_model is not None:
+            targets.append(self.exp_model)
+        # actions and the model hold the dir as a Path, as if validated
+        for obj in targets:
+            obj.experiment_timestamp = exp.experiment_timestamp
+            obj.experiment_output_dir = Path(exp.experiment_output_dir)
+
+
 class Orch(Base):
     """
     Orch class is responsible for orchestrating sequences, experiments, and actions in a distributed system. It manages the lifecycle of these entities, handles exceptions, and communicates with various servers to dispatch and monitor actions.
@@ -93,7 +135,8 @@ class Orch(Base):
         op_enabled (bool): Flag indicating if the operator is enabled.
         heartbeat_interval (int): Interval for heartbeat monitoring.
         globalstatusmodel (GlobalStatusModel): Global status model.
-        interrupt_q (asyncio.Queue): Queue for interrupts.
+        status_waiters (StatusWaiters): Wakes the dispatch loop on status changes.
+        dispatch_trace (DequeDict): Latency trace of the last dispatched actions.
         incoming_status (asyncio.Queue): Queue for incoming statuses.
         incoming (GlobalStatusModel): Incoming status model.
         init_success (bool): Flag indicating if initialization was successful.
@@ -244,9 +287,14 @@ class Orch(Base):
         # basemodel which holds all information for orch
         self.globalstatusmodel = GlobalStatusModel(orchestrator=self.server)
         self.globalstatusmodel._sort_status()
-        # this queue is simply used for waiting for any interrupt
-        # but it does not do anything with its content
-        self.interrupt_q = asyncio.Queue()
+        # wakes the dispatch loop only when an endpoint, server or action
+        # it is waiting on changes status, or on any loop intent change
+        self.status_waiters = StatusWaiters()
+        # per-action dispatch latencies, {action_uuid: trace dict}
+        self.dispatch_trace = DequeDict(
+            maxlen=self.server_params.get("dispatch_trace_length", 1000)
+        )
+        self.last_action_registered = None
         self.incoming_status = asyncio.Queue()
         self.incoming = None
 
@@ -264,7 +312,14 @@ class Orch(Base):
         self.current_wait_ts = 0
         self.last_wait_ts = 0
 
-        self.globstat_q = MultisubscriberQueue()
+        queue_limits = self.server_cfg.get("queue_limits", {})
+        self.globstat_q = MultisubscriberQueue(
+            **{
+                "maxsize": 100,
+                "policy": "drop_oldest",
+                **queue_limits.get("globstat_q", {}),
+            }
+        )
         self.globstat_clients = set()
         self.current_stop_message = ""
 
@@ -274,6 +329,24 @@ class Orch(Base):
         self.status_summary = {}
         self.global_params = {}
 
+        # experiments unpacked ahead of dispatch, off unless the orch config
+        # sets experiment_prefetch_depth > 0,
+        # {id(raw experiment_dq entry): (raw entry, staging context, task)}
+        self.experiment_prefetch_depth = self.server_params.get(
+            "experiment_prefetch_depth", 0
+        )
+        self.prefetched_experiments = {}
+        self.initial_exp_upload = None
+        self.experiment_gap_start = None
+        self.experiment_gap_stats = {
+            "count": 0,
+            "last_s": None,
+            "max_s": 0.0,
+            "total_s": 0.0,
+            "prefetch_hits": 0,
+            "prefetch_misses": 0,
+        }
+
         self.exp_postprocessors: List[MetaProcessor] = []
         self.exp_postprocess_libs = self.server_cfg.get("exp_postprocess_libs", [])
         self.import_postprocessors(
@@ -344,6 +417,8 @@ class Orch(Base):
 
         self.fast_urls = self.get_endpoint_urls()
         self.status_logger = self.aloop.create_task(self.log_status_task())
+        # finish directory moves interrupted by a crash or shutdown
+        self.promotion_resumer = self.aloop.create_task(resume_promotions(self))
         if self.server_cfg.get("regular_update", False):
             regular_delay = self.server_cfg.get("regular_update_delay", 10)
             self.regular_updater = self.aloop.create_task(
@@ -392,6 +467,14 @@ class Orch(Base):
             OBJ_MAP[obj_type][obj_uuid_key].update(obj_uuid_dict)
         else:
             OBJ_MAP[obj_type][obj_uuid_key] = obj_uuid_dict
+            if obj_type == "action":
+                self.last_action_registered = time.perf_counter()
+                trace = self.dispatch_trace.get(str(obj_uuid_key))
+                if trace is not None and trace["registered_s"] is None:
+                    trace["registered_s"] = (
+                        self.last_action_registered - trace["_acked"]
+                    )
+                self.status_waiters.notify([action_wait_key(obj_uuid_key)])
 
     def register_action_uuid(self, action_uuid, action_dict):
         """
@@ -414,6 +497,18 @@ class Orch(Base):
         """
         self.last_dispatched_action_uuid = action_uuid
 
+    def get_queue_stats(self):
+        """
+        Collect lag and drop counters of all message queues, including the
+        global status queue.
+
+        Returns:
+            dict: A dictionary mapping queue names to lists of subscriber statistics.
+        """
+        queue_stats = super().get_queue_stats()
+        queue_stats["globstat_q"] = self.globstat_q.stats()
+        return queue_stats
+
     def start_operator(self):
         """
         Starts the Bokeh server for the operator.
@@ -472,30 +567,28 @@ class Orch(Base):
 
         return doc
 
-    async def wait_for_interrupt(self, pending_action: Optional[Action] = None):
+    async def wait_for_interrupt(
+        self, pending_action: Optional[Action] = None, keys: Optional[list] = None
+    ):
         """
-        Asynchronously waits for an interrupt message from the interrupt queue.
+        Asynchronously waits for a status update or loop intent change.
+
+        Only status updates of the given keys (see helao.helpers.status_waiters)
+        wake the caller; loop intent changes and cleared estop/error states
+        always do.
 
-        This method retrieves at least one status message from the `interrupt_q` queue.
-        If the message is an instance of `GlobalStatusModel`, it updates the `incoming` attribute.
-        It then continues to clear the `interrupt_q` queue, processing any remaining messages
-        and putting their JSON representation into the `globstat_q` queue.
+        Args:
+            pending_action (Action, optional): Action which is re-queued if the
+                loop intent changed to stop while waiting.
+            keys (list, optional): Status keys to wake on, defaults to any update.
 
         Returns:
-            None
+            bool: False if the pending action was re-queued, True otherwise.
         """
 
-        interrupt = await self.interrupt_q.get()
-        if isinstance(interrupt, GlobalStatusModel):
-            self.incoming = interrupt
-
+        await self.status_waiters.wait(keys if keys is not None else [ANY])
+        self.incoming = self.globalstatusmodel
         self.last_interrupt = time.time()
-        # if not empty clear it
-        while not self.interrupt_q.empty():
-            interrupt = await self.interrupt_q.get()
-            if isinstance(interrupt, GlobalStatusModel):
-                self.incoming = interrupt
-                await self.globstat_q.put(interrupt.as_json())
 
         if (
             pending_action is not None
@@ -589,7 +682,7 @@ class Orch(Base):
 
         This method registers the action UUID, constructs a server execution ID, and
         updates the non-blocking list depending on the action status. It also triggers
-        the orchestrator dispatch loop by putting an empty object in the interrupt queue.
+        the orchestrator dispatch loop if it waits on the action's endpoint.
 
         Args:
             actionmodel (Action): The action model containing details of the action.
@@ -653,8 +746,13 @@ class Orch(Base):
             self.nonblocking.append(server_exec_id)
         else:
             self.nonblocking.remove(server_exec_id)
-        # put an empty object in interrupt_q to trigger orch dispatch loop
-        await self.interrupt_q.put(self.globalstatusmodel)
+        # wake the orch dispatch loop if it waits on this endpoint
+        self.status_waiters.notify(
+            [
+                server_wait_key(server_key),
+                endpoint_wait_key(server_key, actionmodel.action_name),
+            ]
+        )
         return {"success": True}
 
     async def clear_nonblocking(self):
@@ -705,11 +803,11 @@ class Orch(Base):
         6. Updates the local buffer with the recent non-active actions.
         7. Checks if any action is in an emergency stop (estop) state or has errored.
         8. Updates the orchestration state based on the current status of actions.
-        9. Pushes the updated global status model to the interrupt queue.
+        9. Wakes the dispatch loop if it waits on the updated server or endpoints.
         10. Updates the operator with the new status.
 
         Note:
-            The method assumes that `self.aiolock`, `self.globalstatusmodel`, `self.interrupt_q`, and `self.update_operator` are defined elsewhere in the class.
+            The method assumes that `self.aiolock`, `self.globalstatusmodel`, `self.status_waiters`, and `self.update_operator` are defined elsewhere in the class.
         """
 
         # LOGGER.debug(
@@ -808,8 +906,15 @@ class Orch(Base):
                 self.globalstatusmodel.orch_state = OrchStatus.busy
                 LOGGER.info(f"running_states: {self.globalstatusmodel.active_dict}")
 
-            # now push it to the interrupt_q
-            await self.interrupt_q.put(self.globalstatusmodel)
+            # wake the dispatch loop if it waits on this server or its endpoints
+            server_name = actionservermodel.action_server.server_name
+            self.status_waiters.notify(
+                [server_wait_key(server_name)]
+                + [
+                    endpoint_wait_key(server_name, endpoint_name)
+                    for endpoint_name in actionservermodel.endpoints
+                ]
+            )
             await self.update_operator(True)
             # await self.globstat_q.put(self.globalstatusmodel.as_json())
 
@@ -831,7 +936,9 @@ class Orch(Base):
         """
         LOGGER.info("got new global status subscriber")
         await websocket.accept()
-        gs_sub = self.globstat_q.subscribe()
+        gs_sub = self.globstat_q.subscribe(
+            label=f"ws_globstat {websocket.client[0]}:{websocket.client[1]}"
+        )
         try:
             async for globstat_msg in gs_sub:
                 await websocket.send_text(json.dumps(globstat_msg.as_dict()))
@@ -854,7 +961,9 @@ class Orch(Base):
         Returns:
             None
         """
-        async for _ in self.globstat_q.subscribe():
+        async for _ in self.globstat_q.subscribe(
+            maxsize=0, label="globstat_broadcast_task"
+        ):
             await asyncio.sleep(0.01)
 
     def unpack_sequence(self, sequence_name: str, sequence_params) -> List[Experiment]:
@@ -1104,12 +1213,14 @@ class Orch(Base):
 
         This method performs the following steps:
         1. Retrieves a new experiment from the experiment queue.
-        2. Copies global parameters to the experiment parameters.
-        3. Initializes the experiment and updates the global status model.
-        4. Unpacks the actions for the experiment and assigns necessary attributes.
-        5. Adds the unpacked actions to the action queue.
-        6. Writes the active experiment to a temporary storage.
-        7. Optionally uploads the initial active experiment JSON to S3.
+        2. Takes its prefetched unpacked copy if available, otherwise copies
+           global parameters to the experiment parameters and unpacks the
+           actions for the experiment (see stage_experiment).
+        3. Updates the global status model.
+        4. Adds the unpacked actions to the action queue.
+        5. Writes the active experiment to a temporary storage.
+        6. Optionally uploads the initial active experiment JSON to S3 in the background.
+        7. Starts prefetching the next experiments.
 
         Returns:
             ErrorCodes: The error code indicating the result of the operation.
@@ -1129,37 +1240,19 @@ class Orch(Base):
         # LOGGER.info("getting new experiment to fill action_dq")
         # generate uids when populating,
         # generate timestamp when acquring
-        self.active_experiment = self.experiment_dq.popleft()
-
-        self.active_experiment.orch_key = self.orch_key
-        self.active_experiment.orch_host = self.orch_host
-        self.active_experiment.orch_port = self.orch_port
-        self.active_experiment.sequence_uuid = self.active_sequence.sequence_uuid
-        if self.active_sequence.campaign_name:
-            self.active_experiment.campaign_name = self.active_sequence.campaign_name
-            self.active_experiment.campaign_uuid = self.active_sequence.campaign_uuid
+        next_raw = self.experiment_dq.raw(0)
+        next_experiment = self.experiment_dq.popleft()
+        staged = await self.get_prefetched_experiment(next_raw)
+        if staged is None:
+            self.experiment_gap_stats["prefetch_misses"] += 1
+            self.map_global_exp_params(next_experiment)
+            staged = self.stage_experiment(next_experiment, self.staging_context())
+        else:
+            self.experiment_gap_stats["prefetch_hits"] += 1
+            staged.restamp(set_time(offset=self.ntp_offset))
+        self.active_experiment = staged.experiment
         self.active_seq_exp_counter += 1
 
-        # LOGGER.info("copying global vars to experiment")
-        # copy requested global param to experiment params
-        for k, v in self.active_experiment.from_global_exp_params.items():
-            LOGGER.info(f"mapping from global params to experiment -- {k}:{v}")
-            if k in self.global_params:
-                if isinstance(v, list):
-                    for vv in v:
-                        self.active_experiment.experiment_params[vv] = (
-                            self.global_params[k]
-                        )
-                else:
-                    self.active_experiment.experiment_params[v] = self.global_params[k]
-                LOGGER.info(
-                    f"global parameter {k} found in global_params, setting to {self.global_params[k]}"
-                )
-            else:
-                LOGGER.info(
-                    f"global parameter {k} not found in global_params, skipping"
-                )
-
         LOGGER.info(
             f"new active experiment is {self.active_experiment.experiment_name}"
         )
@@ -1171,12 +1264,6 @@ class Orch(Base):
                 }
             }
         )
-        self.active_experiment.dummy = self.world_cfg.get("dummy", False)
-        self.active_experiment.simulation = self.world_cfg.get("simulation", False)
-        if self.active_experiment.run_type is None:
-            self.active_experiment.run_type = self.run_type
-        self.active_experiment.orchestrator = self.server
-        self.active_experiment.init_exp(time_offset=self.ntp_offset)
         self.register_obj_uuid(
             self.active_experiment.experiment_uuid,
             {
@@ -1196,48 +1283,138 @@ class Orch(Base):
             "registered experiment uuid: " + str(self.active_experiment.experiment_uuid)
         )
 
-        # attach run_id
-        if self.active_run_id is not None:
-            self.active_experiment.run_id = self.active_run_id
-
         self.globalstatusmodel.new_experiment(
             exp_uuid=self.active_experiment.experiment_uuid
         )
 
+        if staged.actions is None:
+            LOGGER.error("no actions in experiment")
+            self.action_dq = zdeque([])
+            return ErrorCodes.none
+        staged_acts = staged.actions
+
+        LOGGER.info(f"got: {staged_acts}")
+        LOGGER.info(f"optional params: {self.active_experiment.experiment_params}")
+
+        # write a temporary exp
+        self.exp_model = staged.exp_model
+        await self.write_active_experiment_exp()
+        if self.use_db:
+            meta_s3_key = f"experiment/{self.exp_model.experiment_uuid}.json"
+            LOGGER.info(
+                f"uploading initial active experiment json to s3 ({meta_s3_key})"
+            )
+            self.initial_exp_upload = self.aloop.create_task(
+                self.upload_initial_exp(self.exp_model, meta_s3_key)
+            )
+
+        if self.verify_plates and PLATE_API.has_access:
+            plate_found = self.verify_plate_in_params(
+                self.active_experiment.experiment_params
+            )
+            if not plate_found:
+                stop_message = "experiment contains a plate_id parameter but plate_id could not be found"
+                self.current_stop_message = stop_message
+                LOGGER.warning(stop_message)
+                await self.stop()
+                self.globalstatusmodel.loop_state = LoopStatus.stopped
+                await self.intend_none()
+                return ErrorCodes.not_available
+
+        LOGGER.info("adding unpacked actions to action_dq")
+        for act in staged_acts:
+            self.action_dq.append(act)
+
+        self.prefetch_experiments()
+        return ErrorCodes.none
+
+    def map_global_exp_params(self, experiment: Experiment):
+        """Copy requested global params into the experiment params."""
+        for k, v in experiment.from_global_exp_params.items():
+            LOGGER.info(f"mapping from global params to experiment -- {k}:{v}")
+            if k in self.global_params:
+                if isinstance(v, list):
+                    for vv in v:
+                        experiment.experiment_params[vv] = self.global_params[k]
+                else:
+                    experiment.experiment_params[v] = self.global_params[k]
+                LOGGER.info(
+                    f"global parameter {k} found in global_params, setting to {self.global_params[k]}"
+                )
+            else:
+                LOGGER.info(
+                    f"global parameter {k} not found in global_params, skipping"
+                )
+
+    def staging_context(self) -> Optional[tuple]:
+        """Orch state copied into experiments and their actions when unpacked."""
+        if self.active_sequence is None:
+            return None
+        return (
+            self.active_sequence.sequence_uuid,
+            self.active_sequence.campaign_name,
+            self.active_sequence.campaign_uuid,
+            self.active_run_id,
+            self.run_type,
+        )
+
+    def stage_experiment(
+        self, experiment: Experiment, context: tuple
+    ) -> StagedExperiment:
+        """
+        Unpack an experiment into its actions without touching orch state:
+        assigns experiment and action UUIDs, runs the experiment function,
+        resolves action server hosts and builds the experiment model.
+
+        Only reads orch attributes that do not change while a sequence runs,
+        so it can run on a worker thread (see prefetch_experiments).
+        """
+        sequence_uuid, campaign_name, campaign_uuid, run_id, run_type = context
+        experiment.orch_key = self.orch_key
+        experiment.orch_host = self.orch_host
+        experiment.orch_port = self.orch_port
+        experiment.sequence_uuid = sequence_uuid
+        if campaign_name:
+            experiment.campaign_name = campaign_name
+            experiment.campaign_uuid = campaign_uuid
+        experiment.dummy = self.world_cfg.get("dummy", False)
+        experiment.simulation = self.world_cfg.get("simulation", False)
+        if experiment.run_type is None:
+            experiment.run_type = run_type
+        experiment.orchestrator = self.server
+        restamp = experiment.experiment_timestamp is None
+        experiment.init_exp(time_offset=self.ntp_offset)
+        # attach run_id
+        if run_id is not None:
+            experiment.run_id = run_id
+
         # additional experiment params should be stored
         # in experiment.experiment_params
-        # self.print_message(
-        #     f"unpacking actions for {self.active_experiment.experiment_name}"
-        # )
-        exp_func = self.experiment_lib[self.active_experiment.experiment_name]
+        exp_func = self.experiment_lib[experiment.experiment_name]
         exp_func_args = inspect.getfullargspec(exp_func).args
         supplied_params = {
-            k: v
-            for k, v in self.active_experiment.experiment_params.items()
-            if k in exp_func_args
+            k: v for k, v in experiment.experiment_params.items() if k in exp_func_args
         }
-        exp_return = exp_func(self.active_experiment, **supplied_params)
+        exp_return = exp_func(experiment, **supplied_params)
 
         unpacked_acts = None
         if isinstance(exp_return, list):
             unpacked_acts = exp_return
         elif isinstance(exp_return, Experiment):
-            self.active_experiment = exp_return
-            unpacked_acts = self.active_experiment.planned_actions
+            experiment = exp_return
+            unpacked_acts = experiment.planned_actions
 
-        self.active_experiment.experiment_codehash = self.experiment_codehash_lib[
-            self.active_experiment.experiment_name
+        experiment.experiment_codehash = self.experiment_codehash_lib[
+            experiment.experiment_name
         ]
-        self.active_experiment.experiment_codepath = self.experiment_codepath_lib[
-            self.active_experiment.experiment_name
+        experiment.experiment_codepath = self.experiment_codepath_lib[
+            experiment.experiment_name
         ]
-        self.active_experiment.experiment_funcname = self.experiment_lib[
-            self.active_experiment.experiment_name
+        experiment.experiment_funcname = self.experiment_lib[
+            experiment.experiment_name
         ].__name__
         if unpacked_acts is None:
-            LOGGER.error("no actions in experiment")
-            self.action_dq = zdeque([])
-            return ErrorCodes.none
+            return StagedExperiment(experiment, None, None, context, restamp)
 
         process_order_groups = defaultdict(list)
         process_count = 0
@@ -1262,58 +1439,170 @@ class Orch(Base):
             if act.process_finish:
                 process_count += 1
                 init_process_uuids.append(gen_uuid())
-            if self.active_experiment.data_request_id is not None:
-                act.data_request_id = self.active_experiment.data_request_id
+            if experiment.data_request_id is not None:
+                act.data_request_id = experiment.data_request_id
             actserv_cfg = self.world_cfg["servers"][act.action_server.server_name]
             act.action_server.hostname = actserv_cfg["host"]
             act.action_server.port = actserv_cfg["port"]
             act.action_server.machine_name = self.server.machine_name
-            act.campaign_name = self.active_experiment.campaign_name
-            act.campaign_uuid = self.active_experiment.campaign_uuid
+            act.campaign_name = experiment.campaign_name
+            act.campaign_uuid = experiment.campaign_uuid
             staged_acts.append(act)
         if process_order_groups:
-            self.active_experiment.process_order_groups = process_order_groups
+            experiment.process_order_groups = process_order_groups
             process_list = init_process_uuids[: len(process_order_groups)]
-            self.active_experiment.process_list = process_list
+            experiment.process_list = process_list
 
-        LOGGER.info(f"got: {staged_acts}")
-        LOGGER.info(f"optional params: {self.active_experiment.experiment_params}")
+        return StagedExperiment(
+            experiment, staged_acts, experiment.get_exp(), context, restamp
+        )
 
-        # write a temporary exp
-        self.exp_model = self.active_experiment.get_exp()
-        await self.write_active_experiment_exp()
-        if self.use_db:
-            try:
-                meta_s3_key = f"experiment/{self.exp_model.experiment_uuid}.json"
-                LOGGER.info(
-                    f"uploading initial active experiment json to s3 ({meta_s3_key})"
-                )
-                await self.syncer.to_s3(
-                    self.exp_model.clean_dict(strip_private=True), meta_s3_key
-                )
-            except Exception as e:
-                LOGGER.error(
-                    f"Error uploading initial active experiment json to s3: {e}"
-                )
+    def prefetch_experiments(self):
+        """
+        Unpack the next experiments in experiment_dq on a worker thread while
+        the active experiment runs, up to experiment_prefetch_depth (opt-in
+        through the orch server params, default 0). Experiments reading global params are not
+        prefetched, their params are only known when they are dispatched.
+        Staged copies are keyed by the stored queue entry and dropped once it
+        is no longer among the next experiments.
+        """
+        context = self.staging_context()
+        depth = self.experiment_prefetch_depth if context is not None else 0
+        queued = [
+            self.experiment_dq.raw(i) for i in range(min(depth, len(self.experiment_dq)))
+        ]
+        keep = {id(raw) for raw in queued}
+        for key in list(self.prefetched_experiments):
+            if key not in keep:
+                self.prefetched_experiments.pop(key)[2].cancel()
+        for raw in queued:
+            if id(raw) in self.prefetched_experiments:
+                continue
+            task = self.aloop.create_task(
+                asyncio.to_thread(self._prefetch_experiment, raw, context)
+            )
+            # failures are reported when the experiment is unpacked again inline
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self.prefetched_experiments[id(raw)] = (raw, context, task)
+
+    def _prefetch_experiment(
+        self, raw: bytes, context: tuple
+    ) -> Optional[StagedExperiment]:
+        experiment = zdeque.decode(raw)
+        if (
+            experiment.from_global_exp_params
+            or experiment.experiment_name not in self.experiment_lib
+        ):
+            return None
+        return self.stage_experiment(experiment, context)
 
-        if self.verify_plates and PLATE_API.has_access:
-            plate_found = self.verify_plate_in_params(
-                self.active_experiment.experiment_params
+    async def get_prefetched_experiment(self, raw: bytes) -> Optional[StagedExperiment]:
+        """Return the staged copy of a dequeued experiment entry, None if not usable."""
+        entry = self.prefetched_experiments.pop(id(raw), None)
+        if entry is None:
+            return None
+        prefetched_raw, context, task = entry
+        if prefetched_raw is not raw or context != self.staging_context():
+            task.cancel()
+            return None
+        try:
+            return await task
+        except Exception:
+            LOGGER.warning(
+                "experiment prefetch failed, unpacking it again", exc_info=True
             )
-            if not plate_found:
-                stop_message = "experiment contains a plate_id parameter but plate_id could not be found"
-                self.current_stop_message = stop_message
-                LOGGER.warning(stop_message)
-                await self.stop()
-                self.globalstatusmodel.loop_state = LoopStatus.stopped
-                await self.intend_none()
-                return ErrorCodes.not_available
+            return None
 
-        LOGGER.info("adding unpacked actions to action_dq")
-        for act in staged_acts:
-            self.action_dq.append(act)
+    async def upload_initial_exp(self, exp_model: ExperimentModel, meta_s3_key: str):
+        try:
+            await self.syncer.to_s3(exp_model.clean_dict(strip_private=True), meta_s3_key)
+        except Exception as e:
+            LOGGER.error(f"Error uploading initial active experiment json to s3: {e}")
+
+    def record_experiment_gap(self):
+        """Record the time since the previous experiment's actions finished."""
+        if self.experiment_gap_start is None:
+            return
+        gap = time.perf_counter() - self.experiment_gap_start
+        self.experiment_gap_start = None
+        stats = self.experiment_gap_stats
+        stats["count"] += 1
+        stats["total_s"] += gap
+        stats["last_s"] = gap
+        stats["max_s"] = max(stats["max_s"], gap)
+
+    def get_experiment_gap_stats(self) -> dict:
+        """
+        Dead time between experiments, measured from the end of the last
+        action of one experiment until the first action of the next one is
+        dequeued, and experiment prefetch hit counts.
 
-        return ErrorCodes.none
+        Returns:
+            dict: Gap count, last, mean and max in seconds, prefetch hits and misses.
+        """
+        stats = dict(self.experiment_gap_stats)
+        total = stats.pop("total_s")
+        stats["mean_s"] = total / stats["count"] if stats["count"] else None
+        stats["prefetch_depth"] = self.experiment_prefetch_depth
+        stats["prefetched"] = len(self.prefetched_experiments)
+        return stats
+
+    def record_dispatch_trace(self, action_uuid: str, trace: dict):
+        """
+        Store the latencies of a dispatched action from the perf_counter
+        stamps taken in loop_task_dispatch_action. `registered_s` is filled in
+        once the action is registered in the action history.
+        """
+        sent = trace["_sent"]
+        previous = trace["_previous"]
+        trace["wait_s"] = trace["_ready"] - trace["_dequeued"]
+        trace["dispatch_s"] = trace["_acked"] - sent
+        trace["since_previous_s"] = sent - previous if previous is not None else None
+        # fast actions may finish before the dispatch response arrives
+        registered = UUID(action_uuid) in self.action_history
+        trace["registered_s"] = 0.0 if registered else None
+        self.dispatch_trace[str(action_uuid)] = trace
+
+    def get_dispatch_trace(self, last: Optional[int] = None) -> dict:
+        """
+        Latency trace of the most recently dispatched actions.
+
+        Per action: `wait_s` from dequeue until its start condition was met,
+        `dispatch_s` for the dispatch request, `since_previous_s` from the
+        previous action's registration in the action history until this
+        dispatch was sent (action-to-action latency) and `registered_s` from
+        the dispatch response until this action was registered.
+
+        Args:
+            last (int, optional): Only return the last N actions.
+
+        Returns:
+            dict: Summary statistics and the per-action trace.
+        """
+        actions = [
+            {
+                "action_uuid": uuid,
+                **{k: v for k, v in trace.items() if not k.startswith("_")},
+            }
+            for uuid, trace in self.dispatch_trace.items()
+        ]
+        summary = {"count": len(actions)}
+        for field in ("wait_s", "dispatch_s", "since_previous_s", "registered_s"):
+            vals = sorted(x[field] for x in actions if x[field] is not None)
+            summary[field] = (
+                {
+                    "mean": sum(vals) / len(vals),
+                    "p50": vals[len(vals) // 2],
+                    "max": vals[-1],
+                }
+                if vals
+                else None
+            )
+        summary["notifications"] = self.status_waiters.notify_count
+        summary["wakeups"] = self.status_waiters.wake_count
+        if last is not None:
+            actions = actions[-last:]
+        return {"summary": summary, "actions": actions}
 
     async def loop_task_dispatch_action(self) -> ErrorCodes:
         """
@@ -1386,6 +1675,13 @@ class Orch(Base):
             # all action blocking is handled like preempt,
             # check Action requirements
             A = self.action_dq.popleft()
+            self.record_experiment_gap()
+            trace = {
+                "action_name": A.action_name,
+                "action_server": A.action_server.server_name,
+                "start_condition": A.start_condition,
+                "_dequeued": time.perf_counter(),
+            }
 
             # see async_action_dispatcher for unpacking
             if A.start_condition == ActionStartCondition.no_wait:
@@ -1397,7 +1693,13 @@ class Orch(Base):
                         action_server=A.action_server, endpoint_name=A.action_name
                     )
                     while not endpoint_free:
-                        if not await self.wait_for_interrupt():
+                        if not await self.wait_for_interrupt(
+                            keys=[
+                                endpoint_wait_key(
+                                    A.action_server.server_name, A.action_name
+                                )
+                            ]
+                        ):
                             return ErrorCodes.none
                         endpoint_free = self.globalstatusmodel.endpoint_free(
                             action_server=A.action_server, endpoint_name=A.action_name
@@ -1408,7 +1710,9 @@ class Orch(Base):
                         action_server=A.action_server
                     )
                     while not server_free:
-                        if not await self.wait_for_interrupt():
+                        if not await self.wait_for_interrupt(
+                            keys=[server_wait_key(A.action_server.server_name)]
+                        ):
                             return ErrorCodes.none
                         server_free = self.globalstatusmodel.server_free(
                             action_server=A.action_server
@@ -1419,7 +1723,9 @@ class Orch(Base):
                         action_server=A.orchestrator, endpoint_name="wait"
                     )
                     while not wait_free:
-                        if not await self.wait_for_interrupt():
+                        if not await self.wait_for_interrupt(
+                            keys=[endpoint_wait_key(A.orchestrator.server_name, "wait")]
+                        ):
                             return ErrorCodes.none
                         wait_free = self.globalstatusmodel.endpoint_free(
                             action_server=A.orchestrator, endpoint_name="wait"
@@ -1431,7 +1737,21 @@ class Orch(Base):
                         in self.globalstatusmodel.active_dict.keys()
                     )
                     while previous_action_active:
-                        if not await self.wait_for_interrupt():
+                        previous = self.globalstatusmodel.active_dict.get(
+                            self.last_action_uuid
+                        )
+                        if not await self.wait_for_interrupt(
+                            keys=(
+                                [
+                                    endpoint_wait_key(
+                                        previous.action_server.server_name,
+                                        previous.action_name,
+                                    )
+                                ]
+                                if previous is not None
+                                else None
+                            )
+                        ):
                             return ErrorCodes.none
                         previous_action_active = (
                             self.last_action_uuid
@@ -1442,6 +1762,7 @@ class Orch(Base):
 
                 else:  # unsupported value
                     await self.orch_wait_for_all_actions()
+            trace["_ready"] = time.perf_counter()
 
             # LOGGER.info("copying global vars to action")
             # copy requested global param to action params
@@ -1498,9 +1819,12 @@ class Orch(Base):
                         LOGGER.info("orchestrator estopped, not dispatching action")
                         error_code = ErrorCodes.estop
                     else:
+                        trace["_sent"] = time.perf_counter()
+                        trace["_previous"] = self.last_action_registered
                         result_actiondict, error_code = await async_action_dispatcher(
                             self.world_cfg, A
                         )
+                        trace["_acked"] = time.perf_counter()
                 except Exception as e:
                     LOGGER.info(f"Error while dispatching action {A.action_name}: {e}")
                     error_code = ErrorCodes.http
@@ -1536,6 +1860,7 @@ class Orch(Base):
                 result_uuid = result_actiondict["action_uuid"]
                 self.last_action_uuid = result_uuid
                 self.track_action_uuid(UUID(result_uuid))
+                self.record_dispatch_trace(result_uuid, trace)
                 LOGGER.info(
                     f"Action {A.action_name} dispatched with uuid: {result_uuid}"
                 )
@@ -1547,52 +1872,17 @@ class Orch(Base):
                     # orch gets back an active action dict, we can self-register the dispatched action in global status
                     resmod = Action(**result_actiondict)
                     srvname = resmod.action_server.server_name
-                    actname = resmod.action_name
                     resuuid = resmod.action_uuid
                     actstats = resmod.action_status
                     srvkeys = self.globalstatusmodel.server_dict.keys()
                     srvkey = [k for k in srvkeys if k[0] == srvname][0]
-                    if HloStatus.active in actstats:
-                        self.globalstatusmodel.active_dict[resuuid] = resmod
-                        self.globalstatusmodel.server_dict[srvkey].endpoints[
-                            actname
-                        ].active_dict[resuuid] = resmod
-                    else:  # orch got back a nonactive result
-                        for actstat in actstats:
-                            try:
-                                if (
-                                    resuuid
-                                    in self.globalstatusmodel.nonactive_dict.get(
-                                        actstat, {}
-                                    )
-                                ):
-                                    break  # already in nonactive_dict
-
-                                # need to populate nonactive and endpoint statuses
-                                current_nonactive_status = (
-                                    self.globalstatusmodel.nonactive_dict.get(
-                                        actstat, {}
-                                    )
-                                )
-                                current_nonactive_status.update({resuuid: resmod})
-                                self.globalstatusmodel.nonactive_dict[actstat] = (
-                                    current_nonactive_status
-                                )
-
-                                current_endpoint_status = (
-                                    self.globalstatusmodel.server_dict[srvkey]
-                                    .endpoints[actname]
-                                    .nonactive_dict.get(actstat, {})
-                                )
-                                current_endpoint_status.update({resuuid: resmod})
-                                self.globalstatusmodel.server_dict[srvkey].endpoints[
-                                    actname
-                                ].nonactive_dict[actstat] = current_endpoint_status
-                            except Exception:
-                                LOGGER.info(
-                                    f"{actstat} not found in globalstatus.nonactive_dict",
-                                    exc_info=True,
-                                )
+                    try:
+                        self.globalstatusmodel.register_dispatched(srvkey, resmod)
+                    except Exception:
+                        LOGGER.info(
+                            f"could not register {resuuid} with status {actstats} in global status",
+                            exc_info=True,
+                        )
 
             try:
                 result_action = Action(**result_actiondict)
@@ -1751,7 +2041,9 @@ class Orch(Base):
                         self.last_dispatched_action_uuid
                         not in self.action_history.keys()
                     ):
-                        await asyncio.sleep(0.2)
+                        await self.status_waiters.wait(
+                            [action_wait_key(self.last_dispatched_action_uuid)]
+                        )
                     if self.action_dq and self.step_thru_actions:
                         self.current_stop_message = "Step-thru actions is enabled, use 'Start Orch' to dispatch next action."
                         LOGGER.warning(
@@ -2048,16 +2340,16 @@ class Orch(Base):
 
     async def intend_skip(self):
         """
-        Asynchronously sets the loop intent to 'skip' and puts this intent into the interrupt queue.
+        Asynchronously sets the loop intent to 'skip' and wakes the dispatch loop.
 
-        This method updates the global status model's loop intent to 'skip' and then places this intent
-        into the interrupt queue to signal that the current loop should be skipped.
+        This method updates the global status model's loop intent to 'skip' and then wakes all
+        status waiters to signal that the current loop should be skipped.
 
         Returns:
             None
         """
         self.globalstatusmodel.loop_intent = LoopIntent.skip
-        await self.interrupt_q.put(self.globalstatusmodel.loop_intent)
+        self.status_waiters.notify_all()
 
     async def stop(self):
         """
@@ -2077,45 +2369,45 @@ class Orch(Base):
 
     async def intend_stop(self):
         """
-        Asynchronously sets the loop intent to stop and puts this intent into the interrupt queue.
+        Asynchronously sets the loop intent to stop and wakes the dispatch loop.
 
         This method updates the `loop_intent` attribute of the `globalstatusmodel` to `LoopIntent.stop`
-        and then places this intent into the `interrupt_q` queue to signal that the loop should stop.
+        and then wakes all `status_waiters` to signal that the loop should stop.
 
         Returns:
             None
         """
         self.globalstatusmodel.loop_intent = LoopIntent.stop
-        await self.interrupt_q.put(self.globalstatusmodel.loop_intent)
+        self.status_waiters.notify_all()
 
     async def intend_estop(self):
         """
-        Asynchronously sets the loop intent to emergency stop (estop) and puts the
-        updated loop intent into the interrupt queue.
+        Asynchronously sets the loop intent to emergency stop (estop) and wakes
+        the dispatch loop.
 
         This method updates the `loop_intent` attribute of the `globalstatusmodel`
-        to `LoopIntent.estop` and then places this intent into the `interrupt_q`
-        queue to signal an emergency stop.
+        to `LoopIntent.estop` and then wakes all `status_waiters` to signal an
+        emergency stop.
 
         Returns:
             None
         """
         self.globalstatusmodel.loop_intent = LoopIntent.estop
-        await self.interrupt_q.put(self.globalstatusmodel.loop_intent)
+        self.status_waiters.notify_all()
 
     async def intend_none(self):
         """
-        Sets the loop intent to 'none' and puts this intent into the interrupt queue.
+        Sets the loop intent to 'none' and wakes the dispatch loop.
 
         This method updates the global status model's loop intent to indicate that no
-        specific loop action is intended. It then places this updated intent into the
-        interrupt queue to signal other parts of the system.
+        specific loop action is intended. It then wakes all status waiters to
+        signal other parts of the system.
 
         Returns:
             None
         """
         self.globalstatusmodel.loop_intent = LoopIntent.none
-        await self.interrupt_q.put(self.globalstatusmodel.loop_intent)
+        self.status_waiters.notify_all()
 
     async def clear_estop(self):
         """
@@ -2126,7 +2418,7 @@ class Orch(Base):
         2. Clears the estopped status from the global status model.
         3. Releases the estop state for all action servers.
         4. Sets the orchestration status from estopped back to stopped.
-        5. Puts a "cleared_estop" message into the interrupt queue.
+        5. Wakes the dispatch loop.
 
         Returns:
             None
@@ -2138,7 +2430,7 @@ class Orch(Base):
         await self.estop_actions(switch=False)
         # set orch status from estop back to stopped
         self.globalstatusmodel.loop_state = LoopStatus.stopped
-        await self.interrupt_q.put("cleared_estop")
+        self.status_waiters.notify_all()
 
     async def clear_error(self):
         """
@@ -2146,8 +2438,7 @@ class Orch(Base):
 
         This method resets the error dictionary by clearing errored UUIDs
         and updates the global status model to reflect that the errors
-        have been cleared. It also sends a message to the interrupt queue
-        indicating that the errors have been cleared.
+        have been cleared. It also wakes the dispatch loop.
 
         Returns:
             None
@@ -2155,7 +2446,7 @@ class Orch(Base):
         # currently only resets the error dict
         LOGGER.info("clearing errored uuids")
         self.globalstatusmodel.clear_in_finished(hlostatus=HloStatus.errored)
-        await self.interrupt_q.put("cleared_errored")
+        self.status_waiters.notify_all()
 
     async def clear_sequences(self):
         """
@@ -2681,6 +2972,12 @@ class Orch(Base):
         """
         # we need to wait for all actions to finish first
         await self.orch_wait_for_all_actions()
+        if self.active_experiment is not None:
+            self.experiment_gap_start = time.perf_counter()
+        if self.initial_exp_upload is not None:
+            # keep the initial exp json from racing the finished one
+            await self.initial_exp_upload
+            self.initial_exp_upload = None
         while len(self.nonblocking) > 0:
             LOGGER.info(
                 f"Stopping non-blocking action executors ({len(self.nonblocking)})"
@@ -2807,12 +3104,15 @@ class Orch(Base):
         2. Cancels the status logger.
         3. Cancels the NTP syncer.
         4. Cancels the status subscriber.
+        5. Stops the status sender tasks and closes the pooled HTTP sessions.
 
         This method ensures that all ongoing tasks are properly terminated and resources are released.
         """
         await self.detach_subscribers()
         self.status_logger.cancel()
         self.status_subscriber.cancel()
+        for _, _, task in self.prefetched_experiments.values():
+            task.cancel()
         if any(
             [
                 len(x) > 0
@@ -2827,6 +3127,8 @@ class Orch(Base):
             LOGGER.info(
                 f"Orch queues are not empty, exported queues to {export_path}"
             )
+        await self.status_fanout.close()
+        await HTTP_POOL.close()
 
     async def update_operator(self, msg):
         """
@@ -136,6 +136,19 @@ class OrchAPI(HelaoFastAPI):
             """
             await self.orch.ws_data(websocket)
 
+        @self.websocket("/ws_data_decimated")
+        async def websocket_data_decimated(websocket: WebSocket):
+            """
+            Handle WebSocket data decimated per client, see helpers/ws_decimate.py.
+
+            Args:
+                websocket (WebSocket): The WebSocket connection instance.
+
+            Returns:
+                None
+            """
+            await self.orch.ws_data_decimated(websocket)
+
         @self.websocket("/ws_live")
         async def websocket_live(websocket: WebSocket):
             """
@@ -150,7 +163,7 @@ class OrchAPI(HelaoFastAPI):
             await self.orch.ws_live(websocket)
 
         @self.post("/get_status", tags=["private"])
-        def get_status():
+        async def get_status():
             """
             Retrieve the current status of the orchestrator and its driver.
 
@@ -163,7 +176,10 @@ class OrchAPI(HelaoFastAPI):
             status_dict = self.orch.actionservermodel.model_dump()
             driver_status = "not_implemented"
             if isinstance(self.driver, HelaoDriver):
-                resp = self.driver.get_status()
+                if self.driver.offload_io:
+                    resp = await self.driver.aio.get_status()
+                else:
+                    resp = self.driver.get_status()
                 driver_status = resp.status
             status_dict["_driver_status"] = driver_status
             return status_dict
@@ -236,6 +252,42 @@ class OrchAPI(HelaoFastAPI):
             """
             return self.orch.live_buffer
 
+        @self.post("/get_queue_stats", tags=["private"])
+        def get_queue_stats():
+            """
+            Retrieve per-subscriber lag, overflow policy and drop counters of
+            the orchestrator message queues.
+
+            Returns:
+                dict: A dictionary mapping queue names to lists of subscriber statistics.
+            """
+            return self.orch.get_queue_stats()
+
+        @self.post("/get_experiment_gap_stats", tags=["private"])
+        def get_experiment_gap_stats():
+            """
+            Retrieve the dead time between consecutive experiments and the
+            experiment prefetch hit counts.
+
+            Returns:
+                dict: Gap count, last, mean and max in seconds, prefetch hits and misses.
+            """
+            return self.orch.get_experiment_gap_stats()
+
+        @self.post("/get_dispatch_trace", tags=["private"])
+        def get_dispatch_trace(last: Optional[int] = None):
+            """
+            Retrieve the per-action dispatch latency trace.
+
+            Args:
+                last (int, optional): Only return the last N dispatched actions.
+
+            Returns:
+                dict: Latency summary and per-action wait, dispatch, action-to-action
+                and registration times in seconds.
+            """
+            return self.orch.get_dispatch_trace(last)
+
         @self.post("/list_executors", tags=["private"])
         def list_executors():
             """
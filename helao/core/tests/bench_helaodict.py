@@ -0,0 +1,196 @@
+"""
+Benchmark of HelaoDict.as_dict against the previous implementation
+(deepcopy of the attributes, isinstance chain per value, then a nan2None pass)
+on representative Action, Experiment and GlobalStatusModel objects.
+
+usage: python helao/core/tests/bench_helaodict.py [repeats]
+"""
+
+import sys
+import math
+import time
+import types
+from copy import deepcopy
+from datetime import datetime, date
+from enum import Enum
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import numpy as np
+from pydantic import BaseModel
+
+from helao.core.helaodict import nan2None
+from helao.core.models.hlostatus import HloStatus
+from helao.core.models.machine import MachineModel
+from helao.core.models.sample import LiquidSample, SolidSample
+from helao.core.models.server import (
+    ActionServerModel,
+    EndpointModel,
+    GlobalStatusModel,
+)
+from helao.helpers.premodels import Action, Experiment
+
+REPEATS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+
+def legacy_serialize_item(val):
+    if isinstance(val, Enum):
+        return val.name if isinstance(val, str) else val.value
+    elif isinstance(val, type(None)):
+        return val
+    elif isinstance(val, np.bool_):
+        return bool(val)
+    elif isinstance(val, bool):
+        return val
+    elif isinstance(val, np.integer):
+        return int(val)
+    elif isinstance(val, int):
+        return val
+    elif isinstance(val, np.floating):
+        return round(float(val), 9)
+    elif isinstance(val, float):
+        return round(val, 9)
+    elif isinstance(val, str):
+        return val.replace(r"\\", "/") if r"\\" in val else val
+    elif isinstance(val, Path):
+        return str(val.as_posix())
+    elif isinstance(val, datetime):
+        return val.strftime("%Y-%m-%d %H:%M:%S.%f")
+    elif isinstance(val, (UUID, date)):
+        return str(val)
+    elif isinstance(val, list):
+        return [legacy_serialize_item(item) for item in val]
+    elif isinstance(val, tuple):
+        return (legacy_serialize_item(item) for item in val)
+    elif isinstance(val, set):
+        return {legacy_serialize_item(item) for item in val}
+    elif isinstance(val, dict):
+        return legacy_serialize_dict(val)
+    elif hasattr(val, "as_dict"):
+        return legacy_as_dict(val)
+    elif isinstance(val, BaseModel):
+        return legacy_serialize_dict(val.model_dump())
+    raise ValueError(f"cannot serialize {val} of type {type(val)}")
+
+
+def legacy_serialize_dict(dict_in):
+    clean = {}
+    for k, v in dict_in.items():
+        if not isinstance(v, types.FunctionType) and not (
+            isinstance(v, str) and k.startswith("__")
+        ):
+            clean[legacy_serialize_item(k)] = legacy_serialize_item(v)
+    return clean
+
+
+def legacy_as_dict(obj):
+    attr_only = legacy_serialize_dict(deepcopy(vars(obj)))
+    return {k: nan2None(v) for k, v in attr_only.items()}
+
+
+def materialize(obj):
+    """Expand generators (serialized tuples) so outputs can be compared."""
+    if isinstance(obj, dict):
+        return {
+            tuple(k) if isinstance(k, types.GeneratorType) else k: materialize(v)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, (list, types.GeneratorType)):
+        return [materialize(v) for v in obj]
+    if isinstance(obj, float) and math.isnan(obj):
+        return "nan"
+    return obj
+
+
+def make_action(orch: MachineModel, server: MachineModel, name: str) -> Action:
+    action = Action(
+        orchestrator=orch,
+        action_server=server,
+        action_name=name,
+        action_uuid=uuid4(),
+        experiment_uuid=uuid4(),
+        sequence_uuid=uuid4(),
+        experiment_name="ECHE_sub_CV",
+        sequence_name="ECHE_4CA_led_1CV_led",
+        action_status=[HloStatus.active],
+        action_params={
+            "Vinit__V": 0.0,
+            "Vapex1__V": 1.2,
+            "SampleRate": np.float64(0.01),
+            "Cycles": np.int64(3),
+            "IErange": "auto",
+            "offset": float("nan"),
+            "path": r"C:\\INST\\RUNS",
+            "channels": [1, 2, 3],
+        },
+        samples_in=[
+            LiquidSample(sample_no=i, machine_name="hte-xyz-01", volume_ml=2.5)
+            for i in range(3)
+        ]
+        + [SolidSample(plate_id=4534, sample_no=1234, machine_name="legacy")],
+    )
+    action.init_act()
+    return action
+
+
+def make_experiment(orch: MachineModel, server: MachineModel) -> Experiment:
+    experiment = Experiment(
+        orchestrator=orch,
+        experiment_name="ECHE_sub_CV",
+        experiment_uuid=uuid4(),
+        sequence_uuid=uuid4(),
+        experiment_params={"Vinit_vsRHE": 0.0, "Tval__s": 10.0, "gamry_i_range": "auto"},
+    )
+    experiment.init_exp()
+    experiment.dispatched_actions = [
+        make_action(orch, server, f"act{i}") for i in range(10)
+    ]
+    return experiment
+
+
+def make_globalstatus(orch: MachineModel) -> GlobalStatusModel:
+    gsm = GlobalStatusModel(orchestrator=orch)
+    for i in range(20):
+        server = MachineModel(server_name=f"SERVER{i}", machine_name="hte-xyz-01")
+        endpoints = {}
+        for name in ("run_CA", "run_CV", "move"):
+            finished = {}
+            for _ in range(5):
+                act = make_action(orch, server, name)
+                act.action_status = [HloStatus.finished]
+                finished[act.action_uuid] = act
+            endpoints[name] = EndpointModel(
+                endpoint_name=name, nonactive_dict={HloStatus.finished: finished}
+            )
+        gsm.update_global_with_acts(
+            ActionServerModel(action_server=server, endpoints=endpoints)
+        )
+    return gsm
+
+
+def bench(label: str, obj, repeats: int):
+    assert materialize(obj.as_dict()) == materialize(legacy_as_dict(obj)), label
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        legacy_as_dict(obj)
+    t_legacy = (time.perf_counter() - t0) / repeats
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        obj.as_dict()
+    t_new = (time.perf_counter() - t0) / repeats
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        obj.as_json_bytes()
+    t_json = (time.perf_counter() - t0) / repeats
+    print(
+        f"{label:<20} legacy {t_legacy * 1e3:8.3f} ms  as_dict {t_new * 1e3:8.3f} ms"
+        f"  ({t_legacy / t_new:5.1f}x)  as_json_bytes {t_json * 1e3:8.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    orch = MachineModel(server_name="ORCH", machine_name="hte-xyz-01")
+    server = MachineModel(server_name="PSTAT", machine_name="hte-xyz-01")
+    bench("Action", make_action(orch, server, "run_CV"), REPEATS)
+    bench("Experiment", make_experiment(orch, server), max(1, REPEATS // 10))
+    bench("GlobalStatusModel", make_globalstatus(orch), max(1, REPEATS // 50))
@@ -0,0 +1,158 @@
+"""
+Benchmark of helpers.parquet.hlo_to_parquet against the previous implementation
+(json.loads per line, a pandas DataFrame with inferred dtypes per chunk of 100
+lines) on synthetic spectrometer and potentiostat .hlo files.
+
+Each conversion runs in a fresh process; peak memory is the tracemalloc peak
+plus the peak of the Arrow memory pool.
+
+usage: python helao/core/tests/bench_hlo_to_parquet.py [lines] [channels]
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import tracemalloc
+import multiprocessing
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from helao.helpers.parquet import hlo_to_parquet, read_hlo_header
+
+LINES = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+CHANNELS = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+
+
+def legacy_read_hlo_data_chunks(file_path, data_start_index, chunk_size=100):
+    with open(file_path) as f:
+        chunkd = defaultdict(list)
+        for i, line in enumerate(f):
+            if i < data_start_index:
+                continue
+            jd = json.loads(line.strip())
+            for k, val in jd.items():
+                if isinstance(val, list):
+                    chunkd[k] += val
+                else:
+                    chunkd[k].append(val)
+            if (i - data_start_index + 1) % chunk_size == 0:
+                yield dict(chunkd), max([len(v) for v in chunkd.values()])
+                chunkd = defaultdict(list)
+    if chunkd:
+        yield dict(chunkd), max([len(v) for v in chunkd.values()])
+
+
+def legacy_hlo_to_parquet(input_hlo_path, output_parquet_path, HISPEC=False):
+    writer = None
+    metadata = None
+    current_idx = 0
+    header, data_start = read_hlo_header(input_hlo_path)
+    if HISPEC:
+        df_headers_all = list(map(float, [0] + header["optional"]["wl"]))
+    for chunk, chunklen in legacy_read_hlo_data_chunks(input_hlo_path, data_start):
+        df0 = pd.DataFrame(chunk, index=range(current_idx, current_idx + chunklen))
+        if current_idx == 0:
+            start_ticktime = df0.iloc[0, 0]
+        if HISPEC:
+            df0.iloc[:, 0] = df0.iloc[:, 0].apply(lambda x: x - start_ticktime)
+            df0.columns = df_headers_all
+            df = df0.iloc[:, 1:-1]
+            df = df.T.groupby(df.columns // 1).mean().T
+            df.insert(0, "t_s", df0.iloc[:, 0])
+            df.columns = df.columns.astype(str)
+            table = pa.Table.from_pandas(df)
+        else:
+            table = pa.Table.from_pandas(df0)
+        current_idx += chunklen
+        if metadata is None:
+            custom_metadata = json.dumps(header.get("optional", {})).encode("utf8")
+            metadata = {"helao_metadata": custom_metadata, **table.schema.metadata}
+        table = table.replace_schema_metadata(metadata)
+        if writer is None:
+            writer = pq.ParquetWriter(output_parquet_path, table.schema)
+        writer.write_table(table)
+    if writer:
+        writer.close()
+
+
+def write_spec_hlo(path: str, lines: int, channels: int):
+    """One spectrum per line, keyed tick_time, ch_0 .. ch_n."""
+    wl = np.linspace(300.0, 1000.0, channels).round(3).tolist()
+    rng = np.random.default_rng(0)
+    with open(path, "w") as f:
+        f.write(f"hlo_version: '2024.04.18'\noptional:\n  wl: {json.dumps(wl)}\n%%\n")
+        for i in range(lines):
+            row = {"tick_time": 1.7e9 + 0.01 * i}
+            row.update(
+                {f"ch_{j}": v for j, v in enumerate(rng.random(channels).round(6))}
+            )
+            f.write(json.dumps(row) + "\n")
+
+
+def write_pstat_hlo(path: str, lines: int, points: int = 100):
+    """Blocks of `points` potentiostat points per line."""
+    rng = np.random.default_rng(0)
+    with open(path, "w") as f:
+        f.write("hlo_version: '2024.04.18'\noptional: {}\n%%\n")
+        for i in range(lines):
+            t = (i * points + np.arange(points)) * 1e-3
+            row = {
+                "t_s": t.tolist(),
+                "Ewe_V": rng.random(points).round(6).tolist(),
+                "I_A": (rng.random(points) * 1e-3).tolist(),
+                "cycle": [i // 100] * points,
+            }
+            f.write(json.dumps(row) + "\n")
+
+
+def _run(fn_name: str, hlo_path: str, pq_path: str, hispec: bool, queue):
+    fn = legacy_hlo_to_parquet if fn_name == "legacy" else hlo_to_parquet
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn(hlo_path, pq_path, HISPEC=hispec)
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1] + pa.default_memory_pool().max_memory()
+    queue.put((elapsed, peak))
+
+
+def run(fn_name: str, hlo_path: str, pq_path: str, hispec: bool):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run, args=(fn_name, hlo_path, pq_path, hispec, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def bench(label: str, hlo_path: str, hispec: bool):
+    size_mb = os.path.getsize(hlo_path) / 1e6
+    legacy_path = hlo_path + ".legacy.parquet"
+    new_path = hlo_path + ".parquet"
+    t_legacy, m_legacy = run("legacy", hlo_path, legacy_path, hispec)
+    t_new, m_new = run("new", hlo_path, new_path, hispec)
+    old = pd.read_parquet(legacy_path).reset_index(drop=True)
+    new = pd.read_parquet(new_path)
+    pd.testing.assert_frame_equal(old, new)
+    print(
+        f"{label:<8} {size_mb:7.1f} MB  legacy {size_mb / t_legacy:6.1f} MB/s"
+        f" {m_legacy / 1e6:7.1f} MB peak  streaming {size_mb / t_new:6.1f} MB/s"
+        f" {m_new / 1e6:7.1f} MB peak  ({t_legacy / t_new:4.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmpdir:
+        spec_path = os.path.join(tmpdir, "spec.hlo")
+        write_spec_hlo(spec_path, LINES, CHANNELS)
+        bench("HISPEC", spec_path, hispec=True)
+        bench("spec", spec_path, hispec=False)
+        pstat_path = os.path.join(tmpdir, "pstat.hlo")
+        write_pstat_hlo(pstat_path, LINES)
+        bench("pstat", pstat_path, hispec=False)
@@ -0,0 +1,182 @@
+"""
+Checks of DeviceIOExecutor call ordering, cancellation and shutdown, and of
+the driver calls routed through it.
+
+usage: python -m pytest helao/core/tests/test_device_io.py
+"""
+
+import asyncio
+import threading
+from concurrent.futures import CancelledError
+
+import pytest
+
+from helao.core.drivers.device_io import DeviceIOExecutor, IOPriority
+from helao.core.drivers.helao_driver import (
+    DriverPoller,
+    DriverResponse,
+    DriverStatus,
+    HelaoDriver,
+)
+
+TIMEOUT = 5
+
+
+def block(io: DeviceIOExecutor):
+    """Occupy the device thread until the returned event is set."""
+    started, release = threading.Event(), threading.Event()
+
+    def hold():
+        started.set()
+        release.wait(TIMEOUT)
+
+    future = io.submit(hold, label="hold")
+    assert started.wait(TIMEOUT)
+    return future, release
+
+
+def test_priority_ordering():
+    io = DeviceIOExecutor("test")
+    calls = []
+    held, release = block(io)
+    futures = [
+        io.submit(calls.append, name, priority=priority)
+        for name, priority in [
+            ("poll1", IOPriority.poll),
+            ("cmd1", IOPriority.command),
+            ("poll2", IOPriority.poll),
+            ("stop", IOPriority.stop),
+            ("cmd2", IOPriority.command),
+        ]
+    ]
+    assert io.stats()["busy"] == "hold"
+    release.set()
+    for future in [held] + futures:
+        future.result(TIMEOUT)
+    # stop first, then commands, then polls, in submit order within each
+    assert calls == ["stop", "cmd1", "cmd2", "poll1", "poll2"]
+    stats = io.stats()
+    assert stats["queued"] == 0 and stats["busy"] is None
+    assert stats["calls"]["append"]["run_time"]["count"] == 5
+    io.shutdown()
+
+
+def test_calls_run_on_one_thread_and_raise():
+    io = DeviceIOExecutor("test")
+
+    def fail():
+        raise ValueError("no answer")
+
+    async def run():
+        names = {
+            await io.call(lambda: threading.current_thread().name) for _ in range(5)
+        }
+        with pytest.raises(ValueError):
+            await io.call(fail)
+        return names
+
+    assert asyncio.run(run()) == {"io-test"}
+    io.shutdown()
+
+
+def test_cancelled_calls_are_skipped():
+    io = DeviceIOExecutor("test")
+    calls = []
+    held, release = block(io)
+    skipped = io.submit(calls.append, "skipped")
+    assert skipped.cancel()
+
+    async def run():
+        task = asyncio.ensure_future(io.call(calls.append, "awaited"))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+        return await io.call(calls.append, "after")
+
+    asyncio.run(run())
+    held.result(TIMEOUT)
+    assert calls == ["after"]
+    io.shutdown()
+
+
+def test_shutdown_cancels_queued_calls():
+    io = DeviceIOExecutor("test")
+    calls = []
+    held, release = block(io)
+    queued = [io.submit(calls.append, i) for i in range(3)]
+    io.shutdown()
+    assert all(future.cancelled() for future in queued)
+    with pytest.raises(RuntimeError):
+        io.submit(calls.append, "late")
+    # the call in progress completes, then the thread exits
+    release.set()
+    held.result(TIMEOUT)
+    io._thread.join(TIMEOUT)
+    assert not io._thread.is_alive()
+    assert calls == []
+    with pytest.raises(CancelledError):
+        queued[0].result(0)
+
+    # shutting down an executor that never ran a call starts no thread
+    idle = DeviceIOExecutor("idle")
+    idle.shutdown()
+    assert idle._thread is None
+
+
+class ThreadDriver(HelaoDriver):
+    """Driver recording the thread each of its calls runs on."""
+
+    def __init__(self, offload_io: bool):
+        super().__init__()
+        self.offload_io = offload_io
+        self.threads = {}
+
+    def _record(self, name):
+        self.threads[name] = threading.current_thread().name
+        return DriverResponse(status=DriverStatus.ok)
+
+    def connect(self):
+        return self._record("connect")
+
+    def get_status(self):
+        return self._record("get_status")
+
+    def stop(self):
+        return self._record("stop")
+
+    def reset(self):
+        return self._record("reset")
+
+    def disconnect(self):
+        return self._record("disconnect")
+
+
+class ThreadPoller(DriverPoller):
+    def get_data(self):
+        self.driver.threads["get_data"] = threading.current_thread().name
+        return DriverResponse(data={"value": 1.0})
+
+
+@pytest.mark.parametrize("offload_io", [True, False])
+def test_poller_follows_driver_offload(offload_io):
+    driver = ThreadDriver(offload_io)
+
+    async def run():
+        poller = ThreadPoller(driver, wait_time=0.01)
+        for _ in range(100):
+            if poller.live_dict:
+                break
+            await asyncio.sleep(0.01)
+        poller.poll_signal_task.cancel()
+        poller.polling_task.cancel()
+        await driver.aio.stop()
+        return poller.live_dict
+
+    assert asyncio.run(run())["value"] == 1.0
+    loop_thread = threading.current_thread().name
+    expected = "io-ThreadDriver" if offload_io else loop_thread
+    assert driver.threads["get_data"] == expected
+    assert driver.threads["stop"] == "io-ThreadDriver"
+    driver.io.shutdown()
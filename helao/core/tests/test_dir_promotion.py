@@ -0,0 +1,230 @@
+"""
+Checks of the promotion of run directories out of RUNS_ACTIVE: whole action
+dir rename, per-file fallback, verified copies across devices, resumption of
+journaled promotions, and the yml being moved last.
+
+usage: python -m pytest helao/core/tests/test_dir_promotion.py
+"""
+
+import os
+import errno
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+import helao.helpers.dir_promotion as dir_promotion
+import helao.helpers.yml_finisher as yml_finisher
+from helao.core.models.machine import MachineModel
+from helao.helpers.dir_promotion import promote_entry, promote_file
+from helao.helpers.premodels import Action, Experiment
+from helao.helpers.yml_finisher import move_dir, resume_promotions
+
+EXP_YML = "240501.120000000000-exp.yml"
+ACT_YML = "240501.120001000000-act.yml"
+
+
+def write(path: str, text: str = ""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def read(path: str) -> str:
+    with open(path) as f:
+        return f.read()
+
+
+def make_run(tmp_path):
+    """Base stub and an experiment with one action under RUNS_ACTIVE."""
+    save_root = str(tmp_path / "RUNS_ACTIVE")
+    base = SimpleNamespace(
+        helaodirs=SimpleNamespace(
+            save_root=save_root, states_root=str(tmp_path / "STATES")
+        ),
+        world_cfg={},
+        server=MachineModel(server_name="SPEC", machine_name="hte-xyz-01"),
+    )
+    experiment = Experiment(
+        experiment_name="TEST_exp",
+        experiment_timestamp=datetime(2024, 5, 1, 12, 0, 0),
+        sequence_output_dir="24.17/20240501/120000__TEST_seq",
+    )
+    experiment.experiment_output_dir = experiment.get_experiment_dir()
+    action = Action(
+        action_name="acquire",
+        action_server=base.server,
+        action_timestamp=datetime(2024, 5, 1, 12, 0, 1),
+        experiment_output_dir=experiment.experiment_output_dir,
+    )
+    action.action_output_dir = action.get_action_dir()
+    exp_dir = os.path.join(save_root, experiment.experiment_output_dir)
+    act_dir = os.path.join(save_root, action.action_output_dir)
+    write(os.path.join(exp_dir, EXP_YML), "exp")
+    write(os.path.join(exp_dir, "exp_notes.txt"), "notes")
+    write(os.path.join(act_dir, ACT_YML), "act")
+    write(os.path.join(act_dir, "spec.hlo"), "%%\n" + "1.0\n" * 1000)
+    write(os.path.join(act_dir, "sub", "frame.bin"), "frame")
+    return base, experiment, action
+
+
+def finished(path: str) -> str:
+    return path.replace("RUNS_ACTIVE", "RUNS_FINISHED")
+
+
+def pending(base) -> list:
+    return base.promotion_journal.pending()
+
+
+def record_replace(monkeypatch) -> list:
+    """Names of the files moved out of RUNS_ACTIVE by os.replace, in order."""
+    replaced = []
+    real_replace = os.replace
+
+    def replace(src, dst):
+        if "RUNS_ACTIVE" in src:
+            replaced.append(os.path.basename(src))
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(dir_promotion.os, "replace", replace)
+    return replaced
+
+
+def test_action_dir_is_renamed_whole(tmp_path, monkeypatch):
+    base, _, action = make_run(tmp_path)
+    act_dir = os.path.join(base.helaodirs.save_root, action.action_output_dir)
+    replaced = record_replace(monkeypatch)
+    assert asyncio.run(move_dir(action, base=base))
+    assert not os.path.exists(act_dir)
+    assert sorted(os.listdir(finished(act_dir))) == [ACT_YML, "spec.hlo", "sub"]
+    assert read(os.path.join(finished(act_dir), "sub", "frame.bin")) == "frame"
+    # one directory rename, no file moves
+    assert replaced == []
+    assert pending(base) == []
+
+
+def test_existing_destination_falls_back_to_files(tmp_path, monkeypatch):
+    base, _, action = make_run(tmp_path)
+    act_dir = os.path.join(base.helaodirs.save_root, action.action_output_dir)
+    # e.g. a previous partial promotion left the destination behind
+    write(os.path.join(finished(act_dir), "spec.hlo"), "stale")
+    write(os.path.join(finished(act_dir), "other.txt"), "other")
+    replaced = record_replace(monkeypatch)
+    assert asyncio.run(move_dir(action, base=base))
+    assert not os.path.exists(act_dir)
+    assert read(os.path.join(finished(act_dir), "spec.hlo")).startswith("%%")
+    assert read(os.path.join(finished(act_dir), "other.txt")) == "other"
+    assert sorted(replaced) == sorted([ACT_YML, "spec.hlo", "frame.bin"])
+    # the yml goes last
+    assert replaced[-1] == ACT_YML
+
+
+def exdev_replace(monkeypatch):
+    """Renames out of RUNS_ACTIVE failing with EXDEV, as across devices."""
+    real_replace, real_rename = os.replace, os.rename
+
+    def replace(src, dst):
+        if "RUNS_ACTIVE" in src:
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        return real_replace(src, dst)
+
+    def rename(src, dst):
+        if "RUNS_ACTIVE" in src:
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        return real_rename(src, dst)
+
+    monkeypatch.setattr(dir_promotion.os, "replace", replace)
+    monkeypatch.setattr(dir_promotion.os, "rename", rename)
+
+
+def test_cross_device_moves_are_verified_copies(tmp_path, monkeypatch):
+    base, _, action = make_run(tmp_path)
+    act_dir = os.path.join(base.helaodirs.save_root, action.action_output_dir)
+    original = read(os.path.join(act_dir, "spec.hlo"))
+    exdev_replace(monkeypatch)
+    counts = []
+    real_promote_entry = yml_finisher.promote_entry
+    monkeypatch.setattr(
+        yml_finisher,
+        "promote_entry",
+        lambda entry: counts.append(real_promote_entry(entry)) or counts[-1],
+    )
+    assert asyncio.run(move_dir(action, base=base))
+    assert counts == [{"renamed": 0, "copied": 3, "skipped": 0}]
+    assert not os.path.exists(act_dir)
+    assert read(os.path.join(finished(act_dir), "spec.hlo")) == original
+    leftovers = [
+        name
+        for _, _, names in os.walk(finished(act_dir))
+        for name in names
+        if name.endswith(".part")
+    ]
+    assert leftovers == []
+
+
+def test_checksum_mismatch_keeps_source(tmp_path, monkeypatch):
+    src = str(tmp_path / "RUNS_ACTIVE" / "data.hlo")
+    dst = finished(src)
+    write(src, "data")
+    exdev_replace(monkeypatch)
+    monkeypatch.setattr(dir_promotion, "_file_digest", lambda path: "corrupt")
+    with pytest.raises(OSError, match="checksum mismatch"):
+        promote_file(src, dst)
+    assert read(src) == "data"
+    assert not os.path.exists(dst) and not os.path.exists(f"{dst}.part")
+
+
+def test_half_done_promotion_resumes_idempotently(tmp_path, monkeypatch):
+    base, experiment, action = make_run(tmp_path)
+    exp_dir = os.path.join(base.helaodirs.save_root, experiment.experiment_output_dir)
+    act_dir = os.path.join(base.helaodirs.save_root, action.action_output_dir)
+
+    async def crash(entry, base, retry_delay=5):
+        # journaled, then the server dies after moving the first file
+        src, dst = entry["moves"][0]
+        promote_file(src, dst)
+        return False
+
+    monkeypatch.setattr(yml_finisher, "run_promotion", crash)
+    assert asyncio.run(move_dir(action, base=base)) is False
+    monkeypatch.undo()
+    (entry,) = pending(base)
+    assert os.path.isdir(act_dir) and os.path.isdir(finished(act_dir))
+
+    # on restart the entry is run again, the moved file is skipped
+    counts = []
+    real_promote_entry = yml_finisher.promote_entry
+    monkeypatch.setattr(
+        yml_finisher,
+        "promote_entry",
+        lambda entry: counts.append(real_promote_entry(entry)) or counts[-1],
+    )
+    asyncio.run(resume_promotions(base))
+    assert counts == [{"renamed": 2, "copied": 0, "skipped": 1}]
+    assert not os.path.exists(act_dir)
+    assert sorted(os.listdir(finished(act_dir))) == [ACT_YML, "spec.hlo", "sub"]
+    assert pending(base) == []
+
+    # running the same entry once more changes nothing
+    assert promote_entry(entry) == {"renamed": 0, "copied": 0, "skipped": 3}
+    asyncio.run(resume_promotions(base))
+    assert len(counts) == 1
+    assert sorted(os.listdir(finished(act_dir))) == [ACT_YML, "spec.hlo", "sub"]
+    # the experiment dir is untouched
+    assert sorted(os.listdir(exp_dir)) == [EXP_YML, "exp_notes.txt"]
+
+
+def test_experiment_yml_is_moved_last(tmp_path, monkeypatch):
+    base, experiment, action = make_run(tmp_path)
+    exp_dir = os.path.join(base.helaodirs.save_root, experiment.experiment_output_dir)
+    act_dir = os.path.join(base.helaodirs.save_root, action.action_output_dir)
+    asyncio.run(move_dir(action, base=base))
+    write(os.path.join(exp_dir, "zz_last_by_name.txt"), "z")
+    replaced = record_replace(monkeypatch)
+    assert asyncio.run(move_dir(experiment, base=base))
+    assert replaced[-1] == EXP_YML
+    assert sorted(replaced) == [EXP_YML, "exp_notes.txt", "zz_last_by_name.txt"]
+    assert not os.path.exists(exp_dir)
+    assert os.path.isdir(finished(act_dir))
+    assert pending(base) == []
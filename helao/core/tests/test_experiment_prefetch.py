@@ -0,0 +1,122 @@
+"""
+Checks that an experiment unpacked ahead of dispatch by the orch prefetch and
+restamped at dispatch equals the same experiment unpacked inline at dispatch.
+
+usage: python -m pytest helao/core/tests/test_experiment_prefetch.py
+"""
+
+from datetime import datetime
+from types import MethodType, SimpleNamespace
+from uuid import UUID
+
+import helao.core.servers.orch as orch
+import helao.helpers.premodels as premodels
+from helao.core.models.machine import MachineModel
+from helao.helpers.premodels import ActionPlanMaker, Experiment
+from helao.helpers.zdeque import zdeque
+
+STAGED_AT = datetime(2024, 5, 1, 12, 0, 0)
+DISPATCHED_AT = datetime(2024, 5, 1, 12, 7, 30, 250000)
+
+
+def TEST_measure(experiment: Experiment, volume_ul: float = 10.0, cycles: int = 2):
+    apm = ActionPlanMaker()
+    apm.add("PAL", "archive_custom_load", {"volume_ul": apm.pars.volume_ul})
+    for _ in range(apm.pars.cycles):
+        apm.add(
+            "PSTAT",
+            "run_CA",
+            {"Tval__s": 1.0},
+            process_finish=True,
+            process_contrib=["files"],
+        )
+    apm.add("PAL", "archive_custom_unload", {}, process_contrib=["samples_out"])
+    return apm.planned_actions
+
+
+def make_orch():
+    fake = SimpleNamespace(
+        orch_key="O1",
+        orch_host="127.0.0.1",
+        orch_port=8001,
+        ntp_offset=0.0,
+        server=MachineModel(server_name="ORCH", machine_name="hte-xyz-01"),
+        world_cfg={
+            "servers": {
+                "PAL": {"host": "127.0.0.1", "port": 8003},
+                "PSTAT": {"host": "127.0.0.1", "port": 8004},
+            }
+        },
+        experiment_lib={"TEST_measure": TEST_measure},
+        experiment_codehash_lib={"TEST_measure": "abc123"},
+        experiment_codepath_lib={"TEST_measure": "helao/experiments/test_exp.py"},
+    )
+    fake.stage_experiment = MethodType(orch.Orch.stage_experiment, fake)
+    return fake
+
+
+def patch_clock_and_uuids(monkeypatch, now: datetime):
+    """Fix set_time to `now` and restart gen_uuid from the same sequence."""
+    counter = iter(range(10**6))
+
+    def gen_uuid(*args, **kwargs):
+        return UUID(int=next(counter))
+
+    monkeypatch.setattr(premodels, "set_time", lambda offset=0: now)
+    monkeypatch.setattr(premodels, "gen_uuid", gen_uuid)
+    monkeypatch.setattr(orch, "gen_uuid", gen_uuid)
+
+
+def dumps(staged: orch.StagedExperiment):
+    return (
+        staged.experiment.model_dump(),
+        [act.model_dump() for act in staged.actions],
+        staged.exp_model.model_dump(),
+    )
+
+
+def test_restamped_prefetch_matches_inline(monkeypatch):
+    context = (UUID(int=10**7), "campaign", UUID(int=10**7 + 1), None, "standard")
+    experiment_dq = zdeque()
+    experiment_dq.append(
+        Experiment(
+            experiment_name="TEST_measure",
+            experiment_params={"volume_ul": 25.0, "cycles": 3},
+            sequence_output_dir="RUNS_ACTIVE/20240501/seq",
+        )
+    )
+    raw = experiment_dq.raw(0)
+
+    fake = make_orch()
+    patch_clock_and_uuids(monkeypatch, STAGED_AT)
+    prefetched = orch.Orch._prefetch_experiment(fake, raw, context)
+    assert prefetched.experiment.experiment_timestamp == STAGED_AT
+
+    # dispatch time: the prefetched copy is restamped, the inline copy is
+    # unpacked from the same queue entry
+    patch_clock_and_uuids(monkeypatch, DISPATCHED_AT)
+    prefetched.restamp(DISPATCHED_AT)
+    inline = fake.stage_experiment(experiment_dq.popleft(), context)
+
+    assert prefetched.experiment.experiment_output_dir.startswith(
+        "RUNS_ACTIVE/20240501/seq/240501.120730__TEST_measure"
+    )
+    assert len(inline.actions) == 5
+    assert inline.experiment.process_list == prefetched.experiment.process_list
+    assert dumps(prefetched) == dumps(inline)
+
+
+def test_preset_timestamp_is_kept(monkeypatch):
+    context = (UUID(int=10**7), None, None, None, "standard")
+    experiment = Experiment(
+        experiment_name="TEST_measure",
+        experiment_timestamp=STAGED_AT,
+        sequence_output_dir="RUNS_ACTIVE/20240501/seq",
+    )
+    fake = make_orch()
+    patch_clock_and_uuids(monkeypatch, STAGED_AT)
+    staged = fake.stage_experiment(experiment, context)
+    staged.restamp(DISPATCHED_AT)
+    assert staged.experiment.experiment_timestamp == STAGED_AT
+    assert {act.experiment_timestamp for act in staged.actions} == {STAGED_AT}
+
@@ -0,0 +1,275 @@
+"""
+Checks of GlobalStatusModel's indexed status sorting against the previous
+implementation, which re-sorted every endpoint of every server on each
+status update.
+
+usage: python helao/core/tests/test_global_status_model.py [steps]
+"""
+
+import sys
+import random
+from copy import deepcopy
+from uuid import uuid4
+
+from helao.core.models.hlostatus import HloStatus
+from helao.core.models.machine import MachineModel
+from helao.core.models.server import (
+    ActionServerModel,
+    EndpointModel,
+    GlobalStatusModel,
+)
+from helao.helpers.premodels import Action
+
+STEPS = 3000
+
+
+class LegacyGlobalStatusModel(GlobalStatusModel):
+    """GlobalStatusModel with the previous full re-sort on every update."""
+
+    def server_free(self, action_server: MachineModel) -> bool:
+        actionservermodel = self.server_dict.get(action_server.as_key())
+        if actionservermodel is None:
+            return True
+        return not any(
+            statusmodel.orchestrator == self.orchestrator
+            for endpointmodel in actionservermodel.endpoints.values()
+            for statusmodel in endpointmodel.active_dict.values()
+        )
+
+    def endpoint_free(self, action_server: MachineModel, endpoint_name: str) -> bool:
+        actionservermodel = self.server_dict.get(action_server.as_key())
+        if actionservermodel is None:
+            return True
+        endpointmodel = actionservermodel.endpoints.get(endpoint_name)
+        if endpointmodel is None:
+            return True
+        return not any(
+            statusmodel.orchestrator == self.orchestrator
+            for statusmodel in endpointmodel.active_dict.values()
+        )
+
+    def _sort_status(self):
+        recent_nonactive = []
+        for actionservermodel in self.server_dict.values():
+            for endpointmodel in actionservermodel.endpoints.values():
+                endpointmodel.sort_status()
+                for uuid, statusmodel in endpointmodel.active_dict.items():
+                    if statusmodel.orchestrator == self.orchestrator:
+                        self.active_dict.update({uuid: statusmodel})
+                for hlostatus, status_dict in endpointmodel.nonactive_dict.items():
+                    for uuid, statusmodel in status_dict.items():
+                        if statusmodel.orchestrator == self.orchestrator:
+                            if uuid in self.active_dict:
+                                del self.active_dict[uuid]
+                                recent_nonactive.append((uuid, hlostatus.name))
+                            if hlostatus not in self.nonactive_dict:
+                                self.nonactive_dict[hlostatus] = {}
+                            self.nonactive_dict[hlostatus].update({uuid: statusmodel})
+        return recent_nonactive
+
+    def update_global_with_acts(self, actionservermodel: ActionServerModel):
+        server_key = actionservermodel.action_server.as_key()
+        if server_key not in self.server_dict:
+            self.server_dict.update({server_key: actionservermodel})
+        else:
+            self.server_dict[server_key].endpoints.update(actionservermodel.endpoints)
+        return self._sort_status()
+
+    def register_dispatched(self, server_key, action: Action):
+        endpointmodel = self.server_dict[server_key].endpoints[action.action_name]
+        uuid = action.action_uuid
+        if HloStatus.active in action.action_status:
+            self.active_dict[uuid] = action
+            endpointmodel.active_dict[uuid] = action
+            return
+        for actstat in action.action_status:
+            if uuid in self.nonactive_dict.get(actstat, {}):
+                break
+            self.nonactive_dict.setdefault(actstat, {})[uuid] = action
+            endpointmodel.nonactive_dict.setdefault(actstat, {})[uuid] = action
+
+    def find_hlostatus_in_finished(self, hlostatus: HloStatus):
+        if hlostatus in self.nonactive_dict:
+            return dict(self.nonactive_dict[hlostatus])
+        return {
+            uuid: statusmodel
+            for uuid, statusmodel in self.nonactive_dict.get(
+                HloStatus.finished, {}
+            ).items()
+            if hlostatus in statusmodel.action_status
+        }
+
+
+class SimServer:
+    """Action server reporting its endpoints like Base.log_status_task:
+    finished actions are sent once, then cleared."""
+
+    def __init__(self, machine: MachineModel, endpoints: list):
+        self.machine = machine
+        self.active = {name: {} for name in endpoints}
+        self.finished = {name: {} for name in endpoints}
+
+    def start(self, endpoint: str, orch: MachineModel) -> Action:
+        action = Action(
+            action_name=endpoint,
+            action_server=self.machine,
+            orchestrator=orch,
+            action_uuid=uuid4(),
+            action_status=[HloStatus.active],
+        )
+        self.active[endpoint][action.action_uuid] = action
+        return action
+
+    def finish(self, endpoint: str, uuid, extra_status: list = []) -> Action:
+        action = self.active[endpoint].pop(uuid)
+        action = action.model_copy(
+            update={"action_status": [HloStatus.finished] + extra_status}
+        )
+        self.finished[endpoint][HloStatus.finished] = {
+            **self.finished[endpoint].get(HloStatus.finished, {}),
+            uuid: action,
+        }
+        for hlostatus in extra_status:
+            if hlostatus == HloStatus.errored:
+                self.finished[endpoint].setdefault(hlostatus, {})[uuid] = action
+        return action
+
+    def publish(self, endpoint: str) -> ActionServerModel:
+        endpointmodel = EndpointModel(
+            endpoint_name=endpoint,
+            active_dict=dict(self.active[endpoint]),
+            nonactive_dict={k: dict(v) for k, v in self.finished[endpoint].items()},
+        )
+        self.finished[endpoint] = {}
+        return ActionServerModel(
+            action_server=self.machine, endpoints={endpoint: endpointmodel}
+        )
+
+
+def apply(models: list, update: ActionServerModel) -> list:
+    return [model.update_global_with_acts(deepcopy(update)) for model in models]
+
+
+def assert_same(new: GlobalStatusModel, old: GlobalStatusModel, servers, step):
+    assert set(new.active_dict) == set(old.active_dict), step
+    assert new.actions_idle() == old.actions_idle(), step
+    for server in servers:
+        assert new.server_free(server.machine) == old.server_free(server.machine), step
+        for endpoint in server.active:
+            assert new.endpoint_free(server.machine, endpoint) == old.endpoint_free(
+                server.machine, endpoint
+            ), (step, endpoint)
+    for hlostatus in (HloStatus.errored, HloStatus.estopped, HloStatus.finished):
+        assert set(new.find_hlostatus_in_finished(hlostatus)) == set(
+            old.find_hlostatus_in_finished(hlostatus)
+        ), (step, hlostatus)
+    assert {k: set(v) for k, v in new.nonactive_dict.items() if v} == {
+        k: set(v) for k, v in old.nonactive_dict.items() if v
+    }, step
+
+
+def make_models(orch: MachineModel, servers: list):
+    new = GlobalStatusModel(orchestrator=orch)
+    old = LegacyGlobalStatusModel(orchestrator=orch)
+    for server in servers:
+        for endpoint in server.active:
+            apply([new, old], server.publish(endpoint))
+    return new, old
+
+
+def test_randomized_updates_match_legacy(steps: int = STEPS, seed: int = 1):
+    rng = random.Random(seed)
+    orch = MachineModel(server_name="ORCH", machine_name="hte-xyz-01")
+    other = MachineModel(server_name="ORCH2", machine_name="hte-xyz-01")
+    servers = [
+        SimServer(MachineModel(server_name=f"SERVER{i}", machine_name="hte-xyz-01"), ["a", "b", "c"])
+        for i in range(5)
+    ]
+    new, old = make_models(orch, servers)
+    for step in range(steps):
+        server = rng.choice(servers)
+        endpoint = rng.choice(list(server.active))
+        if rng.random() < 0.5 or not server.active[endpoint]:
+            action = server.start(endpoint, rng.choice([orch, orch, other]))
+            if action.orchestrator == orch and rng.random() < 0.5:
+                # dispatch response ahead of the status update
+                for model in (new, old):
+                    model.register_dispatched(server.machine.as_key(), action.model_copy())
+        else:
+            uuid = rng.choice(list(server.active[endpoint]))
+            server.finish(
+                endpoint,
+                uuid,
+                rng.choice([[], [], [HloStatus.errored], [HloStatus.estopped]]),
+            )
+        recent_new, recent_old = apply([new, old], server.publish(endpoint))
+        assert sorted(recent_new) == sorted(recent_old), step
+        assert_same(new, old, servers, step)
+    # finished actions are only remembered while servers still report them
+    assert len(new._sorted_nonactive) <= sum(
+        len(server.active) for server in servers
+    )
+
+
+def test_dispatch_response_after_finish():
+    orch = MachineModel(server_name="ORCH", machine_name="hte-xyz-01")
+    servers = [
+        SimServer(MachineModel(server_name=f"SERVER{i}", machine_name="hte-xyz-01"), ["a", "b"])
+        for i in range(2)
+    ]
+    new, old = make_models(orch, servers)
+    server = servers[0]
+    server_key = server.machine.as_key()
+    action = server.start("a", orch)
+    apply([new, old], server.publish("a"))
+    server.finish("a", action.action_uuid)
+    apply([new, old], server.publish("a"))
+    # the fast action's dispatch response arrives after its finished status
+    for model in (new, old):
+        model.register_dispatched(server_key, action.model_copy())
+    assert new.actions_idle()
+    assert new.endpoint_free(server.machine, "a")
+    apply([new, old], servers[1].publish("b"))
+    assert set(new.active_dict) == set(old.active_dict)
+    assert new.actions_idle() and old.actions_idle()
+
+    # the next update of the same endpoint no longer reports the action,
+    # which stays neither active nor sorted
+    apply([new], server.publish("a"))
+    assert new.actions_idle()
+    assert action.action_uuid not in new._sorted_nonactive
+
+    # an action registered active but dropped by the server is not active
+    dropped = server.start("b", orch)
+    new.register_dispatched(server_key, dropped.model_copy())
+    assert not new.actions_idle()
+    server.active["b"].pop(dropped.action_uuid)
+    apply([new], server.publish("b"))
+    assert new.actions_idle()
+    assert new.server_free(server.machine)
+
+
+def test_clearing_finished_prunes_index():
+    orch = MachineModel(server_name="ORCH", machine_name="hte-xyz-01")
+    server = SimServer(MachineModel(server_name="SERVER0", machine_name="hte-xyz-01"), ["a"])
+    new, _ = make_models(orch, [server])
+    for i in range(50):
+        action = server.start("a", orch)
+        apply([new], server.publish("a"))
+        server.finish("a", action.action_uuid, [HloStatus.errored] if i % 2 else [])
+        apply([new], server.publish("a"))
+    assert len(new.find_hlostatus_in_finished(HloStatus.errored)) == 25
+    assert len(new._sorted_nonactive) <= 1
+    new.clear_in_finished(hlostatus=HloStatus.errored)
+    assert not new.find_hlostatus_in_finished(HloStatus.errored)
+    assert len(new._substatus.get(HloStatus.finished, {})) == 50
+    new.finish_experiment(exp_uuid=uuid4())
+    assert not new._substatus
+    assert not new.nonactive_dict
+
+
+if __name__ == "__main__":
+    test_randomized_updates_match_legacy(int(sys.argv[1]) if len(sys.argv) > 1 else STEPS)
+    test_dispatch_response_after_finish()
+    test_clearing_finished_prunes_index()
+    print("GlobalStatusModel matches the legacy status sorting.")
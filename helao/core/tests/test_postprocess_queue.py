@@ -0,0 +1,243 @@
+"""
+Checks of PostProcessQueue job submission, resumption after a restart and
+finalization of failed jobs, and of the interplay of its pending marker with
+the promotion of experiment and action directories by move_dir.
+
+usage: python -m pytest helao/core/tests/test_postprocess_queue.py
+"""
+
+import os
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+from helao.core.models.file import FileInfo
+from helao.core.models.machine import MachineModel
+from helao.helpers.hlo_postprocessor import find_run_yml
+from helao.helpers.postprocess_queue import POSTPROCESS_MARKER, PostProcessQueue
+from helao.helpers.premodels import Action, Experiment
+from helao.helpers.yml_finisher import move_dir
+
+TIMEOUT = 60
+
+PROCESSOR = '''
+import os
+import time
+
+from helao.core.models.file import FileInfo
+from helao.helpers.hlo_postprocessor import HloPostProcessor
+
+
+class PostProcess(HloPostProcessor):
+    def process(self):
+        params = self.action.action_params
+        release = params.get("release")
+        deadline = time.time() + 30
+        while release and not os.path.exists(release) and time.time() < deadline:
+            time.sleep(0.05)
+        if params.get("fail"):
+            raise RuntimeError("processor failed")
+        with open(os.path.join(self.output_dir, "processed.txt"), "w") as f:
+            f.write(f"{self.exp_yml_path}\\n{self.seq_yml_path}")
+        return self.files + [
+            FileInfo(file_name="processed.txt", file_type="processed__file")
+        ]
+'''
+
+
+def write(path: str, text: str = ""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def make_run(tmp_path, **action_params):
+    """An experiment with one action under RUNS_ACTIVE, with their yml files."""
+    save_root = str(tmp_path / "RUNS_ACTIVE")
+    experiment = Experiment(
+        experiment_name="TEST_exp",
+        experiment_timestamp=datetime(2024, 5, 1, 12, 0, 0),
+        sequence_output_dir="24.17/20240501/120000__TEST_seq",
+    )
+    experiment.experiment_output_dir = experiment.get_experiment_dir()
+    action = Action(
+        action_name="acquire",
+        action_server=MachineModel(server_name="SPEC", machine_name="hte-xyz-01"),
+        action_timestamp=datetime(2024, 5, 1, 12, 0, 1),
+        experiment_output_dir=experiment.experiment_output_dir,
+        action_params=action_params,
+        files=[FileInfo(file_name="spec.hlo", file_type="spec_helao__file")],
+    )
+    action.action_output_dir = action.get_action_dir()
+    seq_dir = os.path.join(save_root, experiment.sequence_output_dir)
+    exp_dir = os.path.join(save_root, experiment.experiment_output_dir)
+    act_dir = os.path.join(save_root, action.action_output_dir)
+    write(os.path.join(seq_dir, "240501.120000000000-seq.yml"), "seq")
+    write(os.path.join(exp_dir, "240501.120000000000-exp.yml"), "exp")
+    write(os.path.join(act_dir, "240501.120001000000-act.yml"), "act")
+    write(os.path.join(act_dir, "spec.hlo"), "%%\n")
+    return save_root, experiment, action
+
+
+def make_queue(tmp_path, on_done, **kwargs) -> PostProcessQueue:
+    kwargs.setdefault("retry_delay", 0)
+    return PostProcessQueue(str(tmp_path / "postprocess.db"), on_done, **kwargs)
+
+
+def processor_path(tmp_path) -> str:
+    path = str(tmp_path / "test_processor.py")
+    write(path, PROCESSOR)
+    return path
+
+
+class Done:
+    """on_done callback recording its calls."""
+
+    def __init__(self, then=None):
+        self.calls = []
+        self.event = asyncio.Event()
+        self.then = then
+
+    async def __call__(self, action, files, error):
+        self.calls.append((action, files, error))
+        if self.then is not None:
+            await self.then(action)
+        self.event.set()
+
+    async def wait(self):
+        await asyncio.wait_for(self.event.wait(), TIMEOUT)
+
+
+def test_submit_runs_processors(tmp_path):
+    save_root, _, action = make_run(tmp_path)
+    act_dir = os.path.join(save_root, action.action_output_dir)
+
+    async def run():
+        done = Done()
+        queue = make_queue(tmp_path, done)
+        job_id = queue.submit(action, [processor_path(tmp_path)], save_root)
+        with open(os.path.join(act_dir, POSTPROCESS_MARKER)) as f:
+            assert f.read() == job_id
+        await done.wait()
+        stats = queue.stats()
+        await queue.shutdown()
+        return done.calls, stats
+
+    calls, stats = asyncio.run(run())
+    (done_action, files, error), = calls
+    assert done_action.action_uuid == action.action_uuid and error is None
+    assert [f.file_name for f in files] == ["spec.hlo", "processed.txt"]
+    assert not os.path.exists(os.path.join(act_dir, POSTPROCESS_MARKER))
+    assert (stats["done"], stats["in_flight"]) == (1, 0)
+
+
+def test_interrupted_jobs_resume_on_start(tmp_path):
+    save_root, _, action = make_run(tmp_path)
+    act_dir = os.path.join(save_root, action.action_output_dir)
+
+    async def interrupt():
+        queue = make_queue(tmp_path, Done())
+        job_id = queue.submit(action, [processor_path(tmp_path)], save_root)
+        # the server stops while the job runs
+        queue._set(job_id, status="running", attempts=1)
+        await queue.shutdown()
+        return job_id
+
+    async def restart():
+        done = Done()
+        queue = make_queue(tmp_path, done)
+        assert queue.start() == 1
+        await done.wait()
+        jobs = queue.jobs()
+        await queue.shutdown()
+        return done.calls, jobs
+
+    job_id = asyncio.run(interrupt())
+    assert os.path.exists(os.path.join(act_dir, POSTPROCESS_MARKER))
+    calls, jobs = asyncio.run(restart())
+    assert len(calls) == 1 and calls[0][2] is None
+    assert [(j["job_id"], j["status"], j["attempts"]) for j in jobs] == [
+        (job_id, "done", 2)
+    ]
+    assert not os.path.exists(os.path.join(act_dir, POSTPROCESS_MARKER))
+
+
+def test_failed_job_is_finalized(tmp_path):
+    save_root, _, action = make_run(tmp_path, fail=True)
+    act_dir = os.path.join(save_root, action.action_output_dir)
+
+    async def run():
+        done = Done()
+        queue = make_queue(tmp_path, done, max_retries=1)
+        queue.submit(action, [processor_path(tmp_path)], save_root)
+        await done.wait()
+        jobs = queue.jobs(status="failed")
+        await queue.shutdown()
+        return done.calls, jobs
+
+    calls, jobs = asyncio.run(run())
+    (_, files, error), = calls
+    # on_done still runs, the action is finalized with its unprocessed files
+    assert files is None and "processor failed" in error
+    assert len(jobs) == 1 and jobs[0]["attempts"] == 2
+    assert not os.path.exists(os.path.join(act_dir, POSTPROCESS_MARKER))
+
+
+def test_experiment_promoted_while_action_postprocesses(tmp_path):
+    release = str(tmp_path / "release")
+    save_root, experiment, action = make_run(tmp_path, release=release)
+    finished_root = save_root.replace("RUNS_ACTIVE", "RUNS_FINISHED")
+    base = SimpleNamespace(
+        helaodirs=SimpleNamespace(save_root=save_root, states_root=None),
+        world_cfg={},
+    )
+    exp_dir = os.path.join(save_root, experiment.experiment_output_dir)
+    act_dir = os.path.join(save_root, action.action_output_dir)
+    finished_exp_dir = os.path.join(finished_root, experiment.experiment_output_dir)
+    finished_act_dir = os.path.join(finished_root, action.action_output_dir)
+
+    async def move_action(done_action):
+        # as Base.finish_postprocessed, without the act yml rewrite
+        await move_dir(done_action, base=base)
+
+    async def run():
+        done = Done(then=move_action)
+        queue = make_queue(tmp_path, done)
+        queue.submit(action, [processor_path(tmp_path)], save_root)
+        # the orch promotes the experiment before the job completes
+        await move_dir(experiment, base=base)
+        assert os.path.exists(os.path.join(act_dir, POSTPROCESS_MARKER))
+        assert os.listdir(exp_dir) == [os.path.basename(act_dir)]
+        assert os.listdir(finished_exp_dir) == ["240501.120000000000-exp.yml"]
+        write(release)
+        await done.wait()
+        await queue.shutdown()
+        return done.calls
+
+    calls = asyncio.run(run())
+    assert calls[0][2] is None
+    assert not os.path.exists(exp_dir)
+    assert sorted(os.listdir(finished_act_dir)) == [
+        "240501.120001000000-act.yml",
+        "processed.txt",
+        "spec.hlo",
+    ]
+    # the processor found the experiment yml in RUNS_FINISHED
+    with open(os.path.join(finished_act_dir, "processed.txt")) as f:
+        exp_yml_path, seq_yml_path = f.read().split("\n")
+    assert exp_yml_path == os.path.join(
+        finished_exp_dir, "240501.120000000000-exp.yml"
+    )
+    assert seq_yml_path == os.path.join(
+        save_root, experiment.sequence_output_dir, "240501.120000000000-seq.yml"
+    )
+
+
+def test_find_run_yml(tmp_path):
+    active = tmp_path / "RUNS_ACTIVE" / "seq" / "exp"
+    finished = tmp_path / "RUNS_FINISHED" / "seq" / "exp"
+    assert find_run_yml(str(active)) is None
+    write(str(finished / "exp.yml"))
+    assert find_run_yml(str(active)) == str(finished / "exp.yml")
+    write(str(active / "exp.yml"))
+    assert find_run_yml(str(active)) == str(active / "exp.yml")
@@ -0,0 +1,130 @@
+"""
+Checks of S3Uploader's upload, verify and retry paths against moto's
+in-memory S3.
+
+usage: python -m pytest helao/core/tests/test_s3_uploader.py
+"""
+
+import asyncio
+import hashlib
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+from botocore.exceptions import ClientError
+
+from helao.core.drivers.data.s3_uploader import S3Uploader
+
+BUCKET = "helao-test"
+
+
+class FlakyClient:
+    """S3 client failing the first `upload_failures` uploads, and optionally
+    every head_object with `head_error` or a wrong size."""
+
+    def __init__(self, s3, upload_failures=0, head_error=None, head_size=None):
+        self.s3 = s3
+        self.upload_failures = upload_failures
+        self.head_error = head_error
+        self.head_size = head_size
+        self.uploads = 0
+
+    def _upload(self, method, *args, **kwargs):
+        self.uploads += 1
+        if self.uploads <= self.upload_failures:
+            raise ConnectionError("connection reset")
+        return getattr(self.s3, method)(*args, **kwargs)
+
+    def upload_file(self, *args, **kwargs):
+        return self._upload("upload_file", *args, **kwargs)
+
+    def upload_fileobj(self, *args, **kwargs):
+        return self._upload("upload_fileobj", *args, **kwargs)
+
+    def head_object(self, **kwargs):
+        if self.head_error is not None:
+            raise ClientError(
+                {"Error": {"Code": self.head_error, "Message": "Forbidden"}},
+                "HeadObject",
+            )
+        head = self.s3.head_object(**kwargs)
+        if self.head_size is not None:
+            head["ContentLength"] = self.head_size
+        return head
+
+
+@pytest.fixture
+def s3():
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def make_uploader(client, **kwargs):
+    kwargs.setdefault("backoff_base", 0.001)
+    kwargs.setdefault("backoff_max", 0.01)
+    return S3Uploader(client, BUCKET, max_workers=2, **kwargs)
+
+
+def test_upload_bytes_file_and_callable(s3, tmp_path):
+    uploader = make_uploader(s3, verify=True)
+    path = tmp_path / "data.hlo"
+    path.write_bytes(b"%%\n" + b'{"t_s": 0.1}\n' * 1000)
+    payload = b'{"action_uuid": "abc"}'
+
+    async def run():
+        return [
+            await uploader.upload(payload, "json/action.json"),
+            await uploader.upload(path, "raw_data/data.hlo"),
+            await uploader.upload(lambda: payload, "json/lazy.json"),
+        ]
+
+    assert asyncio.run(run()) == [True, True, True]
+    body = s3.get_object(Bucket=BUCKET, Key="raw_data/data.hlo")["Body"].read()
+    assert body == path.read_bytes()
+    head = s3.head_object(Bucket=BUCKET, Key="json/action.json")
+    assert head["Metadata"]["sha256"] == hashlib.sha256(payload).hexdigest()
+    stats = uploader.stats()
+    assert (stats["uploaded"], stats["failed"], stats["retried"]) == (3, 0, 0)
+    assert stats["bytes_uploaded"] == 2 * len(payload) + path.stat().st_size
+    uploader.shutdown()
+
+
+def test_retries_failed_uploads(s3):
+    client = FlakyClient(s3, upload_failures=2)
+    uploader = make_uploader(client)
+    assert asyncio.run(uploader.upload(b"payload", "json/retry.json", retries=3))
+    assert client.uploads == 3
+    assert uploader.retried == 2 and uploader.failed == 0
+    assert s3.get_object(Bucket=BUCKET, Key="json/retry.json")["Body"].read() == b"payload"
+
+    client = FlakyClient(s3, upload_failures=10)
+    uploader = make_uploader(client)
+    assert not asyncio.run(uploader.upload(b"payload", "json/never.json", retries=2))
+    assert client.uploads == 3
+    assert uploader.failed == 1 and uploader.uploaded == 0
+
+
+def test_verify_mismatch_is_retried_then_failed(s3):
+    client = FlakyClient(s3, head_size=1)
+    uploader = make_uploader(client, verify=True)
+    assert not asyncio.run(uploader.upload(b"payload", "json/bad.json", retries=1))
+    assert client.uploads == 2
+    assert uploader.failed == 1
+
+
+def test_verify_without_read_permission(s3):
+    # upload-only credentials get a 403 on head_object
+    client = FlakyClient(s3, head_error="403")
+    uploader = make_uploader(client, verify=True)
+    assert asyncio.run(uploader.upload(b"payload", "json/noread.json"))
+    assert client.uploads == 1
+    assert (uploader.uploaded, uploader.unverified, uploader.retried) == (1, 1, 0)
+
+    # verification is off by default, head_object is never called
+    client = FlakyClient(s3, head_error="500")
+    uploader = make_uploader(client)
+    assert asyncio.run(uploader.upload(b"payload", "json/noverify.json"))
+    assert (uploader.uploaded, uploader.unverified) == (1, 0)
@@ -100,7 +100,7 @@ class Calc:
 
         hlo_dict = {}
         for hp, yp in zip(hlos, ymls):
-            meta, data = FM.read_hlo(hp)
+            meta, data = FM.read_hlo_columns(hp)
             actd = FM.read_yml(yp)
 
             expp = os.path.dirname(os.path.dirname(yp))
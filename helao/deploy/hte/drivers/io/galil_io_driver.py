@@ -31,6 +31,7 @@ from helao.helpers import helao_logging as logging
 
 LOGGER = logging.make_logger(__file__) if logging.LOGGER is None else logging.LOGGER
 from helao.core.servers.base import Base
+from helao.core.drivers.device_io import DeviceIOExecutor, IOPriority
 from helao.helpers.executor import Executor
 from helao.core.error import ErrorCodes
 from helao.helpers.make_str_enum import make_str_enum
@@ -105,6 +106,8 @@ class Galil:
 
         self.cycle_lights = False
 
+        # gclib calls run on a dedicated thread, off the event loop
+        self.io = DeviceIOExecutor("galil_io")
         self.aloop = asyncio.get_running_loop()
         self.polling = True
         self.poll_signalq = asyncio.Queue(1)
@@ -134,6 +137,12 @@ class Galil:
                     # self.base.print_message(ai_resp)
             await asyncio.sleep(0.01)
 
+    async def _gcmd(self, cmd: str, priority: IOPriority = IOPriority.command):
+        """Send a command on the gclib I/O thread and return the response."""
+        return await self.io.call(
+            self.galilcmd, cmd, priority=priority, label=f"GCommand {cmd[:2]}"
+        )
+
     async def reset(self):
         pass
 
@@ -169,11 +178,13 @@ class Galil:
                     on=False,
                     value=0.0,
                     ao_name=ao_name,
+                    priority=IOPriority.stop,
                 )
             for do_name in self.dev_do.keys():
                 await self.set_digital_out(
                     on=False,
                     do_name=do_name,
+                    priority=IOPriority.stop,
                 )
             # set flag
             self.base.actionservermodel.estop = True
@@ -190,7 +201,7 @@ class Galil:
             ai_port = self.dev_ai[ai_name]
             cmd = f"MG @AN[{int(ai_port)}]"
             # LOGGER.info(f"cmd: '{cmd}'")
-            ret = self.galilcmd(cmd)
+            ret = await self._gcmd(cmd, IOPriority.poll)
         else:
             err_code = ErrorCodes.not_available
 
@@ -210,7 +221,7 @@ class Galil:
             di_port = self.dev_di[di_name]
             cmd = f"MG @IN[{int(di_port)}]"
             # LOGGER.info(f"cmd: '{cmd}'")
-            ret = self.galilcmd(cmd)
+            ret = await self._gcmd(cmd, IOPriority.poll)
         else:
             err_code = ErrorCodes.not_available
 
@@ -230,7 +241,7 @@ class Galil:
             do_port = self.dev_do[do_name]
             cmd = f"MG @OUT[{int(do_port)}]"
             # LOGGER.info(f"cmd: '{cmd}'")
-            ret = self.galilcmd(cmd)
+            ret = await self._gcmd(cmd, IOPriority.poll)
         else:
             err_code = ErrorCodes.not_available
 
@@ -264,7 +275,14 @@ class Galil:
             "value": None,
         }
 
-    async def set_digital_out(self, on: bool, do_name: str = "", *args, **kwargs):
+    async def set_digital_out(
+        self,
+        on: bool,
+        do_name: str = "",
+        *args,
+        priority: IOPriority = IOPriority.command,
+        **kwargs,
+    ):
         err_code = ErrorCodes.none
         on = bool(on)
         ret = None
@@ -276,10 +294,10 @@ class Galil:
             else:
                 cmd = f"CB {int(do_port)}"
             # LOGGER.info(f"cmd: '{cmd}'")
-            _ = self.galilcmd(cmd)
+            _ = await self._gcmd(cmd, priority)
             cmd = f"MG @OUT[{int(do_port)}]"
             # LOGGER.info(f"cmd: '{cmd}'")
-            ret = self.galilcmd(cmd)
+            ret = await self._gcmd(cmd, priority)
         else:
             err_code = ErrorCodes.not_available
 
@@ -294,9 +312,9 @@ class Galil:
     async def upload_DMC(self, DMC_prog):
         # self.galilcmd("UL;")  # begin upload
         # upload line by line from DMC_prog
-        self.galilprgdownload("DL;")
+        await self.io.call(self.galilprgdownload, "DL;")
         LOGGER.info(f"DMC prg:\n{DMC_prog}")
-        self.galilprgdownload(DMC_prog + "\x00")
+        await self.io.call(self.galilprgdownload, DMC_prog + "\x00")
 
     async def set_digital_cycle(
         self,
@@ -446,25 +464,27 @@ class Galil:
         ]
         dmc_prog = "\n".join(prog_parts)
         await self.upload_DMC(dmc_prog)
-        self.galilcmd("XQ #main,0")  # excecute main routine
+        await self._gcmd("XQ #main,0")  # excecute main routine
 
         return {"error_code": err_code}
 
     async def stop_digital_cycle(self):
         if self.digital_cycle_out is not None:
-            self.galilcmd(f"HX{self.digital_cycle_mainthread}")  # stops main routine
+            await self._gcmd(
+                f"HX{self.digital_cycle_mainthread}", IOPriority.stop
+            )  # stops main routine
             self.digital_cycle_mainthread = None
             if isinstance(self.digital_cycle_out, int):
                 self.digital_cycle_out = [self.digital_cycle_out]
             for i, dout in enumerate(self.digital_cycle_out):
-                self.galilcmd(f"HX{i+1}")  # stops main routine
+                await self._gcmd(f"HX{i+1}", IOPriority.stop)  # stops main routine
                 cmd = f"CB {int(dout)}"
-                _ = self.galilcmd(cmd)
+                _ = await self._gcmd(cmd, IOPriority.stop)
             self.digital_cycle_out = None
             self.digital_cycle_subthread = None
         if self.digital_cycle_out_gamry is not None:
             cmd = f"CB {int(self.digital_cycle_out_gamry)}"
-            _ = self.galilcmd(cmd)
+            _ = await self._gcmd(cmd, IOPriority.stop)
             self.digital_cycle_out_gamry = None
 
         return {"error_code": ErrorCodes.none}
@@ -474,6 +494,7 @@ class Galil:
         # disconnect ... just restart or terminate the server
         LOGGER.info("shutting down galil io")
         self.galil_enabled = False
+        self.io.shutdown()
         try:
             self.g.GClose()
         except Exception as e:
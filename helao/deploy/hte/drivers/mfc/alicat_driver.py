@@ -25,6 +25,7 @@ import numpy as np
 from helao.helpers import helao_logging as logging
 from helao.core.error import ErrorCodes
 from helao.core.servers.base import Base
+from helao.core.drivers.device_io import DeviceIOExecutor, IOPriority
 from helao.helpers.executor import Executor
 from helao.core.models.hlostatus import HloStatus
 from helao.helpers.make_str_enum import make_str_enum
@@ -54,6 +55,8 @@ class AliCatMFC:
         # query status with self.mfc.get()
         # query pid settings with self.mfc.get_pid()
 
+        # serial calls run on a dedicated thread, off the event loop
+        self.io = DeviceIOExecutor("alicat")
         self.aloop = asyncio.get_running_loop()
         self.polling = True
         self.poll_signalq = asyncio.Queue(1)
@@ -135,16 +138,22 @@ class AliCatMFC:
                         await asyncio.sleep(waittime - (checktime - lastupdate))
                     # LOGGER.info(f"Retrieving {dev_name} MFC status")
                     try:
-                        resp_dict = fc.get_status()
+                        resp_dict = await self.io.call(
+                            fc.get_status, priority=IOPriority.poll
+                        )
                     except Exception as e:
                         LOGGER.info(
                             f"Exception occured on get_status() {e}. Resetting MFC."
                         )
-                        self.make_fc_instance(
-                            dev_name, self.config_dict["devices"][dev_name]
+                        await self.io.call(
+                            self.make_fc_instance,
+                            dev_name,
+                            self.config_dict["devices"][dev_name],
                         )
-                        self.fcs[dev_name]._set_control_point(
-                            self.fcs_last_mode[dev_name], 5
+                        await self.io.call(
+                            self.fcs[dev_name]._set_control_point,
+                            self.fcs_last_mode[dev_name],
+                            5,
                         )
                         LOGGER.info("MFC connection restored")
                         continue
@@ -187,8 +196,10 @@ class AliCatMFC:
         """Set control mode to pressure, set point = pressure_psi, ramping psi/sec or zero to disable."""
         resp = []
         await self.stop_polling()
-        resp.append(self._send(device_name, f"SR {ramp_psi_sec} 4"))
-        resp.append(self.fcs[device_name].set_pressure(pressure_psia))
+        resp.append(await self.io.call(self._send, device_name, f"SR {ramp_psi_sec} 4"))
+        resp.append(
+            await self.io.call(self.fcs[device_name].set_pressure, pressure_psia)
+        )
         await self.start_polling()
         return resp
 
@@ -203,15 +214,19 @@ class AliCatMFC:
         """Set control mode to mass flow, set point = flowrate_scc, ramping flowrate_sccm or zero to disable."""
         resp = []
         await self.stop_polling()
-        resp.append(self._send(device_name, f"SR {ramp_sccm_sec} 4"))
-        resp.append(self.fcs[device_name].set_flow_rate(flowrate_sccm))
+        resp.append(
+            await self.io.call(self._send, device_name, f"SR {ramp_sccm_sec} 4")
+        )
+        resp.append(
+            await self.io.call(self.fcs[device_name].set_flow_rate, flowrate_sccm)
+        )
         await self.start_polling()
         return resp
 
     async def set_gas(self, device_name: str, gas: Union[int, str]):
         "Set MFC to pure gas"
         await self.stop_polling()
-        resp = self.fcs[device_name].set_gas(gas)
+        resp = await self.io.call(self.fcs[device_name].set_gas, gas)
         await self.start_polling()
         return resp
 
@@ -222,11 +237,14 @@ class AliCatMFC:
             return {}
         else:
             await self.stop_polling()
-            self.fcs[device_name].delete_mix(236)
-            self.fcs[device_name].create_mix(
-                mix_no=236, name="HELAO_mix", gases=gas_dict
+            await self.io.call(self.fcs[device_name].delete_mix, 236)
+            await self.io.call(
+                self.fcs[device_name].create_mix,
+                mix_no=236,
+                name="HELAO_mix",
+                gases=gas_dict,
             )
-            resp = self.fcs[device_name].set_gas(236)
+            resp = await self.io.call(self.fcs[device_name].set_gas, 236)
             await self.start_polling()
             return resp
 
@@ -236,10 +254,10 @@ class AliCatMFC:
         if device_name is None:
             resp = []
             for dev_name, fc in self.fcs.items():
-                lock_resp = fc.lock()
+                lock_resp = await self.io.call(fc.lock)
                 resp.append({dev_name: lock_resp})
         else:
-            resp = self.fcs[device_name].lock()
+            resp = await self.io.call(self.fcs[device_name].lock)
         await self.start_polling()
         return resp
 
@@ -249,10 +267,10 @@ class AliCatMFC:
         if device_name is None:
             resp = []
             for dev_name, fc in self.fcs.items():
-                unlock_resp = fc.unlock()
+                unlock_resp = await self.io.call(fc.unlock)
                 resp.append({dev_name: unlock_resp})
         else:
-            resp = self.fcs[device_name].unlock()
+            resp = await self.io.call(self.fcs[device_name].unlock)
         await self.start_polling()
         return resp
 
@@ -262,10 +280,10 @@ class AliCatMFC:
         if device_name is None:
             resp = []
             for dev_name, fc in self.fcs.items():
-                hold_resp = fc.hold()
+                hold_resp = await self.io.call(fc.hold)
                 resp.append({dev_name: hold_resp})
         else:
-            resp = self.fcs[device_name].hold()
+            resp = await self.io.call(self.fcs[device_name].hold)
         await self.start_polling()
         return resp
 
@@ -276,10 +294,14 @@ class AliCatMFC:
             resp = []
             for dev_name, _ in self.fcs.items():
                 await self.set_flowrate(dev_name, 0)
-                chold_resp = self._send(dev_name, "hc")
+                chold_resp = await self.io.call(
+                    self._send, dev_name, "hc", priority=IOPriority.stop
+                )
                 resp.append({dev_name: chold_resp})
         else:
-            resp = self._send(device_name, "hc")
+            resp = await self.io.call(
+                self._send, device_name, "hc", priority=IOPriority.stop
+            )
         await self.start_polling()
         return resp
 
@@ -289,10 +311,10 @@ class AliCatMFC:
         if device_name is None:
             resp = []
             for dev_name, fc in self.fcs.items():
-                cancel_resp = fc.cancel_hold()
+                cancel_resp = await self.io.call(fc.cancel_hold)
                 resp.append({dev_name: cancel_resp})
         else:
-            resp = self.fcs[device_name].cancel_hold()
+            resp = await self.io.call(self.fcs[device_name].cancel_hold)
         await self.start_polling()
         return resp
 
@@ -302,10 +324,10 @@ class AliCatMFC:
         if device_name is None:
             resp = []
             for dev_name, fc in self.fcs.items():
-                tarev_resp = fc.tare_volumetric()
+                tarev_resp = await self.io.call(fc.tare_volumetric)
                 resp.append({dev_name: tarev_resp})
         else:
-            resp = self.fcs[device_name].tare_volumetric()
+            resp = await self.io.call(self.fcs[device_name].tare_volumetric)
         await self.start_polling()
         return resp
 
@@ -315,10 +337,10 @@ class AliCatMFC:
         if device_name is None:
             resp = []
             for dev_name, fc in self.fcs.items():
-                tarep_resp = fc.tare_pressure()
+                tarep_resp = await self.io.call(fc.tare_pressure)
                 resp.append({dev_name: tarep_resp})
         else:
-            resp = self.fcs[device_name].tare_pressure()
+            resp = await self.io.call(self.fcs[device_name].tare_pressure)
         await self.start_polling()
         return resp
 
@@ -353,6 +375,7 @@ class AliCatMFC:
         # disconnect ... just restart or terminate the server
         # self.poll_signalq.put_nowait(False)
         LOGGER.info("closing MFC connections")
+        self.io.shutdown()
         for fc in self.fcs.values():
             fc.close()
 
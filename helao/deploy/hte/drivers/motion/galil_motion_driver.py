@@ -1076,6 +1076,35 @@ class Galil:
             )
         }
 
+    async def solid_get_nearest_samples(
+        self,
+        plate_id: Optional[int] = None,
+        platexy: Optional[list] = None,
+        motorxy: Optional[list] = None,
+        max_distance: Optional[float] = None,
+        **kwargs,
+    ) -> dict:
+        """Sample numbers nearest to a batch of plate or motor xy positions."""
+        pm_index = self.unified_db.solidAPI.legacyAPI.get_platemap_index(plate_id)
+        if platexy is None:
+            platexy = self.transform.transform_motorxy_to_platexy_batch(motorxy)
+        platexy = np.asarray(platexy, dtype=float).reshape(-1, 2)
+        if pm_index is None:
+            LOGGER.error(f"no plate map for plate_id {plate_id}")
+            return {"sample_no": [None] * len(platexy), "platexy": platexy.tolist()}
+        rows = pm_index.nearest(
+            platexy[:, 0],
+            platexy[:, 1],
+            max_distance=np.inf if max_distance is None else max_distance,
+        )
+        return {
+            "sample_no": pm_index.sample_numbers(rows),
+            "platexy": [
+                pm_index.xy[row].tolist() if row >= 0 else [None, None]
+                for row in rows
+            ],
+        }
+
 
 class TransformXY:
     # Updating plate calibration will automatically update the system transformation
@@ -1140,6 +1169,20 @@ class TransformXY:
         platexy = np.array(platexy)[0]
         return platexy
 
+    def transform_platexy_to_motorxy_batch(self, platexy) -> np.ndarray:
+        """motorxy of an (N, 2) array of platexy, see transform_platexy_to_motorxy"""
+        platexy = np.asarray(platexy, dtype=float).reshape(-1, 2)
+        n = len(platexy)
+        vec = np.column_stack((platexy, np.zeros(n), np.ones(n)))
+        return np.asarray(vec @ self.M.T)[:, :2]
+
+    def transform_motorxy_to_platexy_batch(self, motorxy) -> np.ndarray:
+        """platexy of an (N, 2) array of motorxy, see transform_motorxy_to_platexy"""
+        motorxy = np.asarray(motorxy, dtype=float).reshape(-1, 2)
+        n = len(motorxy)
+        vec = np.column_stack((motorxy, np.zeros(n), np.ones(n)))
+        return np.asarray(vec @ self.Minv.T)[:, :2]
+
     def transform_motorxyz_to_instrxyz(self, motorxyz, *args, **kwargs):
         """simply calculatesinstrxyz from current motorxyz"""
         motorxyz = np.asarray(motorxyz)
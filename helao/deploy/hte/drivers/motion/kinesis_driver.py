@@ -56,6 +56,9 @@ MOTION_STATES = [
 
 
 class KinesisMotor(HelaoDriver):
+    # kinesis_server calls the motors through aio/io only
+    offload_io = True
+
     def __init__(self, config: dict = {}):
         super().__init__(config=config)
         self.motors = {}
@@ -23,6 +23,7 @@ import numpy as np
 import pandas as pd
 import easy_biologic as ebl
 
+from helao.helpers.ring_buffer import ColumnRingBuffer
 from helao.core.drivers.helao_driver import (
     HelaoDriver,
     DriverResponse,
@@ -54,6 +55,9 @@ class BiologicDriver(HelaoDriver):
         self.channels = {i: None for i in range(self.num_channels)}
         self.channel_params = {i: {} for i in range(self.num_channels)}
         self.channel_technique = {i: None for i in range(self.num_channels)}
+        # parsed data points and read cursor per channel, see get_data
+        self.channel_buffers = {i: None for i in range(self.num_channels)}
+        self.channel_cursors = {i: 0 for i in range(self.num_channels)}
         self.connect()
         self.stopping = False
         self.connection_ctx = None
@@ -148,6 +152,8 @@ class BiologicDriver(HelaoDriver):
             self.channel_params[channel] = listed_params
             self.channel_technique[channel] = technique
             self.channels[channel].field_remap = technique.field_map
+            self.channel_buffers[channel] = ColumnRingBuffer()
+            self.channel_cursors[channel] = 0
             response = DriverResponse(
                 response=DriverResponseType.success,
                 message="setup complete",
@@ -261,8 +267,14 @@ class BiologicDriver(HelaoDriver):
                 for datum in segment_data
             ]
 
-            data = pd.DataFrame(parsed).to_dict(orient="list")
-            data = {program.field_remap[k]: v for k, v in data.items()}
+            buffer = self.channel_buffers[channel]
+            if parsed:
+                buffer.append_rows(parsed, names=parsed[0]._fields)
+            columns, self.channel_cursors[channel] = buffer.read(
+                self.channel_cursors[channel]
+            )
+            arrays = {program.field_remap[k]: v for k, v in columns.items()}
+            data = {k: v.tolist() for k, v in arrays.items()}
             values = pd.DataFrame(values_list).to_dict(orient="list")
             values = {f"_{k}": v for k, v in values.items()}
 
@@ -270,12 +282,10 @@ class BiologicDriver(HelaoDriver):
 
             if "modulus" in data.keys():
                 try:
-                    data["X_ohm"] = (
-                        -np.array(data["modulus"]) * np.sin(np.array(data["phase"]))
-                    ).tolist()
-                    data["R_ohm"] = (
-                        np.array(data["modulus"]) * np.cos(np.array(data["phase"]))
-                    ).tolist()
+                    modulus = arrays["modulus"].astype(float)
+                    phase = arrays["phase"].astype(float)
+                    data["X_ohm"] = (-modulus * np.sin(phase)).tolist()
+                    data["R_ohm"] = (modulus * np.cos(phase)).tolist()
                 except Exception:
                     LOGGER.warning(
                         "Unexpected value in modulus or phase data, unable to calculate X_ohm and R_ohm."
@@ -334,6 +344,8 @@ class BiologicDriver(HelaoDriver):
             self.channels[channel] = None
             self.channel_params[channel] = {}
             self.channel_technique[channel] = None
+            self.channel_buffers[channel] = None
+            self.channel_cursors[channel] = 0
             response = DriverResponse(
                 response=DriverResponseType.success,
                 status=DriverStatus.ok,
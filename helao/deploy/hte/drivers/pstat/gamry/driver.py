@@ -45,6 +45,8 @@ class GamryDriver(HelaoDriver):
     dtaqsink: GamryDtaqSink
     device_name: str
     model: GamryPstat
+    # COM objects of the Gamry framework are bound to the event loop thread
+    offload_io = False
 
     def __init__(self, config: dict = {}):
         super().__init__(config=config)
@@ -318,14 +320,12 @@ class GamryDriver(HelaoDriver):
         """Retrieve data from device buffer."""
         try:
             client.PumpEvents(pump_rate)
-            total_points = len(self.dtaqsink.acquired_points)
+            total_points = self.dtaqsink.buffer.total
             if self.counter < total_points:
-                new_data = self.dtaqsink.acquired_points[self.counter : total_points]
+                new_data, _ = self.dtaqsink.buffer.read(self.counter)
                 data_dict = {
-                    k: v
-                    for k, v in zip(
-                        self.technique.dtaq.output_keys, np.matrix(new_data).T.tolist()
-                    )
+                    k: v.tolist()
+                    for k, v in zip(self.technique.dtaq.output_keys, new_data.values())
                 }
             else:
                 data_dict = {}
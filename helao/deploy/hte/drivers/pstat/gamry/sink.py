@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from typing import Optional
 
+from helao.helpers.ring_buffer import ColumnRingBuffer
 from helao.helpers import helao_logging as logging  # get LOGGER from BaseAPI instance
 LOGGER = logging.make_logger(__file__) if logging.LOGGER is None else logging.LOGGER
 
@@ -9,7 +10,8 @@ class GamryDtaqSink:
 
     def __init__(self, dtaq):
         self.dtaq = dtaq
-        self.acquired_points = []
+        # acquired points by dtaq output column, read by GamryDriver.get_data
+        self.buffer = ColumnRingBuffer()
         self.status = "idle"
         self.buffer_size = 0
 
@@ -20,7 +22,8 @@ class GamryDtaqSink:
         while count > 0:
             try:
                 count, points = self.dtaq.Cook(1024)
-                self.acquired_points.extend(zip(*points))
+                if count > 0:
+                    self.buffer.append_columns(points)
             except Exception:
                 LOGGER.warning("Error while cooking data from Gamry DTAQ.")
                 count = 1
@@ -44,5 +47,5 @@ class DummySink:
 
     dtaq: Optional[object] = None
     status: str = "idle"
-    acquired_points: list = field(default_factory=list)
+    buffer: ColumnRingBuffer = field(default_factory=ColumnRingBuffer)
     buffer_size: int = 0
@@ -11,6 +11,7 @@ import serial
 from helao.helpers import helao_logging as logging
 from helao.core.error import ErrorCodes
 from helao.core.servers.base import Base
+from helao.core.drivers.device_io import DeviceIOExecutor, IOPriority
 from helao.helpers.executor import Executor
 from helao.core.models.data import DataModel
 from helao.core.models.file import FileConnParams, HloHeaderModel
@@ -127,6 +128,8 @@ class SprintIR:
         self.IO_continue = False
         self.IOloop_run = False
 
+        # serial reads run on a dedicated thread, off the event loop
+        self.io = DeviceIOExecutor("sprintir")
         self.polling_task = self.event_loop.create_task(self.poll_sensor_loop())
         self.recording_task = self.event_loop.create_task(self.IOloop())
 
@@ -238,10 +241,12 @@ class SprintIR:
                 LOGGER.warning(
                     f"Did not receive a co2 message from sensor after {reset_after} checks, resetting polling mode."
                 )
-                self.com.write(b"K 2\r\n")
+                await self.io.call(self.com.write, b"K 2\r\n")
                 blanks = 0
             try:
-                co2_level = self.read_stream()
+                co2_level = await self.io.call(
+                    self.read_stream, priority=IOPriority.poll
+                )
             except Exception as err:
                 LOGGER.info(f"Could not parse streaming value, got {err}")
                 continue
@@ -392,6 +397,7 @@ class SprintIR:
             self.recording_task.cancel()
         except asyncio.CancelledError:
             LOGGER.info("closed sensor recording loop task")
+        self.io.shutdown()
         self.com.close()
 
 
@@ -19,6 +19,16 @@ from helao.core.drivers.helao_driver import (
     DriverResponseType,
 )
 
+# SDK3 requires frame buffers aligned to 8 bytes
+BUFFER_ALIGNMENT = 8
+
+
+def aligned_buffer(nbytes: int, alignment: int = BUFFER_ALIGNMENT) -> np.ndarray:
+    """Uninitialized uint8 array of nbytes whose data pointer is aligned."""
+    raw = np.empty(nbytes + alignment, dtype=np.uint8)
+    offset = -raw.ctypes.data % alignment
+    return raw[offset : offset + nbytes]
+
 
 class AndorDriver(HelaoDriver):
     cam: AndorSDK3
@@ -42,6 +52,15 @@ class AndorDriver(HelaoDriver):
         self.clock_hz = None
 
         self.timeout = 5000
+        # frame buffers queued to the SDK, recycled across acquisitions
+        self.frame_buffers = []
+        self.image_size = 0
+        self.ch_keys = []
+        # acquisition counters reported by get_status
+        self.frames_acquired = 0
+        self.first_frame_tick = None
+        self.last_frame_tick = None
+        self.poll_fps = None
 
         self.sdk3 = AndorSDK3()
         self.device_id = self.config.get("dev_id", 0)
@@ -509,12 +528,30 @@ class AndorDriver(HelaoDriver):
 
         return Spectra
 
+    def frame_stats(self) -> dict:
+        """
+        Frame counters of the current acquisition; fps is sustained over the
+        acquisition on the camera clock, poll_fps over the last get_data call
+        on the wall clock.
+        """
+        fps = None
+        if self.frames_acquired > 1 and self.last_frame_tick != self.first_frame_tick:
+            fps = (self.frames_acquired - 1) / (
+                self.last_frame_tick - self.first_frame_tick
+            )
+        return {
+            "frames_acquired": self.frames_acquired,
+            "fps": fps,
+            "poll_fps": self.poll_fps,
+            "buffer_count": len(self.frame_buffers),
+        }
+
     def get_status(self, retries: int = 5) -> DriverResponse:
         """Return current driver status."""
         try:
             response = DriverResponse(
                 response=DriverResponseType.success,
-                data={},
+                data=self.frame_stats(),
                 status=DriverStatus.ok,
             )
         except Exception:
@@ -552,14 +589,21 @@ class AndorDriver(HelaoDriver):
             )  # Returns the buffer size in bytes required to store the data for one frame. This
             # will be affected by the Area of Interest size, binning and whether metadata is  appended to the data stream
 
-            # this makes buffer_count buffers in the camera
-            for _ in range(buffer_count):
-                # each buffer is a numpy array of size imgsize containing unsigned bytes
-                buf = np.empty((imgsize,), dtype="B")
-                # this creates a new buffer in the camera for the next image
+            # allocate buffer_count frame buffers once, they are requeued by
+            # get_data after each frame and reused by the next acquisition
+            if imgsize != self.image_size or len(self.frame_buffers) != buffer_count:
+                self.frame_buffers = [
+                    aligned_buffer(imgsize) for _ in range(buffer_count)
+                ]
+                self.image_size = imgsize
+            for buf in self.frame_buffers:
                 self.cam.queue(buf, imgsize)
 
             self.frame = None  # initialise frame to None
+            self.frames_acquired = 0
+            self.first_frame_tick = None
+            self.last_frame_tick = None
+            self.poll_fps = None
 
             response = DriverResponse(
                 response=DriverResponseType.success,
@@ -603,25 +647,36 @@ class AndorDriver(HelaoDriver):
         total_duration: float,
         external: bool = True,
         first_tick: Optional[float] = None,
+        as_arrays: bool = False,
     ) -> DriverResponse:
-        """Retrieve data from device buffer."""
+        """
+        Retrieve up to `frames` frames from the device buffer.
+
+        Spectra are copied into one (channel, frame) block per call and the
+        frame buffer is requeued right away. With as_arrays, channels are
+        returned as contiguous NumPy rows of the block, e.g. for binary .hlo
+        output; otherwise the block is converted to lists in one pass.
+        """
         try:
             status = DriverStatus.busy
-            data_dict = {"tick_time": []}
-            data_dict.update({f"ch_{i:04}": [] for i in range(self.wl_arr.size)})
+            num_ch = self.wl_arr.size
+            if len(self.ch_keys) != num_ch:
+                self.ch_keys = [f"ch_{i:04}" for i in range(num_ch)]
+            block = np.empty((num_ch, frames), dtype=np.uint32)
+            ticks = np.empty(frames, dtype=np.float64)
+            n = 0
+            poll_start = time.perf_counter()
             for _ in range(frames):
                 try:
                     if not external:
                         self.cam.SoftwareTrigger()
                     acq = self.cam.wait_buffer(self.timeout)
-                    self.cam.queue(
-                        np.zeros(acq._np_data.shape), self.cam.ImageSizeBytes
-                    )  # requeue the buffer
-                    spectrum = acq.image[0]
+                    block[:, n] = acq.image[0][:num_ch]
                     tick_time = acq.metadata.timestamp / self.clock_hz
-                    data_dict["tick_time"].append(tick_time)
-                    for i, x in enumerate(spectrum):
-                        data_dict[f"ch_{i:04}"].append(int(x))
+                    # frame is copied out, hand the same buffer back to the SDK
+                    self.cam.queue(acq._np_data, self.image_size)
+                    ticks[n] = tick_time
+                    n += 1
                     if first_tick is not None:
                         if tick_time - first_tick >= total_duration:
                             status = DriverStatus.ok
@@ -630,10 +685,24 @@ class AndorDriver(HelaoDriver):
                 except CameraException:
                     status = DriverStatus.error
                     break
+            if n:
+                if self.first_frame_tick is None:
+                    self.first_frame_tick = float(ticks[0])
+                self.last_frame_tick = float(ticks[n - 1])
+                self.frames_acquired += n
+                self.poll_fps = n / max(time.perf_counter() - poll_start, 1e-9)
+                if as_arrays:
+                    data_dict = {"tick_time": ticks[:n]}
+                    data_dict.update(zip(self.ch_keys, block[:, :n]))
+                else:
+                    data_dict = {"tick_time": ticks[:n].tolist()}
+                    data_dict.update(zip(self.ch_keys, block[:, :n].tolist()))
+            else:
+                data_dict = {}
             response = DriverResponse(
                 response=DriverResponseType.success,
                 message="",
-                data=data_dict if data_dict["tick_time"] else {},
+                data=data_dict,
                 status=status,
             )
         except Exception:
@@ -9,6 +9,7 @@ from helao.helpers import helao_logging as logging
 from helao.core.error import ErrorCodes
 from helao.core.models.hlostatus import HloStatus
 from helao.core.servers.base import Base
+from helao.core.drivers.device_io import DeviceIOExecutor, IOPriority
 from helao.helpers.executor import Executor
 
 LOGGER = logging.make_logger(__file__) if logging.LOGGER is None else logging.LOGGER
@@ -65,6 +66,8 @@ class MeerstetterTEC(object):
         self.recording_duration = 0
         self.recording_rate = 0.1  # seconds per acquisition
         self.allow_no_sample = self.config_dict.get("allow_no_sample", True)
+        # serial calls run on a dedicated thread, off the event loop
+        self.io = DeviceIOExecutor("mecom")
         self.polling_task = self.event_loop.create_task(self.poll_sensor_loop())
 
     def _tearDown(self):
@@ -143,7 +146,8 @@ class MeerstetterTEC(object):
         waittime = 1.0 / frequency
         LOGGER.info("Starting polling loop")
         while True:
-            tec_vals = {k: v[0] for k, v in self.get_data().items()}
+            data = await self.io.call(self.get_data, priority=IOPriority.poll)
+            tec_vals = {k: v[0] for k, v in data.items()}
             if tec_vals:
                 msg_dict = {"tec_vals": tec_vals}
                 await self.base.put_lbuf(msg_dict)
@@ -154,7 +158,11 @@ class MeerstetterTEC(object):
             self.polling_task.cancel()
         except asyncio.CancelledError:
             LOGGER.info("closed TEC polling loop task")
-        self.disable()
+        try:
+            # behind the poll in progress, ahead of queued ones
+            self.io.submit(self.disable, priority=IOPriority.stop).result(timeout=10)
+        finally:
+            self.io.shutdown()
 
 
 class TECMonExec(Executor):
@@ -29,6 +29,7 @@ from bokeh.models import FileInput
 from helao.helpers import helao_logging as logging
 from helao.core.servers.vis import Vis
 from helao.helpers.plate_api import HTEPlateAPI
+from helao.helpers.spatial_index import PlateMapIndex
 from helao.core.models.data import DataModel
 from helao.core.error import ErrorCodes
 
@@ -118,6 +119,8 @@ class Aligner:
 
         # PM data given as parameter or empty and needs to be loaded
         self.pmdata = []
+        # spatial index of pmdata for nearest sample lookups
+        self.pm_index = None
 
         self.totalwidth = 800
 
@@ -1182,13 +1185,15 @@ class Aligner:
         if self.motor.aligning_enabled:
 
             if isinstance(self.motor.aligner_plateid, int):
-                self.pmdata = self.dataAPI.get_platemap_plateid(
+                self.pm_index = self.dataAPI.get_platemap_index(
                     self.motor.aligner_plateid
                 )
+                self.pmdata = self.pm_index.pmdata if self.pm_index else []
             elif isinstance(self.motor.aligner_plateid, str):
                 self.pmdata, _ = self.dataAPI.legacy_api.readsingleplatemaptxt(
                     self.motor.aligner_plateid.strip("'").strip('"')
                 )
+                self.pm_index = PlateMapIndex(self.pmdata) if self.pmdata else None
             if self.pmdata:
                 self.vis.doc.add_next_tick_callback(
                     partial(self.update_pm_plot_title, self.motor.aligner_plateid)
@@ -1213,22 +1218,12 @@ class Aligner:
                 partial(self.update_status, "Error!\nAlign is invalid!")
             )
 
-    def xy_to_sample(self, xy, pmapxy):
-        """get point from pmap closest to xy"""
-        if len(pmapxy):
-            diff = pmapxy - xy
-            sumdiff = (diff**2).sum(axis=1)
-            return int(np.argmin(sumdiff))
-        else:
-            return None
-
     def get_samples(self, X, Y):
         """get list of samples row number closest to xy"""
         # X and Y are vectors
-        xyarr = np.array((X, Y)).T
-        pmxy = np.array([[col["x"], col["y"]] for col in self.pmdata])
-        samples = list(np.apply_along_axis(self.xy_to_sample, 1, xyarr, pmxy))
-        return samples
+        if self.pm_index is None or self.pm_index.pmdata is not self.pmdata:
+            self.pm_index = PlateMapIndex(self.pmdata)
+        return self.pm_index.nearest_list(X, Y)
 
     def remove_allMarkerpoints(self):
         """Removes all Markers from plot"""
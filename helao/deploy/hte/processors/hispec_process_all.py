@@ -15,6 +15,7 @@ from helao.helpers.parquet import hlo_to_parquet
 from helao.deploy.hte.processors.libs.hispec_calibrate_downsample_parquet import (
     fully_read_and_calibrate_parquet,
 )
+from helao.deploy.hte.processors.libs.melt_spectra import melt_spectra
 from helao.helpers import helao_logging as logging
 
 LOGGER = logging.make_logger(__file__) if logging.LOGGER is None else logging.LOGGER
@@ -55,11 +56,7 @@ class PostProcess(HloPostProcessor):
                     df.reset_index(drop=True, inplace=True)
 
                     non_WL_cols = ["t_s", "U_V", "J_A", "cycle", "direction"]
-                    melted_df = df.melt(id_vars=non_WL_cols, value_name="intensity")
-                    melted_df.rename({"variable": "wl_nm"}, axis=1, inplace=True)
-                    melted_df["wl_nm"] = melted_df["wl_nm"].astype(float)
-
-                    smelted_df = melted_df.sort_values(["t_s", "wl_nm"])
+                    smelted_df = melt_spectra(df, id_vars=non_WL_cols)
                     # write the dataframe to a parquet file
                     pq.write_to_dataset(
                         pa.Table.from_pandas(smelted_df),
@@ -68,7 +65,7 @@ class PostProcess(HloPostProcessor):
                         basename_template="part-{i}.parquet",
                     )
                     # to unmelt this dataframe for analysis:
-                    # df = melted_df.pivot(index=["U_V", "t_s", "J_A", "cycle", "direction"], columns="wl_nm")
+                    # df = smelted_df.pivot(index=["U_V", "t_s", "J_A", "cycle", "direction"], columns="wl_nm")
                     # df.columns = [x[-1] for x in df.columns.to_flat_index()]
                     # df.reset_index()
 
@@ -86,7 +83,7 @@ class PostProcess(HloPostProcessor):
                         posixpath = str(relpath).replace("\\", "/")
                         new_file.file_name = posixpath
                         new_file.nosync = False
-                        new_file.data_keys = list(melted_df.columns)
+                        new_file.data_keys = list(smelted_df.columns)
                         processed_file_list.append(new_file)
 
             except Exception:
@@ -1,8 +1,10 @@
 from helao.helpers.read_hlo import read_hlo
 import pandas as pd
 import numpy as np
+import pyarrow.parquet as pq
 import os
 import json
+from collections import defaultdict
 from pathlib import Path
 import ruamel.yaml
 from typing import Union
@@ -389,6 +391,46 @@ def return_cycle_for_time(time: float, min_max_dict: dict) -> int:
                 )
 
 
+def return_cycles_for_times(times, min_max_dict: dict) -> np.ndarray:
+    """
+    Vectorized return_cycle_for_time for an array of times.
+
+    Cycles produced by generate_min_max_list_for_cycles start at 0 and each one
+    starts at the max time of the previous one, so the cycle of a time is the
+    first one whose max time is not smaller, found with searchsorted. Any
+    other min_max_dict, or times containing NaN (which raise), are handed to
+    return_cycle_for_time one by one.
+
+    inputs:
+    times: an array of the times to be checked
+    min_max_dict: a dictionary of the min and max times of each cycle
+
+    outputs:
+    cycles: an array of the cycle numbers the times belong to.
+    """
+    times = np.asarray(times, dtype=float)
+    cycles = list(min_max_dict.keys())
+    bounds = list(min_max_dict.values())
+    max_times = np.array([min_max[1] for min_max in bounds], dtype=float)
+    contiguous = (
+        len(cycles) > 0
+        and int(cycles[0]) == 0
+        and all(int(cycle) > 0 for cycle in cycles[1:])
+        and all(cur[0] == prev[1] for prev, cur in zip(bounds, bounds[1:]))
+        and bool(np.all(np.diff(max_times) >= 0))
+    )
+    if not contiguous or np.isnan(times).any():
+        return np.array([return_cycle_for_time(t, min_max_dict) for t in times])
+    rounded = np.round(times, 3)
+    # times past the max time of the last cycle belong to the last cycle
+    idx = np.minimum(
+        np.searchsorted(max_times, rounded, side="left"), len(cycles) - 1
+    )
+    result = np.asarray(cycles)[idx]
+    result[rounded <= 0.02] = 0
+    return result
+
+
 def get_cycles_for_spec_times(
     calibration_df: pd.DataFrame,
     CV_data: pd.DataFrame,
@@ -396,7 +438,7 @@ def get_cycles_for_spec_times(
     default_cycle_header1="cycle",
 ) -> pd.DataFrame:
     """
-    This function takes a spec times dataframe and returns a dataframe with the cycle number using the return_cycle_for_time function.
+    This function takes a spec times dataframe and returns a dataframe with the cycle number using the return_cycles_for_times function.
 
     inputs:
     calibration_df: a dataframe with the spec times
@@ -408,8 +450,8 @@ def get_cycles_for_spec_times(
         default_time_header=default_time_header1,
         default_cycle_header=default_cycle_header1,
     )
-    calibration_df[default_cycle_header1] = calibration_df[default_time_header1].apply(
-        lambda x: return_cycle_for_time(x, min_max_dict)
+    calibration_df[default_cycle_header1] = return_cycles_for_times(
+        calibration_df[default_time_header1].to_numpy(), min_max_dict
     )
     return calibration_df
 
@@ -438,40 +480,44 @@ def calcualte_scan_direction_for_spec_times(
     return calibration_df
 
 
-def error_correct_scan(scan_df: pd.DataFrame) -> pd.DataFrame:
-    """This function loops through the the index of the scan_df dataframe. If the difference between the index and the
-    previos index is greater than 1 the rows of scan_df are split at this point. The dataframe with the most rows is
-    assumed to be correct. The rows of the 'ditection' collumn in the other dataframe are set to be the opposite of what
-    they are in the correct dataframe. The two dataframes are then concatinated and returned without distubring the index.
-    """
-    num_errors = 0
-    for i in range(scan_df.shape[0]):
-        if i == 0:
-            continue
-        if scan_df.index[i] - scan_df.index[i - 1] > 1:
-            # split the dataframe
-            left_df = scan_df.iloc[:i]
-            right_df = scan_df.iloc[i:]
-            incorrect_df = right_df if left_df.shape[0] > right_df.shape[0] else left_df
-            # print(incorrect_df['direction'])
-            if incorrect_df["direction"].nunique() == 1:
-                # print("The direction of the incorrect dataframe is the same")
-                # print(f"The direction is {incorrect_df['direction'].iloc[0]}")
-                correct_direction = (
-                    "anodic"
-                    if incorrect_df["direction"].iloc[0] == "cathodic"
-                    else "cathodic"
-                )
-                # print(f"The correct direction is {correct_direction}")
-                num_errors += 1
+def correct_scan_directions(index: np.ndarray, directions: np.ndarray) -> np.ndarray:
+    """
+    Array version of error_correct_scan on the index and direction values of
+    one scan. The scan is split at each gap in the index, in order, and the
+    smaller side of the split is set to the direction opposite to the one it
+    has; a side that already has mixed directions gets the direction set at
+    the previous gap.
+
+    inputs:
+    index: the index values of the scan rows
+    directions: the scan direction of each row
 
-            # get the index of the incorrect dataframe
-            incorrect_index = incorrect_df.index
+    outputs:
+    directions: a corrected copy of directions
+    """
+    directions = np.array(directions, dtype=object)
+    num_rows = len(directions)
+    correct_direction = None
+    for i in np.flatnonzero(np.diff(index) > 1) + 1:
+        incorrect = slice(i, None) if i > num_rows - i else slice(None, i)
+        incorrect_directions = directions[incorrect]
+        if np.all(incorrect_directions == incorrect_directions[0]):
+            correct_direction = (
+                "anodic" if incorrect_directions[0] == "cathodic" else "cathodic"
+            )
+        directions[incorrect] = correct_direction
+    return directions
 
-            # set all values at the index of the incorrect dataframe to the correct direction
-            scan_df.loc[incorrect_index, "direction"] = correct_direction
-    # print(f'{num_errors} errors corrected')
 
+def error_correct_scan(scan_df: pd.DataFrame) -> pd.DataFrame:
+    """This function finds the rows of the scan_df dataframe where the difference between the index and the
+    previous index is greater than 1 and splits the rows of scan_df at each of these points. The dataframe with the most rows is
+    assumed to be correct. The rows of the 'direction' collumn in the other dataframe are set to be the opposite of what
+    they are in the correct dataframe. The dataframe is returned without distubring the index.
+    """
+    scan_df["direction"] = correct_scan_directions(
+        scan_df.index.to_numpy(), scan_df["direction"].to_numpy()
+    )
     return scan_df
 
 
@@ -480,8 +526,8 @@ def error_correct_scan_direction_for_all_cycles(
 ) -> pd.DataFrame:
     """
     This function takes a dataframe with the cycle number and the scan direction and corrects the scan direction
-    for all cycles. It does this by calling the error_correct_scan function for each cycle and concatinating the results
-    into a single dataframe.
+    for all cycles. It does this by correcting the directions of the rows of each cycle and scan direction
+    with correct_scan_directions.
 
     inputs:
     calibration_df: a dataframe with the cycle number and the scan direction
@@ -489,10 +535,16 @@ def error_correct_scan_direction_for_all_cycles(
     outputs:
     calibration_df: a dataframe with the corrected scan direction for all cycles
     """
-    for cycle, frame in calibration_df.groupby("cycle"):
-        for scan, sub_frame in frame.groupby("direction"):
-            corrected_sub_frame = error_correct_scan(sub_frame)
-            calibration_df.iloc[corrected_sub_frame.index, :] = corrected_sub_frame
+    index = calibration_df.index.to_numpy()
+    directions = calibration_df["direction"].to_numpy()
+    corrected = np.array(directions, dtype=object)
+    # every scan is corrected from the uncorrected directions
+    scans = calibration_df.groupby(["cycle", "direction"]).indices
+    for positions in scans.values():
+        corrected[positions] = correct_scan_directions(
+            index[positions], directions[positions]
+        )
+    calibration_df["direction"] = corrected
     return calibration_df
 
 
@@ -550,9 +602,9 @@ def downsample_to_1mV_precision(
     calibrated_spectra: pd.DataFrame, precision: float = 0.001
 ) -> pd.DataFrame:
     """
-    This function takes in the calibrated spectral dataframe and loops using grouby operations, first by cycle, then by direction
-    On each iteration of the loop (i.e. linear sweep) the scan direction collumn is temporarily dropped. The function then groups by
-    Ewe_V//0.001 and rounds the result to 3 decimal places.
+    This function takes in the calibrated spectral dataframe and rounds Ewe_V to the given precision. In a single groupby
+    by cycle, scan direction and rounded voltage (i.e. per linear sweep and voltage step) it averages all other collumns.
+    The result is ordered by cycle, direction and voltage, with the rounded voltage as the index 'U (V)'.
 
     inputs:
     calibrated_spectra: a dataframe with t_s, Ewe_V, cycle, direction and spectral data
@@ -560,49 +612,95 @@ def downsample_to_1mV_precision(
     outputs:
     calibrated_spectra: a dataframe with the voltage values rounded to the nearest 1mV
     """
-    totaldf = pd.DataFrame()
-    for cycle, frame in calibrated_spectra.groupby("cycle"):
-        for scan, sub_frame in frame.groupby("direction"):
-            # drop the direction collumn
-            sub_frame.drop("direction", axis=1, inplace=True)
-            try:
-
-                voltage_grouping = sub_frame["Ewe_V"]
-            except Exception as e:
-                raise ValueError("error in getting the voltage grouping")
-
-            voltage_grouping = np.round(voltage_grouping / precision) * precision
-            try:
-                sub_frame["Ewe_V"] = voltage_grouping
-            except Exception as e:
-                raise ValueError("error in setting the voltage grouping")
-            # sub_frame.astype(float)
-            try:
-                sub_frame = sub_frame.groupby(sub_frame["Ewe_V"]).mean()
-
-                # rename the index E_we_V to U (V)
-                sub_frame.index.rename("U (V)", inplace=True)
-
-                sub_frame["t_s"] = np.round(sub_frame["t_s"], 3)
-            except Exception as e:
-                raise ValueError("error in grouping by voltage")
-            # insert a collumn called 'direction' as the 4th collumn with the value of scan
-            sub_frame.insert(1, "direction", scan)
-
-            # print(sub_frame.head())
-
-            totaldf = pd.concat([totaldf, sub_frame])
-    # reset the index
-    # totaldf.reset_index(drop=True, inplace=True)
-    # rename the Ewe_V collumn U (V)
-    totaldf.rename(columns={"Ewe_V": "U (V)"}, inplace=True)
+    voltage_grouping = np.round(calibrated_spectra["Ewe_V"] / precision) * precision
+    keys = [
+        calibrated_spectra["cycle"].to_numpy(),
+        calibrated_spectra["direction"].to_numpy(),
+        voltage_grouping.to_numpy(),
+    ]
+    totaldf = (
+        calibrated_spectra.drop(columns=["direction", "Ewe_V"]).groupby(keys).mean()
+    )
+    totaldf["t_s"] = np.round(totaldf["t_s"], 3)
+    # insert a collumn called 'direction' as the 2nd collumn with the scan direction
+    totaldf.insert(1, "direction", totaldf.index.get_level_values(1))
+    totaldf.index = pd.Index(totaldf.index.get_level_values(2), name="U (V)")
     # rename t_s to t (s)
     totaldf.rename(columns={"t_s": "t (s)"}, inplace=True)
-
-    # print(len(totaldf.loc['U (V)']))
     return totaldf
 
 
+def downsample_spectra_parquet(
+    calibration_df: pd.DataFrame,
+    spec_path: str,
+    precision: float = 0.001,
+    batch_size: int = 1024,
+    default_time_header: str = "t_s",
+) -> pd.DataFrame:
+    """
+    Streaming equivalent of read_in_spectra_calibrate followed by downsample_to_1mV_precision.
+    The spectra parquet is read in record batches of batch_size rows. The rows of each linear sweep (cycle and
+    direction of calibration_df) are collected until the last one was read, and the sweep is then downsampled on
+    its own, so memory is bounded by the longest sweep rather than by the length of the run.
+
+    inputs:
+    calibration_df: a dataframe with collumns of t_s, Ewe_V, cycle and direction for the spectral data, with a RangeIndex
+    spec_path: the path to the spectra parquet file
+    precision: the voltage step to downsample to
+
+    outputs:
+    calibrated_spectra: the dataframe returned by downsample_to_1mV_precision
+    """
+    spec_file = pq.ParquetFile(spec_path)
+    pandas_meta = spec_file.schema_arrow.pandas_metadata or {}
+    index_columns = [
+        col for col in pandas_meta.get("index_columns", []) if isinstance(col, str)
+    ]
+    spec_columns = [
+        col
+        for col in spec_file.schema_arrow.names
+        if col != default_time_header and col not in index_columns
+    ]
+
+    sweeps = calibration_df.groupby(["cycle", "direction"]).indices
+    sweep_keys = sorted(sweeps)
+    # sweep number of each spectrum, -1 for spectra without a cycle
+    sweep_of_row = np.full(len(calibration_df), -1)
+    for sweep_no, key in enumerate(sweep_keys):
+        sweep_of_row[sweeps[key]] = sweep_no
+    last_row = np.array([sweeps[key][-1] for key in sweep_keys])
+
+    pending = defaultdict(list)
+    downsampled = {}
+
+    def downsample_sweep(sweep_no):
+        sweep_spectra = pd.concat(pending.pop(sweep_no))
+        sweep_df = pd.concat(
+            [calibration_df.loc[sweep_spectra.index], sweep_spectra], axis=1
+        )
+        downsampled[sweep_no] = downsample_to_1mV_precision(
+            sweep_df, precision=precision
+        )
+
+    start = 0
+    for batch in spec_file.iter_batches(batch_size=batch_size, columns=spec_columns):
+        stop = start + batch.num_rows
+        spectra = batch.to_pandas()
+        batch_sweeps = sweep_of_row[start:stop]
+        for sweep_no in np.unique(batch_sweeps[batch_sweeps >= 0]):
+            rows = np.flatnonzero(batch_sweeps == sweep_no)
+            pending[sweep_no].append(
+                spectra.iloc[rows].set_axis(calibration_df.index[start + rows])
+            )
+        for sweep_no in [no for no in pending if last_row[no] < stop]:
+            downsample_sweep(sweep_no)
+        start = stop
+    # sweeps cut short by a spectra file with fewer rows than calibration_df
+    for sweep_no in list(pending):
+        downsample_sweep(sweep_no)
+    return pd.concat([downsampled[no] for no in sorted(downsampled)])
+
+
 def fit_current_time_to_univariate_spline(
     CV: pd.DataFrame,
     smoothing_factor: float = 0.000000001,
@@ -748,18 +846,17 @@ def fully_read_and_calibrate_parquet(
         calibration_df=calibration_df
     )
 
-    spectra_calibrated = read_in_spectra_calibrate(
-        calibration_df=calibration_df, spec_path=spec_path, read_hlo=False
-    )
-
     drop_times_larger_than_CV_max_time(
-        calibrated_spectra=spectra_calibrated,
+        calibrated_spectra=calibration_df,
         CV_data=CV,
         default_time_header=default_time_header,
     )
 
-    spectra_calibrated = downsample_to_1mV_precision(
-        calibrated_spectra=spectra_calibrated, precision=precision
+    spectra_calibrated = downsample_spectra_parquet(
+        calibration_df=calibration_df,
+        spec_path=spec_path,
+        precision=precision,
+        default_time_header=default_time_header,
     )
 
     spectra_calibrated = interpolate_spectral_time_to_current(
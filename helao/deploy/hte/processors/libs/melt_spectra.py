@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+
+def melt_spectra(
+    df: pd.DataFrame,
+    id_vars: list,
+    var_name: str = "wl_nm",
+    value_name: str = "intensity",
+    sort_by: str = "t_s",
+) -> pd.DataFrame:
+    """
+    This function converts a wide dataframe of spectra (one collumn per wavelength) to long format, one row per
+    spectrum and wavelength, ordered by sort_by and wavelength. The result is the same as
+
+        melted = df.melt(id_vars=id_vars, value_name=value_name)
+        melted.rename({"variable": var_name}, axis=1, inplace=True)
+        melted[var_name] = melted[var_name].astype(float)
+        melted.sort_values([sort_by, var_name])
+
+    including the index, but the wavelength labels are converted to float once instead of once per row, and
+    the sort order is computed from the order of the spectra and of the wavelengths instead of by sorting all
+    rows of the long dataframe.
+
+    inputs:
+    df: a dataframe with the id_vars collumns and one collumn per wavelength, labeled by the wavelength
+    id_vars: the collumns repeated for each wavelength, must include sort_by
+    var_name: the name of the wavelength collumn
+    value_name: the name of the intensity collumn
+    sort_by: the collumn ordering the spectra
+
+    outputs:
+    melted_df: the long format dataframe
+    """
+    # by position, rounded wavelength labels can repeat
+    value_pos = [i for i, col in enumerate(df.columns) if col not in id_vars]
+    num_rows, num_cols = len(df), len(value_pos)
+    wavelengths = np.asarray(df.columns[value_pos], dtype=float)
+    times = df[sort_by].to_numpy(dtype=float)
+
+    # row i, collumn j of df is row j * num_rows + i of the melted dataframe
+    row_order = np.argsort(times, kind="stable")
+    col_order = np.argsort(wavelengths, kind="stable")
+    sorted_times = times[row_order]
+    if np.all(sorted_times[1:] != sorted_times[:-1]) and not np.isnan(times).any():
+        order = (col_order[None, :] * num_rows + row_order[:, None]).ravel()
+    else:
+        # repeated times interleave the wavelengths of their spectra
+        order = np.lexsort(
+            (np.repeat(wavelengths, num_rows), np.tile(times, num_cols))
+        )
+    rows = order % num_rows
+    cols = order // num_rows
+
+    melted_df = df[id_vars].take(rows)
+    melted_df.index = pd.RangeIndex(num_rows * num_cols).take(order)
+    melted_df[var_name] = wavelengths[cols]
+    melted_df[value_name] = df.iloc[:, value_pos].to_numpy()[rows, cols]
+    melted_df.columns = pd.Index([*id_vars, var_name, value_name])
+    return melted_df
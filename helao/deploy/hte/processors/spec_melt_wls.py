@@ -8,6 +8,7 @@ import pandas as pd
 from helao.core.models.file import FileInfo
 from helao.helpers.hlo_postprocessor import HloPostProcessor
 from helao.helpers.read_hlo import read_hlo
+from helao.deploy.hte.processors.libs.melt_spectra import melt_spectra
 from helao.helpers import helao_logging as logging
 
 LOGGER = logging.make_logger(__file__) if logging.LOGGER is None else logging.LOGGER
@@ -44,11 +45,7 @@ class PostProcess(HloPostProcessor):
                         axis="columns",
                         inplace=True,
                     )
-                    melted_df = df.melt(id_vars=non_WL_cols, value_name="intensity")
-                    melted_df.rename({"variable": "wl_nm"}, axis=1, inplace=True)
-                    melted_df["wl_nm"] = melted_df["wl_nm"].astype(float)
-
-                    smelted_df = melted_df.sort_values(["t_s", "wl_nm"])
+                    smelted_df = melt_spectra(df, id_vars=non_WL_cols)
                     # write the dataframe to a parquet file
                     smelted_df.to_parquet(new_file_path)
 
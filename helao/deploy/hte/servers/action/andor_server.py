@@ -131,6 +131,8 @@ class AndorAcquire(Executor):
             self.buffer_count = self.action_params["buffer_count"]
             self.exp_time = self.action_params["exp_time"]
             self.framerate = self.action_params["framerate"]
+            # binary .hlo output takes the frame block as arrays
+            self.as_arrays = self.action_params.get("binary_data", False)
 
             self.first_tick = None
 
@@ -166,6 +168,7 @@ class AndorAcquire(Executor):
             total_duration=self.duration,
             external=self.external_trigger,
             first_tick=self.first_tick,
+            as_arrays=self.as_arrays,
         )
         if not resp.data:
             LOGGER.info("No data received.")
@@ -189,6 +192,11 @@ class AndorAcquire(Executor):
 
     async def _post_exec(self):
         resp = self.driver.cleanup()
+        frame_stats = self.driver.frame_stats()
+        self.active.action.action_params["frames_acquired"] = frame_stats[
+            "frames_acquired"
+        ]
+        self.active.action.action_params["fps"] = frame_stats["fps"]
 
         error = (
             ErrorCodes.none if resp.response == "success" else ErrorCodes.critical_error
@@ -211,10 +219,19 @@ async def andor_dyn_endpoints(app: BaseAPI):
         exp_time: float = 0.0098,
         framerate: float = 98,
         timeout: float = 5000,
+        binary_data: bool = False,
     ):
-        data_keys = ["elapsed_time_s"] + [
-            f"ch_{i:04}" for i in range(app.driver.wl_arr.shape[0])
-        ]
+        ch_keys = [f"ch_{i:04}" for i in range(app.driver.wl_arr.shape[0])]
+        if binary_data:
+            # packed records (see helpers/hlo_binary.py), keys must match get_data
+            data_keys = ["tick_time"] + ch_keys
+            binary_header = {
+                "data_format": "binary",
+                "binary_dtypes": {"tick_time": "<f8", **{k: "<i4" for k in ch_keys}},
+            }
+        else:
+            data_keys = ["elapsed_time_s"] + ch_keys
+            binary_header = {}
         active = await app.base.setup_and_contain_action(
             json_data_keys=data_keys,
             file_type="andor_helao__file",
@@ -223,6 +240,7 @@ async def andor_dyn_endpoints(app: BaseAPI):
                 action_name=action.action_name,
                 column_headings=data_keys,
                 optional={"wl": list(app.driver.wl_arr)},
+                **binary_header,
             ),
         )
 
@@ -74,4 +74,9 @@ def makeApp(server_key):
     async def current_progress():
         return app.driver.progress
 
+    @app.post("/upload_stats", tags=["private"])
+    def upload_stats():
+        """Get S3 upload pool counters and throughput."""
+        return app.driver.get_upload_stats()
+
     return app
@@ -394,6 +394,27 @@ async def galil_dyn_endpoints(app: BaseAPI):
             finished_action = await active.finish()
             return finished_action.as_dict()
 
+        @app.post(f"/{server_key}/solid_get_nearest_samples", tags=["action"])
+        async def solid_get_nearest_samples(
+            action: Action = Body({}, embed=True),
+            action_version: int = 1,
+            plate_id: Optional[int] = None,
+            platexy: Optional[List[List[float]]] = Body(None, embed=True),
+            motorxy: Optional[List[List[float]]] = Body(None, embed=True),
+            max_distance: Optional[float] = None,
+        ):
+            """Nearest sample_no to each platexy, or to each motorxy if platexy is not given"""
+            active = await app.base.setup_and_contain_action()
+            datadict = await app.driver.solid_get_nearest_samples(
+                **active.action.action_params
+            )
+            if None in datadict["sample_no"]:
+                active.action.error_code = ErrorCodes.not_available
+            active.action.action_params.update({"_sample_no": datadict["sample_no"]})
+            await active.enqueue_data_dflt(datadict=datadict)
+            finished_action = await active.finish()
+            return finished_action.as_dict()
+
         @app.post(f"/{server_key}/solid_get_builtin_specref", tags=["action"])
         async def solid_get_builtin_specref(
             action: Action = Body({}, embed=True),
@@ -13,9 +13,7 @@ __all__ = ["makeApp"]
 import asyncio
 import json
 import time
-import itertools
 from typing import Optional, List, Union
-from collections import defaultdict, deque
 
 import numpy as np
 import pandas as pd
@@ -38,6 +36,7 @@ from helao.helpers.executor import Executor
 from helao.helpers import helao_logging as logging  # get LOGGER from BaseAPI instance
 from helao.helpers.yml_tools import yml_dumps
 from helao.helpers.bubble_detection import bubble_detection
+from helao.helpers.ring_buffer import ColumnRingBuffer
 from ...drivers.pstat.gamry.driver import GamryDriver, DriverStatus, ControlMode, GamryPoller
 from ...drivers.pstat.gamry.technique import (
     GamryTechnique,
@@ -64,7 +63,8 @@ class GamryExec(Executor):
             self.poll_rate = 0.01  # pump events every 10 millisecond
             self.concurrent = False
             self.start_time = time.time()
-            self.data_buffer = defaultdict(lambda: deque(maxlen=1000))
+            # latest points for the alert window and final outputs
+            self.data_buffer = ColumnRingBuffer(max_capacity=2**16)
 
             # link attrs for convenience
             self.action_params = self.active.action.action_params
@@ -149,8 +149,8 @@ class GamryExec(Executor):
         try:
             resp = self.driver.get_data(self.poll_rate)
             # populate executor buffer for output calculation
-            for k, v in resp.data.items():
-                self.data_buffer[k].extend(v)
+            if resp.data:
+                self.data_buffer.append(resp.data)
             # check for alert thresholds at this point in data_buffer
             poll_iter_time = time.time()
             if self.alert_params["alert_sleep__s"] is not None:
@@ -169,22 +169,22 @@ class GamryExec(Executor):
                     min_duration = self.alert_params["alert_duration__s"]
                     if (
                         min_duration > 0
-                        and self.data_buffer.get("t_s", [-1])[-1] > min_duration
+                        and self.data_buffer.last("t_s", -1) > min_duration
                     ):
                         LOGGER.debug(
                             f"elapsed time is above min_duration: {min_duration}"
                         )
-                        time_buffer = self.data_buffer["t_s"]
-                        idx = 1
-                        latest_t = time_buffer[-1]
-                        slice_duration = latest_t - time_buffer[-idx]
-                        while (len(time_buffer) > idx) and (
-                            slice_duration < min_duration
-                        ):
-                            idx += 1
-                            slice_duration = latest_t - time_buffer[-idx]
-                        LOGGER.debug(f"slice index is: {-idx}")
-                        if slice_duration >= min_duration:
+                        time_buffer = self.data_buffer.values("t_s")
+                        # latest point at least min_duration before the last one
+                        start = (
+                            np.searchsorted(
+                                time_buffer, time_buffer[-1] - min_duration, side="right"
+                            )
+                            - 1
+                        )
+                        LOGGER.debug(f"slice index is: {start - len(time_buffer)}")
+                        if start >= 0:
+                            slice_duration = time_buffer[-1] - time_buffer[start]
                             LOGGER.debug(
                                 f"slice_duration {slice_duration:.3f} is above min_duration"
                             )
@@ -193,14 +193,11 @@ class GamryExec(Executor):
                                     f"alertThresh{thresh_key}", None
                                 )
                                 if thresh_val is not None:
-                                    data_dq = self.data_buffer[thresh_key]
-                                    slice_vals = list(
-                                        itertools.islice(
-                                            data_dq, len(data_dq) - idx, len(data_dq)
-                                        )
-                                    )
+                                    slice_vals = self.data_buffer.values(thresh_key)[
+                                        start:
+                                    ]
                                     if (
-                                        all([x > thresh_val for x in slice_vals])
+                                        np.all(slice_vals > thresh_val)
                                         and self.alert_params["alert_above"]
                                     ):
                                         LOGGER.alert(
@@ -208,7 +205,7 @@ class GamryExec(Executor):
                                         )
                                         self.last_alert_time = poll_iter_time
                                     elif (
-                                        all([x < thresh_val for x in slice_vals])
+                                        np.all(slice_vals < thresh_val)
                                         and not self.alert_params["alert_above"]
                                     ):
                                         LOGGER.alert(
@@ -224,20 +221,21 @@ class GamryExec(Executor):
             return {"error": error, "status": status, "data": resp.data}
         except Exception:
             LOGGER.error("GamryExec poll error", exc_info=True)
-            print(data_dq)
             return {"error": ErrorCodes.critical_error, "status": HloStatus.errored}
 
     async def _post_exec(self):
         resp = self.driver.cleanup(self.ttl_params)
 
         # parse calculate outputs from data buffer:
+        final_points = self.data_buffer.tail(5)
         for k in ["t_s", "Ewe_V", "I_A"]:
-            if k in self.data_buffer:
-                meanv = np.nanmean(np.array(self.data_buffer[k])[-5:])
+            if k in final_points:
+                meanv = np.nanmean(final_points[k])
                 self.active.action.action_params[f"{k}__mean_final"] = meanv
 
         if self.active.action.action_name == "run_OCV":
-            data_df = pd.DataFrame(self.data_buffer)
+            # bubble detection runs on the last 1000 points
+            data_df = pd.DataFrame(self.data_buffer.tail(1000))
             rsd_thresh = self.action_params.get("RSD_threshold", 1)
             simple_thresh = self.action_params.get("simple_threshold", 1)
             signal_change_thresh = self.action_params.get("signal_change_threshold", 1)
@@ -273,7 +271,7 @@ class GamryEisExec(Executor):
             self.action_params = self.active.action.action_params
             self.poll_rate = 0.01  # pump events every 10 millisecond
             self.concurrent = False
-            self.data_buffer = defaultdict(lambda: deque(maxlen=1000))
+            self.data_buffer = ColumnRingBuffer(max_capacity=2**16)
 
             self.ttl_params = {
                 k: self.action_params.get(k, -1) for k in ("TTLwait", "TTLsend")
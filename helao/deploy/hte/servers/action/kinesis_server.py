@@ -45,7 +45,7 @@ class KinesisMotorExec(Executor):
         velocity = self.action_params.get("velocity_mm_s", None)
         acceleration = self.action_params.get("acceleration_mm_s2", None)
         LOGGER.info("KinesisMotorExec checking velocity and accel.")
-        resp = self.driver.setup(
+        resp = await self.driver.aio.setup(
             axis=self.axis_name, velocity=velocity, acceleration=acceleration
         )
         error = ErrorCodes.none if resp.response == "success" else ErrorCodes.setup
@@ -65,7 +65,7 @@ class KinesisMotorExec(Executor):
         self.start_time = time.time()
         if target_position < self.axis_params.get("move_limit_mm", 3.0):
             LOGGER.info("KinesisMotorExec starting motion.")
-            resp = self.driver.move(self.axis_name, move_mode, move_value)
+            resp = await self.driver.aio.move(self.axis_name, move_mode, move_value)
             error = (
                 ErrorCodes.none
                 if resp.response == "success"
@@ -95,8 +95,9 @@ class KinesisMotorExec(Executor):
 
     async def _manual_stop(self):
         "Perform device manual stop, return error state."
-        self.axis.stop(immediate=True, sync=True)
-        return {"error": ErrorCodes.none}
+        resp = await self.driver.aio.stop(self.axis_name)
+        error = ErrorCodes.none if resp.response == "success" else ErrorCodes.stop
+        return {"error": error}
 
 
 async def kinesis_dyn_endpoints(app: BaseAPI):
@@ -157,9 +158,10 @@ async def kinesis_dyn_endpoints(app: BaseAPI):
             acceleration_mm_s2: Optional[float] = None,
         ):
             active = await app.base.setup_and_contain_action(action_abbr="set_velocity")
-            app.driver.motors[
-                active.action.action_params["axis"]
-            ].set_velocity_parameters(
+            await app.driver.io.call(
+                app.driver.motors[
+                    active.action.action_params["axis"]
+                ].set_velocity_parameters,
                 acceleration=active.action.action_params["acceleration_mm_s2"],
                 max_velocity=active.action.action_params["velocity_mm_s"],
             )
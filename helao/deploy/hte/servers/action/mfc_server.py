@@ -364,20 +364,22 @@ async def mfc_dyn_endpoints(app: BaseAPI):
             return app.driver.manual_query_status(device_name)
 
         @app.post("/read_valve_register", tags=["private"])
-        def read_valve_register(device_name: app.driver.dev_mfcs = devices[0]):
-            return app.driver._send(device_name, "R53")
+        async def read_valve_register(device_name: app.driver.dev_mfcs = devices[0]):
+            return await app.driver.io.call(app.driver._send, device_name, "R53")
 
         @app.post("/write_valve_register", tags=["private"])
-        def write_valve_register(
+        async def write_valve_register(
             device_name: app.driver.dev_mfcs = devices[0], value: int = 20000
         ):
-            return app.driver._send(device_name, f"W53={value}")
+            return await app.driver.io.call(
+                app.driver._send, device_name, f"W53={value}"
+            )
 
         @app.post("/send_command", tags=["private"])
-        def send_command(
+        async def send_command(
             device_name: app.driver.dev_mfcs = devices[0], command: str = ""
         ):
-            return app.driver._send(device_name, command)
+            return await app.driver.io.call(app.driver._send, device_name, command)
 
 
 def makeApp(server_key):
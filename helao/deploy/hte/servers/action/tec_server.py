@@ -73,7 +73,9 @@ def makeApp(server_key):
     ):
         """Set target temperature without enabling/disabling control."""
         active = await app.base.setup_and_contain_action(action_abbr="setTEC")
-        app.driver.set_temp(active.action.action_params["target_temperature_degc"])
+        await app.driver.io.call(
+            app.driver.set_temp, active.action.action_params["target_temperature_degc"]
+        )
         finished_action = await active.finish()
         return finished_action.as_dict()
 
@@ -84,7 +86,7 @@ def makeApp(server_key):
     ):
         "Enable TEC control." ""
         active = await app.base.setup_and_contain_action(action_abbr="enableTEC")
-        app.driver.enable()
+        await app.driver.io.call(app.driver.enable)
         finished_action = await active.finish()
         return finished_action.as_dict()
 
@@ -95,7 +97,7 @@ def makeApp(server_key):
     ):
         """Disable TEC control."""
         active = await app.base.setup_and_contain_action(action_abbr="disableTEC")
-        app.driver.disable()
+        await app.driver.io.call(app.driver.disable)
         finished_action = await active.finish()
         return finished_action.as_dict()
 
@@ -62,16 +62,20 @@ class C_potvis:
             return
         self.potserv_host = self.potserv_config.get("host", None)
         self.potserv_port = self.potserv_config.get("port", None)
-        self.wss = Wss(self.potserv_host, self.potserv_port, "ws_data")
-
-        self.data_url = (
-            f"ws://{self.potserv_config['host']}:{self.potserv_config['port']}/ws_data"
+        self.data_dict_keys = ["t_s", "Ewe_V", "I_A", "Zreal", "Zimag", "Zfreq", "Zphz"]
+        # only the plotted columns, min/max decimated to points_per_s
+        self.points_per_s = self.config_dict.get("points_per_s", 500)
+        self.wss = Wss(
+            self.potserv_host,
+            self.potserv_port,
+            f"ws_data_decimated?keys={','.join(self.data_dict_keys)}&points_per_s={self.points_per_s}",
         )
 
+        self.data_url = f"ws://{self.potserv_config['host']}:{self.potserv_config['port']}/ws_data_decimated"
+
         self.IOloop_data_run = False
         self.IOloop_stat_run = False
 
-        self.data_dict_keys = ["t_s", "Ewe_V", "I_A", "Zreal", "Zimag", "Zfreq", "Zphz"]
         self.datasource = ColumnDataSource(
             data={key: [] for key in self.data_dict_keys}
         )
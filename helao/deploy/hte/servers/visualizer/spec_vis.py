@@ -56,12 +56,18 @@ class C_specvis:
             return
         self.specserv_host = self.specserv_config.get("host", None)
         self.specserv_port = self.specserv_config.get("port", None)
-        self.wss = Wss(self.specserv_host, self.specserv_port, "ws_data")
+        # at most spectra_per_s whole spectra per second from the server
+        self.spectra_per_s = self.config_dict.get("spectra_per_s", 5)
+        self.wss = Wss(
+            self.specserv_host,
+            self.specserv_port,
+            f"ws_data_decimated?method=stride&keys=epoch_s,ch_*&points_per_s={self.spectra_per_s}",
+        )
 
         self.cmap = cm.get_cmap("Reds_r", self.max_spectra)
         self.latest_coloridx = 0
 
-        self.data_url = f"ws://{self.specserv_config['host']}:{self.specserv_config['port']}/ws_data"
+        self.data_url = f"ws://{self.specserv_config['host']}:{self.specserv_config['port']}/ws_data_decimated"
 
         self.wl = private_dispatcher(
             self.spec_key,
@@ -233,31 +239,38 @@ class C_specvis:
             ):
                 for _, uuid_dict in data_package.datamodel.data.items():
                     # unpack and sort epoch and channels
-                    epoch = uuid_dict["epoch_s"]
-                    dtstr = datetime.fromtimestamp(epoch).strftime(
-                        "%Y-%m-%d %H:%M:%S.%f"
-                    )
                     ch_keys = sorted(
                         [k for k in uuid_dict.keys() if k.startswith("ch_")],
                         key=lambda x: int(x.split("_")[-1]),
                     )
-                    data_dict = {
-                        "wl": [self.wl[:: self.downsample]],
-                        "ev": [self.ev[:: self.downsample]],
-                        "trans": [[uuid_dict[k] for k in ch_keys][:: self.downsample]],
-                        "color": [mcolors.rgb2hex(self.cmap(0))],
-                        "time": [dtstr],
-                    }
-
-                    current_colors = self.datasource.data["color"]
-                    new_colors = [
-                        mcolors.rgb2hex(self.cmap((i + 1) % self.max_spectra))
-                        for i, _ in enumerate(current_colors)
-                    ]
-                    self.datasource.patch(
-                        {"color": [(slice(len(new_colors)), new_colors)]}
-                    )
-                    self.datasource.stream(data_dict, rollover=self.max_spectra)
+                    # decimated packages hold several spectra as lists
+                    epochs = uuid_dict["epoch_s"]
+                    if not isinstance(epochs, list):
+                        epochs = [epochs]
+                        uuid_dict = {k: [uuid_dict[k]] for k in ch_keys}
+                    for row, epoch in enumerate(epochs):
+                        dtstr = datetime.fromtimestamp(epoch).strftime(
+                            "%Y-%m-%d %H:%M:%S.%f"
+                        )
+                        data_dict = {
+                            "wl": [self.wl[:: self.downsample]],
+                            "ev": [self.ev[:: self.downsample]],
+                            "trans": [
+                                [uuid_dict[k][row] for k in ch_keys][:: self.downsample]
+                            ],
+                            "color": [mcolors.rgb2hex(self.cmap(0))],
+                            "time": [dtstr],
+                        }
+
+                        current_colors = self.datasource.data["color"]
+                        new_colors = [
+                            mcolors.rgb2hex(self.cmap((i + 1) % self.max_spectra))
+                            for i, _ in enumerate(current_colors)
+                        ]
+                        self.datasource.patch(
+                            {"color": [(slice(len(new_colors)), new_colors)]}
+                        )
+                        self.datasource.stream(data_dict, rollover=self.max_spectra)
 
     def _add_plots(self):
         # # clear legend
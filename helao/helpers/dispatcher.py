@@ -1,17 +1,235 @@
-__all__ = ["async_action_dispatcher", "async_private_dispatcher", "private_dispatcher"]
+__all__ = [
+    "async_action_dispatcher",
+    "async_private_dispatcher",
+    "private_dispatcher",
+    "HTTPClientPool",
+    "HTTP_POOL",
+    "configure_http_pool",
+]
 
 import traceback
 import asyncio
+import random
+from bisect import bisect_left
+from time import perf_counter
+from typing import Dict, Tuple
+
 import aiohttp
 import requests
 
 from .premodels import Action
 from helao.core.error import ErrorCodes
+from helao.core.helaodict import json_dumps
 
 from helao.helpers import helao_logging as logging
 
 LOGGER = logging.make_logger(__file__) if logging.LOGGER is None else logging.LOGGER
 
+# upper bucket edges of the per-server request latency histograms
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class _LatencyHistogram:
+    """Request counts and latency buckets for one (host, port) target."""
+
+    def __init__(self, server_key: str):
+        self.server_key = server_key
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, latency_ms: float):
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.requests += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def as_dict(self):
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [
+            f">{LATENCY_BUCKETS_MS[-1]}ms"
+        ]
+        return {
+            "server_key": self.server_key,
+            "requests": self.requests,
+            "failures": self.failures,
+            "retries": self.retries,
+            "latency_mean_ms": self.total_ms / self.requests if self.requests else 0.0,
+            "latency_max_ms": self.max_ms,
+            "latency_histogram": dict(zip(labels, self.counts)),
+        }
+
+
+class HTTPClientPool:
+    """
+    Process-wide pool of keep-alive aiohttp sessions, one per (host, port).
+
+    Dispatchers used to open a new TCPConnector(force_close=True) per request,
+    paying connection setup on every status push and leaving sockets in
+    TIME_WAIT. Sessions are now created on first use and reused until close()
+    is called; a session created on another (closed) event loop is replaced.
+    Request bodies are encoded with orjson (helaodict.json_dumps).
+
+    Args:
+        limit_per_host (int): Maximum simultaneous connections per target. Defaults to 100.
+        keepalive_timeout (float): Seconds an idle connection is kept open. Defaults to 30.
+        backoff_base (float): First retry delay in seconds. Defaults to 0.5.
+        backoff_max (float): Upper bound of the retry delay in seconds. Defaults to 30.
+    """
+
+    def __init__(
+        self,
+        limit_per_host: int = 100,
+        keepalive_timeout: float = 30.0,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sessions: Dict[
+            Tuple[str, int], Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]
+        ] = {}
+        self._histograms: Dict[Tuple[str, int], _LatencyHistogram] = {}
+
+    def configure(self, **kwargs):
+        """Update pool parameters; open sessions keep their connector limits."""
+        for k, v in kwargs.items():
+            if k not in (
+                "limit_per_host",
+                "keepalive_timeout",
+                "backoff_base",
+                "backoff_max",
+            ):
+                LOGGER.warning(f"unknown http pool parameter '{k}' ignored.")
+                continue
+            setattr(self, k, v)
+
+    def session(self, host: str, port: int) -> aiohttp.ClientSession:
+        """Return the keep-alive session for (host, port) on the running loop."""
+        key = (host, int(port))
+        loop = asyncio.get_running_loop()
+        entry = self._sessions.get(key)
+        if entry is not None:
+            sess_loop, sess = entry
+            if sess_loop is loop and not sess.closed:
+                return sess
+        conn = aiohttp.TCPConnector(
+            limit=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            enable_cleanup_closed=True,
+        )
+        sess = aiohttp.ClientSession(connector=conn, json_serialize=json_dumps)
+        self._sessions[key] = (loop, sess)
+        return sess
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered exponential delay in seconds before retry number *attempt* (1-based)."""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def histogram(self, server_key: str, host: str, port: int) -> _LatencyHistogram:
+        key = (host, int(port))
+        if key not in self._histograms:
+            self._histograms[key] = _LatencyHistogram(server_key)
+        return self._histograms[key]
+
+    async def post_json(
+        self,
+        label: str,
+        server_key: str,
+        host: str,
+        port: int,
+        path: str,
+        params: dict = {},
+        json_dict: dict = {},
+        timeout: int = 60,
+        retries: int = 5,
+    ):
+        """
+        POST json to http://host:port/path and decode the json response.
+
+        Non-200 responses and exceptions are retried up to *retries* times with
+        jittered exponential backoff. A dropped keep-alive connection is
+        retried once immediately.
+
+        Returns:
+            tuple: The decoded response (None on failure) and an ErrorCodes value.
+        """
+        url = f"http://{host}:{port}/{path}"
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        hist = self.histogram(server_key, host, port)
+        error_code = ErrorCodes.unspecified
+        response = None
+        success = False
+        retry_count = 0
+
+        while not success and retry_count < retries:
+            retry_wait = None
+            t0 = perf_counter()
+            try:
+                session = self.session(host, port)
+                async with session.post(
+                    url, params=params, json=json_dict, timeout=client_timeout
+                ) as resp:
+                    response = await resp.json()
+                    hist.add((perf_counter() - t0) * 1e3)
+                    error_code = ErrorCodes.none
+                    if resp.status != 200:
+                        error_code = ErrorCodes.http
+                        LOGGER.error(
+                            f"{label} POST request returned status {resp.status}: '{response}', error={error_code}"
+                        )
+                        retry_count += 1
+                        retry_wait = self.backoff(retry_count)
+                    else:
+                        success = True
+            except Exception as e:
+                retry_count += 1
+                response = None
+                if isinstance(e, aiohttp.ServerDisconnectedError) and retry_count == 1:
+                    # stale keep-alive connection, the server may have restarted
+                    retry_wait = 0
+                else:
+                    retry_wait = self.backoff(retry_count)
+                LOGGER.warning(
+                    f"{label} POST request encountered an error, sleeping for {retry_wait:.2f} seconds before retrying...",
+                    exc_info=True,
+                )
+            if not success and retry_count < retries:
+                hist.retries += 1
+                await asyncio.sleep(retry_wait)
+        if not success:
+            hist.failures += 1
+        return success, response, error_code
+
+    def stats(self) -> dict:
+        """Return request counts and latency histograms keyed by 'host:port'."""
+        return {
+            f"{host}:{port}": hist.as_dict()
+            for (host, port), hist in self._histograms.items()
+        }
+
+    async def close(self):
+        """Close all sessions belonging to the running event loop."""
+        loop = asyncio.get_running_loop()
+        for key, (sess_loop, sess) in list(self._sessions.items()):
+            if sess_loop is loop and not sess.closed:
+                await sess.close()
+            self._sessions.pop(key, None)
+
+
+HTTP_POOL = HTTPClientPool()
+
+
+def configure_http_pool(**kwargs):
+    """Update the parameters of the process-wide HTTP_POOL, see HTTPClientPool."""
+    HTTP_POOL.configure(**kwargs)
+    return HTTP_POOL
+
 
 async def async_action_dispatcher(
     world_config_dict: dict,
@@ -22,6 +240,7 @@ async def async_action_dispatcher(
 ):
     """
     Asynchronously dispatches an action to the specified server and handles the response.
+    The request is sent over the pooled keep-alive session of the target server.
 
     Args:
         world_config_dict (dict): A dictionary containing the configuration of the world, including server details.
@@ -35,53 +254,21 @@ async def async_action_dispatcher(
         Exception: If there is an issue with the request or response handling, an exception is caught and logged.
     """
     actd = world_config_dict["servers"][A.action_server.server_name]
-    act_addr = actd["host"]
-    act_port = actd["port"]
-    url = f"http://{act_addr}:{act_port}/{A.action_server.server_name}/{A.action_name}"
-    success = False
-    retry_count = 0
-
-    client_timeout = aiohttp.ClientTimeout(total=timeout)
-    error_code = ErrorCodes.unspecified
-    response = None
-
-    while not success and retry_count < retries:
-        conn = aiohttp.TCPConnector(
-            force_close=True, enable_cleanup_closed=True, limit=1000
-        )
-        try:
-            async with aiohttp.ClientSession(
-                timeout=client_timeout, connector=conn
-            ) as session:
-                async with session.post(
-                    url,
-                    params=params,
-                    json={"action": A.as_dict()},
-                ) as resp:
-                    response = await resp.json()
-                    error_code = ErrorCodes.none
-                    if resp.status != 200:
-                        error_code = ErrorCodes.http
-                        LOGGER.error(
-                            f"{A.action_server.server_name}/{A.action_name} POST request returned status {resp.status}: '{response}', error={error_code}"
-                        )
-                        success = False
-                    else:
-                        success = True
-        except Exception:
-            retry_count += 1
-            retry_wait = retry_count * timeout / 2
-            LOGGER.warning(
-                f"{A.action_server.server_name}/{A.action_name} encountered an error, sleeping for {retry_wait} seconds before retrying...",
-                exc_info=True,
-            )
-            await asyncio.sleep(retry_wait)
-            response = None
-        finally:
-            await conn.close()
+    label = f"{A.action_server.server_name}/{A.action_name}"
+    success, response, error_code = await HTTP_POOL.post_json(
+        label=label,
+        server_key=A.action_server.server_name,
+        host=actd["host"],
+        port=actd["port"],
+        path=f"{A.action_server.server_name}/{A.action_name}",
+        params=params,
+        json_dict={"action": A.as_dict()},
+        timeout=timeout,
+        retries=retries,
+    )
     if not success:
         LOGGER.error(
-            f"{A.action_server.server_name}/{A.action_name} async_action_dispatcher could not decide response: '{response}')",
+            f"{label} async_action_dispatcher could not decide response: '{response}')",
             exc_info=True,
         )
 
@@ -101,6 +288,7 @@ async def async_private_dispatcher(
 ):
     """
     Asynchronously dispatches a private action to a specified server.
+    The request is sent over the pooled keep-alive session of the target server.
 
     Args:
         server_key (str): The key identifying the server.
@@ -113,51 +301,21 @@ async def async_private_dispatcher(
     Returns:
         tuple: A tuple containing the response from the server and an error code.
     """
-    url = f"http://{host}:{port}/{private_action}"
-    success = False
-    retry_count = 0
-
-    client_timeout = aiohttp.ClientTimeout(total=timeout)
-    error_code = ErrorCodes.unspecified
-    response = None
-
-    while not success and retry_count < retries:
-        conn = aiohttp.TCPConnector(
-            force_close=True, enable_cleanup_closed=True, limit=1000
-        )
-        try:
-            async with aiohttp.ClientSession(
-                timeout=client_timeout, connector=conn
-            ) as session:
-                async with session.post(
-                    url,
-                    params=params_dict,
-                    json=json_dict,
-                ) as resp:
-                    response = await resp.json()
-                    error_code = ErrorCodes.none
-                    if resp.status != 200:
-                        error_code = ErrorCodes.http
-                        LOGGER.error(
-                            f"{server_key}/{private_action} POST request returned status {resp.status}: '{response}')"
-                        )
-                        success = False
-                    else:
-                        success = True
-        except Exception:
-            retry_count += 1
-            retry_wait = retry_count * timeout / 2
-            LOGGER.warning(
-                f"{server_key}/{private_action} POST request encountered an error, sleeping for {retry_wait} seconds before retrying...",
-                exc_info=True,
-            )
-            await asyncio.sleep(retry_wait)
-            response = None
-        finally:
-            await conn.close()
+    label = f"{server_key}/{private_action}"
+    success, response, error_code = await HTTP_POOL.post_json(
+        label=label,
+        server_key=server_key,
+        host=host,
+        port=port,
+        path=private_action,
+        params=params_dict,
+        json_dict=json_dict,
+        timeout=timeout,
+        retries=retries,
+    )
     if not success:
         LOGGER.error(
-            f"{server_key}/{private_action} async_private_dispatcher could not decide response: '{response}')",
+            f"{label} async_private_dispatcher could not decide response: '{response}')",
             exc_info=True,
         )
     await asyncio.sleep(0)
@@ -3,7 +3,7 @@ from pathlib import Path
 from typing import Union
 
 from .yml_tools import yml_load
-from .read_hlo import read_hlo
+from .read_hlo import read_hlo, read_hlo_columns
 
 
 class FileMapper:
@@ -30,6 +30,9 @@ class FileMapper:
         read_hlo(p: str, retries: int = 3) -> Union[tuple, None]:
             Reads an HLO file from the given relative path with a specified number of retries.
 
+        read_hlo_columns(p: str, retries: int = 3, **kwargs) -> Union[tuple, None]:
+            Reads selected columns and rows of an HLO file as numpy arrays or a table, with retries.
+
         read_yml(p: str) -> dict:
             Reads a YAML file from the given relative path and returns its contents as a dictionary.
 
@@ -115,7 +118,8 @@ class FileMapper:
 
     def read_hlo(self, p: str, retries: int = 3):
         """
-        Reads an HLO file from the specified path with retry logic.
+        Reads an HLO file from the specified path with retry logic. Binary data
+        sections are returned as memory-mapped numpy arrays (see read_hlo).
 
         Args:
             p (str): The path to the HLO file.
@@ -143,6 +147,32 @@ class FileMapper:
                     retry_counter += 1
             return None
 
+    def read_hlo_columns(self, p: str, retries: int = 3, **kwargs):
+        """
+        Reads selected columns and rows of an HLO file from the specified path with retry logic.
+
+        Args:
+            p (str): The path to the HLO file.
+            retries (int, optional): The number of times to retry reading the file in case of a ValueError. Defaults to 3.
+            **kwargs: keep_keys, omit_keys, start, stop and output, see read_hlo_columns.
+
+        Returns:
+            tuple: The metadata and data of the HLO file if read successfully, otherwise None.
+
+        Raises:
+            FileNotFoundError: If the file cannot be located.
+        """
+        lp = self.locate(p)
+        if lp is None:
+            raise FileNotFoundError
+        retry_counter = 0
+        while retry_counter <= retries:
+            try:
+                return read_hlo_columns(lp.__str__(), **kwargs)
+            except ValueError:  # retry in case file not fully written
+                retry_counter += 1
+        return None
+
     def read_yml(self, p: str):
         """
         Reads a YAML file from the specified path and returns its contents as a dictionary.
@@ -15,6 +15,7 @@ import orjson
 import pandas as pd
 from .yml_tools import yml_load
 from .read_hlo import read_hlo
+from .hlo_binary import hlo_is_binary, read_hlo_binary
 from .file_mapper import FileMapper
 
 
@@ -275,7 +276,8 @@ class HelaoData:
         If the target file ends with ".zip", it reads the specified hlotarget file
         from within the zip archive, decodes the lines, and processes the metadata
         and data sections. The metadata is parsed as YAML, and the data is parsed
-        as JSON and stored in a defaultdict.
+        as JSON and stored in a defaultdict. Binary data sections are returned as
+        numpy arrays viewing the extracted bytes.
 
         Args:
             hlotarget (str): The target .hlo file to read.
@@ -284,16 +286,30 @@ class HelaoData:
             tuple: A tuple containing:
             - meta (dict): The metadata parsed from the .hlo file.
             - data (defaultdict): The data parsed from the .hlo file, organized
-              into a defaultdict of lists.
+              into a defaultdict of lists (or numpy arrays for binary data sections).
         """
         if self.target.endswith(".zip") and "RUNS_NOSYNC" not in hlotarget:
             header_lines = []
             header_end = False
+            meta = {}
             data = defaultdict(list)
 
             with zipfile.ZipFile(self.target, "r") as zf:
-                for line in zf.open(hlotarget):
-                    if header_end:
+                with zf.open(hlotarget) as f:
+                    for line in f:
+                        if line.decode("utf8").startswith("%%"):
+                            header_end = True
+                            break
+                        header_lines.append(line)
+                    if header_lines:
+                        meta = dict(
+                            yml_load("".join([x.decode("utf8") for x in header_lines]))
+                        )
+                    if header_end and hlo_is_binary(meta):
+                        return meta, read_hlo_binary(
+                            f.read(), meta, 0, keep_keys, omit_keys
+                        )
+                    for line in f:
                         line_dict = orjson.loads(line)
                         for k in line_dict:
                             if k in keep_keys or k not in omit_keys:
@@ -302,17 +318,9 @@ class HelaoData:
                                     data[k] += v
                                 else:
                                     data[k].append(v)
-                    elif line.decode("utf8").startswith("%%"):
-                        header_end = True
-                    elif not header_end:
-                        header_lines.append(line)
-            if header_lines:
-                meta = dict(yml_load("".join([x.decode("utf8") for x in header_lines])))
-            else:
-                meta = {}
             return meta, data
         else:
-            return read_hlo(hlotarget)
+            return read_hlo(hlotarget, keep_keys=keep_keys, omit_keys=omit_keys)
 
     def read_parquet(
         self, hlotarget: str, keep_keys: list = [], omit_keys: list = []
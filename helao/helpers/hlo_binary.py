@@ -0,0 +1,151 @@
+"""
+Columnar binary data section for high-rate .hlo files.
+
+An .hlo file normally stores one JSON line per data message after the '%%'
+separator. When the YAML header contains `data_format: binary`, the data section
+instead holds packed fixed-size records, one per data row, laid out as a NumPy
+structured dtype with one field per entry of `column_headings`. Field types are
+listed in the header under `binary_dtypes` (numpy dtype strings, "<f8" if not
+given), so the file remains self-describing:
+
+    hlo_version: ...
+    column_headings: [t_s, Ewe_V, I_A]
+    data_format: binary
+    binary_dtypes: {t_s: <f8, Ewe_V: <f8, I_A: <f8}
+    %%
+    <raw little-endian records>
+
+Readers map the records with np.memmap (or np.frombuffer for in-memory bytes,
+e.g. zip members) and return per-column views without copying.
+"""
+
+__all__ = [
+    "HLO_BINARY_FORMAT",
+    "HLO_BINARY_DEFAULT_DTYPE",
+    "hlo_is_binary",
+    "hlo_record_dtype",
+    "pack_hlo_records",
+    "read_hlo_binary",
+]
+
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+HLO_BINARY_FORMAT = "binary"
+HLO_BINARY_DEFAULT_DTYPE = "<f8"
+
+
+def hlo_is_binary(meta: dict) -> bool:
+    """Return True if the parsed .hlo header declares a binary data section."""
+    return bool(meta) and meta.get("data_format", None) == HLO_BINARY_FORMAT
+
+
+def hlo_record_dtype(
+    column_headings: List[str], binary_dtypes: Optional[Dict[str, str]] = None
+) -> np.dtype:
+    """
+    Build the packed record dtype for a binary .hlo data section.
+
+    Args:
+        column_headings (List[str]): Ordered data keys, one field per key.
+        binary_dtypes (Dict[str, str], optional): numpy dtype string per key,
+            keys not listed use HLO_BINARY_DEFAULT_DTYPE.
+
+    Returns:
+        np.dtype: Unaligned structured dtype, one record per data row.
+    """
+    if binary_dtypes is None:
+        binary_dtypes = {}
+    return np.dtype(
+        [
+            (str(k), np.dtype(binary_dtypes.get(k, HLO_BINARY_DEFAULT_DTYPE)))
+            for k in column_headings
+        ]
+    )
+
+
+def pack_hlo_records(sample_data: dict, record_dtype: np.dtype) -> bytes:
+    """
+    Pack one data message into raw records.
+
+    Scalar values produce a single record, list or array values produce one
+    record per element. All columns of a message must have the same length,
+    and keys which are not part of `record_dtype` are ignored; missing columns
+    are filled with NaN (or 0 for non-float fields).
+
+    Args:
+        sample_data (dict): Data message as passed to Active.enqueue_data.
+        record_dtype (np.dtype): Dtype from hlo_record_dtype.
+
+    Returns:
+        bytes: Packed records.
+
+    Raises:
+        ValueError: If the columns of the message have different lengths.
+    """
+    columns = {
+        k: np.atleast_1d(np.asarray(sample_data[k]))
+        for k in record_dtype.names
+        if k in sample_data
+    }
+    lengths = {v.shape[0] for v in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"binary hlo columns have unequal lengths: {lengths}")
+    nrows = lengths.pop() if lengths else 0
+    records = np.zeros(nrows, dtype=record_dtype)
+    for k in record_dtype.names:
+        if k in columns:
+            records[k] = columns[k]
+        elif records[k].dtype.kind == "f":
+            records[k] = np.nan
+    return records.tobytes()
+
+
+def read_hlo_binary(
+    source: Union[str, bytes, memoryview],
+    meta: dict,
+    offset: int = 0,
+    keep_keys: list = [],
+    omit_keys: list = [],
+) -> Dict[str, np.ndarray]:
+    """
+    Map the binary data section of an .hlo file to column arrays.
+
+    Args:
+        source (str | bytes | memoryview): Path of the .hlo file (memory-mapped
+            read-only) or its full content in memory.
+        meta (dict): Parsed YAML header of the file.
+        offset (int): Byte offset of the first record, i.e. just past '%%\\n'.
+        keep_keys (list): Columns to keep, same semantics as read_hlo.
+        omit_keys (list): Columns to drop, same semantics as read_hlo.
+
+    Returns:
+        Dict[str, np.ndarray]: Column views into the mapped records. A trailing
+        partially written record is ignored.
+    """
+    record_dtype = hlo_record_dtype(
+        meta.get("column_headings", []), meta.get("binary_dtypes", None)
+    )
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            f.seek(0, 2)
+            nbytes = f.tell() - offset
+    else:
+        nbytes = len(source) - offset
+    nrows = max(nbytes, 0) // record_dtype.itemsize if record_dtype.itemsize else 0
+
+    if nrows == 0:
+        records = np.zeros(0, dtype=record_dtype)
+    elif isinstance(source, str):
+        records = np.memmap(
+            source, dtype=record_dtype, mode="r", offset=offset, shape=(nrows,)
+        )
+    else:
+        records = np.frombuffer(source, dtype=record_dtype, count=nrows, offset=offset)
+
+    return {
+        k: records[k]
+        for k in record_dtype.names
+        if k in keep_keys or k not in omit_keys
+    }
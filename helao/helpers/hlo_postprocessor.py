@@ -1,11 +1,28 @@
 import os
-from typing import List
+import re
+from typing import List, Optional
 from glob import glob
 from abc import ABC, abstractmethod
 from helao.core.models.file import FileInfo
 from .premodels import Action
 
 
+def find_run_yml(yml_dir: str) -> Optional[str]:
+    """
+    Return the yml file in *yml_dir*, or in the same directory under another
+    RUNS_* state if it was promoted meanwhile, e.g. an experiment moved to
+    RUNS_FINISHED by the orch while its actions are still post-processing.
+    """
+    yml_paths = glob(os.path.join(yml_dir, "*.yml"))
+    if not yml_paths:
+        runstates = re.findall("RUNS_[A-Z]+", yml_dir)
+        if runstates:
+            yml_paths = glob(
+                os.path.join(yml_dir.replace(runstates[-1], "RUNS_*"), "*.yml")
+            )
+    return yml_paths[0] if yml_paths else None
+
+
 class HloPostProcessor(ABC):
 
     def __init__(self, action: Action, save_root: str):
@@ -13,14 +30,20 @@ class HloPostProcessor(ABC):
         if action.manual_action:
             save_root = str(save_root).replace("RUNS_ACTIVE", "RUNS_DIAG")
         self.output_dir = os.path.join(save_root, action.action_output_dir)
-        exp_dir = os.path.dirname(self.output_dir)
-        exp_yml_paths = glob(os.path.join(exp_dir, "*.yml"))
-        self.exp_yml_path = exp_yml_paths[0] if exp_yml_paths else None
-        seq_dir = os.path.dirname(exp_dir)
-        seq_yml_paths = glob(os.path.join(seq_dir, "*.yml"))
-        self.seq_yml_path = seq_yml_paths[0] if seq_yml_paths else None
+        self.exp_dir = os.path.dirname(self.output_dir)
+        self.seq_dir = os.path.dirname(self.exp_dir)
         self.files = action.files
 
+    @property
+    def exp_yml_path(self) -> Optional[str]:
+        """Experiment yml, located when accessed as the orch may have moved it."""
+        return find_run_yml(self.exp_dir)
+
+    @property
+    def seq_yml_path(self) -> Optional[str]:
+        """Sequence yml, located when accessed as the orch may have moved it."""
+        return find_run_yml(self.seq_dir)
+
     @abstractmethod
     def process(self) -> List[FileInfo]:
         """Return updated list of all action files, after post-processing."""
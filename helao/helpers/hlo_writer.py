@@ -0,0 +1,261 @@
+"""
+Batched, buffered writer for streaming .hlo data files.
+
+Active.log_data_task receives one data message per acquisition poll and used to
+serialize and await one aiofiles write per message and file_conn_key. The
+HloBatchWriter coalesces the serialized lines per file connection and flushes
+them with a single write once a batch is large enough, old enough, or the file
+is closed.
+
+Encoders:
+    json: json.dumps, output is byte-identical to the legacy writer (default).
+    orjson: orjson.dumps with numpy support, compact separators; the lines are
+        still plain JSON and are parsed by read_hlo, but NaN is written as null.
+
+Files registered with a record dtype hold a binary data section instead (see
+helpers/hlo_binary.py); dict payloads are then packed into raw records.
+"""
+
+__all__ = ["HloBatchWriter", "HLO_ENCODERS"]
+
+import asyncio
+import json
+from time import perf_counter
+from typing import Dict, Optional, Union
+from uuid import UUID
+
+import numpy as np
+import orjson
+
+from helao.helpers import helao_logging as logging
+from helao.helpers.hlo_binary import pack_hlo_records
+
+LOGGER = logging.make_logger(__file__) if logging.LOGGER is None else logging.LOGGER
+
+
+def _encode_json(sample_data: dict) -> str:
+    return json.dumps(sample_data)
+
+
+def _encode_orjson(sample_data: dict) -> str:
+    return orjson.dumps(
+        sample_data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    ).decode("utf8")
+
+
+HLO_ENCODERS = {"json": _encode_json, "orjson": _encode_orjson}
+
+
+class _FileBuffer:
+    """Pending lines (or binary records) for one file connection."""
+
+    def __init__(self, file, record_dtype: Optional[np.dtype] = None):
+        self.file = file
+        self.record_dtype = record_dtype
+        self.binary = record_dtype is not None
+        self.lines = []
+        self.nbytes = 0
+        self.first_ts = None
+        self.lock = asyncio.Lock()
+
+
+class HloBatchWriter:
+    """
+    Coalesces .hlo data lines per file connection and flushes them in batches.
+
+    A batch is flushed when it holds `max_batch_lines` lines or `max_batch_bytes`
+    characters, when its oldest line is older than `max_delay` seconds (checked
+    by a background flusher task and on every write), or when the file is
+    flushed or closed explicitly. When the total number of pending characters
+    across all files exceeds `max_pending_bytes`, writes block until every
+    buffer has been flushed, which back-pressures the data logger.
+
+    Args:
+        encoder (str): Key of HLO_ENCODERS used for dict payloads. Defaults to "json".
+        max_batch_lines (int): Line count that triggers a flush. Defaults to 1000.
+        max_batch_bytes (int): Buffered characters that trigger a flush. Defaults to 1 MiB.
+        max_delay (float): Maximum age in seconds of a buffered line. Defaults to 0.2.
+        max_pending_bytes (int): Total buffered characters before writes block. Defaults to 64 MiB.
+    """
+
+    def __init__(
+        self,
+        encoder: str = "json",
+        max_batch_lines: int = 1000,
+        max_batch_bytes: int = 1 << 20,
+        max_delay: float = 0.2,
+        max_pending_bytes: int = 64 << 20,
+    ):
+        if encoder not in HLO_ENCODERS:
+            LOGGER.warning(f"unknown hlo encoder '{encoder}', using 'json'.")
+            encoder = "json"
+        self.encoder = encoder
+        self._encode = HLO_ENCODERS[encoder]
+        self.max_batch_lines = max_batch_lines
+        self.max_batch_bytes = max_batch_bytes
+        self.max_delay = max_delay
+        self.max_pending_bytes = max_pending_bytes
+
+        self._buffers: Dict[UUID, _FileBuffer] = {}
+        self._pending_bytes = 0
+        self._flusher: Optional[asyncio.Task] = None
+
+        self.lines_written = 0
+        self.bytes_written = 0
+        self.flushes = 0
+        self.flush_time_total = 0.0
+        self.flush_time_max = 0.0
+        self.flush_time_last = 0.0
+        self.backpressure_events = 0
+        self.backpressure_time_total = 0.0
+
+    def __contains__(self, file_conn_key: UUID):
+        return file_conn_key in self._buffers
+
+    def register(
+        self, file_conn_key: UUID, file, record_dtype: Optional[np.dtype] = None
+    ) -> None:
+        """
+        Attach an open (aiofiles) file handle to *file_conn_key*.
+
+        If *record_dtype* is given, the file must be opened in binary mode and
+        dict payloads are packed as binary .hlo records.
+        """
+        self._buffers[file_conn_key] = _FileBuffer(file, record_dtype)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(
+                self._flush_loop()
+            )
+
+    def encode(
+        self, sample_data: dict, file_conn_key: Optional[UUID] = None
+    ) -> Union[str, bytes]:
+        """
+        Serialize a data dict to a single .hlo line (without newline), or to
+        packed records if *file_conn_key* refers to a binary file.
+        """
+        buf = self._buffers.get(file_conn_key)
+        if buf is not None and buf.binary:
+            try:
+                return pack_hlo_records(sample_data, buf.record_dtype)
+            except (TypeError, ValueError):
+                LOGGER.error("Data could not be packed as binary records.", exc_info=True)
+                return b""
+        try:
+            return self._encode(sample_data)
+        except TypeError:
+            LOGGER.error("Data is not json serializable.")
+            return "Error: data was not serializable."
+
+    async def write(self, file_conn_key: UUID, output_str: Union[str, bytes]) -> None:
+        """Buffer *output_str* for *file_conn_key*, flushing if a bound is reached."""
+        buf = self._buffers.get(file_conn_key)
+        if buf is None:
+            return
+        if buf.binary:
+            if isinstance(output_str, str):
+                if output_str.strip() != "%%":
+                    LOGGER.error("skipping text payload for binary hlo data section.")
+                    return
+                output_str = b"%%\n"
+            if not output_str:
+                return
+        elif not output_str.endswith("\n"):
+            output_str += "\n"
+        if buf.first_ts is None:
+            buf.first_ts = perf_counter()
+        buf.lines.append(output_str)
+        buf.nbytes += len(output_str)
+        self._pending_bytes += len(output_str)
+
+        if self._pending_bytes > self.max_pending_bytes:
+            self.backpressure_events += 1
+            t0 = perf_counter()
+            await self.flush()
+            self.backpressure_time_total += perf_counter() - t0
+        elif (
+            len(buf.lines) >= self.max_batch_lines
+            or buf.nbytes >= self.max_batch_bytes
+            or perf_counter() - buf.first_ts >= self.max_delay
+        ):
+            await self._flush_buffer(buf)
+
+    async def write_dict(self, file_conn_key: UUID, sample_data: dict) -> None:
+        """Encode *sample_data* and buffer it for *file_conn_key*."""
+        if file_conn_key in self._buffers:
+            await self.write(file_conn_key, self.encode(sample_data, file_conn_key))
+
+    async def _flush_buffer(self, buf: _FileBuffer) -> None:
+        async with buf.lock:
+            if not buf.lines:
+                return
+            lines, nbytes = buf.lines, buf.nbytes
+            buf.lines, buf.nbytes, buf.first_ts = [], 0, None
+            self._pending_bytes -= nbytes
+            t0 = perf_counter()
+            await buf.file.write(b"".join(lines) if buf.binary else "".join(lines))
+            dt = perf_counter() - t0
+            self.flushes += 1
+            self.lines_written += len(lines)
+            self.bytes_written += nbytes
+            self.flush_time_last = dt
+            self.flush_time_total += dt
+            self.flush_time_max = max(self.flush_time_max, dt)
+
+    async def flush(self, file_conn_key: Optional[UUID] = None) -> None:
+        """Flush one file connection, or all of them if *file_conn_key* is None."""
+        if file_conn_key is None:
+            for buf in list(self._buffers.values()):
+                await self._flush_buffer(buf)
+        elif file_conn_key in self._buffers:
+            await self._flush_buffer(self._buffers[file_conn_key])
+
+    async def close(self, file_conn_key: UUID) -> None:
+        """Flush and close the file attached to *file_conn_key*."""
+        buf = self._buffers.get(file_conn_key)
+        if buf is None:
+            return
+        await self._flush_buffer(buf)
+        self._buffers.pop(file_conn_key, None)
+        await buf.file.close()
+        if not self._buffers and self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+
+    async def close_all(self) -> None:
+        """Flush and close every registered file."""
+        for file_conn_key in list(self._buffers):
+            await self.close(file_conn_key)
+
+    async def _flush_loop(self) -> None:
+        """Background task enforcing the `max_delay` bound on idle streams."""
+        try:
+            while True:
+                await asyncio.sleep(self.max_delay)
+                now = perf_counter()
+                for buf in list(self._buffers.values()):
+                    if buf.first_ts is not None and now - buf.first_ts >= self.max_delay:
+                        await self._flush_buffer(buf)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            LOGGER.error("hlo writer flush loop failed", exc_info=True)
+
+    def stats(self) -> dict:
+        """Return throughput, back-pressure and flush-latency counters."""
+        return {
+            "encoder": self.encoder,
+            "open_files": len(self._buffers),
+            "pending_lines": sum(len(b.lines) for b in self._buffers.values()),
+            "pending_bytes": self._pending_bytes,
+            "lines_written": self.lines_written,
+            "bytes_written": self.bytes_written,
+            "flushes": self.flushes,
+            "flush_latency_last_ms": self.flush_time_last * 1e3,
+            "flush_latency_mean_ms": (
+                self.flush_time_total / self.flushes * 1e3 if self.flushes else 0.0
+            ),
+            "flush_latency_max_ms": self.flush_time_max * 1e3,
+            "backpressure_events": self.backpressure_events,
+            "backpressure_wait_ms": self.backpressure_time_total * 1e3,
+        }
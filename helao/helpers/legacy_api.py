@@ -8,12 +8,13 @@ from typing import Optional
 import numpy
 
 from helao.helpers import helao_logging as logging
+from helao.helpers.spatial_index import LRUCache
 
 LOGGER = logging.make_logger(__file__) if logging.LOGGER is None else logging.LOGGER
 
 
 class HTELegacyAPI:
-    def __init__(self):
+    def __init__(self, map_cache_size: int = 32):
 
         self.PLATEMAPFOLDERS = [
             r"J:\hte_jcap_app_proto\map",
@@ -24,7 +25,7 @@ class HTELegacyAPI:
         ]
 
         self.info_cache = {}
-        self.map_cache = {}
+        self.map_cache = LRUCache(maxsize=map_cache_size)
         self.infopath_cache = {}
         self.pmpath_pid_cache = {}
         self.els_cache = {}
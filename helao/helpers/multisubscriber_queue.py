@@ -1,8 +1,116 @@
-__all__ = ["MultisubscriberQueue"]
+__all__ = ["MultisubscriberQueue", "SubscriberQueue", "QUEUE_POLICIES"]
 
 
-from asyncio import Queue
-from typing import Any
+from asyncio import Queue, QueueFull
+from typing import Any, Callable, Hashable, Optional
+
+
+# what a bounded subscriber queue does with a new item when it is full:
+#   block: put() waits for the subscriber, put_nowait() drops the new item
+#   drop_oldest: discard the oldest queued item
+#   drop_newest: discard the new item
+#   conflate: replace the queued item with the same conflate_key, else drop_oldest
+QUEUE_POLICIES = ("block", "drop_oldest", "drop_newest", "conflate")
+
+
+class SubscriberQueue(Queue):
+    """
+    asyncio.Queue of a single subscriber with an overflow policy and counters.
+
+    Args:
+        maxsize (int): Maximum number of queued items, 0 is unbounded.
+        policy (str): One of QUEUE_POLICIES, applied when the queue is full.
+        conflate_key (Callable, optional): Maps an item to its conflation key
+            for the 'conflate' policy.
+        label (str, optional): Name shown in stats().
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        policy: str = "block",
+        conflate_key: Optional[Callable[[Any], Hashable]] = None,
+        label: Optional[str] = None,
+    ):
+        super().__init__(maxsize=maxsize)
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"unknown queue policy '{policy}'")
+        self.policy = policy
+        self.conflate_key = conflate_key
+        self.label = label
+        self.num_put = 0
+        self.num_dropped = 0
+        self.num_conflated = 0
+        self.max_lag = 0
+
+    def _key(self, item: Any):
+        try:
+            return self.conflate_key(item)
+        except Exception:
+            return None
+
+    def _conflate(self, data: Any) -> bool:
+        key = self._key(data)
+        if key is None:
+            return False
+        for i, item in enumerate(self._queue):
+            if item is not StopAsyncIteration and self._key(item) == key:
+                self._queue[i] = data
+                return True
+        return False
+
+    def offer(self, data: Any) -> bool:
+        """
+        Enqueue *data* without waiting, applying the overflow policy.
+
+        Returns:
+            bool: False if *data* was dropped.
+        """
+        self.num_put += 1
+        if self.full():
+            if self.policy == "conflate" and self.conflate_key is not None:
+                if self._conflate(data):
+                    self.num_conflated += 1
+                    return True
+            if self.policy in ("drop_oldest", "conflate"):
+                self.get_nowait()
+                self.num_dropped += 1
+            else:
+                self.num_dropped += 1
+                return False
+        self.put_nowait(data)
+        self.max_lag = max(self.max_lag, self.qsize())
+        return True
+
+    async def put_wait(self, data: Any) -> None:
+        """Enqueue *data*, waiting for free space under the 'block' policy."""
+        if self.policy == "block":
+            self.num_put += 1
+            await self.put(data)
+            self.max_lag = max(self.max_lag, self.qsize())
+        else:
+            self.offer(data)
+
+    def force(self, data: Any) -> None:
+        """Enqueue *data* regardless of bounds (used for the close sentinel)."""
+        try:
+            self.put_nowait(data)
+        except QueueFull:
+            self.get_nowait()
+            self.num_dropped += 1
+            self.put_nowait(data)
+
+    def stats(self) -> dict:
+        return {
+            "label": self.label,
+            "policy": self.policy,
+            "maxsize": self.maxsize,
+            "lag": self.qsize(),
+            "max_lag": self.max_lag,
+            "put": self.num_put,
+            "dropped": self.num_dropped,
+            "conflated": self.num_conflated,
+        }
 
 
 # multisubscriber queue by Kyle Smith
@@ -11,8 +119,13 @@ class MultisubscriberQueue:
     """
     MultisubscriberQueue is a class that allows multiple subscribers to receive data from a single source asynchronously.
 
+    Each subscriber gets its own SubscriberQueue. maxsize, policy and conflate_key
+    set the defaults for new subscribers and can be overridden per subscriber,
+    e.g. lossless internal consumers subscribe with maxsize=0 while websocket
+    clients use the bounded default so a slow client cannot grow memory.
+
     Methods:
-        __init__(**kwargs):
+        __init__(maxsize=0, policy="block", conflate_key=None, **kwargs):
             Initializes the MultisubscriberQueue instance.
 
         __len__():
@@ -43,16 +156,35 @@ class MultisubscriberQueue:
 
         async close():
             Forces clients using MultisubscriberQueue.subscribe() to end iteration.
+
+        stats():
+            Returns lag and drop counters of all subscribers.
     """
 
-    def __init__(self, **kwargs):
+    def __init__(
+        self,
+        maxsize: int = 0,
+        policy: str = "block",
+        conflate_key: Optional[Callable[[Any], Hashable]] = None,
+        **kwargs,
+    ):
         """
         Initializes a new instance of the class.
 
+        Args:
+            maxsize (int): Default subscriber queue size, 0 is unbounded.
+            policy (str): Default overflow policy, one of QUEUE_POLICIES.
+            conflate_key (Callable, optional): Conflation key for the 'conflate' policy.
+
         Keyword Args:
             **kwargs: Arbitrary keyword arguments.
         """
         super().__init__()
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"unknown queue policy '{policy}'")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.conflate_key = conflate_key
         self.subscribers = []
 
     def __len__(self):
@@ -76,10 +208,20 @@ class MultisubscriberQueue:
         """
         return q in self.subscribers
 
-    async def subscribe(self):
+    async def subscribe(
+        self,
+        maxsize: Optional[int] = None,
+        policy: Optional[str] = None,
+        label: Optional[str] = None,
+    ):
         """
         Asynchronously subscribes to a queue and yields values from it.
 
+        Args:
+            maxsize (int, optional): Queue size of this subscriber, defaults to the instance setting.
+            policy (str, optional): Overflow policy of this subscriber, defaults to the instance setting.
+            label (str, optional): Subscriber name shown in stats().
+
         This coroutine function enters a queue context and continuously retrieves
         values from the queue. It yields each value until it encounters a
         StopAsyncIteration, at which point it breaks the loop and stops the
@@ -91,7 +233,7 @@ class MultisubscriberQueue:
         Raises:
             StopAsyncIteration: When the queue signals the end of iteration.
         """
-        with self.queue_context() as q:
+        with self.queue_context(maxsize, policy, label) as q:
             while True:
                 val = await q.get()
                 if val is StopAsyncIteration:
@@ -99,25 +241,40 @@ class MultisubscriberQueue:
                 else:
                     yield val
 
-    def queue(self):
+    def queue(
+        self,
+        maxsize: Optional[int] = None,
+        policy: Optional[str] = None,
+        label: Optional[str] = None,
+    ):
         """
-        Creates a new Queue instance, appends it to the subscribers list, and returns the Queue.
+        Creates a new SubscriberQueue instance, appends it to the subscribers list, and returns the Queue.
 
         Returns:
-            Queue: A new Queue instance that has been added to the subscribers list.
+            SubscriberQueue: A new queue that has been added to the subscribers list.
         """
-        q = Queue()
+        q = SubscriberQueue(
+            maxsize=self.maxsize if maxsize is None else maxsize,
+            policy=self.policy if policy is None else policy,
+            conflate_key=self.conflate_key,
+            label=label,
+        )
         self.subscribers.append(q)
         return q
 
-    def queue_context(self):
+    def queue_context(
+        self,
+        maxsize: Optional[int] = None,
+        policy: Optional[str] = None,
+        label: Optional[str] = None,
+    ):
         """
         Provides a context manager for the queue.
 
         Returns:
             _QueueContext: A context manager instance for the queue.
         """
-        return _QueueContext(self)
+        return _QueueContext(self, maxsize, policy, label)
 
     def remove(self, q):
         """
@@ -136,7 +293,9 @@ class MultisubscriberQueue:
 
     async def put(self, data: Any):
         """
-        Asynchronously puts data into all subscriber queues.
+        Asynchronously puts data into all subscriber queues. Full subscriber
+        queues with the 'block' policy are waited for, the other policies
+        drop or conflate items instead.
 
         Args:
             data (Any): The data to be put into the subscriber queues.
@@ -144,18 +303,26 @@ class MultisubscriberQueue:
         Returns:
             None
         """
-        for q in self.subscribers:
-            await q.put(data)
+        for q in list(self.subscribers):
+            if data is StopAsyncIteration and q.policy != "block":
+                # the end-of-iteration sentinel is never dropped
+                q.force(data)
+            else:
+                await q.put_wait(data)
 
     def put_nowait(self, data: Any):
         """
-        Put data into all subscriber queues without blocking.
+        Put data into all subscriber queues without blocking. Full queues apply
+        their overflow policy, 'block' queues drop the new item.
 
         Args:
             data (Any): The data to be put into the subscriber queues.
         """
         for q in self.subscribers:
-            q.put_nowait(data)
+            if data is StopAsyncIteration:
+                q.force(data)
+            else:
+                q.offer(data)
 
     async def close(self):
         """
@@ -165,6 +332,15 @@ class MultisubscriberQueue:
         """
         await self.put(StopAsyncIteration)
 
+    def stats(self) -> list:
+        """
+        Return lag (queued items) and drop counters of all subscribers.
+
+        Returns:
+            list: One dict per subscriber, see SubscriberQueue.stats().
+        """
+        return [q.stats() for q in self.subscribers]
+
 
 class _QueueContext:
     """
@@ -184,14 +360,16 @@ class _QueueContext:
         parent: The parent object that provides the queue management methods.
     """
 
-    def __init__(self, parent):
+    def __init__(self, parent, maxsize=None, policy=None, label=None):
         """
         Initializes the instance of the class.
 
         Args:
             parent: The parent object that this instance is associated with.
+            maxsize, policy, label: Passed on to parent.queue().
         """
         self.parent = parent
+        self.queue_kwargs = {"maxsize": maxsize, "policy": policy, "label": label}
         self.queue = None
 
     def __enter__(self):
@@ -205,7 +383,7 @@ class _QueueContext:
         Returns:
             queue.Queue: The queue instance created by the parent object.
         """
-        self.queue = self.parent.queue()
+        self.queue = self.parent.queue(**self.queue_kwargs)
         return self.queue
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -1,11 +1,13 @@
 import json
 from ruamel.yaml import YAML
 from collections import defaultdict
+from typing import Optional
 
-import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
 
+from helao.helpers.read_hlo import HloBatchReader, HloSchemaError
+
 """
 This module provides helper functions to read HLO files, process their data, and convert them to Parquet format.
 
@@ -17,8 +19,9 @@ Functions:
         The data is at this point downsampled to every 1 nm, the wavelengths
         are set to be the columns and the time is set to be the index.
 
-    hlo_to_parquet(input_hlo_path, output_parquet_path, chunk_size=100):
-        Converts a HLO file to a Parquet file.
+    hlo_to_parquet(input_hlo_path, output_parquet_path, HISPEC=False, row_group_size=None, compression="snappy"):
+        Converts a HLO file to a Parquet file, streaming fixed-schema Arrow
+        record batches into row groups of row_group_size rows.
 
     read_helao_metadata(parquet_file_path):
         Reads the custom metadata from a Parquet file.
@@ -26,6 +29,10 @@ Functions:
 
 yaml = YAML()
 
+# default row group size of hlo_to_parquet
+ROW_GROUP_BYTES = 16 * 1024 * 1024
+MAX_ROW_GROUP_SIZE = 1024 * 1024
+
 
 def read_hlo_header(file_path):
     """
@@ -85,89 +92,140 @@ def read_hlo_data_chunks(file_path, data_start_index, chunk_size=100):
             yield dict(chunkd), max([len(v) for v in chunkd.values()])
 
 
-def hlo_to_parquet(
-    input_hlo_path, output_parquet_path, chunk_size=100, HISPEC: bool = False
-):
-    """
-    Converts HLO (custom format) data to Parquet format.
-
-    Parameters:
-    input_hlo_path (str): Path to the input HLO file.
-    output_parquet_path (str): Path to the output Parquet file.
-    chunk_size (int, optional): Number of rows to process at a time. Default is 100.
-
-    Returns:
-    None
-    """
-    writer: pq.ParquetWriter = None
-    schema = None
-    metadata = None
-    current_idx = 0
-    header, data_start = read_hlo_header(input_hlo_path)
-
-    if HISPEC:
-        df_headers_no_time = header["optional"]["wl"]
-        df_headers_all = [000] + df_headers_no_time
-        df_headers_all = list(map(float, df_headers_all))
-    # print(len(df_headers_all))
-
-    for chunk, chunklen in read_hlo_data_chunks(
-        input_hlo_path, data_start, chunk_size=chunk_size
-    ):
-        df0 = pd.DataFrame(chunk, index=range(current_idx, current_idx + chunklen))
+def _default_row_group_size(schema: pa.Schema) -> int:
+    """Rows of a schema that fit in about ROW_GROUP_BYTES, at most MAX_ROW_GROUP_SIZE."""
+    row_bytes = sum(
+        field.type.byte_width if pa.types.is_primitive(field.type)
+        and not pa.types.is_boolean(field.type) else 32
+        for field in schema
+    )
+    return max(1, min(MAX_ROW_GROUP_SIZE, ROW_GROUP_BYTES // max(row_bytes, 1)))
 
-        if current_idx == 0:
-            start_ticktime = df0.iloc[0, 0]
 
-        if HISPEC:
+def _hispec_table(table: pa.Table, start_idx: int, start_ticktime, wl: list):
+    df0 = table.to_pandas()
+    df0.index = range(start_idx, start_idx + len(df0))
 
-            # convert from ticktime to time
-            df0.iloc[:, 0] = df0.iloc[:, 0].apply(lambda x: x - start_ticktime)
+    # convert from ticktime to time
+    df0.iloc[:, 0] = df0.iloc[:, 0] - start_ticktime
 
-            # rename the first collumn to Time (s)
-            # df0.rename(columns={df0.columns[0]: 'Time (s)'}, inplace=True)
+    # rename the collumns using the wavelengths of the header
+    df0.columns = wl
 
-            # rename the collumns using df_headers
-            # print(current_idx, current_idx+chunklen)
-            df0.columns = df_headers_all
+    # create a new dataframe with collumns 1:-1 of df0
+    df = df0.iloc[:, 1:-1]
 
-            # create a new dataframe with collumns 1:-1 of df0
-            df = df0.iloc[:, 1:-1]
+    # downsample the data to every 1 nm
+    df = df.T.groupby(df.columns // 1).mean().T
 
-            # downsample the data to every 1 nm
-            df = df.T.groupby(df.columns // 1).mean().T
+    # insert the time collumn from df into df0 as collumn 0
+    df.insert(0, "t_s", df0.iloc[:, 0])
 
-            # insert the time collumn from df into df0 as collumn 0
-            df.insert(0, "t_s", df0.iloc[:, 0])
+    df.columns = df.columns.astype(str)
+    return pa.Table.from_pandas(df, preserve_index=False)
 
-            df.columns = df.columns.astype(str)
 
-            table = pa.Table.from_pandas(df)
-            current_idx += chunklen
-            df = pd.DataFrame()
+def _write_parquet(
+    reader: HloBatchReader,
+    output_parquet_path,
+    HISPEC: bool,
+    row_group_size: Optional[int],
+    compression: str,
+):
+    """Writes the record batches of *reader* as row groups, see hlo_to_parquet."""
+    if row_group_size is None:
+        row_group_size = _default_row_group_size(reader.schema)
+    metadata = {
+        b"helao_metadata": json.dumps(reader.meta.get("optional", {})).encode("utf8")
+    }
+    if HISPEC:
+        wl = [0.0] + list(map(float, reader.meta["optional"]["wl"]))
 
-        else:
-            table = pa.Table.from_pandas(df0)
-            current_idx += chunklen
+    writer: pq.ParquetWriter = None
+    start_ticktime = None
+    current_idx = 0
+    pending = []
+    pending_rows = 0
 
-        # print(df.head())
+    def write_row_group(batches):
+        nonlocal writer, start_ticktime, current_idx, metadata
+        table = pa.Table.from_batches(batches, schema=reader.schema)
+        if HISPEC:
+            if start_ticktime is None:
+                start_ticktime = table.column(0)[0].as_py()
+            table = _hispec_table(table, current_idx, start_ticktime, wl)
+        current_idx += table.num_rows
+        if writer is None:
+            # pandas metadata of the first row group is kept for the file
+            metadata = {**(table.schema.metadata or {}), **metadata}
+            schema = table.schema.with_metadata(metadata)
+            writer = pq.ParquetWriter(
+                output_parquet_path, schema, compression=compression
+            )
+        writer.write_table(
+            table.replace_schema_metadata(metadata), row_group_size=row_group_size
+        )
+
+    try:
+        for batch in reader:
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            while pending_rows >= row_group_size:
+                table = pa.Table.from_batches(pending, schema=reader.schema)
+                write_row_group(table.slice(0, row_group_size).to_batches())
+                rest = table.slice(row_group_size)
+                pending = rest.to_batches()
+                pending_rows = rest.num_rows
+        if pending_rows:
+            write_row_group(pending)
+    finally:
+        if writer:
+            writer.close()
 
-        if schema is None:
-            schema = table.schema
-            existing_metadata = schema.metadata
-            custom_metadata = json.dumps(header.get("optional", {})).encode("utf8")
-            metadata = {**{"helao_metadata": custom_metadata}, **existing_metadata}
 
-        table = table.replace_schema_metadata(metadata)
-        schema = table.schema
+def hlo_to_parquet(
+    input_hlo_path,
+    output_parquet_path,
+    HISPEC: bool = False,
+    row_group_size: Optional[int] = None,
+    compression: str = "snappy",
+    block_size: int = 1 << 23,
+):
+    """
+    Converts HLO (custom format) data to Parquet format.
 
-        if writer is None:
-            writer = pq.ParquetWriter(output_parquet_path, schema)
+    The .hlo data is parsed into record batches with a fixed schema (see
+    read_hlo.HloBatchReader) and written one row group at a time, so at most
+    one row group is held in memory whatever the size of the file. Integer
+    columns stay int64 unless they also hold floats, in which case the file
+    is converted again with them as float64.
 
-        writer.write_table(table)
+    Parameters:
+    input_hlo_path (str): Path to the input HLO file.
+    output_parquet_path (str): Path to the output Parquet file.
+    HISPEC (bool, optional): Convert tick times to t_s and downsample the
+        spectra to every 1 nm, using the wavelengths of the header. Default is False.
+    row_group_size (int, optional): Rows per row group. Default is the number
+        of rows that fit in ROW_GROUP_BYTES.
+    compression (str, optional): Parquet compression codec. Default is 'snappy'.
+    block_size (int, optional): Bytes of .hlo data parsed at a time. Default is 8 MiB.
 
-    if writer:
-        writer.close()
+    Returns:
+    None
+    """
+    float_keys = []
+    while True:
+        reader = HloBatchReader(
+            input_hlo_path, block_size=block_size, float_keys=float_keys
+        )
+        try:
+            return _write_parquet(
+                reader, output_parquet_path, HISPEC, row_group_size, compression
+            )
+        except HloSchemaError as e:
+            # integer columns holding floats further down, start over with
+            # them widened to float64
+            float_keys = float_keys + e.keys
 
 
 def read_helao_metadata(parquet_file_path):
@@ -9,12 +9,13 @@ import mendeleev
 from helao.helpers import helao_logging as logging
 from helao.core.drivers.data.loaders.helao_loader import HelaoLoader
 from helao.helpers.legacy_api import HTELegacyAPI
+from helao.helpers.spatial_index import LRUCache, PlateMapIndex
 
 LOGGER = logging.make_logger(__file__) if logging.LOGGER is None else logging.LOGGER
 
 
 class HTEPlateAPI:
-    def __init__(self, env_file: str | None = None):
+    def __init__(self, env_file: str | None = None, map_cache_size: int = 32):
         self.loader = None
         if "HELAO_CREDENTIALS" in os.environ:
             env_file = os.environ["HELAO_CREDENTIALS"]
@@ -26,9 +27,11 @@ class HTEPlateAPI:
                     "Could not load HTEPlateAPI credentials from .env file.",
                     exc_info=True,
                 )
-        self.map_cache = {}
+        self.map_cache = LRUCache(maxsize=map_cache_size)
+        # plateid: PlateMapIndex
+        self.index_cache = LRUCache(maxsize=map_cache_size)
         self.legacy_plateid_threshold: int = 10000
-        self.legacy_api = HTELegacyAPI()
+        self.legacy_api = HTELegacyAPI(map_cache_size=map_cache_size)
 
     @property
     def has_access(self):
@@ -102,6 +105,17 @@ class HTEPlateAPI:
         else:
             return self.get_info_plateid(plateid)
 
+    def get_platemap_index(self, plateid: int) -> PlateMapIndex | None:
+        """Spatial index of the plate map of plateid, None without a plate map."""
+        if plateid in self.index_cache:
+            return self.index_cache[plateid]
+        pmdata = self.get_platemap_plateid(plateid)
+        if not pmdata:
+            return None
+        index = PlateMapIndex(pmdata)
+        self.index_cache[plateid] = index
+        return index
+
     def get_rcp_plateid(self, plateid: int):
         LOGGER.info(f" ... get rcp for plateid: {plateid}")
         return self.legacy_api.get_rcp_plateid(plateid)
@@ -0,0 +1,277 @@
+"""
+Background post-processing of finished actions.
+
+Active.finish used to run the configured HloPostProcessors in the default
+thread pool before writing the final act yml and releasing the action, so a
+multi-GB hlo-to-parquet conversion held up the next action by minutes and
+competed for the GIL. PostProcessQueue instead records a job per action in a
+sqlite table and runs the processors in a process pool; the action finishes
+right away and `on_done` amends its file list and act yml when the job
+completes.
+
+Jobs survive restarts: queued and interrupted (running) jobs are resubmitted
+by `start`. A failed job is retried up to `max_retries` times before it is
+marked failed and `on_done` is called with the error, so the action is still
+finalized with its unprocessed files.
+
+While a job is pending, the action output dir holds a POSTPROCESS_MARKER
+file; move_dir keeps experiment and sequence dirs containing one. Their yml
+files are still promoted, HloPostProcessor finds them wherever they are.
+"""
+
+__all__ = [
+    "PostProcessQueue",
+    "POSTPROCESS_MARKER",
+    "run_postprocess_job",
+]
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from importlib.util import spec_from_file_location, module_from_spec
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from helao.core.helaodict import json_dumps
+from helao.core.models.file import FileInfo
+from helao.helpers.gen_uuid import gen_uuid
+from helao.helpers.premodels import Action
+from helao.helpers import helao_logging as logging
+
+LOGGER = logging.make_logger(__file__) if logging.LOGGER is None else logging.LOGGER
+
+POSTPROCESS_MARKER = ".postprocess_pending"
+
+# PostProcess classes loaded in this (worker) process, keyed by script path
+_PROCESSORS: Dict[str, type] = {}
+
+
+def _load_processor(script_path: str) -> type:
+    ppclass = _PROCESSORS.get(script_path)
+    if ppclass is None:
+        mod_name = os.path.basename(script_path).split(".py")[0]
+        proc_spec = spec_from_file_location(mod_name, script_path)
+        proc_mod = module_from_spec(proc_spec)
+        proc_spec.loader.exec_module(proc_mod)
+        ppclass = _PROCESSORS[script_path] = proc_mod.PostProcess
+    return ppclass
+
+
+def run_postprocess_job(
+    processor_paths: List[str], action_dict: dict, save_root: str
+) -> List[dict]:
+    """
+    Worker process entry point, runs the processors in order on the action,
+    each one receiving the file list returned by the previous one.
+
+    Returns:
+        list: The final action files as dicts.
+    """
+    action = Action(**action_dict)
+    for script_path in processor_paths:
+        postprocessor = _load_processor(script_path)(action, save_root)
+        action.files = postprocessor.process()
+    return [fileinfo.as_dict() for fileinfo in action.files]
+
+
+class PostProcessQueue:
+    """
+    Persistent queue of post-processing jobs run in a process pool.
+
+    Args:
+        db_path (str): sqlite file holding the jobs.
+        on_done (Callable): Coroutine function called with (action, files,
+            error) when a job completes; files is None if the job failed.
+        max_workers (int): Worker processes, i.e. concurrent jobs. Defaults to 1.
+        max_retries (int): Retries of a failed job. Defaults to 2.
+        retry_delay (float): Seconds before a failed job is retried. Defaults to 30.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        on_done: Callable[[Action, Optional[List[FileInfo]], Optional[str]], Awaitable],
+        max_workers: int = 1,
+        max_retries: int = 2,
+        retry_delay: float = 30.0,
+    ):
+        self.db_path = db_path
+        self.on_done = on_done
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._con = sqlite3.connect(db_path, isolation_level=None)
+        self._con.row_factory = sqlite3.Row
+        if db_path != ":memory:":
+            self._con.execute("PRAGMA journal_mode=WAL;")
+        self._con.execute(
+            """CREATE TABLE IF NOT EXISTS jobs(
+              job_id TEXT PRIMARY KEY,
+              action_uuid TEXT NOT NULL,
+              processors TEXT NOT NULL,
+              action TEXT NOT NULL,
+              save_root TEXT NOT NULL,
+              status TEXT NOT NULL,
+              attempts INTEGER NOT NULL DEFAULT 0,
+              error TEXT,
+              files TEXT,
+              created REAL NOT NULL,
+              updated REAL NOT NULL
+              );"""
+        )
+        self._con.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status);")
+
+    def _executor_for_job(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process running an event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _set(self, job_id: str, **fields):
+        fields["updated"] = time.time()
+        cols = ", ".join(f"{k} = ?" for k in fields)
+        self._con.execute(
+            f"UPDATE jobs SET {cols} WHERE job_id = ?;", (*fields.values(), job_id)
+        )
+
+    def start(self) -> int:
+        """Resubmit queued and interrupted jobs, returns their number."""
+        rows = self._con.execute(
+            "SELECT job_id FROM jobs WHERE status IN ('queued', 'running') ORDER BY created;"
+        ).fetchall()
+        for row in rows:
+            self._schedule(row["job_id"])
+        if rows:
+            LOGGER.info(f"resumed {len(rows)} post-processing jobs")
+        return len(rows)
+
+    def submit(self, action: Action, processor_paths: List[str], save_root: str) -> str:
+        """
+        Queue post-processing of *action* and mark its output dir as pending.
+
+        Returns:
+            str: The job id.
+        """
+        job_id = str(gen_uuid())
+        now = time.time()
+        self._con.execute(
+            "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, 'queued', 0, NULL, NULL, ?, ?);",
+            (
+                job_id,
+                str(action.action_uuid),
+                json.dumps(processor_paths),
+                json_dumps(action.as_dict()),
+                save_root,
+                now,
+                now,
+            ),
+        )
+        output_dir = os.path.join(save_root, action.action_output_dir)
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, POSTPROCESS_MARKER), "w") as f:
+            f.write(job_id)
+        self._schedule(job_id)
+        return job_id
+
+    def _schedule(self, job_id: str):
+        self._tasks[job_id] = asyncio.create_task(self._run(job_id))
+
+    async def _run(self, job_id: str):
+        loop = asyncio.get_running_loop()
+        row = self._con.execute(
+            "SELECT * FROM jobs WHERE job_id = ?;", (job_id,)
+        ).fetchone()
+        action = Action(**json.loads(row["action"]))
+        attempts = row["attempts"]
+        files = None
+        error = None
+        try:
+            while True:
+                attempts += 1
+                self._set(job_id, status="running", attempts=attempts)
+                try:
+                    file_dicts = await loop.run_in_executor(
+                        self._executor_for_job(),
+                        run_postprocess_job,
+                        json.loads(row["processors"]),
+                        json.loads(row["action"]),
+                        row["save_root"],
+                    )
+                    files = [FileInfo(**d) for d in file_dicts]
+                    self._set(
+                        job_id, status="done", error=None, files=json_dumps(file_dicts)
+                    )
+                    break
+                except Exception as e:
+                    if isinstance(e, BrokenProcessPool):
+                        # a worker died (e.g. out of memory), start a new pool
+                        self._executor = None
+                    error = repr(e)
+                    LOGGER.error(
+                        f"post-processing job {job_id} for action {row['action_uuid']} "
+                        f"failed [{attempts}/{self.max_retries + 1}]",
+                        exc_info=True,
+                    )
+                    if attempts > self.max_retries:
+                        self._set(job_id, status="failed", error=error)
+                        break
+                    self._set(job_id, status="queued", error=error)
+                    await asyncio.sleep(self.retry_delay)
+            output_dir = os.path.join(row["save_root"], action.action_output_dir)
+            marker = os.path.join(output_dir, POSTPROCESS_MARKER)
+            if os.path.exists(marker):
+                os.remove(marker)
+            await self.on_done(action, files, None if files is not None else error)
+        except asyncio.CancelledError:
+            # left as running, resubmitted by start() after a restart
+            raise
+        except Exception:
+            LOGGER.error(f"could not complete post-processing job {job_id}", exc_info=True)
+        finally:
+            self._tasks.pop(job_id, None)
+
+    def jobs(self, status: Optional[str] = None, limit: int = 50) -> List[dict]:
+        """Most recent jobs, optionally filtered by status."""
+        query = "SELECT job_id, action_uuid, processors, status, attempts, error, created, updated FROM jobs"
+        args = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            args = (status,)
+        rows = self._con.execute(
+            query + " ORDER BY created DESC LIMIT ?;", (*args, limit)
+        ).fetchall()
+        return [
+            {**dict(row), "processors": json.loads(row["processors"])} for row in rows
+        ]
+
+    def stats(self) -> dict:
+        """Job counts by status and the number of jobs in flight."""
+        counts = dict(
+            self._con.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status;"
+            ).fetchall()
+        )
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": len(self._tasks),
+            **{k: counts.get(k, 0) for k in ("queued", "running", "done", "failed")},
+        }
+
+    async def shutdown(self):
+        """Cancel job tasks, they are resumed on the next start()."""
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._con.close()
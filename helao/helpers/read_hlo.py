@@ -2,7 +2,13 @@
 This module provides functionality to read and manage Helao data files, specifically .hlo files and YAML files. It includes the following:
 Functions:
     read_hlo(path: str) -> Tuple[dict, dict]:
+    read_hlo_columns(path: str, keep_keys, omit_keys, start, stop, output) -> Tuple[dict, Any]:
+    hlo_line_index(path: str) -> HloLineIndex:
 Classes:
+    HloLineIndex:
+            Cached header and data line offsets of a memory-mapped .hlo file.
+    HloBatchReader:
+            Streams the data of an .hlo file as fixed-schema Arrow record batches.
     HelaoData:
             __init__(self, target: str, **kwargs):
             ls:
@@ -13,14 +19,29 @@ Classes:
                 Returns a string representation of the object.
 """
 
-__all__ = ["read_hlo"]
+__all__ = [
+    "read_hlo",
+    "read_hlo_columns",
+    "hlo_line_index",
+    "HloLineIndex",
+    "HloBatchReader",
+    "HloSchemaError",
+]
 
+import os
+import json
+import mmap
 import orjson
 from pathlib import Path
-from typing import Tuple
-from collections import defaultdict
+from typing import Any, Iterator, Optional, Tuple, Union
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.json as pa_json
 
 from .yml_tools import yml_load
+from .hlo_binary import hlo_is_binary, read_hlo_binary
 
 
 def read_hlo(
@@ -33,7 +54,8 @@ def read_hlo(
     Returns:
         Tuple[dict, dict]: A tuple containing two dictionaries:
             - The first dictionary contains the metadata.
-            - The second dictionary contains the data, where each key maps to a list of values.
+            - The second dictionary contains the data, where each key maps to a list of values,
+              or to a memory-mapped numpy array if the file has a binary data section.
     """
     if keep_keys and omit_keys:
         print(
@@ -43,26 +65,506 @@ def read_hlo(
     path_to_hlo = Path(path)
     header_lines = []
     header_end = False
+    data_offset = 0
+    meta = {}
     data = defaultdict(list)
 
     with open(str(path_to_hlo), "rb") as f:
         for line in f:
-            if header_end:
-                line_dict = orjson.loads(line)
-                for k in line_dict:
-                    if k in keep_keys or k not in omit_keys:
-                        v = line_dict[k]
-                        if isinstance(v, list):
-                            data[k] += v
-                        else:
-                            data[k].append(v)
-            elif line.decode("utf8").startswith("%%"):
+            data_offset += len(line)
+            if line.decode("utf8").startswith("%%"):
                 header_end = True
-            elif not header_end:
-                header_lines.append(line)
-    if header_lines:
-        meta = dict(yml_load("".join([x.decode("utf8") for x in header_lines])))
-    else:
-        meta = {}
+                break
+            header_lines.append(line)
+        if header_lines:
+            meta = dict(yml_load("".join([x.decode("utf8") for x in header_lines])))
+        if header_end and hlo_is_binary(meta):
+            return meta, read_hlo_binary(
+                str(path_to_hlo), meta, data_offset, keep_keys, omit_keys
+            )
+        for line in f:
+            line_dict = orjson.loads(line)
+            for k in line_dict:
+                if k in keep_keys or k not in omit_keys:
+                    v = line_dict[k]
+                    if isinstance(v, list):
+                        data[k] += v
+                    else:
+                        data[k].append(v)
 
     return meta, data
+
+
+class HloLineIndex:
+    """
+    Header metadata and data line offsets of an .hlo file.
+
+    The file is scanned once through a read-only memory map; newline positions
+    are located with vectorized numpy comparisons in fixed-size chunks. Calling
+    update() on a file that has grown since the last scan (e.g. an .hlo that is
+    still being written) only scans the appended bytes. A trailing line without
+    newline is not indexed until it is complete.
+
+    Attributes:
+        path (str): Path of the .hlo file.
+        meta (dict): Parsed YAML header.
+        data_offset (int): Byte offset of the first data line, None if the '%%'
+            separator has not been written yet.
+        line_bounds (np.ndarray): int64 offsets, line i spans
+            line_bounds[i]:line_bounds[i + 1].
+    """
+
+    scan_chunk = 1 << 26
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = str(path)
+        self._reset()
+        self.update()
+
+    def _reset(self):
+        self.meta = {}
+        self.data_offset = None
+        self.line_bounds = np.zeros(0, dtype=np.int64)
+        self.indexed_size = 0
+        self.mtime_ns = None
+
+    @property
+    def num_lines(self) -> int:
+        return max(len(self.line_bounds) - 1, 0)
+
+    @property
+    def binary(self) -> bool:
+        return hlo_is_binary(self.meta)
+
+    def update(self) -> "HloLineIndex":
+        """Index bytes appended since the last call; rescan if the file shrank."""
+        st = os.stat(self.path)
+        if st.st_size < self.indexed_size:
+            self._reset()
+        if st.st_size == self.indexed_size and st.st_mtime_ns == self.mtime_ns:
+            return self
+        self.mtime_ns = st.st_mtime_ns
+
+        if self.data_offset is None:
+            header_lines = []
+            offset = 0
+            with open(self.path, "rb") as f:
+                for line in f:
+                    offset += len(line)
+                    if line.decode("utf8").startswith("%%"):
+                        self.data_offset = offset
+                        break
+                    header_lines.append(line)
+            if self.data_offset is None:
+                return self
+            if header_lines:
+                self.meta = dict(
+                    yml_load("".join([x.decode("utf8") for x in header_lines]))
+                )
+            self.line_bounds = np.array([self.data_offset], dtype=np.int64)
+            self.indexed_size = self.data_offset
+
+        if self.binary:
+            self.indexed_size = st.st_size
+            return self
+
+        if st.st_size > self.indexed_size:
+            new_ends = []
+            with open(self.path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    buf = np.frombuffer(mm, dtype=np.uint8)
+                    for pos in range(self.indexed_size, st.st_size, self.scan_chunk):
+                        chunk = buf[pos : min(pos + self.scan_chunk, st.st_size)]
+                        new_ends.append(np.flatnonzero(chunk == 10) + (pos + 1))
+                    del buf, chunk
+            if new_ends:
+                new_ends = np.concatenate(new_ends).astype(np.int64)
+                self.line_bounds = np.concatenate([self.line_bounds, new_ends])
+            # only complete lines are indexed, rescan the remainder next time
+            self.indexed_size = int(self.line_bounds[-1])
+        return self
+
+    def read_bytes(self, start: Optional[int] = None, stop: Optional[int] = None):
+        """Return the raw bytes of data lines [start:stop] (python slice semantics)."""
+        rows = range(self.num_lines)[slice(start, stop)]
+        if len(rows) == 0:
+            return b""
+        lo = int(self.line_bounds[rows.start])
+        hi = int(self.line_bounds[rows.stop])
+        with open(self.path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm[lo:hi]
+
+
+# line indexes of the most recently read files, least recently used first
+LINE_INDEX_CACHE_SIZE = 16
+_LINE_INDEX_CACHE: "OrderedDict[str, HloLineIndex]" = OrderedDict()
+
+
+def hlo_line_index(path: Union[str, Path]) -> HloLineIndex:
+    """
+    Return the cached HloLineIndex of *path*, updated to the current file size.
+
+    Only the LINE_INDEX_CACHE_SIZE most recently used files are kept.
+    """
+    key = os.path.abspath(str(path))
+    index = _LINE_INDEX_CACHE.get(key)
+    if index is None:
+        index = HloLineIndex(key)
+    else:
+        index.update()
+    _LINE_INDEX_CACHE[key] = index
+    _LINE_INDEX_CACHE.move_to_end(key)
+    while len(_LINE_INDEX_CACHE) > LINE_INDEX_CACHE_SIZE:
+        _LINE_INDEX_CACHE.popitem(last=False)
+    return index
+
+
+def _loads(raw: bytes):
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # json also accepts the NaN literals written by json.dumps
+        return json.loads(raw)
+
+
+def _select_keys(keys, keep_keys: list, omit_keys: list):
+    if keep_keys:
+        return [k for k in keys if k in keep_keys]
+    return [k for k in keys if k not in omit_keys]
+
+
+def _arrow_type(val):
+    if isinstance(val, bool):
+        return pa.bool_()
+    if isinstance(val, int):
+        return pa.int64()
+    if isinstance(val, float):
+        return pa.float64()
+    if isinstance(val, str):
+        return pa.string()
+    if isinstance(val, list) and val:
+        item_type = _arrow_type(val[0])
+        if item_type is not None and not pa.types.is_list(item_type):
+            return pa.list_(item_type)
+    return None
+
+
+def _is_int_type(arrow_type: pa.DataType) -> bool:
+    if pa.types.is_list(arrow_type):
+        arrow_type = arrow_type.value_type
+    return pa.types.is_integer(arrow_type)
+
+
+def _column_to_numpy(col: pa.ChunkedArray) -> np.ndarray:
+    if pa.types.is_list(col.type):
+        col = pa.chunked_array(
+            [chunk.flatten() for chunk in col.chunks], type=col.type.value_type
+        )
+    return col.to_numpy()
+
+
+def _parse_hlo_lines(raw: bytes, keep_keys: list, omit_keys: list) -> dict:
+    """
+    Parse json data lines into numpy columns.
+
+    The column schema is taken from the first line and passed to the pyarrow
+    json reader, which parses multithreaded and skips unselected keys. Integer
+    columns of the first line that hold floats further down are inferred by the
+    reader instead, which widens them to float64. Lines that do not fit the
+    schema (NaN literals, mixed scalar/list values) fall back to a single
+    orjson pass over all lines.
+    """
+    first = raw[: raw.find(b"\n")] if b"\n" in raw else raw
+    first_dict = _loads(first)
+    keys = _select_keys(list(first_dict.keys()), keep_keys, omit_keys)
+    fields = [(k, _arrow_type(first_dict[k])) for k in keys]
+    if keys and all(t is not None for _, t in fields):
+        int_fields = [k for k, t in fields if _is_int_type(t)]
+        attempts = [(fields, "ignore")]
+        if int_fields:
+            # let the reader widen int columns holding floats
+            attempts.append(([f for f in fields if f[0] not in int_fields], "infer"))
+        for schema_fields, unexpected in attempts:
+            try:
+                table = pa_json.read_json(
+                    pa.BufferReader(raw),
+                    parse_options=pa_json.ParseOptions(
+                        explicit_schema=pa.schema(schema_fields),
+                        unexpected_field_behavior=unexpected,
+                    ),
+                )
+                return {k: _column_to_numpy(table.column(k)) for k in keys}
+            except (pa.ArrowInvalid, pa.ArrowTypeError, KeyError):
+                pass
+    lines = b"[" + b",".join([x for x in raw.splitlines() if x.strip()]) + b"]"
+    data = defaultdict(list)
+    for line_dict in _loads(lines):
+        for k in _select_keys(line_dict, keep_keys, omit_keys):
+            v = line_dict[k]
+            if isinstance(v, list):
+                data[k] += v
+            else:
+                data[k].append(v)
+    return {k: np.asarray(v) for k, v in data.items()}
+
+
+def read_hlo_columns(
+    path: str,
+    keep_keys: list = [],
+    omit_keys: list = [],
+    start: Optional[int] = None,
+    stop: Optional[int] = None,
+    output: str = "numpy",
+) -> Tuple[dict, Any]:
+    """
+    Reads selected columns and rows of a .hlo file into arrays.
+
+    Unlike read_hlo, the file is memory-mapped and its line offsets are indexed
+    once (see hlo_line_index), so only the requested rows are parsed, and
+    values are returned as numpy arrays rather than lists of python objects.
+    Integer json values are read as int64, other numbers as float64, and
+    columns mixing both as float64; list values are flattened.
+
+    Args:
+        path (str): The file path to the .hlo file.
+        keep_keys (list): Columns to return. If given, omit_keys is ignored.
+        omit_keys (list): Columns to skip.
+        start (int, optional): First data line (json) or record (binary) to read,
+            negative values count from the end.
+        stop (int, optional): Data line or record after the last one to read.
+        output (str): "numpy" for a dict of arrays, "arrow" for a pyarrow.Table
+            or "pandas" for a pandas.DataFrame. Tables require equal column lengths.
+
+    Returns:
+        Tuple[dict, Any]: The metadata and the selected data.
+    """
+    index = hlo_line_index(path)
+    meta = index.meta
+    if index.data_offset is None:
+        cols = {}
+    elif index.binary:
+        records = read_hlo_binary(index.path, meta, index.data_offset)
+        cols = {
+            k: records[k][start:stop]
+            for k in _select_keys(list(records), keep_keys, omit_keys)
+        }
+    else:
+        raw = index.read_bytes(start, stop)
+        cols = _parse_hlo_lines(raw, keep_keys, omit_keys) if raw.strip() else {}
+
+    if output == "numpy":
+        return meta, cols
+    table = pa.table(cols)
+    if output == "arrow":
+        return meta, table
+    elif output == "pandas":
+        return meta, table.to_pandas()
+    raise ValueError(f"unsupported output type '{output}'")
+
+
+def _widen(arrow_type: pa.DataType, to_float: bool) -> pa.DataType:
+    if not to_float or not _is_int_type(arrow_type):
+        return arrow_type
+    if pa.types.is_list(arrow_type):
+        return pa.list_(pa.float64())
+    return pa.float64()
+
+
+class HloSchemaError(ValueError):
+    """
+    A json block of an .hlo file holds floats in integer columns of the
+    HloBatchReader schema. Read the file again with `keys` in float_keys.
+    """
+
+    def __init__(self, keys: list):
+        self.keys = keys
+        super().__init__(f"integer columns {keys} hold float values")
+
+
+def _field_type(val) -> pa.DataType:
+    """Arrow type of a json value, float64 when it cannot be told from the value."""
+    arrow_type = _arrow_type(val)
+    if arrow_type is None:
+        return pa.list_(pa.float64()) if isinstance(val, list) else pa.float64()
+    return arrow_type
+
+
+class HloBatchReader:
+    """
+    Streams the data of an .hlo file as Arrow record batches with a fixed schema.
+
+    The schema is taken once from the first data line (json) or the record
+    dtype (binary): integer values are int64, other numbers float64, and list
+    values are flattened into rows, as in read_hlo_columns. A later block
+    holding floats in an integer column raises HloSchemaError, the file can
+    then be read again with those columns in `float_keys`. Json lines are parsed in blocks of about
+    `block_size` bytes with the pyarrow json reader, falling back to orjson for
+    blocks it rejects (e.g. NaN literals); binary records are sliced from the
+    memory map. Only one block is held at a time, so memory does not depend
+    on the size of the file.
+
+    Args:
+        path (str): The file path to the .hlo file.
+        block_size (int): Bytes parsed per record batch. Defaults to 8 MiB.
+        keep_keys (list): Columns to read. If given, omit_keys is ignored.
+        omit_keys (list): Columns to skip.
+        float_keys (list): Numeric json columns read as float64 whatever the
+            type of their first value.
+
+    Attributes:
+        meta (dict): Parsed YAML header.
+        schema (pa.Schema): Schema of the record batches, empty without data.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        block_size: int = 1 << 23,
+        keep_keys: list = [],
+        omit_keys: list = [],
+        float_keys: list = [],
+    ):
+        self.path = str(path)
+        self.block_size = block_size
+        self.keep_keys = keep_keys
+        self.omit_keys = omit_keys
+        self.float_keys = float_keys
+        self.meta = {}
+        self.data_offset = None
+        self._json_schema = None
+        header_lines = []
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                offset += len(line)
+                if line.decode("utf8").startswith("%%"):
+                    self.data_offset = offset
+                    break
+                header_lines.append(line)
+            if header_lines:
+                self.meta = dict(
+                    yml_load("".join([x.decode("utf8") for x in header_lines]))
+                )
+            if self.data_offset is None:
+                self.schema = pa.schema([])
+            elif hlo_is_binary(self.meta):
+                records = read_hlo_binary(
+                    self.path, self.meta, self.data_offset, keep_keys, omit_keys
+                )
+                self.schema = pa.schema(
+                    [(k, pa.from_numpy_dtype(v.dtype)) for k, v in records.items()]
+                )
+            else:
+                first = b""
+                for line in f:
+                    if line.strip():
+                        first = line
+                        break
+                first_dict = _loads(first) if first else {}
+                keys = _select_keys(list(first_dict), keep_keys, omit_keys)
+                self._json_schema = pa.schema(
+                    [
+                        (k, _widen(_field_type(first_dict[k]), k in float_keys))
+                        for k in keys
+                    ]
+                )
+                self.schema = pa.schema(
+                    [
+                        (
+                            field.name,
+                            field.type.value_type
+                            if pa.types.is_list(field.type)
+                            else field.type,
+                        )
+                        for field in self._json_schema
+                    ]
+                )
+
+    def __iter__(self) -> Iterator[pa.RecordBatch]:
+        if self.data_offset is None or not self.schema:
+            return
+        if hlo_is_binary(self.meta):
+            yield from self._binary_batches()
+        else:
+            yield from self._json_batches()
+
+    def _binary_batches(self) -> Iterator[pa.RecordBatch]:
+        records = read_hlo_binary(
+            self.path, self.meta, self.data_offset, self.keep_keys, self.omit_keys
+        )
+        nrows = len(next(iter(records.values())))
+        row_bytes = sum(col.dtype.itemsize for col in records.values())
+        step = max(1, self.block_size // max(row_bytes, 1))
+        for start in range(0, nrows, step):
+            yield pa.record_batch(
+                [
+                    pa.array(np.ascontiguousarray(records[field.name][start : start + step]))
+                    for field in self.schema
+                ],
+                schema=self.schema,
+            )
+
+    def _json_batches(self) -> Iterator[pa.RecordBatch]:
+        with open(self.path, "rb") as f:
+            f.seek(self.data_offset)
+            carry = b""
+            while True:
+                chunk = f.read(self.block_size)
+                if not chunk:
+                    if carry.strip():
+                        yield self._parse_block(carry)
+                    return
+                block = carry + chunk
+                end = block.rfind(b"\n") + 1
+                if end == 0:
+                    # a line longer than block_size
+                    carry = block
+                    continue
+                carry = block[end:]
+                if block[:end].strip():
+                    yield self._parse_block(block[:end])
+
+    def _parse_block(self, raw: bytes) -> pa.RecordBatch:
+        try:
+            table = pa_json.read_json(
+                pa.BufferReader(raw),
+                parse_options=pa_json.ParseOptions(
+                    explicit_schema=self._json_schema,
+                    unexpected_field_behavior="ignore",
+                ),
+            )
+            columns = []
+            for field in self._json_schema:
+                col = table.column(field.name)
+                if pa.types.is_list(field.type):
+                    col = pa.chunked_array(
+                        [chunk.flatten() for chunk in col.chunks],
+                        type=field.type.value_type,
+                    )
+                columns.append(col.combine_chunks())
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            values = defaultdict(list)
+            for line in raw.splitlines():
+                if not line.strip():
+                    continue
+                line_dict = _loads(line)
+                for field in self._json_schema:
+                    v = line_dict.get(field.name)
+                    if isinstance(v, list):
+                        values[field.name] += v
+                    else:
+                        values[field.name].append(v)
+            mixed = [
+                field.name
+                for field in self.schema
+                if pa.types.is_integer(field.type)
+                and any(isinstance(v, float) for v in values[field.name])
+            ]
+            if mixed:
+                raise HloSchemaError(mixed)
+            columns = [
+                pa.array(values[field.name], type=field.type)
+                for field in self.schema
+            ]
+        return pa.record_batch(columns, schema=self.schema)
@@ -0,0 +1,183 @@
+"""
+Preallocated column buffer for potentiostat acquisition.
+
+Device event sinks used to extend a list of row tuples for the whole
+measurement, and drivers sliced it and transposed the new rows on every
+poll, so memory and poll cost grew with the run length. ColumnRingBuffer
+keeps one NumPy array per column, grows them by doubling up to
+`max_capacity` points and then overwrites the oldest points. Readers keep
+an absolute cursor and get views of the points appended since; points
+overwritten before they were read are counted in `dropped`.
+"""
+
+__all__ = ["ColumnRingBuffer"]
+
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class ColumnRingBuffer:
+    """
+    Growable ring of equally long columns.
+
+    Args:
+        columns (list, optional): Column names. If omitted they are set by the
+            first append, to the dict keys or to 0..n-1 for positional columns.
+        capacity (int): Initial points per column. Defaults to 4096.
+        max_capacity (int): Points per column kept before the oldest are
+            overwritten. Defaults to 2**20.
+    """
+
+    def __init__(
+        self,
+        columns: Optional[Sequence[Hashable]] = None,
+        capacity: int = 4096,
+        max_capacity: int = 2**20,
+    ):
+        self.columns: Optional[List[Hashable]] = (
+            list(columns) if columns is not None else None
+        )
+        self.capacity = min(capacity, max_capacity)
+        self.max_capacity = max_capacity
+        self._arrays: Dict[Hashable, np.ndarray] = {}
+        self.total = 0  # points appended since creation or clear()
+        self.dropped = 0  # points overwritten before they were read
+
+    def __len__(self):
+        return self.total
+
+    @property
+    def size(self) -> int:
+        """Number of points held."""
+        return min(self.total, self.capacity)
+
+    def clear(self):
+        self._arrays = {}
+        self.total = 0
+        self.dropped = 0
+
+    def _allocate(self, columns: Dict[Hashable, np.ndarray]):
+        if self.columns is None:
+            self.columns = list(columns)
+        for name in self.columns:
+            self._arrays[name] = np.empty(self.capacity, dtype=columns[name].dtype)
+
+    def _grow(self, needed: int):
+        capacity = self.capacity
+        while capacity < needed and capacity < self.max_capacity:
+            capacity *= 2
+        capacity = min(capacity, self.max_capacity)
+        if capacity == self.capacity:
+            return
+        for name, arr in self._arrays.items():
+            grown = np.empty(capacity, dtype=arr.dtype)
+            grown[: self.total] = arr[: self.total]
+            self._arrays[name] = grown
+        self.capacity = capacity
+
+    def append(self, columns: Dict[Hashable, Sequence]) -> int:
+        """
+        Append equally long columns given as a dict of name: values.
+
+        Returns:
+            int: Number of points appended.
+        """
+        arrays = {name: np.asarray(vals) for name, vals in columns.items()}
+        count = len(next(iter(arrays.values()), ()))
+        if count == 0:
+            return 0
+        if not self._arrays:
+            self._allocate(arrays)
+        elif arrays.keys() != self._arrays.keys():
+            raise ValueError(f"columns {list(arrays)} do not match {self.columns}")
+        if self.total + count > self.capacity and self.capacity < self.max_capacity:
+            # below max_capacity no point has been overwritten yet
+            self._grow(self.total + count)
+        for name, arr in arrays.items():
+            buf = self._arrays[name]
+            if not np.can_cast(arr.dtype, buf.dtype, casting="same_kind") or (
+                arr.dtype.kind == "U" and arr.dtype.itemsize > buf.dtype.itemsize
+            ):
+                # e.g. float values in a column that started with ints
+                self._arrays[name] = buf.astype(np.result_type(buf.dtype, arr.dtype))
+        if count > self.capacity:
+            # keep the newest points of an oversized append
+            self.dropped += count - self.capacity
+            self.total += count - self.capacity
+            arrays = {name: arr[-self.capacity :] for name, arr in arrays.items()}
+            count = self.capacity
+        start = self.total % self.capacity
+        first = min(count, self.capacity - start)
+        for name, arr in arrays.items():
+            buf = self._arrays[name]
+            buf[start : start + first] = arr[:first]
+            if first < count:
+                buf[: count - first] = arr[first:]
+        self.total += count
+        return count
+
+    def append_columns(self, columns: Sequence[Sequence]) -> int:
+        """Append positional columns, e.g. the points returned by a Gamry Cook()."""
+        names = self.columns if self.columns is not None else range(len(columns))
+        return self.append(dict(zip(names, columns)))
+
+    def append_rows(self, rows: Sequence[Sequence], names: Optional[Sequence] = None) -> int:
+        """Append row tuples, columns are named by *names* or positionally."""
+        if not rows:
+            return 0
+        columns = list(zip(*rows))
+        if names is None:
+            return self.append_columns(columns)
+        return self.append(dict(zip(names, columns)))
+
+    def _span(self, arr: np.ndarray, start: int, stop: int) -> np.ndarray:
+        p0 = start % self.capacity
+        n = stop - start
+        if p0 + n <= self.capacity:
+            return arr[p0 : p0 + n]
+        return np.concatenate((arr[p0:], arr[: n - (self.capacity - p0)]))
+
+    def read(self, cursor: int) -> Tuple[Dict[Hashable, np.ndarray], int]:
+        """
+        Points appended since absolute index *cursor*.
+
+        The arrays are views into the buffer unless the range wraps around its
+        end; they are only valid until the next append overwrites them.
+
+        Returns:
+            tuple: (dict of column name: array, new cursor)
+        """
+        oldest = self.total - self.size
+        if cursor < oldest:
+            self.dropped += oldest - cursor
+            cursor = oldest
+        if cursor >= self.total or not self._arrays:
+            return {}, self.total
+        return (
+            {
+                name: self._span(arr, cursor, self.total)
+                for name, arr in self._arrays.items()
+            },
+            self.total,
+        )
+
+    def values(self, name: Hashable) -> np.ndarray:
+        """All held points of a column, oldest first."""
+        if name not in self._arrays:
+            return np.empty(0)
+        return self._span(self._arrays[name], self.total - self.size, self.total)
+
+    def tail(self, n: int) -> Dict[Hashable, np.ndarray]:
+        """The latest *n* points of every column."""
+        n = min(n, self.size)
+        return {
+            name: self._span(arr, self.total - n, self.total)
+            for name, arr in self._arrays.items()
+        }
+
+    def last(self, name: Hashable, default=None):
+        """Latest value of a column."""
+        if self.total == 0 or name not in self._arrays:
+            return default
+        return self._arrays[name][(self.total - 1) % self.capacity]
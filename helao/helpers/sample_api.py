@@ -10,8 +10,10 @@ import asyncio
 import json
 import os
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import groupby
 from socket import gethostname
-import pandas as pd
 from typing import List, Tuple, Union
 import aiofiles
 import shortuuid
@@ -30,10 +32,23 @@ from helao.core.models.sample import (
     object_to_sample,
     SampleType,
 )
-from .file_in_use import file_in_use
 
 
 class SampleModelAPI:
+    """
+    SQLite sample database of one sample type.
+
+    The database file is opened once in WAL mode and kept open; every query
+    runs on a single worker thread (so the event loop never waits on disk) and
+    an asyncio.Lock serializes the multi-statement operations of this process.
+    Inserts and updates of a list of samples are written in one IMMEDIATE
+    transaction with parameterized executemany, so other processes using the
+    same file never see partial batches.
+    """
+
+    # max. number of bound parameters per "idx IN (...)" query
+    max_query_params = 900
+
     def __init__(self, sampleclass, Serv_class, extra_columns: str):
 
         self.extra_columns = extra_columns
@@ -82,6 +97,11 @@ class SampleModelAPI:
         self._db = os.path.join(self._dbfilepath, self._dbfilename)
         self._con = None
         self._cur = None
+        self._lock = asyncio.Lock()
+        # all db access happens on this thread, the connection is not shared
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=self._sample_type
+        )
         # convert these to json when saving them to the db
         self._jsonkeys = [
             "chemical",
@@ -94,64 +114,84 @@ class SampleModelAPI:
         ]
         self.ready = False
 
+    async def _run(self, func, *args):
+        """Run a blocking db function on the db thread."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(func, *args)
+        )
+
     async def _open_db(self):
-        """Opens sqlite db file, retries if in use, and assigns connection & cursor."""
-        while file_in_use(self._db):
-            LOGGER.info("db already in use, waiting")
-            await asyncio.sleep(1)
-        self._con = sqlite3.connect(self._db)
-        self._cur = self._con.cursor()
+        """Opens the sqlite db file once and assigns connection & cursor.
+        Concurrent writers wait on the sqlite busy timeout."""
+        if self._con is not None:
+            return
+        await self._run(self._connect)
         LOGGER.info(f"opened db: {self._db}")
 
+    def _connect(self):
+        # autocommit mode, write transactions are opened explicitly
+        self._con = sqlite3.connect(
+            self._db, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._con.row_factory = sqlite3.Row
+        self._con.execute("PRAGMA journal_mode=WAL;")
+        self._con.execute("PRAGMA synchronous=NORMAL;")
+        self._cur = self._con.cursor()
+
     def _close_db(self):
-        """Commits changes to sqlite db and closes connection and cursor."""
+        """Closes the persistent connection and cursor."""
         if self._con is not None:
-            # commit any changes
-            self._con.commit()
             self._con.close()
             LOGGER.info(f"closed db: {self._db}")
             self._con = None
             self._cur = None
 
-    def _df_to_sample(self, df):
-        """converts db dataframe back to a sample basemodel
+    def _row_to_sample(self, row):
+        """converts a db row back to a sample basemodel
         and performs a simply data integrity check"""
-
-        if df.size == 0:
-            return NoneSample()
-        sampledict = dict(df.iloc[-1, :])
-
+        sampledict = dict(row)
         for key in self._jsonkeys:
-            sampledict.update({key: json.loads(sampledict[key])})
+            if sampledict.get(key, None) is not None:
+                sampledict.update({key: json.loads(sampledict[key])})
 
         if sampledict["idx"] != sampledict["sample_no"]:  # integrity check
             raise ValueError(
                 f"sampledict['idx'] != sampledict['sample_no']: {sampledict['idx']} != {sampledict['sample_no']}"
             )
-
         return object_to_sample(sampledict)
 
-    def _df_to_samples(self, df):
-        """converts db dataframe back to a sample basemodel
-        and performs a simply data integrity check"""
-
-        if df.size == 0:
-            return [NoneSample()]
-        else:
-            sample_list = []
-            for i in range(df.shape[0]):
-                sampledict = dict(df.iloc[i, :])
-
-                for key in self._jsonkeys:
-                    sampledict.update({key: json.loads(sampledict[key])})
-
-                if sampledict["idx"] != sampledict["sample_no"]:  # integrity check
-                    raise ValueError(
-                        f"sampledict['idx'] != sampledict['sample_no']: {sampledict['idx']} != {sampledict['sample_no']}"
-                    )
-                sample_list.append(object_to_sample(sampledict))
-
-        return sample_list
+    def _sample_to_row(self, sample) -> dict:
+        """converts a sample basemodel to a dict of db column values"""
+        dfdict = sample.as_dict()
+        row = {}
+        for key, val in dfdict.items():
+            if key not in self.column_names:
+                LOGGER.warning(
+                    f"Invalid {self._sample_type} data key '{key}', skipping it."
+                )
+                continue
+            if key in self._jsonkeys:
+                val = json.dumps(val)
+            elif isinstance(val, UUID):
+                val = str(val)
+            elif isinstance(val, bool):
+                val = int(val)
+            elif val is not None and not isinstance(val, (int, float, str)):
+                val = str(val)
+            row[key] = val
+        return row
+
+    def _select_rows(self, idxs: List[int]) -> dict:
+        """returns {idx: row} for the given idx values"""
+        rows = {}
+        for i in range(0, len(idxs), self.max_query_params):
+            chunk = idxs[i : i + self.max_query_params]
+            self._cur.execute(
+                f"SELECT * FROM {self._sample_type} WHERE idx IN ({','.join('?' * len(chunk))});",
+                chunk,
+            )
+            rows.update({row["idx"]: row for row in self._cur.fetchall()})
+        return rows
 
     def _create_init_db(self):
         self._cur.execute(
@@ -162,64 +202,154 @@ class SampleModelAPI:
         )
 
         LOGGER.info(f"{self._sample_type} table created")
-        # commit changes
-        self._con.commit()
-
-    async def _append_sample(
-        self,
-        sample: Union[AssemblySample, LiquidSample, GasSample, SolidSample, NoneSample],
-    ) -> Union[AssemblySample, LiquidSample, GasSample, SolidSample, NoneSample]:
-        await asyncio.sleep(0.01)
-        lock = asyncio.Lock()
-        async with lock:
-            await self._open_db()
-            self._cur.execute(f"select count(idx) from {self._sample_type};")
-            counts = self._cur.fetchone()[0]
-            sample.sample_no = counts + 1
-            if sample.machine_name is None:
-                sample.machine_name = self._base.server.machine_name
-            if sample.server_name is None:
-                sample.server_name = self._base.server.server_name
-            # if sample.action_timestamp is None:
-            #     atime = datetime.fromtimestamp(datetime.now().timestamp() + self._base.ntp_offset)
-            #     sample.action_timestamp = atime.strftime("%y%m%d.%H%M%S%f")
-            if sample.sample_creation_timecode is None:
-                sample.sample_creation_timecode = self._base.get_realtime_nowait()
-            if sample.last_update is None:
-                sample.last_update = self._base.get_realtime_nowait()
-            sample.global_label = sample.get_global_label()
 
-            dfdict = sample.as_dict()
-            for key in self._jsonkeys:
-                dfdict.update({key: [json.dumps(dfdict[key])]})
+    def _init_tables(self):
+        # check if table exists
+        listOfTables = self._cur.execute(
+            """SELECT name FROM sqlite_master WHERE type='table'
+              AND name=?;""",
+            (self._sample_type,),
+        ).fetchall()
+
+        if listOfTables == []:
+            LOGGER.error(f"{self._sample_type} table not found, creating it.")
+            self._create_init_db()
+        else:
+            LOGGER.info(f"{self._sample_type} table found!")
 
-            keys_to_deletes = []
-            for key, val in dfdict.items():
-                if isinstance(val, UUID):
-                    dfdict[key] = str(val)
+    def _count(self) -> int:
+        self._cur.execute(f"select count(idx) from {self._sample_type};")
+        return self._cur.fetchone()[0]
 
-                if key not in self.column_names:
-                    LOGGER.warning(
-                        f"Invalid {self._sample_type} data key '{key}', skipping it."
-                    )
-                    keys_to_deletes.append(key)
+    def _insert_samples(self, samples: list) -> list:
+        """
+        Assigns sample_no and inserts *samples* in one transaction.
 
-            for key in keys_to_deletes:
-                del dfdict[key]
+        The next AUTOINCREMENT idx is reserved under the write lock taken by
+        BEGIN IMMEDIATE, so sample_no (and the global_label derived from it)
+        are known before the single executemany INSERT. The last inserted
+        rowid is checked against the reserved range before committing.
+        """
+        if not samples:
+            return []
+        self._cur.execute("BEGIN IMMEDIATE;")
+        try:
+            self._cur.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name=?;", (self._sample_type,)
+            )
+            seq = self._cur.fetchone()
+            self._cur.execute(f"SELECT MAX(idx) FROM {self._sample_type};")
+            max_idx = self._cur.fetchone()[0]
+            first_no = max(seq[0] if seq else 0, max_idx or 0) + 1
 
-            df = pd.DataFrame(data=dfdict)
-            df.to_sql(
-                name=self._sample_type, con=self._con, if_exists="append", index=False
+            rows = []
+            for i, sample in enumerate(samples):
+                sample.sample_no = first_no + i
+                if sample.machine_name is None:
+                    sample.machine_name = self._base.server.machine_name
+                if sample.server_name is None:
+                    sample.server_name = self._base.server.server_name
+                if sample.sample_creation_timecode is None:
+                    sample.sample_creation_timecode = self._base.get_realtime_nowait()
+                if sample.last_update is None:
+                    sample.last_update = self._base.get_realtime_nowait()
+                sample.global_label = sample.get_global_label()
+                row = self._sample_to_row(sample)
+                row["idx"] = sample.sample_no
+                rows.append(row)
+
+            keys = list(rows[0].keys())
+            self._cur.executemany(
+                f"INSERT INTO {self._sample_type} ({','.join(keys)}) VALUES ({','.join('?' * len(keys))});",
+                [tuple(row.get(k, None) for k in keys) for row in rows],
             )
+            self._cur.execute("SELECT last_insert_rowid();")
+            lastrowid = self._cur.fetchone()[0]
+            if lastrowid != first_no + len(rows) - 1:
+                raise ValueError(
+                    f"unexpected last rowid {lastrowid} for sample_no {first_no}..{first_no + len(rows) - 1}"
+                )
+            self._cur.execute("COMMIT;")
+        except Exception:
+            self._cur.execute("ROLLBACK;")
+            raise
+
+        # now read back the samples and compare and return them
+        retrows = self._select_rows([row["idx"] for row in rows])
+        return [self._row_to_sample(retrows[row["idx"]]) for row in rows]
 
-            # now read back the sample and compare and return it
-            retdf = pd.read_sql_query(
-                f"""select * from {self._sample_type} ORDER BY idx DESC LIMIT 1;""",
-                con=self._con,
+    def _update_rows(self, rows: List[dict]) -> None:
+        """
+        Writes *rows* (column values incl. idx) in one transaction. Rows with
+        the same set of columns share one parameterized executemany UPDATE.
+        """
+        groups = {}
+        for row in rows:
+            idx = row["idx"]
+            values = {}
+            for key, val in row.items():
+                if key == "idx":
+                    continue
+                if key not in self.column_types:
+                    LOGGER.error(f"unknown key '{key}' for updating sample")
+                    continue
+                # NOT NULL columns keep their value if no new one is given
+                if self.column_notNULL[key] and val is None:
+                    continue
+                values[key] = val
+            groups.setdefault(tuple(values), []).append(
+                tuple(values.values()) + (idx,)
             )
-            self._close_db()
-            retsample = self._df_to_sample(retdf)
-            return retsample
+
+        self._cur.execute("BEGIN IMMEDIATE;")
+        try:
+            for keys, params in groups.items():
+                if not keys:
+                    continue
+                assignments = ", ".join(f"{k} = ?" for k in keys)
+                self._cur.executemany(
+                    f"UPDATE {self._sample_type} SET {assignments} WHERE idx = ?;",
+                    params,
+                )
+            self._cur.execute("COMMIT;")
+        except Exception:
+            self._cur.execute("ROLLBACK;")
+            raise
+
+    def _list_rows(self, limit: int, give_only: bool) -> list:
+        inherit = "WHERE inheritance = 'give_only'" if give_only else ""
+        self._cur.execute(
+            f"""
+            SELECT
+                *
+            FROM
+                {self._sample_type}
+            {inherit}
+            ORDER BY
+                sample_creation_timecode DESC
+            LIMIT
+                ?;
+            """,
+            (limit,),
+        )
+        return self._cur.fetchall()
+
+    async def _append_sample(
+        self,
+        sample: Union[AssemblySample, LiquidSample, GasSample, SolidSample, NoneSample],
+    ) -> Union[AssemblySample, LiquidSample, GasSample, SolidSample, NoneSample]:
+        retsamples = await self._append_samples([sample])
+        return retsamples[0] if retsamples else NoneSample()
+
+    async def _append_samples(
+        self,
+        samples: List[
+            Union[AssemblySample, LiquidSample, GasSample, SolidSample, NoneSample]
+        ],
+    ) -> List[Union[AssemblySample, LiquidSample, GasSample, SolidSample, NoneSample]]:
+        async with self._lock:
+            await self._open_db()
+            return await self._run(self._insert_samples, samples)
 
     async def _key_checks(self, sample):
         return sample
@@ -233,44 +363,31 @@ class SampleModelAPI:
         while not self.ready:
             LOGGER.info("db not ready")
             await asyncio.sleep(0.1)
-        await asyncio.sleep(0.01)
         ret_samples = []
+        add_samples = []
 
         for i, sample in enumerate(samples):
             if isinstance(sample, type(self._sampleclass)):
-                await asyncio.sleep(0.01)
                 sample = await self._key_checks(sample)
-                added_sample = await self._append_sample(sample=sample)
-                if added_sample.sample_type is not None:
-                    ret_samples.append(added_sample)
-                else:
-                    LOGGER.error(
-                        "crtitical error, new_sample got NoneSample back from dn"
-                    )
+                add_samples.append(sample)
             else:
                 LOGGER.info(
                     f"wrong sample type {type(sample)}!={self._sample_type}, skipping it"
                 )
                 # ret_samples.append(NoneSample())
 
+        for added_sample in await self._append_samples(add_samples):
+            if added_sample.sample_type is not None:
+                ret_samples.append(added_sample)
+            else:
+                LOGGER.error("crtitical error, new_sample got NoneSample back from dn")
+
         return ret_samples
 
     async def init_db(self):
-        lock = asyncio.Lock()
-        async with lock:
+        async with self._lock:
             await self._open_db()
-            # check if table exists
-            listOfTables = self._cur.execute(
-                f"""SELECT name FROM sqlite_master WHERE type='table'
-              AND name='{self._sample_type}';"""
-            ).fetchall()
-
-            if listOfTables == []:
-                LOGGER.error(f"{self._sample_type} table not found, creating it.")
-                self._create_init_db()
-            else:
-                LOGGER.info(f"{self._sample_type} table found!")
-            self._close_db()
+            await self._run(self._init_tables)
         LOGGER.info(f"'{self._sample_type}' db initialized")
         self.ready = True
         await self.count_samples()  # has also a separate lock
@@ -279,14 +396,10 @@ class SampleModelAPI:
         while not self.ready:
             LOGGER.info("db not ready")
             await asyncio.sleep(0.1)
-        await asyncio.sleep(0.01)
-        lock = asyncio.Lock()
-        async with lock:
+        async with self._lock:
             await self._open_db()
-            self._cur.execute(f"select count(idx) from {self._sample_type};")
-            counts = self._cur.fetchone()[0]
+            counts = await self._run(self._count)
             LOGGER.info(f"sqlite db {self._sample_type} count: {counts}")
-            self._close_db()
             return counts
 
     async def get_samples(
@@ -302,54 +415,40 @@ class SampleModelAPI:
         while not self.ready:
             LOGGER.info("db not ready")
             await asyncio.sleep(0.1)
-        await asyncio.sleep(0.01)
         ret_samples = []
 
-        lock = asyncio.Lock()
-        async with lock:
+        async with self._lock:
             await self._open_db()
+            counts = None
+            if any(sample.sample_no < 0 for sample in samples):
+                counts = await self._run(self._count)
 
-            for i, sample in enumerate(samples):
+            # resolve the requested idx of each sample, then fetch them at once
+            req_idxs = []
+            for sample in samples:
+                idx = None
                 if sample.sample_no < 0:  # get sample from back
-                    self._cur.execute(f"select count(idx) from {self._sample_type};")
-                    counts = self._cur.fetchone()[0]
                     if counts > abs(sample.sample_no):
-                        LOGGER.info(
-                            f"getting sample: {self._sample_type} {counts+sample.sample_no+1}"
-                        )
-                        await asyncio.sleep(0.01)
-                        retdf = pd.read_sql_query(
-                            f"""select * from {self._sample_type} where idx={counts+sample.sample_no+1};""",
-                            con=self._con,
-                        )
-                        retsample = self._df_to_sample(retdf)
-                        LOGGER.info(retsample)
-                        if sample.sample_type is not None:
-                            ret_samples.append(retsample)
-                        else:
-                            LOGGER.info(
-                                f"sample '{sample.sample_no}' does not exist yet"
-                            )
+                        idx = counts + sample.sample_no + 1
                     else:
                         LOGGER.info(f"sample '{sample.sample_no}' does not exist yet")
-                        # ret_samples.append(NoneSample())
                 elif sample.sample_no > 0:  # get sample from front
-                    LOGGER.info(
-                        f"getting sample: {self._sample_type} {sample.sample_no}"
-                    )
-                    await asyncio.sleep(0.01)
-                    retdf = pd.read_sql_query(
-                        f"""select * from {self._sample_type} where idx={sample.sample_no};""",
-                        con=self._con,
-                    )
-                    retsample = self._df_to_sample(retdf)
-                    if retsample.sample_type is not None:
-                        ret_samples.append(retsample)
-                    else:
-                        LOGGER.info(f"sample '{sample.sample_no}' does not exist yet")
+                    idx = sample.sample_no
                 else:
                     LOGGER.info("zero sample_no is not supported")
-            self._close_db()
+                req_idxs.append(idx)
+            rows = await self._run(
+                self._select_rows, sorted({x for x in req_idxs if x is not None})
+            )
+
+        for sample, idx in zip(samples, req_idxs):
+            if idx is None:
+                continue
+            LOGGER.info(f"getting sample: {self._sample_type} {idx}")
+            if idx in rows:
+                ret_samples.append(self._row_to_sample(rows[idx]))
+            else:
+                LOGGER.info(f"sample '{sample.sample_no}' does not exist yet")
         return ret_samples
 
     async def list_new_samples(
@@ -362,65 +461,17 @@ class SampleModelAPI:
         while not self.ready:
             LOGGER.info("db not ready")
             await asyncio.sleep(0.1)
-        await asyncio.sleep(0.01)
         ret_samples = []
-        inherit = 'WHERE inheritance = "give_only"' if give_only else ""
-        lock = asyncio.Lock()
-        async with lock:
+        async with self._lock:
             await self._open_db()
             LOGGER.info(f"getting {limit} samples of type {self._sample_type}")
-            await asyncio.sleep(0.01)
-            retdf = pd.read_sql_query(
-                f"""
-                SELECT 
-                    *
-                FROM
-                    {self._sample_type}
-                {inherit}
-                ORDER BY
-                    sample_creation_timecode DESC
-                LIMIT
-                    {limit};
-                """,
-                con=self._con,
-            )
-            retdf.fillna("")
-            retsample_list = self._df_to_samples(retdf)
-            for retsample in retsample_list:
-                if retsample.sample_type is not None:
-                    ret_samples.append(retsample.as_dict())
-            self._close_db()
-            # print('\n\n', ret_samples, '\n\n')
+            rows = await self._run(self._list_rows, limit, give_only)
+        for row in rows:
+            retsample = self._row_to_sample(row)
+            if retsample.sample_type is not None:
+                ret_samples.append(retsample.as_dict())
         return ret_samples
 
-    def _update(self, sample_dfdict):
-        idx = sample_dfdict["idx"]
-        for key, val in sample_dfdict.items():
-            if key in self.column_types and key != "idx":
-                col_type = self.column_types[key]
-                if not (self.column_notNULL[key] and val is None):
-                    if col_type in ["integer", "real"]:
-                        if val is None:
-                            cmd = f"""UPDATE {self._sample_type} SET {key} = NULL WHERE idx = {idx};"""
-                        else:
-                            cmd = f"""UPDATE {self._sample_type} SET {key} = {val} WHERE idx = {idx};"""
-                        LOGGER.info(f"dbcommand: {cmd}")
-                        self._cur.execute(cmd)
-                    else:
-                        if val is not None:
-                            # val = val.replace('"', '""')
-                            # val = val.replace("'", "''")
-                            val = val.strip("'").strip('"')
-                            cmd = f"""UPDATE {self._sample_type} SET {key} = '{val}' WHERE idx = {idx};"""
-                        else:
-                            cmd = f"""UPDATE {self._sample_type} SET {key} = NULL WHERE idx = {idx};"""
-                        LOGGER.info(f"dbcommand: {cmd}")
-                        self._cur.execute(cmd)
-
-            else:
-                if key != "idx":
-                    LOGGER.error(f"unknown key '{key}' for updating sample")
-
     async def update_samples(
         self,
         samples: List[
@@ -431,38 +482,32 @@ class SampleModelAPI:
             LOGGER.info("db not ready")
             await asyncio.sleep(0.1)
 
-        await asyncio.sleep(0.01)
-
-        lock = asyncio.Lock()
-        async with lock:
-            await self._open_db()
-
-            for sample in samples:
-                LOGGER.info(
-                    f"updating sample '{self._sample_type}' '{sample.sample_no}'"
-                )
-                if sample.global_label is None:
-                    LOGGER.info("No global_label. Skipping sample.")
-                    continue
+        checked = []
+        for sample in samples:
+            LOGGER.info(f"updating sample '{self._sample_type}' '{sample.sample_no}'")
+            if sample.global_label is None:
+                LOGGER.info("No global_label. Skipping sample.")
+                continue
 
-                if sample.sample_no < 1:
-                    LOGGER.info(f"Cannot update sample '{sample.sample_no}'")
-                    continue
+            if sample.sample_no < 1:
+                LOGGER.info(f"Cannot update sample '{sample.sample_no}'")
+                continue
 
-                sample = await self._key_checks(sample)
+            checked.append(await self._key_checks(sample))
 
-                # get the current info from db so we can perform some checks
-                LOGGER.info(f"getting sample {self._sample_type} {sample.sample_no}")
-                await asyncio.sleep(0.01)
-                retdf = pd.read_sql_query(
-                    f"""select * from {self._sample_type} where idx={sample.sample_no};""",
-                    con=self._con,
-                )
-                prev_sample = self._df_to_sample(retdf)
+        async with self._lock:
+            await self._open_db()
+            # get the current info from db so we can perform some checks
+            prev_rows = await self._run(
+                self._select_rows, sorted({sample.sample_no for sample in checked})
+            )
 
-                if prev_sample.sample_type is None:
+            update_rows = []
+            for sample in checked:
+                if sample.sample_no not in prev_rows:
                     LOGGER.error("update_samples: invalid sample")
                     continue
+                prev_sample = self._row_to_sample(prev_rows[sample.sample_no])
 
                 # some safety checks
                 if sample.global_label != prev_sample.global_label:
@@ -481,27 +526,12 @@ class SampleModelAPI:
                 sample.last_update = self._base.get_realtime_nowait()
 
                 # update the old sample now
-                dfdict = sample.as_dict()
-                for key in self._jsonkeys:
-                    # fdict.update({key: [json.dumps(dfdict[key])]})
-                    dfdict.update({key: json.dumps(dfdict[key])})
-
-                keys_to_deletes = []
-                for key in dfdict.keys():
-                    if key not in self.column_names:
-                        LOGGER.warning(
-                            f"Invalid {self._sample_type} data key '{key}', skipping it."
-                        )
-                        keys_to_deletes.append(key)
-
-                for key in keys_to_deletes:
-                    del dfdict[key]
+                row = self._sample_to_row(sample)
+                row.update({"idx": sample.sample_no})
+                update_rows.append(row)
 
-                dfdict.update({"idx": sample.sample_no})
-                self._update(dfdict)
-                # df = pd.DataFrame(data=dfdict)
-                # df.to_sql(name=self._sample_type, con=self._con, if_exists="append", index=False, index_label="idx")
-            self._close_db()
+            if update_rows:
+                await self._run(self._update_rows, update_rows)
 
     async def get_platemap(
         self,
@@ -887,6 +917,22 @@ class UnifiedSampleDataAPI:
         LOGGER.info("unified db initialized")
         self.ready = True
 
+    def _type_api(self, sample_type):
+        return {
+            SampleType.liquid: self.liquidAPI,
+            SampleType.solid: self.solidAPI,
+            SampleType.gas: self.gasAPI,
+            SampleType.assembly: self.assemblyAPI,
+        }.get(sample_type, None)
+
+    def _type_runs(self, samples):
+        """Yield (sample_type, samples) for consecutive samples of the same type,
+        so each sample db handles a whole run in one batch and order is kept."""
+        return groupby(
+            [object_to_sample(sample_) for sample_ in samples],
+            key=lambda sample: sample.sample_type,
+        )
+
     async def new_samples(
         self,
         samples: List[
@@ -895,24 +941,10 @@ class UnifiedSampleDataAPI:
     ) -> List[Union[AssemblySample, LiquidSample, GasSample, SolidSample, NoneSample]]:
         retval = []
 
-        for sample_ in samples:
-            sample = object_to_sample(sample_)
-            if sample.sample_type == SampleType.liquid:
-                tmp = await self.liquidAPI.new_samples(samples=[sample])
-                for t in tmp:
-                    retval.append(t)
-            elif sample.sample_type == SampleType.solid:
-                tmp = await self.solidAPI.new_samples(samples=[sample])
-                for t in tmp:
-                    retval.append(t)
-            elif sample.sample_type == SampleType.gas:
-                tmp = await self.gasAPI.new_samples(samples=[sample])
-                for t in tmp:
-                    retval.append(t)
-            elif sample.sample_type == SampleType.assembly:
-                tmp = await self.assemblyAPI.new_samples(samples=[sample])
-                for t in tmp:
-                    retval.append(t)
+        for sample_type, run in self._type_runs(samples):
+            api = self._type_api(sample_type)
+            if api is not None:
+                retval += await api.new_samples(samples=list(run))
 
         return retval
 
@@ -928,36 +960,25 @@ class UnifiedSampleDataAPI:
         """
         retval = []
 
-        for i, sample_ in enumerate(samples):
-            # print("sample", i, ":", sample_)
-            sample = object_to_sample(sample_)
-            LOGGER.info(
-                f"retrieving sample {sample.get_global_label()} of sample_type {sample.sample_type}"
-            )
-            if sample.sample_type == SampleType.liquid:
-                tmp = await self.liquidAPI.get_samples([sample])
-                for t in tmp:
-                    retval.append(t)
-            elif sample.sample_type == SampleType.solid:
-                tmp = await self.solidAPI.get_samples([sample])
-                for t in tmp:
-                    retval.append(t)
-            elif sample.sample_type == SampleType.gas:
-                tmp = await self.gasAPI.get_samples([sample])
-                for t in tmp:
-                    retval.append(t)
-            elif sample.sample_type == SampleType.assembly:
-                tmp = await self.assemblyAPI.get_samples([sample])
-                # first need to get the most recent part info
-                for t in tmp:
-                    t.parts = await self.get_samples(samples=t.parts)
-                    # and then add the assembly to the return list
-                    retval.append(t)
-            elif sample.sample_type is None:
+        for sample_type, run in self._type_runs(samples):
+            run = list(run)
+            for sample in run:
+                LOGGER.info(
+                    f"retrieving sample {sample.get_global_label()} of sample_type {sample_type}"
+                )
+            api = self._type_api(sample_type)
+            if api is not None:
+                tmp = await api.get_samples(run)
+                if sample_type == SampleType.assembly:
+                    # first need to get the most recent part info
+                    for t in tmp:
+                        t.parts = await self.get_samples(samples=t.parts)
+                retval += tmp
+            elif sample_type is None:
                 LOGGER.info("got None sample")
             else:
                 LOGGER.error(
-                    f"validation error, type '{type(sample)}' is not a valid sample model"
+                    f"validation error, type '{type(run[0])}' is not a valid sample model"
                 )
 
         return retval
@@ -983,26 +1004,25 @@ class UnifiedSampleDataAPI:
             Union[AssemblySample, LiquidSample, GasSample, SolidSample, NoneSample]
         ] = [],
     ) -> None:
-        for sample_ in samples:
-            sample = object_to_sample(sample_)
-            LOGGER.info(
-                f"updating sample: {sample.global_label} of sample_type {sample.sample_type}"
-            )
-            if sample.sample_type == SampleType.liquid:
-                await self.liquidAPI.update_samples([sample])
-            elif sample.sample_type == SampleType.solid:
-                await self.solidAPI.update_samples([sample])
-            elif sample.sample_type == SampleType.gas:
-                await self.gasAPI.update_samples([sample])
-            elif sample.sample_type == SampleType.assembly:
-                # update also the parts
-                await self.update_samples(sample.parts)
-                await self.assemblyAPI.update_samples([sample])
-            elif sample.sample_type is None:
+        for sample_type, run in self._type_runs(samples):
+            run = list(run)
+            for sample in run:
+                LOGGER.info(
+                    f"updating sample: {sample.global_label} of sample_type {sample_type}"
+                )
+            api = self._type_api(sample_type)
+            if api is not None:
+                if sample_type == SampleType.assembly:
+                    # update also the parts
+                    await self.update_samples(
+                        [part for sample in run for part in sample.parts]
+                    )
+                await api.update_samples(run)
+            elif sample_type is None:
                 LOGGER.info("got None sample")
             else:
                 LOGGER.error(
-                    f"validation error, type '{type(sample)}' is not a valid sample model"
+                    f"validation error, type '{type(run[0])}' is not a valid sample model"
                 )
 
     async def get_samples_xy(
@@ -69,6 +69,14 @@ class HelaoFastAPI(FastAPI):
             port=self.server_cfg["port"],
         )
 
+        @self.get("/health", tags=["private"])
+        def health():
+            """
+            Readiness probe for the launcher. Requests are only served once the
+            startup events have completed, so any response means ready.
+            """
+            return {"server": self.helao_srv, "ready": True}
+
 
 class HelaoBokehAPI:
     """
@@ -0,0 +1,145 @@
+"""
+Spatial index of plate map sample positions.
+
+The aligner and operator found the sample nearest to a clicked or motor
+position by computing the distance to every spot of the plate map, for each
+lookup, and the plate APIs kept every map they ever loaded. PlateMapIndex
+builds a KD-tree once per loaded plate map and answers batched nearest and
+radius queries in log time; maps and their indexes are kept in LRUCaches.
+
+usage:
+    index = PlateMapIndex(pmdata)
+    rows = index.nearest([x0, x1], [y0, y1])
+    pmdata[rows[0]]["Sample"]
+"""
+
+__all__ = ["LRUCache", "PlateMapIndex"]
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class LRUCache(OrderedDict):
+    """
+    Dict keeping the `maxsize` most recently used entries.
+
+    Args:
+        maxsize (int): Entries kept before the least recently used is dropped.
+            Defaults to 32.
+    """
+
+    def __init__(self, maxsize: int = 32, *args, **kwargs):
+        self.maxsize = maxsize
+        super().__init__(*args, **kwargs)
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+class PlateMapIndex:
+    """
+    KD-tree over the (x, y) plate positions of a plate map.
+
+    Queries return row numbers of `pmdata`; spots without finite coordinates
+    are never returned.
+
+    Args:
+        pmdata (list): Plate map as a list of dicts (or a DataFrame).
+        xkey (str): Key of the plate x coordinate. Defaults to 'x'.
+        ykey (str): Key of the plate y coordinate. Defaults to 'y'.
+        samplekey (str): Key of the sample number. Defaults to 'Sample'.
+    """
+
+    def __init__(
+        self,
+        pmdata: Sequence[dict],
+        xkey: str = "x",
+        ykey: str = "y",
+        samplekey: str = "Sample",
+    ):
+        if hasattr(pmdata, "to_dict"):
+            pmdata = pmdata.to_dict(orient="records")
+        self.pmdata = pmdata
+        self.samplekey = samplekey
+        self.xy = np.array(
+            [(row.get(xkey, np.nan), row.get(ykey, np.nan)) for row in pmdata],
+            dtype=float,
+        ).reshape(-1, 2)
+        valid = np.isfinite(self.xy).all(axis=1)
+        # tree position -> pmdata row
+        self._rows = np.flatnonzero(valid)
+        self.tree = cKDTree(self.xy[valid]) if len(self._rows) else None
+        self._sample_rows: Dict[int, int] = {}
+        for i, row in enumerate(pmdata):
+            try:
+                self._sample_rows.setdefault(int(row.get(samplekey)), i)
+            except (TypeError, ValueError):
+                # no or non-numeric sample number
+                pass
+
+    def __len__(self):
+        return len(self.pmdata)
+
+    @staticmethod
+    def _points(X, Y) -> np.ndarray:
+        return np.column_stack(
+            (
+                np.atleast_1d(np.asarray(X, dtype=float)),
+                np.atleast_1d(np.asarray(Y, dtype=float)),
+            )
+        )
+
+    def nearest(self, X, Y, max_distance: float = np.inf) -> np.ndarray:
+        """
+        Rows of the spots nearest to the points (X, Y).
+
+        Returns:
+            np.ndarray: Row numbers, -1 where no spot is within `max_distance`.
+        """
+        points = self._points(X, Y)
+        if self.tree is None:
+            return np.full(len(points), -1, dtype=int)
+        dist, pos = self.tree.query(points, distance_upper_bound=max_distance)
+        rows = np.full(len(points), -1, dtype=int)
+        found = np.isfinite(dist)
+        rows[found] = self._rows[pos[found]]
+        return rows
+
+    def nearest_list(self, X, Y, max_distance: float = np.inf) -> List[Optional[int]]:
+        """`nearest` as a list of ints, None where no spot was found."""
+        return [
+            None if row < 0 else int(row)
+            for row in self.nearest(X, Y, max_distance=max_distance)
+        ]
+
+    def within(self, X, Y, radius: float) -> List[np.ndarray]:
+        """Rows of the spots within `radius` of each point (X, Y), in row order."""
+        points = self._points(X, Y)
+        if self.tree is None:
+            return [np.empty(0, dtype=int) for _ in points]
+        return [
+            np.sort(self._rows[np.asarray(pos, dtype=int)])
+            for pos in self.tree.query_ball_point(points, r=radius)
+        ]
+
+    def sample_row(self, sample_no: int) -> Optional[int]:
+        """Row of a sample number, None if it is not on the map."""
+        return self._sample_rows.get(int(sample_no))
+
+    def sample_numbers(self, rows: Sequence[int]) -> list:
+        """Sample numbers of rows as returned by `nearest`, None for -1."""
+        return [
+            None if row is None or row < 0 else self.pmdata[row].get(self.samplekey)
+            for row in rows
+        ]
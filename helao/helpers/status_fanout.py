@@ -0,0 +1,184 @@
+"""
+Non-blocking delivery of action server status updates to status clients.
+
+Base.log_status_task used to push every status change to each client in turn,
+retrying inline and sleeping between clients, which held up the event loop for
+every status change. StatusFanout gives each client its own sender task and a
+pending buffer holding at most one payload per endpoint, so a slow or
+unreachable client only delays itself.
+
+When a client falls behind, a new payload for an endpoint that is still pending
+is merged into the pending one per action_uuid: the newest status of each
+action wins and finished/errored entries of the older payload are kept, so no
+terminal status is lost. Payloads whose endpoint state equals the last one
+delivered to the same client are skipped.
+"""
+
+__all__ = ["StatusFanout"]
+
+import asyncio
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from helao.core.error import ErrorCodes
+from helao.helpers import helao_logging as logging
+
+LOGGER = logging.make_logger(__file__) if logging.LOGGER is None else logging.LOGGER
+
+ClientKey = Tuple[str, str, int]
+
+
+def _merge_endpoint(old: dict, new: dict) -> dict:
+    """Merge two serialized EndpointModels, newer action statuses win."""
+    nonactive = {}
+    for status_dict in (old.get("nonactive_dict", {}), new.get("nonactive_dict", {})):
+        for hlostatus, acts in status_dict.items():
+            nonactive.setdefault(hlostatus, {}).update(acts)
+    finished = {uuid for acts in nonactive.values() for uuid in acts}
+    merged = dict(new)
+    merged["active_dict"] = {
+        uuid: act
+        for uuid, act in new.get("active_dict", {}).items()
+        if uuid not in finished
+    }
+    merged["nonactive_dict"] = nonactive
+    return merged
+
+
+def _merge_payload(old: dict, new: dict, action_name: str) -> dict:
+    """Merge two serialized single-endpoint ActionServerModels."""
+    merged = dict(new)
+    merged["endpoints"] = {
+        action_name: _merge_endpoint(
+            old["endpoints"][action_name], new["endpoints"][action_name]
+        )
+    }
+    return merged
+
+
+class _Subscriber:
+    def __init__(self, client_key: ClientKey):
+        self.client_key = client_key
+        self.pending: "OrderedDict[str, dict]" = OrderedDict()
+        self.last_sent: Dict[str, dict] = {}
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.coalesced = 0
+        self.unchanged = 0
+        self.failed = 0
+
+
+class StatusFanout:
+    """
+    One sender task and one coalescing pending buffer per status client.
+
+    Args:
+        send_func (Callable): Coroutine taking a client key (servkey, host, port)
+            and a serialized ActionServerModel, returning (response, error_code).
+        retry_limit (int): Delivery attempts per payload before it is dropped.
+            Defaults to 5.
+    """
+
+    def __init__(
+        self,
+        send_func: Callable[[ClientKey, dict], Awaitable[tuple]],
+        retry_limit: int = 5,
+    ):
+        self.send_func = send_func
+        self.retry_limit = retry_limit
+        self._subscribers: Dict[ClientKey, _Subscriber] = {}
+
+    def sync_clients(self, client_keys: Iterable[ClientKey]) -> None:
+        """Start senders for new clients and stop senders of detached ones."""
+        client_keys = set(client_keys)
+        for client_key in list(self._subscribers):
+            if client_key not in client_keys:
+                self.remove(client_key)
+        for client_key in client_keys:
+            if client_key not in self._subscribers:
+                sub = _Subscriber(client_key)
+                sub.task = asyncio.get_running_loop().create_task(self._sender(sub))
+                self._subscribers[client_key] = sub
+
+    def remove(self, client_key: ClientKey) -> None:
+        sub = self._subscribers.pop(client_key, None)
+        if sub is not None and sub.task is not None:
+            sub.task.cancel()
+
+    def publish(
+        self, client_keys: Iterable[ClientKey], action_name: str, payload: dict
+    ) -> None:
+        """
+        Queue a single-endpoint status payload for every client without waiting
+        for delivery. *payload* must be a snapshot (e.g. from get_fastapi_json),
+        it is shared between clients and not modified.
+        """
+        if not payload or action_name not in payload.get("endpoints", {}):
+            return
+        self.sync_clients(client_keys)
+        for sub in self._subscribers.values():
+            if action_name in sub.pending:
+                sub.pending[action_name] = _merge_payload(
+                    sub.pending[action_name], payload, action_name
+                )
+                sub.coalesced += 1
+            else:
+                sub.pending[action_name] = payload
+            sub.wakeup.set()
+
+    async def _sender(self, sub: _Subscriber) -> None:
+        servkey = sub.client_key[0]
+        try:
+            while True:
+                if not sub.pending:
+                    sub.wakeup.clear()
+                    await sub.wakeup.wait()
+                    continue
+                action_name, payload = sub.pending.popitem(last=False)
+                endpoint = payload["endpoints"][action_name]
+                if sub.last_sent.get(action_name) == endpoint:
+                    sub.unchanged += 1
+                    continue
+                success = False
+                for _ in range(self.retry_limit):
+                    response, error_code = await self.send_func(sub.client_key, payload)
+                    if response and error_code == ErrorCodes.none:
+                        success = True
+                        break
+                if success:
+                    sub.sent += 1
+                    sub.last_sent[action_name] = endpoint
+                    LOGGER.info(f"Pushed status message to {servkey}.")
+                else:
+                    sub.failed += 1
+                    sub.last_sent.pop(action_name, None)
+                    LOGGER.error(
+                        f"Failed to push status message to {servkey} after {self.retry_limit} attempts."
+                    )
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            LOGGER.error(f"status sender for {servkey} failed", exc_info=True)
+            self._subscribers.pop(sub.client_key, None)
+
+    async def close(self) -> None:
+        """Cancel all sender tasks, pending payloads are discarded."""
+        tasks = [sub.task for sub in self._subscribers.values() if sub.task]
+        for client_key in list(self._subscribers):
+            self.remove(client_key)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        """Return delivery counters keyed by client server key."""
+        return {
+            f"{sub.client_key[0]}@{sub.client_key[1]}:{sub.client_key[2]}": {
+                "pending": len(sub.pending),
+                "sent": sub.sent,
+                "coalesced": sub.coalesced,
+                "unchanged_skipped": sub.unchanged,
+                "failed": sub.failed,
+            }
+            for sub in self._subscribers.values()
+        }
@@ -0,0 +1,104 @@
+"""
+Keyed wake-ups for the orchestrator dispatch loop.
+
+The dispatch loop used to block on a single interrupt queue that every status
+update, intent change and nonblocking update was pushed to, and re-evaluated
+its start condition after each one. StatusWaiters instead lets a waiter
+register for the keys its condition depends on, e.g. one action server
+endpoint, and `notify` only wakes waiters registered for the changed keys
+(plus those waiting on ANY).
+
+Keys are plain tuples built with the helpers below:
+
+    endpoint_wait_key(server_name, endpoint_name)
+    server_wait_key(server_name)
+    action_wait_key(action_uuid)
+"""
+
+__all__ = [
+    "StatusWaiters",
+    "ANY",
+    "endpoint_wait_key",
+    "server_wait_key",
+    "action_wait_key",
+]
+
+import asyncio
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, Optional, Set
+
+ANY = ("any",)
+
+
+def endpoint_wait_key(server_name: str, endpoint_name: str) -> tuple:
+    return ("endpoint", server_name, endpoint_name)
+
+
+def server_wait_key(server_name: str) -> tuple:
+    return ("server", server_name)
+
+
+def action_wait_key(action_uuid) -> tuple:
+    return ("action", str(action_uuid))
+
+
+class StatusWaiters:
+    """Registry of futures woken by the keys they were registered for."""
+
+    def __init__(self):
+        self._waiters: Dict[Hashable, Set[asyncio.Future]] = defaultdict(set)
+        self.notify_count = 0
+        self.wake_count = 0
+
+    def __len__(self):
+        return len({fut for futs in self._waiters.values() for fut in futs})
+
+    async def wait(self, keys: Iterable[Hashable], timeout: Optional[float] = None):
+        """
+        Wait until one of *keys* (or every key, via `notify_all`) is notified.
+
+        Args:
+            keys: Keys to wake on. ANY wakes on every notification.
+            timeout (float): Seconds after which to return without a
+                notification, None waits indefinitely.
+
+        Returns:
+            bool: True if woken by a notification, False on timeout.
+        """
+        keys = set(keys)
+        fut = asyncio.get_running_loop().create_future()
+        for key in keys:
+            self._waiters[key].add(fut)
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            for key in keys:
+                waiters = self._waiters.get(key)
+                if waiters is not None:
+                    waiters.discard(fut)
+                    if not waiters:
+                        del self._waiters[key]
+            if not fut.done():
+                fut.cancel()
+
+    def _wake(self, futs: Iterable[asyncio.Future]):
+        for fut in futs:
+            if not fut.done():
+                fut.set_result(True)
+                self.wake_count += 1
+
+    def notify(self, keys: Iterable[Hashable]):
+        """Wake waiters registered for any of *keys* and all ANY waiters."""
+        self.notify_count += 1
+        woken = set(self._waiters.get(ANY, ()))
+        for key in keys:
+            woken.update(self._waiters.get(key, ()))
+        self._wake(woken)
+
+    def notify_all(self):
+        """Wake every waiter, e.g. on a loop intent change."""
+        self.notify_count += 1
+        self._wake({fut for futs in self._waiters.values() for fut in futs})
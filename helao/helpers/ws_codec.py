@@ -0,0 +1,136 @@
+"""
+Websocket frame codecs shared by the ws_status, ws_data and ws_live publishers
+and by WsSubscriber / WsSyncClient.
+
+A frame is a serialized message compressed with zstd. The codec is chosen per
+connection by the client with the `codec` query parameter, e.g.
+ws://host:port/ws_data?codec=msgpack; connections without it use "pickle",
+which is the legacy format.
+
+Codecs:
+    pickle: pickle.dumps, any python object (default).
+    msgpack: msgpack with numpy arrays as lists, smaller and faster to decode
+        for plain dict payloads, and readable by non-python clients. Requires
+        the optional msgpack package.
+
+WsFrameEncoder caches the encoded frames of recent messages so a message that
+is fanned out to many subscribers is transformed, serialized and compressed
+once per codec instead of once per subscriber.
+"""
+
+__all__ = [
+    "WS_CODECS",
+    "DEFAULT_WS_CODEC",
+    "available_ws_codecs",
+    "select_ws_codec",
+    "encode_ws_frame",
+    "decode_ws_frame",
+    "WsFrameEncoder",
+]
+
+import pickle
+from collections import OrderedDict
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+import numpy as np
+import pyzstd
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def _msgpack_default(obj: Any):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (UUID, datetime, date)):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"cannot serialize {type(obj)} with msgpack")
+
+
+def _dumps_msgpack(obj: Any) -> bytes:
+    return msgpack.packb(obj, default=_msgpack_default, use_bin_type=True)
+
+
+def _loads_msgpack(raw: bytes) -> Any:
+    return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+
+WS_CODECS = {
+    "pickle": (pickle.dumps, pickle.loads),
+    "msgpack": (_dumps_msgpack, _loads_msgpack),
+}
+DEFAULT_WS_CODEC = "pickle"
+
+
+def available_ws_codecs() -> list:
+    """Return the codec names usable in this environment."""
+    return [k for k in WS_CODECS if k != "msgpack" or msgpack is not None]
+
+
+def select_ws_codec(requested: Optional[str] = None) -> Optional[str]:
+    """Return the codec for a connection's `codec` query value, None if unavailable."""
+    if not requested:
+        return DEFAULT_WS_CODEC
+    return requested if requested in available_ws_codecs() else None
+
+
+def encode_ws_frame(obj: Any, codec: str = DEFAULT_WS_CODEC) -> bytes:
+    """Serialize *obj* with *codec* and zstd-compress it."""
+    return pyzstd.compress(WS_CODECS[codec][0](obj))
+
+
+def decode_ws_frame(frame: bytes, codec: str = DEFAULT_WS_CODEC) -> Any:
+    """Inverse of encode_ws_frame."""
+    return WS_CODECS[codec][1](pyzstd.decompress(frame))
+
+
+class WsFrameEncoder:
+    """
+    Encode-once cache for messages broadcast to several websocket subscribers.
+
+    Frames are cached per message object (by identity) and codec. The cache
+    keeps a reference to the message so its id cannot be reused while cached,
+    and holds the frames of the last `max_cached` messages, which should cover
+    the subscriber queue length; a subscriber lagging further behind simply
+    re-encodes its message.
+
+    Args:
+        xform_func (Callable): Applied to a message before serialization,
+            e.g. lambda msg: msg.as_dict(). Defaults to the identity.
+        max_cached (int): Number of messages whose frames are kept. Defaults to 2048.
+    """
+
+    def __init__(self, xform_func: Callable = lambda x: x, max_cached: int = 2048):
+        self.xform_func = xform_func
+        self.max_cached = max_cached
+        self._frames: "OrderedDict[int, tuple]" = OrderedDict()
+        self.encoded = 0
+        self.cache_hits = 0
+
+    def frame(self, msg: Any, codec: str = DEFAULT_WS_CODEC) -> bytes:
+        """Return the compressed frame of *msg* for *codec*."""
+        key = id(msg)
+        entry = self._frames.get(key)
+        if entry is None or entry[0] is not msg:
+            entry = (msg, {})
+            self._frames[key] = entry
+            if len(self._frames) > self.max_cached:
+                self._frames.popitem(last=False)
+        frames = entry[1]
+        if codec in frames:
+            self.cache_hits += 1
+        else:
+            frames[codec] = encode_ws_frame(self.xform_func(msg), codec)
+            self.encoded += 1
+        return frames[codec]
@@ -0,0 +1,289 @@
+"""
+Per-client decimation of the data stream for visualizers.
+
+The raw ws_data stream forwards every DataPackageModel, so a visualizer
+plotting a 1 kHz potentiostat or a 1000-channel spectrometer receives and
+re-plots every point. The ws_data_decimated websocket instead buffers the
+packages of each action and sends, every `interval` seconds, at most
+`points_per_s * interval` rows per action, keeping only the requested
+columns. Packages are still DataPackageModels, so visualizer code written for
+ws_data works unchanged.
+
+Query parameters (all optional):
+
+    method        minmax (default): min and max row of `y` per bucket
+                  lttb: largest-triangle-three-buckets on (`x`, `y`)
+                  stride: evenly spaced rows, e.g. whole spectra
+    points_per_s  row budget per action and second, default 500
+    interval      seconds between sends, default 0.1
+    keys          comma-separated column names or fnmatch patterns
+                  (e.g. t_s,Ewe_V,I_A or epoch_s,ch_*), default all
+    x, y          columns used by lttb/minmax, default t_s if present
+                  (else the row number) and the first other numeric column
+    codec         frame codec, see helpers/ws_codec.py
+
+e.g. ws://host:port/ws_data_decimated?keys=t_s,Ewe_V,I_A&points_per_s=200
+"""
+
+__all__ = [
+    "DecimationParams",
+    "DataDecimator",
+    "lttb_indices",
+    "minmax_indices",
+    "stride_indices",
+]
+
+import time
+from fnmatch import fnmatchcase
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from helao.core.models.data import DataModel, DataPackageModel
+from helao.core.models.hlostatus import HloStatus
+
+DECIMATION_METHODS = ("minmax", "lttb", "stride")
+
+
+def stride_indices(n: int, n_out: int) -> np.ndarray:
+    """Indices of `n_out` evenly spaced rows out of `n`, first and last included."""
+    if n <= n_out:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, n_out).round().astype(int))
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the min and max of `y` in `n_out // 2` buckets, in order."""
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    n_buckets = max(1, n_out // 2)
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)
+    y = np.where(np.isnan(y), np.nanmean(y) if np.isfinite(y).any() else 0.0, y)
+    idx = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            seg = y[lo:hi]
+            idx.append(lo + int(np.argmin(seg)))
+            idx.append(lo + int(np.argmax(seg)))
+    return np.unique(idx)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-triangle-three-buckets selection of `n_out` rows of (`x`, `y`)."""
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return stride_indices(n, n_out) if n_out < 3 else np.arange(n)
+    y = np.where(np.isnan(y), 0.0, y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=int)
+    idx[0] = 0
+    idx[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo = hi
+        nhi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nlo:nhi].mean() if nhi > nlo else x[-1]
+        avg_y = y[nlo:nhi].mean() if nhi > nlo else y[-1]
+        seg_x = x[lo:hi]
+        seg_y = y[lo:hi]
+        area = np.abs(
+            (x[a] - avg_x) * (seg_y - y[a]) - (x[a] - seg_x) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+
+def _numeric(values: list) -> Optional[np.ndarray]:
+    try:
+        arr = np.asarray(
+            [np.nan if v is None else v for v in values], dtype=float
+        )
+    except (TypeError, ValueError):
+        return None
+    return arr if arr.ndim == 1 else None
+
+
+class DecimationParams:
+    """
+    Decimation settings of one websocket client, see the module docstring.
+
+    Raises:
+        ValueError: On an unknown method or a non-positive budget or interval.
+    """
+
+    def __init__(
+        self,
+        method: str = "minmax",
+        points_per_s: float = 500.0,
+        interval: float = 0.1,
+        keys: Optional[List[str]] = None,
+        x: Optional[str] = None,
+        y: Optional[str] = None,
+    ):
+        if method not in DECIMATION_METHODS:
+            raise ValueError(f"unknown decimation method '{method}'")
+        if points_per_s <= 0 or interval <= 0:
+            raise ValueError("points_per_s and interval must be positive")
+        self.method = method
+        self.points_per_s = points_per_s
+        self.interval = interval
+        self.keys = keys
+        self.x = x
+        self.y = y
+
+    @classmethod
+    def from_query(cls, query: dict) -> "DecimationParams":
+        keys = query.get("keys")
+        return cls(
+            method=query.get("method", "minmax"),
+            points_per_s=float(query.get("points_per_s", 500)),
+            interval=float(query.get("interval", 0.1)),
+            keys=[k.strip() for k in keys.split(",") if k.strip()] if keys else None,
+            x=query.get("x"),
+            y=query.get("y"),
+        )
+
+    def selects(self, column: str) -> bool:
+        return self.keys is None or any(fnmatchcase(column, k) for k in self.keys)
+
+
+class _ActionBuffer:
+    def __init__(self, action_uuid, action_name: str):
+        self.action_uuid = action_uuid
+        self.action_name = action_name
+        self.status = HloStatus.active
+        self.errors = []
+        # file_conn_key: column: values
+        self.columns: Dict[object, Dict[str, list]] = {}
+        self.rows = 0
+
+    def add(self, pkg: DataPackageModel, params: DecimationParams) -> int:
+        added = 0
+        for file_conn_key, coldict in pkg.datamodel.data.items():
+            cols = self.columns.setdefault(file_conn_key, {})
+            nrows = 0
+            for col, val in coldict.items():
+                if not params.selects(col):
+                    continue
+                if isinstance(val, np.ndarray):
+                    # e.g. frame blocks of binary acquisitions
+                    vals = val.tolist()
+                else:
+                    vals = val if isinstance(val, list) else [val]
+                cols.setdefault(col, []).extend(vals)
+                nrows = max(nrows, len(vals))
+            added += nrows
+        self.rows += added
+        self.status = pkg.datamodel.status
+        self.errors.extend(pkg.errors)
+        return added
+
+    def take(self, budget: int, params: DecimationParams) -> DataPackageModel:
+        data = {}
+        for file_conn_key, cols in self.columns.items():
+            if not cols:
+                continue
+            n = max(len(v) for v in cols.values())
+            for v in cols.values():
+                if len(v) < n:
+                    v.extend([None] * (n - len(v)))
+            data[file_conn_key] = self._decimate(cols, n, budget, params)
+        pkg = DataPackageModel(
+            action_uuid=self.action_uuid,
+            action_name=self.action_name,
+            datamodel=DataModel(data=data, errors=[], status=self.status),
+            errors=self.errors,
+        )
+        self.columns = {}
+        self.errors = []
+        self.rows = 0
+        return pkg
+
+    def _decimate(self, cols: Dict[str, list], n: int, budget: int, params) -> dict:
+        if n <= budget:
+            return cols
+        x = y = None
+        if params.method != "stride":
+            xkey = params.x or ("t_s" if "t_s" in cols else None)
+            ykey = params.y or next(
+                (
+                    k
+                    for k in cols
+                    if k != xkey and _numeric(cols[k][:1]) is not None
+                ),
+                None,
+            )
+            y = _numeric(cols[ykey]) if ykey in cols else None
+            if xkey in cols:
+                x = _numeric(cols[xkey])
+            if x is None:
+                x = np.arange(n, dtype=float)
+        if y is None:
+            idx = stride_indices(n, budget)
+        elif params.method == "lttb":
+            idx = lttb_indices(x, y, budget)
+        else:
+            idx = minmax_indices(y, budget)
+        return {k: [v[i] for i in idx] for k, v in cols.items()}
+
+
+class DataDecimator:
+    """
+    Buffers DataPackageModels per action and releases them decimated.
+
+    `add` returns the packages to send right away: anything that is not a
+    DataPackageModel, and the buffered data of an action whose data stream
+    stopped being active. `flush` returns the decimated buffers, it is
+    called every `params.interval` seconds.
+    """
+
+    def __init__(self, params: DecimationParams):
+        self.params = params
+        self._buffers: Dict[object, _ActionBuffer] = {}
+        self._last_flush = time.time()
+        self.rows_in = 0
+        self.rows_out = 0
+
+    def add(self, msg) -> list:
+        if not isinstance(msg, DataPackageModel):
+            return [msg]
+        buf = self._buffers.get(msg.action_uuid)
+        if buf is None:
+            buf = self._buffers[msg.action_uuid] = _ActionBuffer(
+                msg.action_uuid, msg.action_name
+            )
+        self.rows_in += buf.add(msg, self.params)
+        if msg.datamodel.status != HloStatus.active:
+            # send the tail of a finished stream without waiting for a flush
+            budget = self._budget(time.time() - self._last_flush)
+            return [self._take(self._buffers.pop(msg.action_uuid), budget)]
+        return []
+
+    def flush(self) -> list:
+        now = time.time()
+        budget = self._budget(now - self._last_flush)
+        self._last_flush = now
+        return [
+            self._take(buf, budget) for buf in self._buffers.values() if buf.rows
+        ]
+
+    def _budget(self, elapsed: float) -> int:
+        return max(2, int(self.params.points_per_s * max(elapsed, self.params.interval)))
+
+    def _take(self, buf: _ActionBuffer, budget: int) -> DataPackageModel:
+        pkg = buf.take(budget, self.params)
+        self.rows_out += max(
+            (len(next(iter(cols.values()), [])) for cols in pkg.datamodel.data.values()),
+            default=0,
+        )
+        return pkg
+
+    def stats(self) -> dict:
+        return {
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "buffered_actions": len(self._buffers),
+        }
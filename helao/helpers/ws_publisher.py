@@ -1,10 +1,10 @@
-import pickle
 from typing import List
 
-import pyzstd
 import websockets
 from fastapi import WebSocket
 
+from helao.helpers.ws_codec import WsFrameEncoder, select_ws_codec
+
 
 class WsPublisher:
     """
@@ -14,6 +14,7 @@ class WsPublisher:
         active_connections (List[WebSocket]): A list of currently active WebSocket connections.
         source_queue: The queue from which messages are sourced.
         xform_func (function): A transformation function applied to each message before broadcasting.
+        encoder (WsFrameEncoder): Encodes each message once per codec for all connections.
 
     Methods:
         __init__(source_queue, xform_func=lambda x: x):
@@ -48,6 +49,7 @@ class WsPublisher:
         self.active_connections = []
         self.source_queue = source_queue
         self.xform_func = xform_func
+        self.encoder = WsFrameEncoder(xform_func)
 
     async def connect(self, websocket: WebSocket):
         """
@@ -80,8 +82,10 @@ class WsPublisher:
         Broadcasts messages from the source queue to the given websocket.
 
         This method subscribes to the source queue and listens for messages.
-        Each message is transformed using the `xform_func` and then compressed
-        using `pyzstd` before being sent to the websocket.
+        Each message is transformed using the `xform_func`, serialized with the
+        codec requested by the `codec` query parameter (pickle by default) and
+        compressed using `pyzstd` before being sent to the websocket. The frame
+        is encoded once and reused for all connections.
 
         Args:
             websocket (WebSocket): The websocket to which messages are broadcasted.
@@ -90,12 +94,17 @@ class WsPublisher:
             websockets.ConnectionClosedError: If the client closes the connection
                                               without sending a close frame.
         """
-        src_sub = self.source_queue.subscribe()
+        codec = select_ws_codec(websocket.query_params.get("codec", None))
+        if codec is None:
+            await websocket.close(code=1003, reason="unsupported codec")
+            return
+        client = websocket.client
+        src_sub = self.source_queue.subscribe(
+            label=f"ws {client[0]}:{client[1]}" if client else "ws"
+        )
         try:
-            async for source_msg in self.source_queue.subscribe():
-                await websocket.send_bytes(
-                    pyzstd.compress(pickle.dumps(self.xform_func(source_msg)))
-                )
+            async for source_msg in src_sub:
+                await websocket.send_bytes(self.encoder.frame(source_msg, codec))
         except websockets.ConnectionClosedError:
             print("Client closed connection, but no close frame received or sent.")
             if src_sub in self.source_queue.subscribers:
@@ -5,19 +5,29 @@ Classes:
         A synchronous WebSocket client for reading messages from a specified server.
             __init__(host, port, path):
     WsSubscriber:
-        A class that subscribes to a WebSocket server and receives broadcasted messages asynchronously.
+        A class that subscribes to a WebSocket server and receives broadcasted messages asynchronously,
+        reconnecting indefinitely without blocking the event loop.
                 Initializes the WebSocket subscriber with the given host, port, path, and optional max queue length.
 """
 
 import asyncio
-import pickle
 import collections
+import random
 import time
 
-import pyzstd
 import websockets
 from websockets.sync.client import connect
 
+from helao.helpers.ws_codec import DEFAULT_WS_CODEC, decode_ws_frame
+
+
+def _ws_url(host, port, path, codec):
+    url = f"ws://{host}:{port}/{path}"
+    if codec != DEFAULT_WS_CODEC:
+        # path may carry query parameters, e.g. ws_data_decimated?keys=t_s
+        url += f"{'&' if '?' in path else '?'}codec={codec}"
+    return url
+
 
 class WsSyncClient:
     """
@@ -33,7 +43,7 @@ class WsSyncClient:
             if successful, otherwise returns an empty dictionary.
     """
 
-    def __init__(self, host, port, path):
+    def __init__(self, host, port, path, codec=DEFAULT_WS_CODEC):
         """
         Initializes the WebSocket subscriber with the given host, port, and path.
 
@@ -41,11 +51,14 @@ class WsSyncClient:
             host (str): The hostname or IP address of the WebSocket server.
             port (int): The port number of the WebSocket server.
             path (str): The path to the WebSocket endpoint.
+            codec (str, optional): Frame codec requested from the server, see
+                helpers/ws_codec.py. Defaults to "pickle".
 
         Attributes:
             data_url (str): The constructed WebSocket URL.
         """
-        self.data_url = f"ws://{host}:{port}/{path}"
+        self.codec = codec
+        self.data_url = _ws_url(host, port, path, codec)
 
     def read_messages(self):
         """
@@ -53,8 +66,8 @@ class WsSyncClient:
 
         This method tries to establish a connection to the WebSocket server
         specified by `self.data_url` and read messages from it. The messages
-        are expected to be compressed using `pyzstd` and serialized using
-        `pickle`. If the connection or reading fails, it will retry up to
+        are expected to be compressed using `pyzstd` and serialized with
+        `self.codec`. If the connection or reading fails, it will retry up to
         `retry_limit` times with a delay between retries.
 
         Returns:
@@ -70,7 +83,7 @@ class WsSyncClient:
                 with connect(self.data_url) as conn:
                     recv_bytes = conn.recv()
                 if recv_bytes:
-                    return pickle.loads(pyzstd.decompress(recv_bytes))
+                    return decode_ws_frame(recv_bytes, self.codec)
             except Exception:
                 print(f"Could not connect, retrying {retry_idx+1}/{retry_limit}")
                 time.sleep(2)
@@ -81,23 +94,47 @@ class WsSubscriber:
     """
     WsSubscriber is a class that subscribes to a WebSocket server and receives broadcasted messages.
 
+    The subscriber reconnects indefinitely with jittered exponential backoff, so a
+    restarting server does not stall the event loop of the subscribing process.
+    Frames larger than `offload_bytes` are decompressed and decoded in the default
+    executor. When `recv_queue` is full the oldest message is dropped and counted.
+
     Attributes:
         data_url (str): The WebSocket URL constructed from the host, port, and path.
         recv_queue (collections.deque): A deque to store received messages with a maximum length.
         subscriber_task (asyncio.Task): An asyncio task that runs the subscriber loop.
 
     Methods:
-        __init__(host, port, path, max_qlen=500):
+        __init__(host, port, path, max_qlen=500, codec="pickle"):
             Initializes the WsSubscriber with the given host, port, path, and optional max queue length.
 
         subscriber_loop():
-            Coroutine that connects to the WebSocket server and receives messages, retrying on failure.
+            Coroutine that connects to the WebSocket server and receives messages, reconnecting on failure.
+
+        drain():
+            Empties the recv_queue and returns the messages.
 
         read_messages():
-            Asynchronously empties the recv_queue and returns the messages.
+            Asynchronous alias of drain().
+
+        stats():
+            Returns message, drop and reconnect counters.
+
+        close():
+            Stops the subscriber loop.
     """
 
-    def __init__(self, host, port, path, max_qlen=500):
+    def __init__(
+        self,
+        host,
+        port,
+        path,
+        max_qlen=500,
+        codec=DEFAULT_WS_CODEC,
+        retry_delay=0.5,
+        max_retry_delay=30.0,
+        offload_bytes=256 * 1024,
+    ):
         """
         Initializes the WebSocket subscriber.
 
@@ -106,56 +143,114 @@ class WsSubscriber:
             port (int): The port number of the WebSocket server.
             path (str): The path to the WebSocket endpoint.
             max_qlen (int, optional): The maximum length of the receive queue. Defaults to 500.
+            codec (str, optional): Frame codec requested from the server, see
+                helpers/ws_codec.py. Defaults to "pickle".
+            retry_delay (float, optional): First reconnect delay in seconds,
+                doubled on each failed attempt. Defaults to 0.5.
+            max_retry_delay (float, optional): Upper bound of the reconnect
+                delay in seconds. Defaults to 30.
+            offload_bytes (int, optional): Frames of at least this size are
+                decoded in the default executor. Defaults to 256 KiB.
         """
-        self.data_url = f"ws://{host}:{port}/{path}"
+        self.codec = codec
+        self.data_url = _ws_url(host, port, path, codec)
         self.recv_queue = collections.deque(maxlen=max_qlen)
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.offload_bytes = offload_bytes
+        self.connected = False
+        self.num_received = 0
+        self.num_dropped = 0
+        self.num_offloaded = 0
+        self.num_reconnects = 0
         self.subscriber_task = asyncio.create_task(self.subscriber_loop())
 
     async def subscriber_loop(self):
         """
         Asynchronous method to handle the subscription loop for receiving data.
 
-        This method attempts to connect to a WebSocket server at `self.data_url` and
-        receive data in a loop. The received data is expected to be compressed with
-        `pyzstd` and serialized with `pickle`. The decompressed and deserialized data
+        This method connects to the WebSocket server at `self.data_url` and
+        receives data in a loop. The received data is expected to be compressed with
+        `pyzstd` and serialized with `self.codec`. The decompressed and deserialized data
         is appended to `self.recv_queue`.
 
-        If the connection fails, it will retry up to `retry_limit` times with a delay
-        of 2 seconds between each retry.
-
-        Attributes:
-            retry_limit (int): The number of times to retry the connection before giving up.
-            retry_idx (int): The current retry attempt index.
-            recv_bytes (bytes): The raw bytes received from the WebSocket.
-            recv_data_dict (dict): The decompressed and deserialized data received from the WebSocket.
-
-        Raises:
-            Exception: If an error occurs during the connection or data reception process.
+        If the connection fails or drops, it reconnects after a delay that doubles
+        from `retry_delay` up to `max_retry_delay`, with random jitter so that
+        several visualizers do not reconnect in lockstep. The delay is reset once
+        a connection succeeds.
         """
-        retry_limit = 5
-        for retry_idx in range(retry_limit):
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
             try:
                 async with websockets.connect(self.data_url) as ws:
-                    while True:
-                        recv_bytes = await ws.recv()
-                        recv_data_dict = pickle.loads(pyzstd.decompress(recv_bytes))
+                    if attempt:
+                        self.num_reconnects += 1
+                        print(f"Reconnected to {self.data_url}")
+                    attempt = 0
+                    self.connected = True
+                    async for recv_bytes in ws:
+                        if len(recv_bytes) >= self.offload_bytes:
+                            self.num_offloaded += 1
+                            recv_data_dict = await loop.run_in_executor(
+                                None, decode_ws_frame, recv_bytes, self.codec
+                            )
+                        else:
+                            recv_data_dict = decode_ws_frame(recv_bytes, self.codec)
+                        if len(self.recv_queue) == self.recv_queue.maxlen:
+                            self.num_dropped += 1
                         self.recv_queue.append(recv_data_dict)
-            except Exception:
-                print(f"Could not connect, retrying {retry_idx+1}/{retry_limit}")
-                time.sleep(2)
+                        self.num_received += 1
+            except asyncio.CancelledError:
+                self.connected = False
+                raise
+            except Exception as e:
+                if attempt == 0:
+                    print(f"Could not connect to {self.data_url} ({repr(e)}), retrying")
+            self.connected = False
+            delay = min(self.max_retry_delay, self.retry_delay * 2**attempt)
+            attempt += 1
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+    def drain(self):
+        """
+        Empties the receive queue in one step.
+
+        Returns:
+            list: The messages read from the `recv_queue`, oldest first.
+        """
+        messages = list(self.recv_queue)
+        self.recv_queue.clear()
+        return messages
 
     async def read_messages(self):
         """
         Asynchronously reads messages from the receive queue.
 
-        This method continuously reads messages from the `recv_queue` until it is empty.
-        Each message is appended to a list which is returned at the end.
-
         Returns:
             list: A list of messages read from the `recv_queue`.
         """
-        messages = []
-        while self.recv_queue:
-            messages.append(self.recv_queue.popleft())
-            await asyncio.sleep(1e-4)
-        return messages
+        return self.drain()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Connection state and message, drop and reconnect counters.
+        """
+        return {
+            "url": self.data_url,
+            "connected": self.connected,
+            "received": self.num_received,
+            "dropped": self.num_dropped,
+            "queued": len(self.recv_queue),
+            "offloaded": self.num_offloaded,
+            "reconnects": self.num_reconnects,
+        }
+
+    async def close(self):
+        """Stops the subscriber loop and closes the connection."""
+        self.subscriber_task.cancel()
+        try:
+            await self.subscriber_task
+        except asyncio.CancelledError:
+            pass
@@ -1,4 +1,4 @@
-__all__ = ["yml_finisher"]
+__all__ = ["yml_finisher", "move_dir", "resume_promotions"]
 
 import os
 import asyncio
@@ -12,11 +12,15 @@ import aiofiles
 
 from .yml_tools import yml_load
 from .premodels import Sequence, Experiment, Action
+from .postprocess_queue import POSTPROCESS_MARKER
+from .dir_promotion import promote_entry, journal_for
 
 from helao.helpers import helao_logging as logging
 
 LOGGER = logging.make_logger(__file__) if logging.LOGGER is None else logging.LOGGER
 
+MOVE_RETRIES = 60
+
 
 async def yml_finisher(yml_path: str, db_config: dict = {}, retry: int = 3):
     """
@@ -73,16 +77,16 @@ async def move_dir(
     """
     Move directory from RUNS_ACTIVE to RUNS_FINISHED or RUNS_DIAG based on the type and attributes of the provided object.
 
+    Files are renamed rather than copied when possible and the move is journaled
+    in STATES/promotions, see helao.helpers.dir_promotion.
+
     Parameters:
     hobj (Union[Sequence, Experiment, Action]): The object whose directory is to be moved. Can be of type Sequence, Experiment, or Action.
-    base (object, optional): The base object that provides the print_message method. Defaults to None.
-    retry_delay (int, optional): The delay in seconds between retries for copying and removing files. Defaults to 5.
+    base (object, optional): The base object providing helaodirs and world_cfg. Defaults to None.
+    retry_delay (int, optional): The delay in seconds between retries when files are locked. Defaults to 5.
 
     Returns:
-    dict: An empty dictionary if an invalid object type is provided.
-
-    Raises:
-    Exception: If there are issues with directory creation, file copying, or file removal.
+    bool: True if the directory was moved, an empty dictionary if an invalid object type is provided.
     """
 
     obj_type = hobj.__class__.__name__.lower()
@@ -112,110 +116,134 @@ async def move_dir(
     yml_dir = os.path.normpath(os.path.join(save_dir, target_subdir))
 
     new_dir = os.path.join(yml_dir.replace("RUNS_ACTIVE", dest_dir))
-    nosync_dir = os.path.join(yml_dir.replace("RUNS_ACTIVE", "RUNS_NOSYNC"))
-    await aiofiles.os.makedirs(new_dir, exist_ok=True)
-    await aiofiles.os.makedirs(nosync_dir, exist_ok=True)
+    timestamp = getattr(hobj, f"{obj_type}_timestamp").strftime("%y%m%d.%H%M%S%f")
+    yml_name = f"{timestamp}-{obj_type[:3]}.yml"
 
-    copy_success = False
-    copy_retries = 0
     if obj_type == "action":
         src_list = glob(os.path.join(yml_dir, "**", "*"), recursive=True)
     else:
         src_list = glob(os.path.join(yml_dir, "*"))
-    src_list = [x for x in src_list if os.path.isfile(x)]
-
-    while (not copy_success) and copy_retries <= 60:
-        dst_list = [
-            p.replace(
-                "RUNS_ACTIVE",
-                (
-                    "RUNS_NOSYNC"
-                    if p.endswith(".hlo") and not hobj.sync_data
-                    else dest_dir
-                ),
+    # the yml goes last so the finished dir is only picked up once complete
+    src_list = sorted(
+        (x for x in src_list if os.path.isfile(x)),
+        key=lambda x: os.path.basename(x) == yml_name,
+    )
+    moves = []
+    nosync_moves = []
+    for src in src_list:
+        if src.endswith(".hlo") and not hobj.sync_data:
+            nosync_moves.append((src, src.replace("RUNS_ACTIVE", "RUNS_NOSYNC")))
+        else:
+            moves.append((src, src.replace("RUNS_ACTIVE", dest_dir)))
+
+    entry = {
+        "obj_type": obj_type,
+        "src_dir": yml_dir,
+        "dst_dir": new_dir,
+        "yml_path": os.path.join(new_dir, yml_name),
+        "is_manual": is_manual,
+        "moves": moves,
+        "nosync_moves": nosync_moves,
+    }
+    journal = journal_for(base)
+    if journal is not None:
+        journal.begin(entry)
+    return await run_promotion(entry, base, retry_delay=retry_delay)
+
+
+async def run_promotion(entry: dict, base: object, retry_delay: int = 5) -> bool:
+    """
+    Move the files of a promotion entry, remove its RUNS_ACTIVE dir and
+    finish the yml with the DB server. Also resumes journaled entries.
+
+    Args:
+        entry (dict): Promotion entry built by move_dir.
+        base (object): The server base, providing helaodirs and world_cfg.
+        retry_delay (int, optional): Seconds between retries when files are
+            locked. Defaults to 5.
+
+    Returns:
+        bool: True if the promotion completed.
+    """
+    loop = asyncio.get_running_loop()
+    obj_type = entry["obj_type"]
+    yml_dir = entry["src_dir"]
+    for retry in range(MOVE_RETRIES + 1):
+        try:
+            counts = await loop.run_in_executor(None, promote_entry, entry)
+            LOGGER.info(f"Moved {yml_dir} to FINISHED: {counts}")
+            break
+        except Exception:
+            LOGGER.warning(
+                f"Could not move {yml_dir} [{retry}/{MOVE_RETRIES}], retrying after {retry_delay} seconds",
+                exc_info=True,
             )
-            for p in src_list
-        ]
-        for p in dst_list:
-            os.makedirs(os.path.dirname(p), exist_ok=True)
-            
-        mvtups = []
-        cptups = []
-        for src, dst in zip(src_list, dst_list):
-            if "RUNS_NOSYNC" in dst:
-                mvtups.append((src, dst))
-            else:
-                cptups.append((src, dst))
-        
-        move_results = await asyncio.gather(
-            *[aioshutil.move(src, dst) for src, dst in mvtups],
-            return_exceptions=True,
-        )
-            
-        copy_results = await asyncio.gather(
-            *[aioshutil.copy(src, dst) for src, dst in cptups],
-            return_exceptions=True,
-        )
-        
-        exists_list = [f for f in dst_list if os.path.exists(f)]
-        if len(exists_list) == len(src_list):
-            copy_success = True
-            LOGGER.info(f"Successfully copied {yml_dir} to FINISHED.")
+            await asyncio.sleep(retry_delay)
+    else:
+        LOGGER.error(f"Giving up moving {yml_dir}, it is resumed on restart.")
+        return False
+
+    # actions still post-processing are moved when their job completes
+    pending = obj_type != "action" and glob(
+        os.path.join(yml_dir, "**", POSTPROCESS_MARKER), recursive=True
+    )
+    if pending:
+        LOGGER.info(f"Keeping {yml_dir}, {len(pending)} actions are post-processing.")
+    else:
+        await _rmtree(yml_dir)
+
+    if obj_type == "action":
+        exp_dir = os.path.dirname(yml_dir)
+        seq_dir = os.path.dirname(exp_dir)
+        if entry["is_manual"]:
+            # remove active sequence and experiment dirs
+            await _rmtree(exp_dir)
+            await _rmtree(seq_dir)
         else:
-            src_list = [f for f in src_list if f not in exists_list]
-            LOGGER.info(
-                f"Could not copy {len(src_list)} files to FINISHED, retrying after {retry_delay} seconds"
+            # experiment and sequence dirs kept for a post-processing
+            # action are left empty once it is moved
+            for parent_dir in (exp_dir, seq_dir):
+                if os.path.isdir(parent_dir) and not os.listdir(parent_dir):
+                    try:
+                        await aiofiles.os.rmdir(parent_dir)
+                    except OSError:
+                        break
+
+    if not entry["is_manual"]:
+        await yml_finisher(
+            entry["yml_path"],
+            db_config=base.world_cfg.get("servers", {}).get("DB", {}),
+        )
+    journal = journal_for(base)
+    if journal is not None:
+        journal.end(entry)
+    LOGGER.info(f"Successfully removed {yml_dir}")
+    return True
+
+
+async def resume_promotions(base: object):
+    """Complete promotions of *base* interrupted by a crash or shutdown."""
+    journal = journal_for(base)
+    if journal is None:
+        return
+    entries = journal.pending()
+    if entries:
+        LOGGER.info(f"Resuming {len(entries)} interrupted directory moves")
+    for entry in entries:
+        try:
+            await run_promotion(entry, base)
+        except Exception:
+            LOGGER.error(
+                f"Failed to resume move of {entry.get('src_dir')}", exc_info=True
             )
-            LOGGER.info(src_list)
-            LOGGER.info(move_results)
-            LOGGER.info(copy_results)
-            copy_retries += 1
-        await asyncio.sleep(retry_delay)
-
-    if copy_success:
-        rm_success = False
-        rm_retries = 0
-        rm_list = src_list
-        while (not rm_success) and rm_retries <= 30:
-            rm_files = [x for x in rm_list if os.path.isfile(x)]
-            await asyncio.gather(
-                *[aiofiles.os.remove(f) for f in rm_files], return_exceptions=True
+
+
+async def _rmtree(path: str):
+    if os.path.exists(path):
+        try:
+            await aioshutil.rmtree(path)
+        except FileNotFoundError:
+            LOGGER.warning(
+                f"Error removing {path}, perhaps removed by another operation.",
+                exc_info=False,
             )
-            rm_files_done = [f for f in rm_files if not os.path.exists(f)]
-            if len(rm_files_done) == len(rm_files):
-                if os.path.exists(yml_dir):
-                    try:
-                        await aioshutil.rmtree(yml_dir)
-                    except FileNotFoundError:
-                        LOGGER.warning(
-                            f"Error removing {yml_dir}, perhaps removed by another operation.",
-                            exc_info=False,
-                        )
-                if not os.path.exists(yml_dir):
-                    rm_success = True
-                    timestamp = getattr(hobj, f"{obj_type}_timestamp").strftime(
-                        "%y%m%d.%H%M%S%f"
-                    )
-                    yml_path = os.path.join(new_dir, f"{timestamp}-{obj_type[:3]}.yml")
-                    if not is_manual:
-                        await yml_finisher(
-                            yml_path,
-                            db_config=base.world_cfg.get("servers", {}).get("DB", {}),
-                        )
-                    LOGGER.info(f"Successfully removed {yml_dir}")
-                if rm_success and obj_type == "action" and is_manual:
-                    # remove active sequence and experiment dirs
-                    exp_dir = os.path.dirname(yml_dir)
-                    if os.path.exists(exp_dir):
-                        await aioshutil.rmtree(exp_dir)
-                    seq_dir = os.path.dirname(exp_dir)
-                    if os.path.exists(seq_dir):
-                        await aioshutil.rmtree(seq_dir)
-            else:
-                rm_list = [f for f in rm_list if f not in rm_files_done]
-                LOGGER.info(
-                    f"Could not remove directory from ACTIVE, retrying after {retry_delay} seconds"
-                )
-                LOGGER.info(rm_list)
-                rm_retries += 1
-            await asyncio.sleep(retry_delay)
@@ -34,6 +34,12 @@ class zdeque(deque):
 
         index(x):
             Return the index of item `x` after pickling and compressing it.
+
+        raw(i):
+            Return the stored compressed item at index `i` without decoding it.
+
+        decode(raw):
+            Decompress and unpickle a stored item.
     """
 
     def __init__(self, *args, **kwargs):
@@ -59,6 +65,35 @@ class zdeque(deque):
         x = super().__getitem__(i)
         return pickle.loads(pyzstd.decompress(x))
 
+    def raw(self, i):
+        """
+        Retrieve the stored (pickled and compressed) item at index `i`.
+
+        The returned object is the one held by the deque, so it identifies the
+        queue entry until it is removed, unlike the fresh copies returned by
+        `__getitem__`.
+
+        Args:
+            i (int): The index of the item to retrieve.
+
+        Returns:
+            bytes: The compressed item.
+        """
+        return super().__getitem__(i)
+
+    @staticmethod
+    def decode(raw):
+        """
+        Decompress and deserialize an item returned by `raw`.
+
+        Args:
+            raw (bytes): The compressed item.
+
+        Returns:
+            object: The decompressed and deserialized item.
+        """
+        return pickle.loads(pyzstd.decompress(raw))
+
     def __iter__(self):
         """
         Iterate over the elements in the deque, decompressing and unpickling each element.
@@ -5,6 +5,8 @@ Classes:
 Functions:
     validateConfig(PIDD, confDict, helao_repo_root): Validates the configuration dictionary for HELAO servers.
     wait_key(): Waits for a key press on the console and returns it.
+    server_dependencies(server, serverDict, launchGroups, launchOrder): Determines the servers a server waits for.
+    probe_ready(host, port, codeKey, timeout=1.0): Checks whether a server accepts requests.
     launcher(confArg, confDict, helao_repo_root, extraopt=""): Launches HELAO servers based on the provided configuration.
     main(): Main entry point for the HELAO launcher script.
 Usage:
@@ -33,6 +35,7 @@ import re
 import threading
 import zipfile
 from glob import glob
+from concurrent.futures import ThreadPoolExecutor
 
 import click
 from termcolor import cprint
@@ -437,9 +440,76 @@ def wait_key():
     return keypress
 
 
+def server_dependencies(server, serverDict, launchGroups, launchOrder):
+    """
+    Determines the servers that must be ready before a server is launched.
+
+    An explicit 'depends_on' list in the server config is used as is. Otherwise a
+    server depends on the servers of earlier groups in `launchOrder` that its
+    params refer to by name, or on all of them if its params refer to none, e.g.
+    an orchestrator waits for every action server.
+
+    Args:
+        server (str): Server key.
+        serverDict (dict): Server configuration.
+        launchGroups (dict): Server keys by group.
+        launchOrder (list): Group launch priority.
+
+    Returns:
+        list: Server keys to wait for.
+    """
+    if "depends_on" in serverDict:
+        return list(serverDict["depends_on"])
+    group = serverDict["group"]
+    earlier = [
+        sk
+        for g in launchOrder[: launchOrder.index(group)]
+        for sk in launchGroups.get(g, {})
+    ]
+
+    def param_strings(val):
+        if isinstance(val, str):
+            yield val
+        elif isinstance(val, dict):
+            for v in val.values():
+                yield from param_strings(v)
+        elif isinstance(val, (list, tuple)):
+            for v in val:
+                yield from param_strings(v)
+
+    referenced = set(param_strings(serverDict.get("params", {})))
+    named = [sk for sk in earlier if sk in referenced]
+    return named if named else earlier
+
+
+def probe_ready(host, port, codeKey, timeout=1.0):
+    """
+    Checks whether a server accepts requests.
+
+    FastAPI servers answer GET /health once their startup events have completed,
+    bokeh servers are ready when they serve any page.
+
+    Returns:
+        bool: True if the server responded.
+    """
+    url = f"http://{host}:{port}/health" if codeKey == "fast" else f"http://{host}:{port}/"
+    try:
+        resp = requests.get(url, timeout=timeout)
+        return resp.status_code < 500 if codeKey != "fast" else resp.status_code == 200
+    except requests.exceptions.RequestException:
+        return False
+
+
 def launcher(confArg, confDict, helao_repo_root, extraopt=""):
     """
     Launches the Helao servers based on the provided configuration.
+
+    Servers are launched as soon as the servers they depend on (see
+    `server_dependencies`) answer their health probe, so servers of one group
+    start in parallel. A server that does not become ready within
+    'ready_timeout' seconds (config key 'launch', default 60) is reported and
+    no longer waited for. A startup timeline is logged at the end.
+
     Args:
         confArg (str): Path to the configuration file.
         confDict (dict): Dictionary containing the configuration details.
@@ -447,7 +517,6 @@ def launcher(confArg, confDict, helao_repo_root, extraopt=""):
         extraopt (str, optional): Additional options for launching. Defaults to "".
     Raises:
         Exception: If the configuration is invalid.
-        Exception: If a server cannot be started due to port conflicts.
     Returns:
         Pidd: An instance of the Pidd class containing the process IDs of the launched servers.
     """
@@ -457,6 +526,9 @@ def launcher(confArg, confDict, helao_repo_root, extraopt=""):
 
     # API server launch priority (matches folders in root helao-dev/)
     LAUNCH_ORDER = ["action", "orchestrator", "visualizer", "operator"]
+    launchCfg = confDict.get("launch", {})
+    readyTimeout = launchCfg.get("ready_timeout", 60)
+    pollInterval = launchCfg.get("poll_interval", 0.25)
 
     pidd = Pidd(
         pidFile=f"pids_{confPrefix}_{extraopt}.pck", pidPath=helaodirs.states_root
@@ -479,68 +551,152 @@ def launcher(confArg, confDict, helao_repo_root, extraopt=""):
     }
     pidd.servers = allGroup
     pidd.orchServs = []
+
+    # servers to launch and servers to probe, by key
+    toLaunch = {}
+    toProbe = {}
     for group in LAUNCH_ORDER:
-        LAUNCH_LOGGER.info(f"Launching {group} group.")
-        if group in pidd.servers.keys():
-            G = pidd.servers[group]
-            for server in G.keys():
-                S = G[server]
-                codeKey = [k for k in S if k in pidd.codeKeys]
-                if codeKey:
-                    codeKey = codeKey[0]
-                    servPy = S[codeKey]
-                else:
-                    servPy = None
-                servHost = S["host"]
-                servPort = S["port"]
-                servKHP = (server, servHost, servPort)
-                servHP = (servHost, servPort)
-                if extraopt in ["liveonly", "gpvis"] and servPy != "live_visualizer":
-                    continue
-                # if 'py' key is None, assume remotely started or monitored by a separate action
-                if servPy is None:
-                    LAUNCH_LOGGER.info(
-                        f"{server} does not specify one of ({pidd.codeKeys}) so action server will not be managed by this launcher.",
-                    )
-                elif servKHP in activeKHP:
+        G = pidd.servers.get(group, {})
+        for server in G.keys():
+            S = G[server]
+            codeKey = [k for k in S if k in pidd.codeKeys]
+            if codeKey:
+                codeKey = codeKey[0]
+                servPy = S[codeKey]
+            else:
+                codeKey = None
+                servPy = None
+            servHost = S["host"]
+            servPort = S["port"]
+            servKHP = (server, servHost, servPort)
+            servHP = (servHost, servPort)
+            if extraopt in ["liveonly", "gpvis"] and servPy != "live_visualizer":
+                continue
+            # if 'py' key is None, assume remotely started or monitored by a separate action
+            if servPy is None:
+                LAUNCH_LOGGER.info(
+                    f"{server} does not specify one of ({pidd.codeKeys}) so action server will not be managed by this launcher.",
+                )
+            elif servKHP in activeKHP:
+                LAUNCH_LOGGER.info(
+                    f"{server} already running with pid [{active[activeKHP.index(servKHP)][3]}]",
+                )
+                toProbe[server] = (servHost, servPort, codeKey)
+            elif servHP in activeHP:
+                LAUNCH_LOGGER.warning(
+                    f"Cannot start {server}, {servHost}:{servPort} is already in use."
+                )
+            elif codeKey == "bokeh" and (
+                extraopt in ["nolive", "actionvis"] and servPy == "live_visualizer"
+            ):
+                continue
+            elif codeKey not in ("fast", "bokeh"):
+                LAUNCH_LOGGER.warning(
+                    f"No launch method available for code type '{codeKey}', cannot launch {group}/{servPy}.py",
+                )
+            else:
+                toLaunch[server] = (group, servPy, codeKey)
+                toProbe[server] = (servHost, servPort, codeKey)
+
+    deps = {
+        server: [
+            dk
+            for dk in server_dependencies(
+                server, confDict["servers"][server], allGroup, LAUNCH_ORDER
+            )
+            if dk in toProbe and dk != server
+        ]
+        for server in toLaunch
+    }
+
+    t0 = time.time()
+    launched = {}  # server: (launch time, Popen)
+    ready = {}  # server: ready time
+    failed = {}  # server: reason
+    pending = list(toLaunch)
+    # servers already running only need to answer their probe
+    probing = {server: t0 for server in toProbe if server not in toLaunch}
+    with ThreadPoolExecutor(max_workers=16) as probePool:
+        while pending or probing:
+            # launch every pending server whose dependencies are resolved
+            resolved = set(ready) | set(failed)
+            startable = [sk for sk in pending if set(deps[sk]) <= resolved]
+            if not startable and not probing and pending:
+                LAUNCH_LOGGER.error(
+                    f"Circular 'depends_on' between {pending}, launching them anyway."
+                )
+                startable = list(pending)
+            for server in startable:
+                pending.remove(server)
+                group, servPy, codeKey = toLaunch[server]
+                servHost, servPort, _ = toProbe[server]
+                LAUNCH_LOGGER.info(
+                    f"Launching {server} at {servHost}:{servPort} using helao/servers/{group}/{servPy}.py",
+                )
+                if group == "orchestrator" and codeKey == "fast":
+                    pidd.orchServs.append(server)
+                cmd = ["python", f"{codeKey}_launcher.py", confArg, server]
+                p = subprocess.Popen(cmd, cwd=helao_repo_root)
+                pidd.store_pid(server, servHost, servPort, p.pid)
+                launched[server] = (time.time(), p)
+                probing[server] = launched[server][0]
+
+            if not probing:
+                continue
+            time.sleep(pollInterval)
+            probeKeys = list(probing)
+            results = probePool.map(
+                lambda sk: probe_ready(*toProbe[sk], timeout=1.0), probeKeys
+            )
+            for server, isReady in zip(probeKeys, results):
+                if isReady:
+                    ready[server] = time.time()
+                    probing.pop(server)
                     LAUNCH_LOGGER.info(
-                        f"{server} already running with pid [{active[activeKHP.index(servKHP)][3]}]",
+                        f"{server} ready after {ready[server] - probing_start(launched, server, t0):.1f} s."
                     )
-                elif servHP in activeHP:
+                elif server in launched and launched[server][1].poll() is not None:
+                    failed[server] = f"exited with code {launched[server][1].returncode}"
+                    probing.pop(server)
+                    LAUNCH_LOGGER.error(f"{server} {failed[server]}.")
+                elif time.time() - probing[server] > readyTimeout:
+                    failed[server] = f"not ready after {readyTimeout} s"
+                    probing.pop(server)
                     LAUNCH_LOGGER.warning(
-                        f"Cannot start {server}, {servHost}:{servPort} is already in use."
+                        f"{server} {failed[server]}, no longer waiting for it."
                     )
-                else:
-                    LAUNCH_LOGGER.info(
-                        f"Launching {server} at {servHost}:{servPort} using helao/servers/{group}/{servPy}.py",
-                    )
-                    if codeKey == "fast":
-                        if group == "orchestrator":
-                            pidd.orchServs.append(server)
-                        cmd = ["python", "fast_launcher.py", confArg, server]
-                        p = subprocess.Popen(cmd, cwd=helao_repo_root)
-                        ppid = p.pid
-                    elif codeKey == "bokeh":
-                        if (
-                            extraopt in ["nolive", "actionvis"]
-                            and servPy == "live_visualizer"
-                        ):
-                            continue
-                        cmd = ["python", "bokeh_launcher.py", confArg, server]
-                        p = subprocess.Popen(cmd, cwd=helao_repo_root)
-                        ppid = p.pid
-                    else:
-                        LAUNCH_LOGGER.warning(
-                            f"No launch method available for code type '{codeKey}', cannot launch {group}/{servPy}.py",
-                        )
-                        continue
-                    pidd.store_pid(server, servHost, servPort, ppid)
-                    time.sleep(0.5)
-        if group != LAUNCH_ORDER[-1]:
-            time.sleep(3)
+
+    LAUNCH_LOGGER.info(
+        "startup timeline:\n"
+        + "\n".join(
+            timeline_row(server, t0, launched, ready, failed, deps)
+            for server in sorted(
+                toProbe,
+                key=lambda sk: ready.get(sk, float("inf")),
+            )
+        )
+        + f"\nall servers resolved after {time.time() - t0:.1f} s"
+    )
     return pidd
 
 
+def probing_start(launched, server, t0):
+    """Launch time of a server, or the launcher start for servers already running."""
+    return launched[server][0] if server in launched else t0
+
+
+def timeline_row(server, t0, launched, ready, failed, deps):
+    """Formats one line of the startup timeline, times relative to `t0`."""
+    start = probing_start(launched, server, t0)
+    launchStr = f"launched +{start - t0:6.1f} s" if server in launched else "already running "
+    if server in ready:
+        readyStr = f"ready +{ready[server] - t0:6.1f} s ({ready[server] - start:5.1f} s)"
+    else:
+        readyStr = f"FAILED: {failed.get(server, 'unknown')}"
+    depStr = f"  after {', '.join(deps[server])}" if deps.get(server) else ""
+    return f"  {server:<16} {launchStr}  {readyStr}{depStr}"
+
+
 def main():
     """
     Main function to initialize and launch the HELAO application.